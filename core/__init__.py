@@ -1,20 +1,36 @@
 # core paketi — İş mantığı modülleri
+#
+# Yönetici ve controller sınıfları PyQt6'ya bağımlıdır; ilk erişimde yüklenirler (PEP 562).
+# Böylece `core.workers.*` gibi alt modüller arayüz olmadan (CLI) PyQt6 yüklenmeden içe aktarılabilir.
 
-# Yönetici sınıflar
-from core.project_manager import ProjectManager
-from core.ui_state_manager import UIStateManager
-from core.file_list_manager import FileListManager
+import importlib
 
-# Controller sınıfları
-from core.download_controller import DownloadController
-from core.translation_controller import TranslationController
-from core.merge_controller import MergeController
-from core.token_controller import TokenController
-from core.process_controller import (
-    CleaningController,
-    SplitController,
-    EpubController,
-    ErrorCheckController,
-    ChapterCheckController,
-    MLTerminologyController,
-)
+_LAZY_EXPORTS = {
+    # Yönetici sınıflar
+    "ProjectManager": "core.project_manager",
+    "UIStateManager": "core.ui_state_manager",
+    "FileListManager": "core.file_list_manager",
+
+    # Controller sınıfları
+    "DownloadController": "core.download_controller",
+    "TranslationController": "core.translation_controller",
+    "MergeController": "core.merge_controller",
+    "TokenController": "core.token_controller",
+    "CleaningController": "core.process_controller",
+    "SplitController": "core.process_controller",
+    "EpubController": "core.process_controller",
+    "ErrorCheckController": "core.process_controller",
+    "ChapterCheckController": "core.process_controller",
+    "MLTerminologyController": "core.process_controller",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'core' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
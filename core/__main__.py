@@ -0,0 +1,7 @@
+# python -m core <komut> — arayüz olmadan çalıştırma (bkz. core/cli.py)
+
+import sys
+
+from core.cli import main
+
+sys.exit(main())
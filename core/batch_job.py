@@ -0,0 +1,446 @@
+"""
+Batch Job — Sağlayıcı batch API'leri ile çevrimdışı (gece) toplu çeviri.
+
+Akış:
+  1. prepare  → Bekleyen tüm istekler JSONL iş dosyasına yazılır (Gemini Batch / OpenAI Batch formatı)
+  2. submit   → İş dosyası sağlayıcıya yüklenir, uzak iş kimliği manifeste kaydedilir
+  3. poll     → İş tamamlanana kadar durum sorgulanır
+  4. download → Sonuç JSONL'i proje klasörüne indirilir
+  5. ingest   → Her sonuç satırı trslt'ye ve cache'e işlenir; işlenen kimlikler ayrı bir
+                dosyaya eklenir (append-only) → yarıda kesilen içe aktarma kaldığı yerden devam eder
+
+Her adım manifestte (config/batch_jobs/<job_id>.json) kayıtlıdır; uygulama kapanıp açıldığında
+gönderilmiş bir iş yeniden gönderilmez, yalnızca sorgulanmaya devam edilir.
+
+Arka uçlar:
+  - GeminiBatchBackend  : google-genai client.batches
+  - OpenAIBatchBackend  : openai client.files + client.batches
+  - LocalBatchServer    : Ağ gerektirmeyen yerel taklit sunucu (çevrimdışı test için)
+"""
+
+import os
+import json
+import time
+import uuid
+import codecs
+import threading
+from logger import app_logger
+
+
+BATCH_JOBS_SUBFOLDER = os.path.join("config", "batch_jobs")
+
+FORMAT_GEMINI = "gemini"
+FORMAT_OPENAI = "openai"
+
+# Manifest durumları
+STATUS_PREPARED = "prepared"
+STATUS_SUBMITTED = "submitted"
+STATUS_COMPLETED = "completed"
+STATUS_INGESTED = "ingested"
+STATUS_FAILED = "failed"
+
+# Arka uçların poll() dönüşünde kullandığı ortak durumlar
+REMOTE_RUNNING = "running"
+REMOTE_SUCCEEDED = "succeeded"
+REMOTE_FAILED = "failed"
+
+
+# ─────────────────────── JSONL Satır Formatları ───────────────────────
+
+def build_request_line(fmt: str, custom_id: str, prompt: str, model_id: str) -> dict:
+    """Tek bir isteği sağlayıcının batch satır formatına dönüştürür."""
+    if fmt == FORMAT_GEMINI:
+        return {
+            "key": custom_id,
+            "request": {"contents": [{"role": "user", "parts": [{"text": prompt}]}]},
+        }
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {"model": model_id, "messages": [{"role": "user", "content": prompt}]},
+    }
+
+
+def parse_result_line(fmt: str, line: dict) -> tuple[str | None, str | None, str | None]:
+    """
+    Sonuç satırını (custom_id, metin, hata) üçlüsüne çevirir.
+    Hatalı satırlarda metin None, hata açıklaması dolu döner.
+    """
+    if fmt == FORMAT_GEMINI:
+        custom_id = line.get("key")
+        if line.get("error"):
+            return custom_id, None, json.dumps(line["error"], ensure_ascii=False)
+        try:
+            candidate = line["response"]["candidates"][0]
+            text = "".join(p.get("text", "") for p in candidate["content"]["parts"])
+            return custom_id, text, None
+        except (KeyError, IndexError, TypeError) as e:
+            return custom_id, None, f"Geçersiz Gemini sonuç satırı: {e}"
+
+    custom_id = line.get("custom_id")
+    if line.get("error"):
+        return custom_id, None, json.dumps(line["error"], ensure_ascii=False)
+    response = line.get("response") or {}
+    if response.get("status_code", 200) != 200:
+        return custom_id, None, f"HTTP {response.get('status_code')}: {json.dumps(response.get('body'), ensure_ascii=False)[:300]}"
+    try:
+        return custom_id, response["body"]["choices"][0]["message"]["content"], None
+    except (KeyError, IndexError, TypeError) as e:
+        return custom_id, None, f"Geçersiz OpenAI sonuç satırı: {e}"
+
+
+def _extract_prompt(fmt: str, request_line: dict) -> str:
+    if fmt == FORMAT_GEMINI:
+        return "".join(p.get("text", "") for p in request_line["request"]["contents"][0]["parts"])
+    return request_line["body"]["messages"][-1]["content"]
+
+
+# ─────────────────────── Arka Uçlar ───────────────────────
+
+
+class GeminiBatchBackend:
+    """google-genai Batch API arka ucu."""
+
+    fmt = FORMAT_GEMINI
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def _client(self):
+        self.provider._ensure_gemini()
+        return self.provider._gemini_client
+
+    def submit(self, input_path: str, model_id: str, display_name: str) -> str:
+        from google.genai import types
+        client = self._client()
+        uploaded = client.files.upload(
+            file=input_path,
+            config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl"),
+        )
+        job = client.batches.create(
+            model=model_id,
+            src=uploaded.name,
+            config={"display_name": display_name},
+        )
+        return job.name
+
+    def poll(self, remote_id: str) -> tuple[str, str | None]:
+        job = self._client().batches.get(name=remote_id)
+        state = getattr(job.state, "name", str(job.state))
+        if state == "JOB_STATE_SUCCEEDED":
+            return REMOTE_SUCCEEDED, job.dest.file_name
+        if state in ("JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"):
+            return REMOTE_FAILED, state
+        return REMOTE_RUNNING, state
+
+    def download(self, output_ref: str, dest_path: str):
+        data = self._client().files.download(file=output_ref)
+        with open(dest_path, "wb") as f:
+            f.write(data)
+
+
+class OpenAIBatchBackend:
+    """OpenAI (ve uyumlu) Batch API arka ucu."""
+
+    fmt = FORMAT_OPENAI
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def _client(self):
+        self.provider._ensure_openai()
+        return self.provider._openai_client
+
+    def submit(self, input_path: str, model_id: str, display_name: str) -> str:
+        client = self._client()
+        with open(input_path, "rb") as f:
+            uploaded = client.files.create(file=f, purpose="batch")
+        job = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"description": display_name},
+        )
+        return job.id
+
+    def poll(self, remote_id: str) -> tuple[str, str | None]:
+        job = self._client().batches.retrieve(remote_id)
+        if job.status == "completed":
+            # Başarısız istekler ayrı error dosyasında gelir; ikisi birlikte indirilir
+            return REMOTE_SUCCEEDED, json.dumps([job.output_file_id, job.error_file_id])
+        if job.status in ("failed", "expired", "cancelled"):
+            return REMOTE_FAILED, job.status
+        return REMOTE_RUNNING, job.status
+
+    def download(self, output_ref: str, dest_path: str):
+        client = self._client()
+        with open(dest_path, "w", encoding="utf-8") as out:
+            for file_id in json.loads(output_ref):
+                if file_id:
+                    out.write(client.files.content(file_id).text.rstrip("\n") + "\n")
+
+
+def pseudo_translate(text: str) -> str:
+    """Yerel taklit sunucunun varsayılan yanıtı: ROT13 sahte çeviri (ağ/anahtar gerektirmez)."""
+    return codecs.encode(text, "rot13")
+
+
+class LocalBatchServer:
+    """
+    Ağ gerektirmeyen yerel batch sunucusu taklidi.  Gerçek arka uçlarla aynı arayüzü sunar;
+    işler arka planda bir thread ile işlenir ve durumları diskte tutulur (süreç yeniden
+    başlasa bile tamamlanmamış işler poll sırasında kaldığı yerden işlenir).
+
+    responder: prompt → yanıt metni.  Varsayılan: pseudo_translate (tüm prompt'a ROT13).
+    """
+
+    def __init__(self, storage_folder: str, fmt: str = FORMAT_OPENAI, responder=None,
+                 seconds_per_request: float = 0.0):
+        self.storage_folder = storage_folder
+        self.fmt = fmt
+        self.responder = responder or pseudo_translate
+        self.seconds_per_request = seconds_per_request
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        os.makedirs(storage_folder, exist_ok=True)
+
+    def _job_dir(self, remote_id: str) -> str:
+        return os.path.join(self.storage_folder, remote_id)
+
+    def _read_state(self, remote_id: str) -> dict:
+        with open(os.path.join(self._job_dir(remote_id), "state.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self, remote_id: str, state: dict):
+        path = os.path.join(self._job_dir(remote_id), "state.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def submit(self, input_path: str, model_id: str, display_name: str) -> str:
+        remote_id = f"localbatch-{uuid.uuid4().hex[:12]}"
+        job_dir = self._job_dir(remote_id)
+        os.makedirs(job_dir, exist_ok=True)
+        with open(input_path, "r", encoding="utf-8") as src, \
+                open(os.path.join(job_dir, "input.jsonl"), "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+        self._write_state(remote_id, {"status": REMOTE_RUNNING, "done": 0, "display_name": display_name})
+        self._ensure_processing(remote_id)
+        return remote_id
+
+    def _ensure_processing(self, remote_id: str):
+        with self._lock:
+            thread = self._threads.get(remote_id)
+            if thread and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._process, args=(remote_id,), daemon=True)
+            self._threads[remote_id] = thread
+            thread.start()
+
+    def _process(self, remote_id: str):
+        job_dir = self._job_dir(remote_id)
+        state = self._read_state(remote_id)
+        with open(os.path.join(job_dir, "input.jsonl"), "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+
+        out_path = os.path.join(job_dir, "output.jsonl")
+        with open(out_path, "a", encoding="utf-8") as out:
+            for idx in range(state.get("done", 0), len(lines)):
+                request_line = lines[idx]
+                out.write(json.dumps(self._respond(request_line), ensure_ascii=False) + "\n")
+                out.flush()
+                state["done"] = idx + 1
+                self._write_state(remote_id, state)
+                if self.seconds_per_request:
+                    time.sleep(self.seconds_per_request)
+        state["status"] = REMOTE_SUCCEEDED
+        self._write_state(remote_id, state)
+
+    def _respond(self, request_line: dict) -> dict:
+        try:
+            text = self.responder(_extract_prompt(self.fmt, request_line))
+            error = None
+        except Exception as e:
+            text, error = None, {"message": str(e)}
+
+        if self.fmt == FORMAT_GEMINI:
+            if error:
+                return {"key": request_line["key"], "error": error}
+            return {"key": request_line["key"],
+                    "response": {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}}
+        if error:
+            return {"custom_id": request_line["custom_id"], "response": None, "error": error}
+        return {
+            "custom_id": request_line["custom_id"],
+            "response": {"status_code": 200,
+                         "body": {"choices": [{"message": {"role": "assistant", "content": text}}]}},
+            "error": None,
+        }
+
+    def poll(self, remote_id: str) -> tuple[str, str | None]:
+        state = self._read_state(remote_id)
+        if state["status"] == REMOTE_SUCCEEDED:
+            return REMOTE_SUCCEEDED, os.path.join(self._job_dir(remote_id), "output.jsonl")
+        self._ensure_processing(remote_id)
+        return REMOTE_RUNNING, f"{state.get('done', 0)} istek işlendi"
+
+    def download(self, output_ref: str, dest_path: str):
+        with open(output_ref, "r", encoding="utf-8") as src, open(dest_path, "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+
+
+def create_batch_backend(kind: str, provider, project_path: str):
+    """config.ini [Batch] batch_job_backend değerine göre arka uç oluşturur."""
+    if kind == "local":
+        return LocalBatchServer(os.path.join(project_path, BATCH_JOBS_SUBFOLDER, "local_server"))
+    if kind == "auto":
+        kind = "gemini" if provider.ep_type == "gemini" else "openai"
+    if kind == "gemini":
+        return GeminiBatchBackend(provider)
+    return OpenAIBatchBackend(provider)
+
+
+# ─────────────────────── İş Yöneticisi ───────────────────────
+
+
+class BatchJobManager:
+    """Proje bazlı batch iş manifestlerini ve JSONL dosyalarını yönetir."""
+
+    def __init__(self, project_path: str, backend):
+        self.folder = os.path.join(project_path, BATCH_JOBS_SUBFOLDER)
+        os.makedirs(self.folder, exist_ok=True)
+        self.backend = backend
+        self.fmt = backend.fmt
+
+    # ──────── Manifest ────────
+
+    def _manifest_path(self, job_id: str) -> str:
+        return os.path.join(self.folder, f"{job_id}.json")
+
+    def _ingested_path(self, job: dict) -> str:
+        return os.path.join(self.folder, f"{job['job_id']}.ingested")
+
+    def save(self, job: dict):
+        """Manifesti atomik olarak yazar (yarım yazılmış manifest kalmaz)."""
+        path = self._manifest_path(job["job_id"])
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(job, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def open_jobs(self) -> list[dict]:
+        """İçe aktarımı bitmemiş işleri oluşturulma sırasına göre döndürür."""
+        jobs = []
+        for name in sorted(os.listdir(self.folder)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.folder, name), "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except Exception as e:
+                app_logger.warning(f"Batch iş manifesti okunamadı ({name}): {e}")
+                continue
+            if job.get("status") not in (STATUS_INGESTED, STATUS_FAILED):
+                jobs.append(job)
+        return sorted(jobs, key=lambda j: j.get("created_at", 0))
+
+    # ──────── Adımlar ────────
+
+    def prepare(self, requests: dict[str, str], model_id: str) -> dict:
+        """
+        requests: {custom_id: prompt}.  JSONL iş dosyasını yazar ve manifest oluşturur.
+        """
+        job_id = time.strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:6]
+        input_path = os.path.join(self.folder, f"{job_id}.input.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            for custom_id, prompt in requests.items():
+                f.write(json.dumps(build_request_line(self.fmt, custom_id, prompt, model_id), ensure_ascii=False) + "\n")
+
+        job = {
+            "job_id": job_id,
+            "format": self.fmt,
+            "model_id": model_id,
+            "status": STATUS_PREPARED,
+            "remote_id": None,
+            "input_file": input_path,
+            "output_file": os.path.join(self.folder, f"{job_id}.output.jsonl"),
+            "custom_ids": list(requests.keys()),
+            "created_at": time.time(),
+        }
+        self.save(job)
+        app_logger.info(f"Batch iş dosyası hazırlandı: {job_id} ({len(requests)} istek)")
+        return job
+
+    def submit(self, job: dict) -> dict:
+        if job["status"] != STATUS_PREPARED:
+            return job
+        job["remote_id"] = self.backend.submit(job["input_file"], job["model_id"], f"yznvl-{job['job_id']}")
+        job["status"] = STATUS_SUBMITTED
+        job["submitted_at"] = time.time()
+        self.save(job)
+        app_logger.info(f"Batch iş gönderildi: {job['job_id']} → {job['remote_id']}")
+        return job
+
+    def poll(self, job: dict) -> str:
+        """İşin durumunu sorgular; tamamlandıysa sonucu indirir.  Güncel manifest durumunu döndürür."""
+        if job["status"] != STATUS_SUBMITTED:
+            return job["status"]
+        state, ref = self.backend.poll(job["remote_id"])
+        if state == REMOTE_SUCCEEDED:
+            self.backend.download(ref, job["output_file"])
+            job["status"] = STATUS_COMPLETED
+            self.save(job)
+            app_logger.info(f"Batch iş tamamlandı ve indirildi: {job['job_id']}")
+        elif state == REMOTE_FAILED:
+            job["status"] = STATUS_FAILED
+            job["error"] = ref
+            self.save(job)
+            app_logger.error(f"Batch iş başarısız: {job['job_id']} ({ref})")
+        else:
+            app_logger.debug(f"Batch iş bekleniyor: {job['job_id']} ({ref})")
+        return job["status"]
+
+    def load_ingested(self, job: dict) -> set[str]:
+        path = self._ingested_path(job)
+        if not os.path.exists(path):
+            return set()
+        with open(path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def mark_ingested(self, job: dict, custom_id: str):
+        """İçe aktarılan kimliği append-only dosyaya ekler (çökme sonrası tekrar işlenmez)."""
+        with open(self._ingested_path(job), "a", encoding="utf-8") as f:
+            f.write(custom_id + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_results(self, job: dict):
+        """(custom_id, metin, hata) üçlülerini üretir; önceden içe aktarılanlar atlanır."""
+        ingested = self.load_ingested(job)
+        with open(job["output_file"], "r", encoding="utf-8") as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                try:
+                    line = json.loads(raw)
+                except json.JSONDecodeError as e:
+                    app_logger.warning(f"Batch sonuç satırı okunamadı: {e}")
+                    continue
+                custom_id, text, error = parse_result_line(job["format"], line)
+                if custom_id and custom_id not in ingested:
+                    ingested.add(custom_id)
+                    yield custom_id, text, error
+
+    def finish(self, job: dict):
+        job["status"] = STATUS_INGESTED
+        job["ingested_at"] = time.time()
+        self.save(job)
+
+    def pending_custom_ids(self) -> set[str]:
+        """Açık işlerde bekleyen (henüz içe aktarılmamış) tüm kimlikler."""
+        ids = set()
+        for job in self.open_jobs():
+            ids.update(set(job.get("custom_ids", [])) - self.load_ingested(job))
+        return ids
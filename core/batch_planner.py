@@ -0,0 +1,100 @@
+"""
+Batch Planner — Token farkındalıklı batch planlama (first-fit-decreasing bin packing).
+
+Her bölüm için karakter ve token tahmini (estimate_tokens) kullanılır; bayt boyutu kullanılmaz,
+böylece CJK bölümleri (UTF-8'de karakter başına ~3 bayt) batch'leri gereğinden küçük bırakmaz.
+
+Bir batch şu sınırların hepsine uymalıdır:
+  - max_chars:          toplam karakter (Proje ayarı max_batch_chars)
+  - max_items:          bölüm sayısı (max_chapters_per_batch)
+  - max_input_tokens:   modelin girdi token sınırı (statik ön ek düşülmüş hâli), None → sınırsız
+  - max_output_tokens:  modelin çıktı token sınırı; bölüm başına beklenen çıktı = token × output_ratio
+
+Bölümler büyükten küçüğe yerleştirilir (FFD), her batch içindeki sıra ise orijinal bölüm sırasıdır.
+"""
+
+
+class BatchItem:
+    """Planlanacak tek bir bölüm: ad, orijinal sıra, karakter ve token tahmini."""
+
+    def __init__(self, name: str, index: int, chars: int, tokens: int):
+        self.name = name
+        self.index = index
+        self.chars = chars
+        self.tokens = tokens
+
+
+class PlannedBatch:
+    def __init__(self):
+        self.items: list[BatchItem] = []
+        self.chars = 0
+        self.tokens = 0
+
+    def add(self, item: BatchItem):
+        self.items.append(item)
+        self.chars += item.chars
+        self.tokens += item.tokens
+
+    @property
+    def names(self) -> list[str]:
+        return [item.name for item in sorted(self.items, key=lambda it: it.index)]
+
+
+class BatchLimits:
+    def __init__(self, max_chars: int, max_items: int, max_input_tokens: int | None = None,
+                 max_output_tokens: int | None = None, output_ratio: float = 1.0):
+        self.max_chars = max(1, int(max_chars))
+        self.max_items = max(1, int(max_items))
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.output_ratio = output_ratio
+
+    def fits(self, batch: PlannedBatch, item: BatchItem) -> bool:
+        if len(batch.items) + 1 > self.max_items:
+            return False
+        if batch.chars + item.chars > self.max_chars:
+            return False
+        tokens = batch.tokens + item.tokens
+        if self.max_input_tokens and tokens > self.max_input_tokens:
+            return False
+        if self.max_output_tokens and tokens * self.output_ratio > self.max_output_tokens:
+            return False
+        return True
+
+    def fill_ratio(self, batch: PlannedBatch) -> float:
+        """Batch'in en dar sınıra göre doluluk oranı (0.0 – 1.0+)."""
+        ratios = [len(batch.items) / self.max_items, batch.chars / self.max_chars]
+        if self.max_input_tokens:
+            ratios.append(batch.tokens / self.max_input_tokens)
+        if self.max_output_tokens:
+            ratios.append(batch.tokens * self.output_ratio / self.max_output_tokens)
+        return max(ratios)
+
+
+def plan_batches(items: list[BatchItem], limits: BatchLimits) -> list[PlannedBatch]:
+    """
+    First-fit-decreasing bin packing.  Tek başına sınırı aşan bölüm kendi batch'ine konur.
+    Batch'ler içerdikleri ilk bölümün sırasına göre döndürülür.
+    """
+    batches: list[PlannedBatch] = []
+    for item in sorted(items, key=lambda it: (-it.tokens, it.index)):
+        target = next((b for b in batches if limits.fits(b, item)), None)
+        if target is None:
+            target = PlannedBatch()
+            batches.append(target)
+        target.add(item)
+    batches.sort(key=lambda b: min(it.index for it in b.items))
+    return batches
+
+
+def summarize_fill(batches: list[PlannedBatch], limits: BatchLimits) -> dict:
+    """Planın doluluk istatistikleri."""
+    if not batches:
+        return {"batches": 0, "avg_fill": 0.0, "min_fill": 0.0, "max_fill": 0.0}
+    fills = [limits.fill_ratio(b) for b in batches]
+    return {
+        "batches": len(batches),
+        "avg_fill": sum(fills) / len(fills),
+        "min_fill": min(fills),
+        "max_fill": max(fills),
+    }
@@ -0,0 +1,162 @@
+"""
+Cancel Token — Worker'lar için olay tabanlı duraklatma / devam / durdurma.
+
+Eskiden worker'lar `while self.is_paused: time.sleep(0.5)` ve bekleme döngülerinde `is_running`
+yoklaması yapıyordu; durdurma/duraklatma en geç bir yoklama aralığı sonra fark ediliyordu.
+CancelToken iki threading.Event üzerine kuruludur: bekleyen thread'ler stop() / resume() anında
+uyanır.  Durdurmada kayıtlı geri çağırımlar (henüz başlamamış future'ların iptali, pipeline
+iptali, kota beklemesinin uyandırılması) hemen çalıştırılır.
+
+Worker'lar CancellableMixin ile mevcut `is_running` / `is_paused` bayraklarını korur; bayraklar
+token'a bağlı özelliklerdir (property), dolayısıyla `self.is_running = False` da token'ı durdurur.
+
+Kullanım:
+    self.cancel_token.wait_if_paused()          # duraklatıldıysa devam / durdurma gelene kadar bekler
+    if not self.cancel_token.sleep(wait_time):  # bekleme sırasında durdurulduysa False
+        return None
+    self.cancel_token.track(future)             # durdurmada başlamamış future iptal edilir
+"""
+
+import asyncio
+import threading
+
+from logger import app_logger
+
+
+class CancelToken:
+    """Thread-safe durdurma/duraklatma belirteci."""
+
+    def __init__(self):
+        self._stopped = threading.Event()
+        self._resumed = threading.Event()   # duraklatılmamışken set
+        self._resumed.set()
+        self._lock = threading.Lock()
+        self._callbacks: list = []
+
+    # ──────── Durum ────────
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set() and not self._stopped.is_set()
+
+    # ──────── Komutlar ────────
+
+    def stop(self):
+        """Durdurur; duraklatılmış ve uyuyan thread'ler uyanır, geri çağırımlar çalışır."""
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            self._stopped.set()
+            self._resumed.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                app_logger.warning(f"Durdurma geri çağırımı başarısız: {type(e).__name__}: {e}")
+
+    def pause(self):
+        if not self._stopped.is_set():
+            self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    # ──────── Bekleme ────────
+
+    def wait_if_paused(self) -> bool:
+        """Duraklatıldıysa devam veya durdurma gelene kadar bekler.  Devam edilebilirse True."""
+        self._resumed.wait()
+        return not self._stopped.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """seconds kadar bekler; durdurulursa hemen döner.  Süre kesintisiz dolduysa True."""
+        return not self._stopped.wait(max(0.0, seconds))
+
+    def wait_stopped(self, timeout: float | None = None) -> bool:
+        """Durdurma gelene kadar (en fazla timeout sn) bekler.  Durdurulduysa True."""
+        return self._stopped.wait(timeout)
+
+    async def async_sleep(self, seconds: float) -> bool:
+        """sleep()'in asyncio karşılığı; durdurma geldiğinde bekleme hemen biter."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        remove = self.on_stop(lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, seconds))
+            return False
+        except asyncio.TimeoutError:
+            return not self._stopped.is_set()
+        finally:
+            remove()
+
+    # ──────── Geri çağırımlar ────────
+
+    def on_stop(self, callback):
+        """
+        Durdurmada çağrılacak fonksiyonu kaydeder (zaten durdurulduysa hemen çağırır).
+        Kaydı silen bir fonksiyon döndürür.
+        """
+        with self._lock:
+            if not self._stopped.is_set():
+                self._callbacks.append(callback)
+                registered = True
+            else:
+                registered = False
+        if not registered:
+            callback()
+
+        def _remove():
+            with self._lock:
+                try:
+                    self._callbacks.remove(callback)
+                except ValueError:
+                    pass
+        return _remove
+
+    def track(self, future):
+        """Future'ı durdurmada iptal edilecek şekilde kaydeder (çalışmaya başlamış olanlar bitene kadar sürer)."""
+        remove = self.on_stop(future.cancel)
+        future.add_done_callback(lambda _f: remove())
+        return future
+
+
+class CancellableMixin:
+    """
+    Worker sınıfları için `cancel_token` ve token'a bağlı `is_running` / `is_paused` özellikleri.
+    QObject'ten önce miras alınır: class XWorker(CancellableMixin, QObject).
+    """
+
+    @property
+    def cancel_token(self) -> CancelToken:
+        token = self.__dict__.get('_cancel_token')
+        if token is None:
+            token = self.__dict__['_cancel_token'] = CancelToken()
+        return token
+
+    @property
+    def is_running(self) -> bool:
+        return not self.cancel_token.stopped
+
+    @is_running.setter
+    def is_running(self, value: bool):
+        if not value:
+            self.cancel_token.stop()
+        elif self.cancel_token.stopped:
+            # Durdurulmuş worker yeniden başlatılıyor: yeni belirteç
+            self.__dict__['_cancel_token'] = CancelToken()
+
+    @property
+    def is_paused(self) -> bool:
+        return self.cancel_token.paused
+
+    @is_paused.setter
+    def is_paused(self, value: bool):
+        if value:
+            self.cancel_token.pause()
+        else:
+            self.cancel_token.resume()
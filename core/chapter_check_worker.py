@@ -1,8 +1,9 @@
 import os
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 from logger import app_logger
 
-class ChapterCheckWorker(QObject):
+class ChapterCheckWorker(CancellableMixin, QObject):
     """
     Seçili dosyaların ilk 3 satırında 'Bölüm' kelimesini arayan
     ve sonuçları raporlayan işçi sınıfı.
@@ -16,7 +17,6 @@ class ChapterCheckWorker(QObject):
         super().__init__()
         self.project_path = project_path
         self.files_to_check = files_to_check # List of (filename, full_path)
-        self.is_running = True
 
     def run(self):
         if not self.files_to_check:
@@ -99,4 +99,4 @@ class ChapterCheckWorker(QObject):
             self.error.emit(f"Başlık kontrolü sırasında hata: {str(e)}")
 
     def stop(self):
-        self.is_running = False
\ No newline at end of file
+        self.cancel_token.stop()
\ No newline at end of file
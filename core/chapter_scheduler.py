@@ -0,0 +1,108 @@
+"""
+ChapterScheduler — Çeviri sırası için öncelik kuyruğu.
+
+Öncelik sınıfları (küçük olan önce):
+  0. Kullanıcının dosya tablosunda seçtiği (işaretlediği) bölümler
+  1. Okuma konumu etrafındaki "önden çeviri" penceresi (konumdan itibaren ileriye doğru)
+  2. Geri kalan bölümler (doğal sıra)
+
+Öncelikler çeviri sırasında değiştirilebilir (set_selected / set_reading_position); bir sonraki
+next() çağrısı yeni sıralamayı kullanır.  Dağıtılmış bölümler tekrar verilmez.
+"""
+
+import heapq
+import threading
+
+
+PRIORITY_SELECTED = 0
+PRIORITY_AHEAD = 1
+PRIORITY_REST = 2
+
+
+class ChapterScheduler:
+    """Thread-safe bölüm zamanlayıcısı.  Bölümler (index, dosya_adı) olarak dağıtılır."""
+
+    def __init__(self, files: list[str], selected: list[str] | None = None,
+                 reading_position: str | None = None, ahead_window: int = 20, behind_window: int = 0):
+        self._files = list(files)
+        self._index = {name: i for i, name in enumerate(self._files)}
+        self._remaining = set(self._files)
+        self._lock = threading.Lock()
+        self._selected: set[str] = set(selected or [])
+        self._position: int | None = self._index.get(reading_position) if reading_position else None
+        self.ahead_window = max(0, int(ahead_window))
+        self.behind_window = max(0, int(behind_window))
+        self._heap: list[tuple[int, int, str]] = []
+        self._rebuild()
+
+    # ──────── Öncelik ayarları (çalışma sırasında çağrılabilir) ────────
+
+    def set_selected(self, names: list[str]):
+        with self._lock:
+            self._selected = set(names or [])
+            self._rebuild()
+
+    def set_reading_position(self, file_name: str | None, ahead_window: int | None = None):
+        with self._lock:
+            self._position = self._index.get(file_name) if file_name else None
+            if ahead_window is not None:
+                self.ahead_window = max(0, int(ahead_window))
+            self._rebuild()
+
+    def requeue(self, file_name: str):
+        """Dağıtılmış bir bölümü (ör. başarısız) tekrar kuyruğa ekler."""
+        with self._lock:
+            if file_name in self._index and file_name not in self._remaining:
+                self._remaining.add(file_name)
+                heapq.heappush(self._heap, self._entry(file_name))
+
+    # ──────── Dağıtım ────────
+
+    def next(self) -> tuple[int, str] | None:
+        """En yüksek öncelikli bekleyen bölümü döndürür; kalmadıysa None."""
+        with self._lock:
+            while self._heap:
+                _, _, name = heapq.heappop(self._heap)
+                if name not in self._remaining:
+                    continue
+                self._remaining.discard(name)
+                return self._index[name], name
+            return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._remaining)
+
+    def ordered(self, names: list[str]) -> list[str]:
+        """Verilen bölümleri dağıtmadan öncelik sırasına dizer (batch planlaması için)."""
+        with self._lock:
+            return sorted((n for n in names if n in self._index), key=self._entry)
+
+    def priority_of(self, file_name: str) -> int:
+        with self._lock:
+            return self._priority(self._index[file_name])
+
+    # ──────── İç işleyiş ────────
+
+    def _priority(self, idx: int) -> int:
+        if self._files[idx] in self._selected:
+            return PRIORITY_SELECTED
+        if self._position is not None and \
+                self._position - self.behind_window <= idx <= self._position + self.ahead_window:
+            return PRIORITY_AHEAD
+        return PRIORITY_REST
+
+    def _order(self, idx: int) -> int:
+        """Aynı öncelik içinde sıra: pencere içinde konuma uzaklık (önce ileri), diğerlerinde doğal sıra."""
+        if self._position is not None and self._priority(idx) == PRIORITY_AHEAD:
+            return idx - self._position if idx >= self._position else self.ahead_window + (self._position - idx)
+        return idx
+
+    def _entry(self, name: str) -> tuple[int, int, str]:
+        idx = self._index[name]
+        return self._priority(idx), self._order(idx), name
+
+    def _rebuild(self):
+        """Öncelik değiştiğinde bekleyen bölümler için yığını yeniden kurar."""
+        self._heap = [self._entry(name) for name in self._remaining]
+        heapq.heapify(self._heap)
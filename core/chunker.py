@@ -0,0 +1,178 @@
+"""
+Chunker — İstek bütçesini aşan bölüm/paragrafların cümle sınırlarından parçalara bölünmesi.
+
+Tek parça hâlindeki dev paragraflar veya birleştirilmiş bölüm dökümleri modelin çıktı sınırını aşıp
+sessizce kesilebilir.  Metin önce paragraflara, bütçeyi aşan paragraflar cümlelere, bütçeyi aşan
+cümleler de karakter sınırından bölünür; parçalar token bütçesine göre paketlenir.
+
+Her parça, önceki parçanın son cümlelerinden oluşan küçük bir bağlam penceresi (overlap) taşır.
+Bu pencere yalnızca bağlam için gönderilir, çevrilmez ve birleştirilen çıktıya girmez.
+
+Kullanım:
+    chunks = chunk_text(text, token_budget=4000, overlap_tokens=150)
+    translations = [translate(format_chunk_prompt(c)) for c in chunks]
+    result = stitch_chunks(chunks, translations)
+"""
+
+import re
+
+from core.workers.token_counter import estimate_tokens
+
+
+# Cümle sonu: Latin (. ! ? …) + isteğe bağlı kapanış tırnağı/parantez ve boşluk; CJK (。！？) boşluksuz
+_SENTENCE_END = re.compile(
+    r'(?<=[.!?…])["\'”’»)\]]*\s+'
+    r'|(?<=[。！？])[」』”’）]*'
+)
+
+_CJK_END = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef」』”’）]$')
+
+PARAGRAPH_JOINER = "\n\n"
+SENTENCE_JOINER = " "
+
+CONTEXT_OPEN = "[BAĞLAM — yalnızca bağlam içindir, ÇEVİRME ve çıktıya EKLEME:]"
+CONTEXT_CLOSE = "[BAĞLAM SONU — yalnızca aşağıdaki metni çevir:]"
+
+
+class Chunk:
+    """Tek bir çeviri parçası: metin, önceki parçaya eklenirken kullanılacak ayraç ve bağlam penceresi."""
+
+    def __init__(self, text: str, joiner: str = "", context: str = ""):
+        self.text = text
+        self.joiner = joiner
+        self.context = context
+
+
+def split_sentences(text: str) -> list[str]:
+    """Metni cümlelere böler (Latin ve CJK noktalaması).  Boş parçalar atılır."""
+    parts = []
+    last = 0
+    for match in _SENTENCE_END.finditer(text):
+        end = match.end()
+        if end <= last:
+            continue
+        sentence = text[last:end].strip()
+        if sentence:
+            parts.append(sentence)
+        last = end
+    tail = text[last:].strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def _hard_split(text: str, token_budget: int, model: str | None = None) -> list[tuple[str, str]]:
+    """
+    Cümle sınırı bulunamayan aşırı uzun metni karakter sınırından (mümkünse boşlukta) böler.
+    (ayraç, parça) döndürür; boşluktan kesilmeyen parçaların ayracı boştur.
+    """
+    tokens = max(estimate_tokens(text, model), 1)
+    max_chars = max(1, int(len(text) * token_budget / tokens))
+    pieces = []
+    joiner = SENTENCE_JOINER
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        next_joiner = SENTENCE_JOINER
+        if cut <= max_chars // 2:
+            cut = max_chars
+            next_joiner = ""
+        pieces.append((joiner, text[:cut].strip()))
+        text = text[cut:].strip()
+        joiner = next_joiner
+    if text:
+        pieces.append((joiner, text))
+    return pieces
+
+
+def _units(text: str, token_budget: int, model: str | None = None) -> list[tuple[str, str]]:
+    """Metni (ayraç, birim) listesine çevirir; her birim bütçeye sığar."""
+    units = []
+    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text.strip()) if p.strip()]
+    for p_idx, paragraph in enumerate(paragraphs):
+        joiner = PARAGRAPH_JOINER if p_idx else ""
+        if estimate_tokens(paragraph, model) <= token_budget:
+            units.append((joiner, paragraph))
+            continue
+        for s_idx, sentence in enumerate(split_sentences(paragraph)):
+            if estimate_tokens(sentence, model) <= token_budget:
+                pieces = [(SENTENCE_JOINER, sentence)]
+            else:
+                pieces = _hard_split(sentence, token_budget, model)
+            for k, (piece_joiner, piece) in enumerate(pieces):
+                if k:
+                    joiner = piece_joiner
+                elif s_idx:
+                    # CJK cümleleri arasında boşluk yoktur
+                    joiner = "" if _CJK_END.search(units[-1][1]) else SENTENCE_JOINER
+                units.append((joiner, piece))
+    return units
+
+
+def _tail_context(text: str, overlap_tokens: int, model: str | None = None) -> str:
+    """Parçanın sonundan overlap_tokens'ı aşmayan son cümleler."""
+    if overlap_tokens <= 0:
+        return ""
+    picked = []
+    used = 0
+    for sentence in reversed(split_sentences(text)):
+        tokens = estimate_tokens(sentence, model)
+        if used + tokens > overlap_tokens:
+            break
+        picked.append(sentence)
+        used += tokens
+    return " ".join(reversed(picked))
+
+
+def chunk_text(text: str, token_budget: int, overlap_tokens: int = 0, model: str | None = None) -> list[Chunk]:
+    """
+    Metni token bütçesine göre parçalara böler.  Bütçeye sığan metin tek parça olarak döner.
+
+    Args:
+        token_budget: Parça başına en fazla tahmini girdi token'ı (bağlam penceresi hariç).
+        overlap_tokens: Önceki parçadan bağlam olarak eklenecek en fazla token.
+        model: Token tahmininde kullanılacak kalibrasyonun modeli (None: ortak kalibrasyon).
+    """
+    token_budget = max(1, int(token_budget))
+    if estimate_tokens(text, model) <= token_budget:
+        return [Chunk(text.strip())]
+
+    chunks: list[Chunk] = []
+    current: list[str] = []
+    current_joiner = ""
+    used = 0
+    for joiner, unit in _units(text, token_budget, model):
+        tokens = estimate_tokens(unit, model)
+        if current and used + tokens > token_budget:
+            chunks.append(Chunk("".join(current), current_joiner))
+            current, used = [], 0
+        if not current:
+            current_joiner = joiner
+            current.append(unit)
+        else:
+            current.append(joiner + unit)
+        used += tokens
+    if current:
+        chunks.append(Chunk("".join(current), current_joiner))
+
+    for prev, chunk in zip(chunks, chunks[1:]):
+        chunk.context = _tail_context(prev.text, overlap_tokens, model)
+    chunks[0].joiner = ""
+    return chunks
+
+
+def format_chunk_prompt(chunk: Chunk) -> str:
+    """Parçayı (varsa bağlam penceresiyle) istek gövdesine çevirir."""
+    if not chunk.context:
+        return "\n\n" + chunk.text
+    return f"\n\n{CONTEXT_OPEN}\n{chunk.context}\n{CONTEXT_CLOSE}\n\n{chunk.text}"
+
+
+def stitch_chunks(chunks: list[Chunk], translations: list[str]) -> str:
+    """Parça çevirilerini orijinal ayraçlarla (paragraf / cümle) birleştirir."""
+    parts = []
+    for chunk, translated in zip(chunks, translations):
+        # Model bağlam penceresini yanıta kopyaladıysa yalnızca işaretten sonrası alınır
+        if CONTEXT_CLOSE in translated:
+            translated = translated.split(CONTEXT_CLOSE, 1)[1]
+        parts.append(chunk.joiner + translated.strip())
+    return "".join(parts)
@@ -0,0 +1,493 @@
+"""
+CLI — Arayüz olmadan (headless) indirme, çeviri, hata kontrolü, birleştirme, EPUB ve token sayımı.
+
+Arayüzün kullandığı worker sınıflarını aynı proje klasörü düzeniyle (dwnld / trslt / cmplt / config)
+çalıştırır.  Worker sinyalleri Qt yerine düz geri çağırımlara (callback) bağlanır; bu modül ve
+yüklediği modüller PyQt6'yı hiç içe aktarmaz (bkz. core.qt_compat).
+
+Kullanım (uygulama klasöründen):
+    python -m core translate "Proje Adı" --limit 10
+    python -m core translate "Proje Adı" --shard --node pc2   # bölümleri diğer süreçlerle paylaşarak çevirir
+    python -m core check "Proje Adı" --source-lang zh
+    python -m core merge "Proje Adı"
+    python -m core epub "Proje Adı"
+    python -m core count-tokens "Proje Adı"
+    python -m core calibrate-tokens --model gemini-2.5-flash   # token tahmini hata raporu
+    python -m core download "Proje Adı" --method booktoki --chapter-limit 200
+    python -m core serve --port 8765          # çoklu proje iş kuyruğu (bkz. core/job_server.py)
+
+Çıktı: stdout'a satır başına bir JSON olay yazılır (loglar stderr'e gider):
+    {"event": "start", "command": "translate", "ts": ...}
+    {"event": "progress", "command": "translate", "current": 3, "total": 40, "ts": ...}
+    {"event": "done", "command": "translate", "ok": true, ..., "ts": ...}
+
+Çıkış kodları:
+    0   işlem başarılı
+    1   işlem hatası (worker hatası, çevrilemeyen bölüm, yüksek riskli kontrol bulgusu)
+    2   kullanım / proje yapılandırma hatası
+    130 kullanıcı tarafından durduruldu (Ctrl+C)
+"""
+
+import os
+
+# core.qt_compat bu değişkeni içe aktarma anında okur; core modüllerinden ÖNCE ayarlanmalıdır
+os.environ["YZNVL_HEADLESS"] = "1"
+
+import sys
+import json
+import time
+import argparse
+import threading
+import configparser
+
+from logger import app_logger
+from core.utils import natural_sort_key
+
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class CLIError(Exception):
+    """Kullanım veya proje yapılandırma hatası (çıkış kodu 2)."""
+
+
+class EventWriter:
+    """Olayları satır başına bir JSON nesnesi olarak yazar.  Worker thread'lerinden çağrılabilir."""
+
+    def __init__(self, command: str, stream=None):
+        self.command = command
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, **fields):
+        record = {"event": event, "command": self.command, **fields, "ts": round(time.time(), 3)}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+# ──────── Ortak yardımcılar ────────
+
+def _project_path(name: str) -> str:
+    path = name if os.path.isabs(name) else os.path.join(os.getcwd(), name)
+    if not os.path.isdir(path):
+        raise CLIError(f"Proje klasörü bulunamadı: {path}")
+    return path
+
+
+def _read_project_config(project_path: str) -> configparser.ConfigParser:
+    config_path = os.path.join(project_path, 'config', 'config.ini')
+    if not os.path.exists(config_path):
+        raise CLIError(f"config.ini bulunamadı: {config_path}")
+    config = configparser.ConfigParser()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.read_file(f)
+    except configparser.Error as e:
+        raise CLIError(f"Config dosyası okunurken hata oluştu: {e}")
+    return config
+
+
+def _translated_files(project_path: str, names: list[str] | None = None) -> list[str]:
+    """trslt klasöründeki çevrilmiş dosyalar (doğal sıralı); names verilmişse yalnızca onlar."""
+    folder = os.path.join(project_path, 'trslt')
+    if not os.path.isdir(folder):
+        return []
+    if names:
+        paths = [os.path.join(folder, n) for n in names]
+        missing = [p for p in paths if not os.path.exists(p)]
+        if missing:
+            raise CLIError(f"Dosya bulunamadı: {', '.join(os.path.basename(p) for p in missing)}")
+    else:
+        paths = [
+            os.path.join(folder, f) for f in os.listdir(folder)
+            if f.startswith('translated_') and f.endswith('.txt')
+        ]
+    return sorted(paths, key=lambda p: natural_sort_key(os.path.basename(p)))
+
+
+def _run_worker(worker, emit: EventWriter) -> bool:
+    """
+    Worker'ı ayrı bir thread'de çalıştırır ve bitmesini bekler.  Ctrl+C gelirse worker.stop()
+    çağrılır, worker'ın kendi temizliğini (journal, hata kaydı) bitirmesi beklenir ve False döner.
+    """
+    thread = threading.Thread(target=worker.run, name=f"cli-{emit.command}", daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.2)
+    except KeyboardInterrupt:
+        emit("interrupted")
+        app_logger.warning("CLI: Kullanıcı tarafından durduruldu, worker'ın kapanması bekleniyor...")
+        if hasattr(worker, "stop"):
+            worker.stop()
+        try:
+            thread.join()
+        except KeyboardInterrupt:
+            pass
+        return False
+    return True
+
+
+def _connect_common(worker, emit: EventWriter, errors: list[str]):
+    worker.progress.connect(lambda current, total: emit("progress", current=current, total=total))
+
+    def on_error(message):
+        errors.append(message)
+        emit("error", message=message)
+
+    worker.error.connect(on_error)
+
+
+# ──────── Komutlar ────────
+
+def cmd_translate(args, emit: EventWriter) -> int:
+    from core.llm_provider import NODE_ID_ENV
+    from core.workers.translation_worker import create_translation_worker
+
+    project_path = _project_path(args.project)
+    config = _read_project_config(project_path)
+    if args.node:
+        # Anahtar havuzu worker oluşturulurken okunur: düğüme özel anahtar dosyası için önce ayarlanmalı
+        os.environ[NODE_ID_ENV] = args.node
+    try:
+        worker = create_translation_worker(
+            project_path, config, model_version=args.model, file_limit=args.limit, priority_files=args.files,
+            shard=True if args.shard else None, node_id=args.node,
+        )
+    except ValueError as e:
+        raise CLIError(str(e))
+    errors: list[str] = []
+    requests = [0]
+    _connect_common(worker, emit, errors)
+
+    def on_request():
+        requests[0] += 1
+
+    worker.request_made.connect(on_request)
+
+    emit("start", project=project_path, model=worker.model_version)
+    completed = _run_worker(worker, emit)
+
+    failed = dict(worker.translation_errors)
+    ok = completed and not errors and not failed
+    emit("done", ok=ok, failed=failed, errors=errors, api_requests=requests[0],
+         token_usage=worker.token_usage_report())
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_check(args, emit: EventWriter) -> int:
+    from core.workers.translation_error_check_worker import TranslationErrorCheckWorker
+
+    project_path = _project_path(args.project)
+    trslt_folder = os.path.join(project_path, 'trslt')
+    if not os.path.isdir(trslt_folder):
+        raise CLIError(f"Çeviri klasörü bulunamadı: {trslt_folder}")
+
+    worker = TranslationErrorCheckWorker(
+        trslt_folder, os.path.join(trslt_folder, 'hata_kontrol'), source_lang=args.source_lang
+    )
+    errors: list[str] = []
+    results: dict = {}
+    _connect_common(worker, emit, errors)
+    worker.finished.connect(results.update)
+
+    emit("start", project=project_path)
+    completed = _run_worker(worker, emit)
+
+    high = [f["filename"] for f in results.get("high", [])]
+    low = [f["filename"] for f in results.get("low", [])]
+    ok = completed and not errors and not high
+    emit("done", ok=ok, high=high, low=low, report_path=results.get("report_path", ""), errors=errors)
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_merge(args, emit: EventWriter) -> int:
+    from core.workers.merging_worker import MergingWorker
+
+    project_path = _project_path(args.project)
+    files = _translated_files(project_path, args.files)
+    if not files:
+        raise CLIError("Birleştirilecek çevrilmiş dosya bulunamadı.")
+    output_folder = os.path.join(project_path, 'cmplt')
+    os.makedirs(output_folder, exist_ok=True)
+
+    worker = MergingWorker(files, output_folder)
+    errors: list[str] = []
+    _connect_common(worker, emit, errors)
+
+    emit("start", project=project_path, files=len(files))
+    completed = _run_worker(worker, emit)
+
+    ok = completed and not errors
+    emit("done", ok=ok, output_folder=output_folder, errors=errors)
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_epub(args, emit: EventWriter) -> int:
+    try:
+        from core.workers.epub_worker import EpubWorker
+    except ImportError as e:
+        raise CLIError(f"EPUB bağımlılıkları eksik: {e}")
+
+    project_path = _project_path(args.project)
+    files = _translated_files(project_path, args.files)
+    if not files:
+        raise CLIError("EPUB için çevrilmiş dosya bulunamadı.")
+    output_folder = os.path.join(project_path, 'cmplt')
+    os.makedirs(output_folder, exist_ok=True)
+
+    worker = EpubWorker(files, output_folder, project_name=args.title or os.path.basename(project_path))
+    errors: list[str] = []
+    messages: list[str] = []
+    _connect_common(worker, emit, errors)
+    worker.finished.connect(messages.append)
+
+    emit("start", project=project_path, files=len(files))
+    completed = _run_worker(worker, emit)
+
+    ok = completed and not errors
+    emit("done", ok=ok, message=(messages[-1] if messages else ""), errors=errors)
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_count_tokens(args, emit: EventWriter) -> int:
+    from core.workers.local_token_count_worker import LocalTokenCountWorker
+    from core.workers.token_counter import load_token_data, save_token_data
+
+    project_path = _project_path(args.project)
+    download_folder = os.path.join(project_path, 'dwnld')
+    translated_folder = os.path.join(project_path, 'trslt')
+    if args.files:
+        names = list(args.files)
+    else:
+        names = []
+        for folder in (download_folder, translated_folder):
+            if os.path.isdir(folder):
+                names.extend(f for f in os.listdir(folder) if f.endswith('.txt'))
+        names.sort(key=natural_sort_key)
+    if not names:
+        raise CLIError("Sayılacak dosya bulunamadı.")
+
+    worker = LocalTokenCountWorker(project_path, names, download_folder, translated_folder)
+    errors: list[str] = []
+    results: dict = {}
+    _connect_common(worker, emit, errors)
+    worker.finished.connect(results.update)
+
+    emit("start", project=project_path, files=len(names))
+    completed = _run_worker(worker, emit)
+
+    if completed and results:
+        # Arayüzdeki gibi mevcut token cache'i ile birleştirilip kaydedilir
+        config_folder = os.path.join(project_path, 'config')
+        cache = load_token_data(config_folder) or {}
+        file_data = cache.get("file_token_data", {})
+        for fname, data in results.get("file_token_data", {}).items():
+            file_data.setdefault(fname, {}).update(data)
+        total_original = sum(v.get("original_tokens", 0) for v in file_data.values()
+                             if isinstance(v.get("original_tokens"), int))
+        total_translated = sum(v.get("translated_tokens", 0) for v in file_data.values()
+                               if isinstance(v.get("translated_tokens"), int))
+        save_token_data(config_folder, {
+            "file_token_data": file_data,
+            "total_original_tokens": total_original,
+            "total_translated_tokens": total_translated,
+            "total_combined_tokens": total_original + total_translated,
+        })
+
+    ok = completed and not errors and bool(results)
+    extra = {"files": results.get("file_token_data", {})} if args.per_file else {}
+    emit(
+        "done", ok=ok, errors=errors,
+        total_original_tokens=results.get("total_original_tokens", 0),
+        total_translated_tokens=results.get("total_translated_tokens", 0),
+        total_combined_tokens=results.get("total_combined_tokens", 0),
+        **extra,
+    )
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_calibrate_tokens(args, emit: EventWriter) -> int:
+    from core.token_calibration import ALL_MODELS, get_calibrator
+
+    calibrator = get_calibrator()
+    if args.reset:
+        calibrator.reset(args.model)
+        emit("reset", model=args.model or ALL_MODELS)
+    report = calibrator.error_report(args.model)
+    for entry in report:
+        emit("model", **entry)
+    emit("done", ok=True, models=len(report))
+    return EXIT_OK
+
+
+_SELENIUM_METHODS = {
+    # yöntem → (JS dosyası, worker komutu)
+    "booktoki": ("booktoki.js", "booktoki"),
+    "69shuba": ("69shuba.js", "shuba"),
+    "novelfire": ("novelfire.js", "novelfire"),
+}
+
+
+def cmd_download(args, emit: EventWriter) -> int:
+    project_path = _project_path(args.project)
+    config = _read_project_config(project_path)
+    project_link = config.get('ProjectInfo', 'link', fallback=None)
+    if not project_link:
+        raise CLIError("Config dosyasında proje linki bulunamadı.")
+    max_pages = args.max_pages or config.getint('ProjectInfo', 'max_pages', fallback=None)
+
+    js_script_path = None
+    selenium_command = None
+    if args.method in _SELENIUM_METHODS:
+        filename, selenium_command = _SELENIUM_METHODS[args.method]
+        js_script_path = os.path.join(os.getcwd(), filename)
+        if not os.path.exists(js_script_path):
+            from core.js_create import create_js_file
+            create_js_file(filename)
+        if not os.path.exists(js_script_path):
+            raise CLIError(f"JS dosyası bulunamadı: {js_script_path}")
+
+    try:
+        from core.workers.download_worker import DownloadWorker
+    except ImportError as e:
+        raise CLIError(f"İndirme bağımlılıkları eksik: {e}")
+
+    download_folder = os.path.join(project_path, 'dwnld')
+    os.makedirs(download_folder, exist_ok=True)
+    worker = DownloadWorker(project_link, download_folder, max_pages, js_script_path)
+    if args.chapter_limit:
+        worker.selenium_chapter_limit = args.chapter_limit
+
+    errors: list[str] = []
+    downloaded: list[str] = []
+    _connect_common(worker, emit, errors)
+    worker.status_message.connect(lambda message: emit("status", message=message))
+
+    def on_file(path, name):
+        downloaded.append(name)
+        emit("file", path=path, name=name)
+
+    worker.file_downloaded.connect(on_file)
+    # Arayüzdeki site seçim menüsünün yerine komut satırındaki yöntem kullanılır
+    worker.selenium_menu_required.connect(lambda: setattr(worker, "selenium_command", selenium_command))
+
+    emit("start", project=project_path, url=project_link, method=args.method)
+    completed = _run_worker(worker, emit)
+
+    ok = completed and not errors and bool(downloaded)
+    emit("done", ok=ok, downloaded=len(downloaded), errors=errors)
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_serve(args, emit: EventWriter) -> int:
+    from core.job_server import serve
+
+    try:
+        serve(args.host, args.port, max_concurrent_jobs=args.max_jobs, on_ready=lambda url: emit("ready", url=url))
+    except OSError as e:
+        raise CLIError(f"Job server başlatılamadı: {e}")
+    except KeyboardInterrupt:
+        emit("done", ok=True)
+    return EXIT_OK
+
+
+# ──────── Giriş noktası ────────
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="Arayüz olmadan proje işlemleri. İlerleme stdout'a JSON satırları olarak yazılır.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("download", help="Proje linkinden bölümleri indirir (dwnld)")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--method", choices=["standard", *_SELENIUM_METHODS], default="standard",
+                   help="İndirme yöntemi (Selenium yöntemleri Chrome gerektirir)")
+    p.add_argument("--max-pages", type=int, default=None, help="En fazla sayfa (varsayılan: config.ini)")
+    p.add_argument("--chapter-limit", type=int, default=None, help="Selenium yöntemlerinde bölüm sınırı")
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("translate", help="dwnld klasöründeki bölümleri çevirir (trslt)")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--limit", type=int, default=None, help="En fazla çevrilecek dosya sayısı")
+    p.add_argument("--model", default=None, help="Model (varsayılan: AppConfigs/GVersion.ini)")
+    p.add_argument("--files", nargs="+", default=None, help="Öncelikli çevrilecek bölüm dosyaları")
+    p.add_argument("--shard", action="store_true",
+                   help="Bölümleri aynı projeyi çeviren diğer süreçlerle lease queue üzerinden paylaşır")
+    p.add_argument("--node", default=None,
+                   help="Düğüm kimliği (varsayılan: YZNVL_NODE_ID veya makine-pid); anahtar dosyası <endpoint>@<düğüm>.txt")
+    p.set_defaults(func=cmd_translate)
+
+    p = sub.add_parser("check", help="Çevirilerde hata kontrolü yapar (trslt/hata_kontrol raporu)")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--source-lang", default="en", help="Kaynak dil (en, zh, ko, ja ...)")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("merge", help="Çevrilmiş dosyaları tek dosyada birleştirir (cmplt)")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--files", nargs="+", default=None, help="trslt içindeki dosyalar (varsayılan: tümü)")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("epub", help="Çevrilmiş dosyalardan EPUB oluşturur (cmplt)")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--files", nargs="+", default=None, help="trslt içindeki dosyalar (varsayılan: tümü)")
+    p.add_argument("--title", default=None, help="Kitap adı (varsayılan: proje adı)")
+    p.set_defaults(func=cmd_epub)
+
+    p = sub.add_parser("count-tokens", help="Yerel (API'sız) token sayımı yapar")
+    p.add_argument("project", help="Proje klasörü (ad veya yol)")
+    p.add_argument("--files", nargs="+", default=None, help="dwnld/trslt içindeki dosyalar (varsayılan: tümü)")
+    p.add_argument("--per-file", action="store_true", help="Sonuç olayına dosya bazlı sayıları ekler")
+    p.set_defaults(func=cmd_count_tokens)
+
+    p = sub.add_parser("calibrate-tokens",
+                       help="Token tahmini kalibrasyonunun kalibrasyon öncesi/sonrası hata raporunu yazar")
+    p.add_argument("--model", default=None, help="Yalnızca bu model (ve ortak '*' kalibrasyon)")
+    p.add_argument("--reset", action="store_true", help="Modelin (model verilmezse tümünün) kalibrasyonunu siler")
+    p.set_defaults(func=cmd_calibrate_tokens)
+
+    p = sub.add_parser("serve", help="Çoklu proje iş kuyruğu için yerel HTTP servisini (job server) başlatır")
+    p.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: yalnızca yerel)")
+    p.add_argument("--port", type=int, default=8765, help="Dinlenecek port")
+    p.add_argument("--max-jobs", type=int, default=4,
+                   help="Eşzamanlı çalışacak en fazla proje (istekler ortak kota ile paylaştırılır)")
+    p.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    emit = EventWriter(args.command)
+    try:
+        return args.func(args, emit)
+    except CLIError as e:
+        emit("error", message=str(e))
+        emit("done", ok=False)
+        return EXIT_USAGE
+    except KeyboardInterrupt:
+        emit("interrupted")
+        return EXIT_INTERRUPTED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Context Cache — Statik prompt ön ekinin sağlayıcı tarafında önbelleğe alınması.
+
+Ön ek prompt_prefix'tir.  Terim alt kümesi (terminology_subset_enabled, varsayılan açık) kullanılırken
+terimler istek gövdesine eklenir ve ön ekin parçası değildir; yalnızca alt küme kapalıyken tüm terim
+listesi ön eke dahil edilir.
+
+Desteklenen yöntemler:
+  - gemini: Explicit context caching (client.caches).  Ön ek bir kez yüklenir ve her istekte
+    `cached_content` adıyla referans verilir.  TTL dolmadan süre uzatılır; ön ek değişirse (prompt
+    veya — alt küme kapalıyken — terminoloji) eski cache silinip yenisi oluşturulur.
+  - openai_compatible: Prompt-prefix caching.  Ön ek her istekte en başta, değişmeden gönderilir
+    (OpenAI / DeepSeek otomatik cache'ler).  İsteğe bağlı modlar:
+        "cache_control"    → Anthropic tarzı `cache_control: ephemeral` işareti (OpenRouter vb.)
+        "prompt_cache_key" → OpenAI `prompt_cache_key` alanı (aynı sunucuya yönlendirme)
+
+Endpoint ayarı (MCP_Endpoints.json):
+    "context_cache": {"enabled": true, "ttl_seconds": 3600, "min_tokens": 1024, "mode": "auto"}
+"""
+
+import hashlib
+import threading
+import time
+from logger import app_logger
+
+
+DEFAULT_CONTEXT_CACHE = {
+    "enabled": True,
+    "ttl_seconds": 3600,
+    "min_tokens": 1024,
+    "mode": "auto",
+}
+
+# TTL bitimine bu kadar saniye kala süre uzatılır
+REFRESH_MARGIN_SECONDS = 120
+
+# Başka thread cache oluştururken en fazla bu kadar beklenir; sonra ön ek satır içi gönderilir
+CREATE_WAIT_SECONDS = 60
+
+# Cache oluşturulamadığında aynı ön ek için bu süre boyunca yeniden denenmez (API çağrılmaz):
+# kalıcı hatalar (explicit caching desteklemeyen model / katman, 403, kota) uzun, geçici sunucu
+# veya bağlantı hataları kısa süre bekletilir
+FAILURE_RETRY_SECONDS = 1800
+TRANSIENT_FAILURE_RETRY_SECONDS = 30
+TRANSIENT_ERROR_CODES = ("500", "502", "503", "504", "TimeoutError", "ConnectionError", "ReadTimeout", "ConnectTimeout")
+
+
+def get_context_cache_config(endpoint: dict) -> dict:
+    """Endpoint'in context_cache ayarını varsayılanlarla birleştirerek döndürür."""
+    cfg = dict(DEFAULT_CONTEXT_CACHE)
+    cfg.update((endpoint or {}).get("context_cache") or {})
+    return cfg
+
+
+def hash_prefix(prefix: str) -> str:
+    return hashlib.sha1(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+class ContextCacheManager:
+    """
+    Tek bir LLMProvider için statik ön ek cache yaşam döngüsünü yönetir. Thread-safe.
+
+    Gemini cache'leri API anahtarına (projeye) bağlıdır; anahtar rotasyonunda
+    invalidate() çağrılmalıdır.
+    """
+
+    def __init__(self, config: dict, model_id: str):
+        self.config = config
+        self.model_id = model_id
+        self.enabled = bool(config.get("enabled", True))
+        self.ttl_seconds = int(config.get("ttl_seconds", 3600))
+        self.min_tokens = int(config.get("min_tokens", 1024))
+        self.mode = config.get("mode", "auto")
+        self._lock = threading.Lock()
+
+        # Gemini cache durumu
+        self._cache_name = None
+        self._cache_hash = None
+        self._expire_at = 0.0
+        self._too_small_hashes: set[str] = set()
+        self._retry_after: dict[str, float] = {}   # ön ek hash'i → oluşturma tekrar denenebileceği an
+        self._in_progress = False                  # Bir thread cache oluşturuyor / uzatıyor
+        self._idle = threading.Condition(self._lock)
+        self._generation = 0                       # invalidate() sayacı
+
+        # İstatistikler
+        self.cached_input_tokens = 0
+        self.cache_creations = 0
+        self.cache_hits = 0
+
+    # ──────── Uygunluk ────────
+
+    def is_worth_caching(self, prefix: str) -> bool:
+        """Ön ek, sağlayıcının minimum cache boyutunu karşılıyor mu?"""
+        if not self.enabled or not prefix:
+            return False
+        if hash_prefix(prefix) in self._too_small_hashes:
+            return False
+        try:
+            from core.workers.token_counter import estimate_tokens
+            return estimate_tokens(prefix, self.model_id) >= self.min_tokens
+        except Exception:
+            return len(prefix) // 4 >= self.min_tokens
+
+    # ──────── Gemini ────────
+
+    def get_gemini_cache(self, client, prefix: str) -> str | None:
+        """
+        Ön ek için geçerli bir Gemini cache adı döndürür; gerekirse oluşturur veya süresini uzatır.
+        Cache kullanılamıyorsa None döner (çağıran ön eki satır içi gönderir).
+
+        Karar kilit altında verilir, ağ çağrıları (create / update / delete) kilit dışında yapılır.
+        Aynı anda yalnızca bir thread oluşturma / uzatma yapar; diğerleri geçerli cache varsa onu
+        kullanır, yoksa sonucu bekler.
+        """
+        if not self.is_worth_caching(prefix):
+            return None
+
+        prefix_hash = hash_prefix(prefix)
+        with self._lock:
+            while True:
+                now = time.time()
+                current = self._cache_name if self._cache_hash == prefix_hash else None
+                if current and self._expire_at - now > REFRESH_MARGIN_SECONDS:
+                    return current
+                if prefix_hash in self._too_small_hashes or self._retry_after.get(prefix_hash, 0.0) > now:
+                    return current if current and self._expire_at > now else None
+                if not self._in_progress:
+                    break
+                if current and self._expire_at > now:
+                    return current  # Süre başka thread'de uzatılıyor; mevcut cache hâlâ geçerli
+                if not self._idle.wait(timeout=CREATE_WAIT_SECONDS):
+                    return None
+            self._in_progress = True
+            generation = self._generation
+            stale = self._cache_name
+
+        name = None
+        try:
+            if current and self._refresh_gemini(client, current):
+                name = current
+            else:
+                # Ön ek değişti (ör. prompt güncellendi) veya süre uzatılamadı → yeniden oluştur
+                if stale:
+                    self._delete_gemini(client, stale)
+                name = self._create_gemini(client, prefix, prefix_hash)
+        finally:
+            with self._lock:
+                invalidated = generation != self._generation
+                if not invalidated:
+                    self._cache_name = name
+                    self._cache_hash = prefix_hash if name else None
+                    self._expire_at = time.time() + self.ttl_seconds if name else 0.0
+                    if name and name != current:
+                        self.cache_creations += 1
+                self._in_progress = False
+                self._idle.notify_all()
+        if invalidated and name:
+            # Arada invalidate() çağrıldı (anahtar rotasyonu): sonuç eski anahtara ait, saklanmaz ve
+            # TTL boyunca depolama ücreti doğurmaması için silinir; çağıran ön eki satır içi gönderir
+            if name != current:
+                self._delete_gemini(client, name)
+            return None
+        return name
+
+    def _create_gemini(self, client, prefix: str, prefix_hash: str) -> str | None:
+        try:
+            from google.genai import types
+            cache = client.caches.create(
+                model=self.model_id,
+                config=types.CreateCachedContentConfig(
+                    display_name=f"yznvl-prefix-{prefix_hash}",
+                    contents=[types.Content(role="user", parts=[types.Part(text=prefix)])],
+                    ttl=f"{self.ttl_seconds}s",
+                ),
+            )
+        except Exception as e:
+            msg = str(e)
+            if "too small" in msg.lower() or "min_total_token_count" in msg:
+                # Sağlayıcı ön eki cache için fazla küçük buldu — bu ön ek için tekrar deneme
+                self._too_small_hashes.add(prefix_hash)
+                app_logger.info(f"Context cache: ön ek minimum boyutun altında, satır içi gönderilecek. ({msg[:120]})")
+            else:
+                from core.usage_metrics import error_code
+                transient = error_code(e) in TRANSIENT_ERROR_CODES
+                delay = TRANSIENT_FAILURE_RETRY_SECONDS if transient else FAILURE_RETRY_SECONDS
+                with self._lock:
+                    self._retry_after[prefix_hash] = time.time() + delay
+                app_logger.warning(
+                    f"Context cache oluşturulamadı, satır içi gönderilecek; {delay} sn yeniden denenmeyecek: {msg}"
+                )
+            return None
+
+        app_logger.info(f"Context cache oluşturuldu: {cache.name} (TTL {self.ttl_seconds}s, model {self.model_id})")
+        return cache.name
+
+    def _refresh_gemini(self, client, name: str) -> bool:
+        try:
+            from google.genai import types
+            client.caches.update(
+                name=name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+            app_logger.debug(f"Context cache TTL uzatıldı: {name}")
+            return True
+        except Exception as e:
+            app_logger.warning(f"Context cache TTL uzatılamadı, yeniden oluşturulacak: {e}")
+            return False
+
+    @staticmethod
+    def _delete_gemini(client, name: str):
+        try:
+            client.caches.delete(name=name)
+            app_logger.info(f"Context cache silindi: {name}")
+        except Exception as e:
+            app_logger.debug(f"Context cache silinemedi ({name}): {e}")
+
+    def invalidate(self, client=None):
+        """Mevcut cache referansını bırakır (anahtar rotasyonu / cache bulunamadı hatası)."""
+        with self._lock:
+            name = self._cache_name
+            self._cache_name = None
+            self._cache_hash = None
+            self._expire_at = 0.0
+            self._generation += 1
+        if client is not None and name:
+            self._delete_gemini(client, name)
+
+    # ──────── OpenAI-Uyumlu ────────
+
+    def build_openai_messages(self, prefix: str, body: str) -> list[dict]:
+        """
+        Ön eki cache dostu biçimde mesaj listesine yerleştirir.
+        "auto" modunda istek yapısı değişmez (tek user mesajı, ön ek en başta).
+        """
+        if self.enabled and prefix and self.mode == "cache_control":
+            return [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": body},
+                ],
+            }]
+        return [{"role": "user", "content": (prefix or "") + body}]
+
+    def openai_extra_body(self, prefix: str) -> dict | None:
+        if self.enabled and prefix and self.mode == "prompt_cache_key":
+            return {"prompt_cache_key": f"yznvl-{hash_prefix(prefix)}"}
+        return None
+
+    # ──────── İstatistik ────────
+
+    def record_cached_tokens(self, count: int | None):
+        if not count:
+            return
+        with self._lock:
+            self.cached_input_tokens += int(count)
+            self.cache_hits += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_input_tokens": self.cached_input_tokens,
+                "cache_hits": self.cache_hits,
+                "cache_creations": self.cache_creations,
+            }
@@ -0,0 +1,136 @@
+"""
+JobJournal — Çeviri işleri için yalnızca-ekleme (append-only) durum günlüğü.
+
+Her bölümün durum geçişleri (queued → in_flight → done / failed) anında SQLite'a yazılır
+(config/job_journal.db, WAL modu).  Kayıtlar hiçbir zaman güncellenmez veya silinmez; bir
+bölümün güncel durumu, o bölüm için yazılmış son kayıttır.
+
+Çökme veya zorla durdurma sonrasında devam ederken trslt klasörü taranmaz; hangi bölümlerin
+tamamlandığı ve hangilerinin hangi nedenle başarısız olduğu yalnızca bu günlükten okunur.
+
+done / failed kayıtları o denemede harcanan gerçek token kullanımını (sağlayıcının bildirdiği
+usage, JSON) taşır; bölüm ve proje toplamları bu kayıtların toplamıdır.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from logger import app_logger
+from core.usage_metrics import TokenUsage
+
+
+STATE_QUEUED = "queued"
+STATE_IN_FLIGHT = "in_flight"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+JOURNAL_FILENAME = "job_journal.db"
+
+
+class JobJournal:
+    """Thread-safe, tek bağlantılı SQLite günlük adaptörü."""
+
+    def __init__(self, project_path: str):
+        self.db_path = os.path.join(project_path, 'config', JOURNAL_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL NOT NULL,
+                file_name TEXT NOT NULL,
+                state TEXT NOT NULL,
+                reason TEXT,
+                usage TEXT
+            )
+        ''')
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if "usage" not in columns:
+            # Kullanım sütunundan önce oluşturulmuş günlükler
+            self._conn.execute("ALTER TABLE events ADD COLUMN usage TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_file ON events(file_name, id)")
+        self._conn.commit()
+
+    # ──────── Yazma ────────
+
+    def record(self, file_name: str, state: str, reason: str | None = None, usage: TokenUsage | None = None):
+        """Tek bir durum geçişini (varsa token kullanımıyla) yazar ve hemen commit eder."""
+        usage_json = json.dumps(usage.to_dict(ndigits=2), separators=(",", ":")) if usage else None
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO events (ts, file_name, state, reason, usage) VALUES (?, ?, ?, ?, ?)",
+                    (time.time(), file_name, state, reason, usage_json),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                app_logger.error(f"İş günlüğü yazılamadı [{file_name} → {state}]: {e}")
+
+    def record_many(self, file_names: list[str], state: str, reason: str | None = None):
+        """Birden fazla bölüm için aynı geçişi tek işlemde yazar (ör. başlangıçta 'queued')."""
+        if not file_names:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT INTO events (ts, file_name, state, reason) VALUES (?, ?, ?, ?)",
+                    [(now, name, state, reason) for name in file_names],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                app_logger.error(f"İş günlüğü toplu yazılamadı ({state}): {e}")
+
+    # ──────── Okuma ────────
+
+    def latest_states(self) -> dict[str, tuple[str, str | None]]:
+        """Her bölümün son durumunu döndürür: {dosya_adı: (durum, neden)}."""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT e.file_name, e.state, e.reason FROM events e
+                JOIN (SELECT file_name, MAX(id) AS max_id FROM events GROUP BY file_name) last
+                  ON e.id = last.max_id
+            ''').fetchall()
+        return {name: (state, reason) for name, state, reason in rows}
+
+    def failed(self) -> dict[str, str]:
+        """Son durumu 'failed' olan bölümler: {dosya_adı: neden} (translation_errors biçiminde)."""
+        return {
+            name: reason or ""
+            for name, (state, reason) in self.latest_states().items()
+            if state == STATE_FAILED
+        }
+
+    def history(self, file_name: str) -> list[tuple[float, str, str | None]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT ts, state, reason FROM events WHERE file_name = ? ORDER BY id", (file_name,)
+            ).fetchall()
+
+    def usage_by_file(self) -> dict[str, TokenUsage]:
+        """Bölüm başına tüm denemelerde harcanan token kullanımı."""
+        with self._lock:
+            rows = self._conn.execute("SELECT file_name, usage FROM events WHERE usage IS NOT NULL").fetchall()
+        totals: dict[str, TokenUsage] = {}
+        for name, usage_json in rows:
+            totals.setdefault(name, TokenUsage()).add(json.loads(usage_json))
+        return totals
+
+    def usage_totals(self) -> TokenUsage:
+        """Projenin (bu günlüğün) toplam token kullanımı."""
+        total = TokenUsage()
+        for usage in self.usage_by_file().values():
+            total.add(usage)
+        return total
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,566 @@
+"""
+Job Server — Birden fazla projenin çeviri işlerini kuyruğa alan yerel HTTP servisi (daemon).
+
+İşler AppConfigs/job_server.db'de (SQLite) tutulur; servis yeniden başlatıldığında yarıda kalan
+işler kuyruğa geri alınır.  TranslationWorker iş günlüğü (job_journal) sayesinde tamamlanmış
+bölümleri atlayarak kaldığı yerden devam eder.  Aynı süreçte çalışan tüm işler endpoint başına
+tek API anahtar havuzunu paylaşır (llm_provider.enable_shared_key_pools) ve API istekleri endpoint
+kotası üzerinden projeler arasında ağırlıklı adil kuyrukla dağıtılır (core.quota_scheduler).
+
+Başlatma:
+    python -m core serve --port 8765 --max-jobs 4
+
+HTTP API (JSON, yalnızca yerel arayüze bağlanır):
+    GET  /health                  → {"ok": true}
+    GET  /projects                → proje listesi (ProjectManager)
+    POST /jobs                    → iş gönder  {"project": "Ad", "limit": 10, "files": [...], "model": "...", "weight": 2}
+    GET  /jobs                    → tüm işler (?state=queued,running)
+    GET  /jobs/<id>               → iş durumu
+    POST /jobs/<id>/pause         → duraklat
+    POST /jobs/<id>/resume        → devam ettir
+    POST /jobs/<id>/cancel        → iptal et
+    POST /jobs/<id>/weight        → kota ağırlığını değiştir  {"weight": 2}
+    GET  /metrics                 → iş sayıları, istek ve gerçek token kullanımı, anahtar havuzu ve kota kullanımı
+
+Masaüstü arayüzü veya betikler JobServerClient ile servise bağlanabilir.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from urllib import request as urlrequest, error as urlerror
+
+from logger import app_logger
+from core.usage_metrics import TokenUsage
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING, JOB_PAUSED)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+JOB_DB_FILE = os.path.join(os.getcwd(), "AppConfigs", "job_server.db")
+
+
+class JobServerError(Exception):
+    """İstemci hatası; status HTTP durum kodudur (400 / 404 / 409)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# ─────────────────────── Kalıcı kuyruk ───────────────────────
+
+
+class JobStore:
+    """İşlerin SQLite'ta tutulan kalıcı kaydı.  Thread-safe."""
+
+    _FIELDS = ("id", "project", "state", "options", "submitted_at", "started_at", "finished_at",
+               "progress_current", "progress_total", "api_requests", "error", "failed", "token_usage")
+
+    def __init__(self, db_path: str = JOB_DB_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                project TEXT NOT NULL,
+                state TEXT NOT NULL,
+                options TEXT NOT NULL DEFAULT '{}',
+                submitted_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                progress_current INTEGER NOT NULL DEFAULT 0,
+                progress_total INTEGER NOT NULL DEFAULT 0,
+                api_requests INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                failed TEXT NOT NULL DEFAULT '{}',
+                token_usage TEXT NOT NULL DEFAULT '{}'
+            )
+        ''')
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "token_usage" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN token_usage TEXT NOT NULL DEFAULT '{}'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, submitted_at)")
+        self._conn.commit()
+
+    def _row_to_job(self, row) -> dict:
+        job = dict(zip(self._FIELDS, row))
+        job["options"] = json.loads(job["options"] or "{}")
+        job["failed"] = json.loads(job["failed"] or "{}")
+        job["token_usage"] = json.loads(job["token_usage"] or "{}")
+        return job
+
+    def add(self, project: str, options: dict) -> dict:
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, project, state, options, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, project, JOB_QUEUED, json.dumps(options, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, states: list[str] | None = None) -> list[dict]:
+        query = f"SELECT {', '.join(self._FIELDS)} FROM jobs"
+        params: tuple = ()
+        if states:
+            query += f" WHERE state IN ({', '.join('?' * len(states))})"
+            params = tuple(states)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY submitted_at", params).fetchall()
+        return [self._row_to_job(r) for r in rows]
+
+    def update(self, job_id: str, **fields):
+        for name in ("failed", "token_usage"):
+            if name in fields:
+                fields[name] = json.dumps(fields[name], ensure_ascii=False)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            try:
+                self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                app_logger.error(f"Job server: iş kaydı güncellenemedi [{job_id}]: {e}")
+
+    def requeue_interrupted(self) -> int:
+        """Servis kapanırken çalışan işleri kuyruğa geri alır (duraklatılmışlar duraklatılmış kalır)."""
+        with self._lock:
+            cur = self._conn.execute("UPDATE jobs SET state = ? WHERE state = ?", (JOB_QUEUED, JOB_RUNNING))
+            self._conn.commit()
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+
+# ─────────────────────── Servis ───────────────────────
+
+
+class _RunningJob:
+    def __init__(self, job_id: str, worker, thread: threading.Thread):
+        self.job_id = job_id
+        self.worker = worker
+        self.thread = thread
+        self.cancel_requested = False
+        self.errors: list[str] = []
+        self.api_requests = 0
+        self.processed = 0
+
+
+class JobServer:
+    """
+    Kuyruktaki işleri en fazla max_concurrent_jobs kadar eşzamanlı çalıştırır (gönderim sırasıyla).
+    Aynı proje için aynı anda yalnızca bir etkin iş kabul edilir.  Eşzamanlı işlerin API istekleri
+    ortak QuotaScheduler'dan yuva alır; işin "weight" seçeneği projenin kota payıdır.
+    """
+
+    def __init__(self, store: JobStore, max_concurrent_jobs: int = 4, project_manager=None, quota=None):
+        from core.project_manager import ProjectManager
+        from core.quota_scheduler import QuotaScheduler
+
+        self.store = store
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.projects = project_manager or ProjectManager()
+        self.quota = quota or QuotaScheduler()
+        self._lock = threading.RLock()
+        self._running: dict[str, _RunningJob] = {}
+        self._stopping = False
+        self._started_at = time.time()
+        self._api_requests = 0
+        self._chapters_done = 0
+        self._token_usage = TokenUsage()
+
+    # ──────── Yaşam döngüsü ────────
+
+    def start(self):
+        from core.llm_provider import enable_shared_key_pools
+
+        enable_shared_key_pools(True)
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            app_logger.info(f"Job server: yarıda kalan {requeued} iş kuyruğa geri alındı.")
+        self._schedule()
+
+    def shutdown(self, timeout: float = 60.0):
+        """Çalışan işleri durdurur; bir sonraki açılışta kaldıkları yerden devam etmeleri için kuyrukta bırakır."""
+        with self._lock:
+            self._stopping = True
+            running = list(self._running.values())
+        for job in running:
+            job.worker.resume()
+            job.worker.stop()
+        deadline = time.time() + timeout
+        for job in running:
+            job.thread.join(max(0.0, deadline - time.time()))
+        self.store.close()
+
+    # ──────── İşlemler ────────
+
+    def submit(self, project: str, options: dict | None = None) -> dict:
+        options = {k: v for k, v in (options or {}).items() if k in ("limit", "files", "model", "weight")}
+        if project not in self.projects.list_projects():
+            raise JobServerError(f"Proje bulunamadı: {project}", 404)
+        with self._lock:
+            if any(j["project"] == project for j in self.store.list(list(ACTIVE_STATES))):
+                raise JobServerError(f"'{project}' için zaten etkin bir iş var.", 409)
+            job = self.store.add(project, options)
+        app_logger.info(f"Job server: iş kuyruğa alındı [{job['id']}] {project}")
+        self._schedule()
+        return self.store.get(job["id"])
+
+    def status(self, job_id: str) -> dict:
+        job = self.store.get(job_id)
+        if job is None:
+            raise JobServerError(f"İş bulunamadı: {job_id}", 404)
+        return job
+
+    def jobs(self, states: list[str] | None = None) -> list[dict]:
+        return self.store.list(states)
+
+    def pause(self, job_id: str) -> dict:
+        with self._lock:
+            job = self.status(job_id)
+            if job["state"] not in (JOB_QUEUED, JOB_RUNNING):
+                raise JobServerError(f"'{job['state']}' durumundaki iş duraklatılamaz.", 409)
+            running = self._running.get(job_id)
+            if running:
+                running.worker.pause()
+            self.store.update(job_id, state=JOB_PAUSED)
+        return self.store.get(job_id)
+
+    def resume(self, job_id: str) -> dict:
+        with self._lock:
+            job = self.status(job_id)
+            if job["state"] != JOB_PAUSED:
+                raise JobServerError(f"'{job['state']}' durumundaki iş devam ettirilemez.", 409)
+            running = self._running.get(job_id)
+            if running:
+                running.worker.resume()
+                self.store.update(job_id, state=JOB_RUNNING)
+            else:
+                self.store.update(job_id, state=JOB_QUEUED)
+        self._schedule()
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> dict:
+        with self._lock:
+            job = self.status(job_id)
+            if job["state"] not in ACTIVE_STATES:
+                raise JobServerError(f"'{job['state']}' durumundaki iş iptal edilemez.", 409)
+            running = self._running.get(job_id)
+            if running:
+                # Durum, worker kapandığında _run_job tarafından yazılır
+                running.cancel_requested = True
+                running.worker.resume()
+                running.worker.stop()
+            else:
+                self.store.update(job_id, state=JOB_CANCELLED, finished_at=time.time())
+        return self.store.get(job_id)
+
+    def set_weight(self, job_id: str, weight) -> dict:
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise JobServerError("'weight' sayı olmalı.")
+        if weight <= 0:
+            raise JobServerError("'weight' sıfırdan büyük olmalı.")
+        with self._lock:
+            job = self.status(job_id)
+            options = {**job["options"], "weight": weight}
+            self.store.update(job_id, options=json.dumps(options, ensure_ascii=False))
+            self.quota.set_weight(job["project"], weight)
+        return self.store.get(job_id)
+
+    def metrics(self) -> dict:
+        from core.llm_provider import shared_key_pool_stats
+
+        counts = {state: 0 for state in (*ACTIVE_STATES, JOB_DONE, JOB_FAILED, JOB_CANCELLED)}
+        for job in self.store.list():
+            counts[job["state"]] = counts.get(job["state"], 0) + 1
+        with self._lock:
+            running = [
+                {
+                    "id": r.job_id,
+                    "project": self.store.get(r.job_id)["project"],
+                    "api_requests": r.api_requests,
+                    "token_usage": r.worker.token_usage.to_dict(),
+                }
+                for r in self._running.values()
+            ]
+            api_requests = self._api_requests + sum(r.api_requests for r in self._running.values())
+            chapters_done = self._chapters_done
+            token_usage = TokenUsage().add(self._token_usage)
+            for r in self._running.values():
+                token_usage.add(r.worker.token_usage)
+        return {
+            "uptime": time.time() - self._started_at,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "jobs": counts,
+            "running": running,
+            "api_requests": api_requests,
+            "chapters_done": chapters_done,
+            "token_usage": token_usage.to_dict(),
+            "key_pools": shared_key_pool_stats(),
+            "quota": self.quota.stats(),
+        }
+
+    # ──────── Zamanlama ────────
+
+    def _schedule(self):
+        """Boş yuva varsa kuyruktaki en eski işleri başlatır."""
+        with self._lock:
+            if self._stopping:
+                return
+            for job in self.store.list([JOB_QUEUED]):
+                if len(self._running) >= self.max_concurrent_jobs:
+                    break
+                if job["id"] not in self._running:
+                    self._start_job(job)
+
+    def _start_job(self, job: dict):
+        from core.workers.translation_worker import create_translation_worker
+
+        project_path = self.projects.get_project_path(job["project"])
+        options = job["options"]
+        try:
+            worker = create_translation_worker(
+                project_path, self.projects.load_config(job["project"]),
+                model_version=options.get("model"), file_limit=options.get("limit"),
+                priority_files=options.get("files"),
+                quota=self.quota.flow(job["project"], options.get("weight", 1.0)),
+            )
+        except Exception as e:
+            app_logger.error(f"Job server: iş başlatılamadı [{job['id']}]: {e}")
+            self.store.update(job["id"], state=JOB_FAILED, error=str(e), finished_at=time.time())
+            return
+
+        thread = threading.Thread(target=self._run_job, args=(job["id"],), name=f"job-{job['id']}", daemon=True)
+        running = _RunningJob(job["id"], worker, thread)
+
+        def on_progress(current, total):
+            running.processed = max(running.processed, current)
+            self.store.update(job["id"], progress_current=current, progress_total=total)
+
+        def on_request():
+            running.api_requests += 1
+
+        worker.progress.connect(on_progress)
+        worker.request_made.connect(on_request)
+        worker.error.connect(running.errors.append)
+
+        self._running[job["id"]] = running
+        self.store.update(job["id"], state=JOB_RUNNING, started_at=time.time(), error=None)
+        app_logger.info(f"Job server: iş başlatıldı [{job['id']}] {job['project']}")
+        thread.start()
+
+    def _run_job(self, job_id: str):
+        running = self._running[job_id]
+        worker = running.worker
+        try:
+            worker.run()
+        except Exception as e:
+            running.errors.append(f"{type(e).__name__}: {e}")
+
+        failed = dict(worker.translation_errors)
+        with self._lock:
+            self._running.pop(job_id, None)
+            self._api_requests += running.api_requests
+            self._chapters_done += running.processed
+            self._token_usage.add(worker.token_usage)
+            previous = self.store.get(job_id) or {}
+            fields = {
+                "api_requests": previous.get("api_requests", 0) + running.api_requests,
+                "failed": failed,
+                # Devam ettirilen işlerde önceki çalıştırmaların kullanımı korunur
+                "token_usage": TokenUsage.from_dict(previous.get("token_usage")).add(worker.token_usage).to_dict(),
+            }
+            if running.cancel_requested:
+                fields.update(state=JOB_CANCELLED, finished_at=time.time())
+            elif self._stopping:
+                # Sonraki açılışta devam eder; kullanıcının duraklattığı iş duraklatılmış kalır
+                fields.update(state=JOB_PAUSED if previous.get("state") == JOB_PAUSED else JOB_QUEUED)
+            elif running.errors:
+                fields.update(state=JOB_FAILED, error=running.errors[-1], finished_at=time.time())
+            else:
+                fields.update(state=JOB_DONE, finished_at=time.time())
+            self.store.update(job_id, **fields)
+        app_logger.info(f"Job server: iş bitti [{job_id}] → {fields['state']}")
+        self._schedule()
+
+
+# ─────────────────────── HTTP ───────────────────────
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "YznvlJobServer/1.0"
+    job_server: JobServer = None   # serve() tarafından atanır
+
+    def log_message(self, fmt, *args):
+        app_logger.debug("Job server HTTP: " + fmt % args)
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            raise JobServerError("Geçersiz JSON gövdesi.")
+        if not isinstance(data, dict):
+            raise JobServerError("JSON gövdesi bir nesne olmalı.")
+        return data
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        server = self.job_server
+        try:
+            if method == "GET" and parts == ["health"]:
+                return self._send(200, {"ok": True})
+            if method == "GET" and parts == ["projects"]:
+                return self._send(200, server.projects.list_projects())
+            if method == "GET" and parts == ["metrics"]:
+                return self._send(200, server.metrics())
+            if parts[:1] == ["jobs"]:
+                if method == "GET" and len(parts) == 1:
+                    states = parse_qs(url.query).get("state", [""])[0]
+                    return self._send(200, server.jobs([s for s in states.split(",") if s] or None))
+                if method == "POST" and len(parts) == 1:
+                    body = self._body()
+                    if not body.get("project"):
+                        raise JobServerError("'project' alanı gerekli.")
+                    return self._send(201, server.submit(body["project"], body))
+                if method == "GET" and len(parts) == 2:
+                    return self._send(200, server.status(parts[1]))
+                actions = {"pause": server.pause, "resume": server.resume, "cancel": server.cancel}
+                if method == "POST" and len(parts) == 3 and parts[2] in actions:
+                    return self._send(200, actions[parts[2]](parts[1]))
+                if method == "POST" and len(parts) == 3 and parts[2] == "weight":
+                    return self._send(200, server.set_weight(parts[1], self._body().get("weight")))
+            raise JobServerError(f"Bilinmeyen istek: {method} {url.path}", 404)
+        except JobServerError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            app_logger.error(f"Job server HTTP hatası: {type(e).__name__}: {e}")
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+def create_http_server(job_server: JobServer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type("JobServerHandler", (_Handler,), {"job_server": job_server})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_concurrent_jobs: int = 4,
+          db_path: str = JOB_DB_FILE, on_ready=None):
+    """Servisi başlatır ve Ctrl+C'ye kadar bloklar.  on_ready(url) dinlemeye başlayınca çağrılır."""
+    job_server = JobServer(JobStore(db_path), max_concurrent_jobs=max_concurrent_jobs)
+    httpd = create_http_server(job_server, host, port)
+    job_server.start()
+    url = f"http://{host}:{httpd.server_address[1]}"
+    app_logger.info(f"Job server dinleniyor: {url} (eşzamanlı iş: {job_server.max_concurrent_jobs})")
+    if on_ready:
+        on_ready(url)
+    try:
+        httpd.serve_forever(poll_interval=0.5)
+    finally:
+        httpd.server_close()
+        app_logger.info("Job server kapatılıyor; çalışan işler kuyruğa geri alınacak...")
+        job_server.shutdown()
+
+
+# ─────────────────────── İstemci ───────────────────────
+
+
+class JobServerClient:
+    """Job server HTTP API'si için küçük istemci (ör. masaüstü arayüzünden kullanım)."""
+
+    def __init__(self, base_url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method: str, path: str, payload: dict | None = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urlrequest.Request(self.base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+        try:
+            with urlrequest.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urlerror.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise JobServerError(message, e.code)
+
+    def is_alive(self) -> bool:
+        try:
+            return bool(self._call("GET", "/health").get("ok"))
+        except (OSError, JobServerError):
+            return False
+
+    def submit(self, project: str, **options) -> dict:
+        return self._call("POST", "/jobs", {"project": project, **options})
+
+    def jobs(self, states: list[str] | None = None) -> list[dict]:
+        return self._call("GET", "/jobs" + (f"?state={','.join(states)}" if states else ""))
+
+    def status(self, job_id: str) -> dict:
+        return self._call("GET", f"/jobs/{job_id}")
+
+    def pause(self, job_id: str) -> dict:
+        return self._call("POST", f"/jobs/{job_id}/pause")
+
+    def resume(self, job_id: str) -> dict:
+        return self._call("POST", f"/jobs/{job_id}/resume")
+
+    def cancel(self, job_id: str) -> dict:
+        return self._call("POST", f"/jobs/{job_id}/cancel")
+
+    def set_weight(self, job_id: str, weight: float) -> dict:
+        return self._call("POST", f"/jobs/{job_id}/weight", {"weight": weight})
+
+    def metrics(self) -> dict:
+        return self._call("GET", "/metrics")
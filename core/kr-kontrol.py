@@ -5,8 +5,16 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from logger import app_logger
+from core.script_classifier import script_histogram
 from core.workers.translation_quality_checker import TranslationQualityChecker
 
+def karakter_ozeti(metin):
+    """Metindeki Latin / Hangul / Han / Kana oranları (sayım kalite kontrolüyle paylaşılan sınıflandırıcıdan)."""
+    histogram = script_histogram(metin)
+    toplam = len(metin) or 1
+    return ", ".join(f"{ad} %{histogram[ad] * 100 / toplam:.0f}"
+                     for ad in ("latin", "hangul", "han", "kana") if histogram[ad]) or "-"
+
 def klasoru_tara(klasor_yolu, kaynak_klasor_yolu=None, source_lang="ko"):
     """
     Belirtilen klasördeki txt dosyalarını bulur, kalite ve Korece/CJK karakter analizini raporlar.
@@ -46,7 +54,7 @@ def klasoru_tara(klasor_yolu, kaynak_klasor_yolu=None, source_lang="ko"):
                     icerik = f.read()
                     is_failed = checker.is_translation_failed(original_text, icerik, dosya_adi)
                     if is_failed:
-                        app_logger.info(f"Dosya: {dosya_adi} -> Hatalı/Çevrilmemiş Tespit Edildi")
+                        app_logger.info(f"Dosya: {dosya_adi} -> Hatalı/Çevrilmemiş Tespit Edildi ({karakter_ozeti(icerik)})")
                         sorunlu_dosya += 1
                         silinecek_list.append(dosya_tam_yolu)
                     else:
@@ -0,0 +1,311 @@
+"""
+Lease Queue — Aynı proje klasörünü paylaşan birden fazla süreç/makine arasında bölüm dağıtımı.
+
+Bölümler proje klasöründeki config/lease_queue.db (SQLite) üzerinden kiralanır (lease).  Bir düğüm
+(node) bölümü kiraladığında kira süresi (lease_seconds) boyunca bölüm başka düğümlere verilmez;
+düğüm çalıştığı sürece kiraları arka planda yeniler (heartbeat).  Çöken veya bağlantısı kopan
+düğümün kiraları süre dolunca diğer düğümler tarafından geri alınır.
+
+Durumlar: pending → leased → done / failed.  Başarısız bölümler düğüm çalıştığı sürece onun yeniden
+deneme kuyruğunda kalır; sahibi kapanmış (kirası bitmiş) başarısız bölümler bir sonraki çalıştırmada
+(seed) tekrar 'pending' yapılır.
+
+Her düğüm kendi API anahtar havuzunu kullanabilir: YZNVL_NODE_ID tanımlıysa
+AppConfigs/APIKeys/MCP/<endpoint_id>@<node_id>.txt dosyası varsa ortak dosyanın yerine okunur.
+
+NOT: SQLite kilitleri yerel diskte ve kilitlemeyi doğru destekleyen ağ paylaşımlarında (NFSv4, SMB)
+güvenilirdir.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from logger import app_logger
+from core.llm_provider import NODE_ID_ENV
+
+
+LEASE_PENDING = "pending"
+LEASE_LEASED = "leased"
+LEASE_DONE = "done"
+LEASE_FAILED = "failed"
+
+LEASE_DB_FILENAME = "lease_queue.db"
+
+
+def default_node_id() -> str:
+    """YZNVL_NODE_ID veya makine adı + süreç kimliği."""
+    return os.environ.get(NODE_ID_ENV) or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseQueue:
+    """
+    Süreçler arası kiralık iş kuyruğu.  Her işlem kısa bir BEGIN IMMEDIATE işlemidir; aynı anda
+    tek düğüm yazabilir, böylece bir bölüm iki düğüme birden verilmez.
+    """
+
+    def __init__(self, project_path: str, node_id: str = None, lease_seconds: float = 300.0):
+        self.node_id = node_id or default_node_id()
+        self.lease_seconds = max(5.0, float(lease_seconds))
+        self.db_path = os.path.join(project_path, 'config', LEASE_DB_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS leases (
+                file_name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                owner TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                reason TEXT,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self._heartbeat = None
+        self._stop = threading.Event()
+
+    # ──────── İşlem yardımcısı ────────
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn, time.time())
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ──────── Kuyruk hazırlığı ────────
+
+    def seed(self, file_names: list[str], completed: list[str] = ()) -> set[str]:
+        """
+        Bölümleri kuyruğa ekler (zaten olanlara dokunmaz).  completed: bu düğümün günlüğüne göre
+        tamamlanmış bölümler.  Önceki çalıştırmadan kalan başarısız bölümler tekrar 'pending' olur.
+        Herhangi bir düğümce tamamlanmış bölümlerin adlarını döndürür.
+        """
+        completed = set(completed)
+
+        def _seed(conn, now):
+            conn.executemany(
+                "INSERT OR IGNORE INTO leases (file_name, state, updated_at) VALUES (?, ?, ?)",
+                [(name, LEASE_DONE if name in completed else LEASE_PENDING, now) for name in file_names],
+            )
+            if completed:
+                conn.executemany(
+                    "UPDATE leases SET state = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                    "WHERE file_name = ? AND state = ?",
+                    [(LEASE_DONE, now, name, LEASE_PENDING) for name in completed],
+                )
+            # Sahibi hâlâ çalışan (kirası süren) başarısız bölümler o düğümün yeniden deneme kuyruğundadır
+            conn.execute(
+                "UPDATE leases SET state = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE state = ? AND (lease_until IS NULL OR lease_until <= ?)",
+                (LEASE_PENDING, now, LEASE_FAILED, now),
+            )
+            return {row[0] for row in conn.execute("SELECT file_name FROM leases WHERE state = ?", (LEASE_DONE,))}
+        return self._tx(_seed)
+
+    # ──────── Kiralama ────────
+
+    def try_claim(self, file_name: str) -> bool:
+        """Bölüm boştaysa, kirası dolmuşsa veya zaten bu düğümdeyse kiralar."""
+        def _claim(conn, now):
+            row = conn.execute(
+                "SELECT state, owner, lease_until FROM leases WHERE file_name = ?", (file_name,)
+            ).fetchone()
+            if row is None:
+                return False
+            state, owner, lease_until = row
+            if state == LEASE_LEASED and owner != self.node_id and (lease_until or 0) > now:
+                return False
+            if state not in (LEASE_PENDING, LEASE_LEASED):
+                return False
+            if state == LEASE_LEASED and owner != self.node_id:
+                app_logger.warning(f"Lease: '{file_name}' kirası doldu ({owner}), {self.node_id} tarafından geri alındı.")
+            conn.execute(
+                "UPDATE leases SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE file_name = ?",
+                (LEASE_LEASED, self.node_id, now + self.lease_seconds, now, file_name),
+            )
+            return True
+        return self._tx(_claim)
+
+    def claim_next(self) -> str | None:
+        """Boştaki veya kirası dolmuş ilk bölümü kiralar (ada göre sıralı)."""
+        def _claim(conn, now):
+            row = conn.execute(
+                "SELECT file_name, state, owner FROM leases WHERE state = ? OR (state = ? AND lease_until <= ?) "
+                "ORDER BY file_name LIMIT 1",
+                (LEASE_PENDING, LEASE_LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            name, state, owner = row
+            if state == LEASE_LEASED:
+                app_logger.warning(f"Lease: '{name}' kirası doldu ({owner}), {self.node_id} tarafından geri alındı.")
+            conn.execute(
+                "UPDATE leases SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE file_name = ?",
+                (LEASE_LEASED, self.node_id, now + self.lease_seconds, now, name),
+            )
+            return name
+        return self._tx(_claim)
+
+    def owns(self, file_name: str) -> bool:
+        """Bölüm bu düğümde mi (kiralı veya bu düğümde başarısız)?"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner FROM leases WHERE file_name = ? AND state IN (?, ?)",
+                (file_name, LEASE_LEASED, LEASE_FAILED),
+            ).fetchone()
+        return row is not None and row[0] == self.node_id
+
+    def others_active(self) -> bool:
+        """Başka düğümlerin kirası henüz dolmamış bölüm var mı?"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE state = ? AND owner != ? AND lease_until > ?",
+                (LEASE_LEASED, self.node_id, time.time()),
+            ).fetchone()
+        return bool(row[0])
+
+    # ──────── Sonuç ────────
+
+    def _set_state(self, file_name: str, state: str, reason: str | None = None):
+        def _update(conn, now):
+            # Başarısız bölümün kirası düğüm kapanana kadar sürer (yeniden deneme kuyruğu bu düğümde)
+            lease_until = now + self.lease_seconds if state == LEASE_FAILED else None
+            conn.execute(
+                "UPDATE leases SET state = ?, owner = ?, lease_until = ?, reason = ?, updated_at = ? "
+                "WHERE file_name = ?",
+                (state, self.node_id, lease_until, reason, now, file_name),
+            )
+        try:
+            self._tx(_update)
+        except sqlite3.Error as e:
+            app_logger.error(f"Lease durumu yazılamadı [{file_name} → {state}]: {e}")
+
+    def complete(self, file_name: str):
+        self._set_state(file_name, LEASE_DONE)
+
+    def fail(self, file_name: str, reason: str):
+        self._set_state(file_name, LEASE_FAILED, reason)
+
+    def release_own(self) -> int:
+        """
+        Bu düğümün bitmemiş kiralarını boşa çıkarır (düzgün kapanış).  Başarısız bölümler 'failed'
+        kalır; kiraları sona erdirildiği için bir sonraki seed() onları tekrar kuyruğa alır.
+        """
+        def _release(conn, now):
+            cur = conn.execute(
+                "UPDATE leases SET state = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE state = ? AND owner = ?",
+                (LEASE_PENDING, now, LEASE_LEASED, self.node_id),
+            )
+            conn.execute(
+                "UPDATE leases SET lease_until = NULL, updated_at = ? WHERE state = ? AND owner = ?",
+                (now, LEASE_FAILED, self.node_id),
+            )
+            return cur.rowcount
+        return self._tx(_release)
+
+    def renew(self) -> int:
+        """Bu düğümün tüm kiralarını (başarısız bölümler dahil) uzatır."""
+        def _renew(conn, now):
+            cur = conn.execute(
+                "UPDATE leases SET lease_until = ?, updated_at = ? WHERE state IN (?, ?) AND owner = ?",
+                (now + self.lease_seconds, now, LEASE_LEASED, LEASE_FAILED, self.node_id),
+            )
+            return cur.rowcount
+        return self._tx(_renew)
+
+    # ──────── Heartbeat ────────
+
+    def start_heartbeat(self):
+        if self._heartbeat is not None:
+            return
+        interval = self.lease_seconds / 3
+
+        def _beat():
+            while not self._stop.wait(interval):
+                try:
+                    self.renew()
+                except sqlite3.Error as e:
+                    app_logger.warning(f"Lease yenilenemedi ({self.node_id}): {e}")
+
+        self._heartbeat = threading.Thread(target=_beat, name=f"lease-{self.node_id}", daemon=True)
+        self._heartbeat.start()
+
+    def close(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout=5)
+            self._heartbeat = None
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    # ──────── Rapor ────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, owner, COUNT(*) FROM leases GROUP BY state, owner"
+            ).fetchall()
+        by_state: dict[str, int] = {}
+        by_node: dict[str, int] = {}
+        for state, owner, count in rows:
+            by_state[state] = by_state.get(state, 0) + count
+            if state == LEASE_DONE and owner:
+                by_node[owner] = by_node.get(owner, 0) + count
+        return {"states": by_state, "done_by_node": by_node}
+
+
+class LeasedScheduler:
+    """
+    ChapterScheduler sarmalayıcısı: öncelik sırası korunur, ancak yalnızca kiralanabilen bölümler
+    verilir.  Kendi sırası bitince diğer düğümlerin kirası dolan bölümleri geri alır; başka düğümler
+    hâlâ çalışıyorsa kiralarının dolmasını (veya bitmelerini) should_wait() True olduğu sürece bekler.
+    sleep(saniye) → bool verilirse (ör. CancelToken.sleep) bekleme durdurmada hemen biter.
+    """
+
+    POLL_SECONDS = 2.0
+
+    def __init__(self, scheduler, lease: LeaseQueue, files: list[str], should_wait=None, sleep=None):
+        self._scheduler = scheduler
+        self._lease = lease
+        self._index = {name: i for i, name in enumerate(files)}
+        self._should_wait = should_wait or (lambda: True)
+        self._sleep = sleep or (lambda seconds: time.sleep(seconds) or True)
+
+    def next(self) -> tuple[int, str] | None:
+        while True:
+            entry = self._scheduler.next()
+            if entry is None:
+                break
+            if self._lease.try_claim(entry[1]):
+                return entry
+        while True:
+            name = self._lease.claim_next()
+            if name is not None:
+                return self._index.get(name, 0), name
+            if not self._lease.others_active() or not self._should_wait():
+                return None
+            if not self._sleep(self.POLL_SECONDS):
+                return None
+
+    def __len__(self) -> int:
+        return len(self._scheduler)
+
+    def __getattr__(self, name):
+        # set_selected / set_reading_position / requeue / ordered / priority_of
+        return getattr(self._scheduler, name)
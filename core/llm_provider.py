@@ -11,12 +11,18 @@ import json
 import random
 import hashlib
 import time
+import threading
 from logger import app_logger
+from core.context_cache import ContextCacheManager, get_context_cache_config
+from core.token_calibration import observe_usage
+from core.usage_metrics import TokenUsage, key_label, record_request
 
 # ─────────────────────────── Sabitler ───────────────────────────
 
 MCP_ENDPOINTS_FILE = os.path.join(os.getcwd(), "AppConfigs", "MCP_Endpoints.json")
 MCP_KEYS_FOLDER = os.path.join(os.getcwd(), "AppConfigs", "APIKeys", "MCP")
+# Paylaşımlı çeviride (lease queue) düğüm kimliği; tanımlıysa düğüme özel anahtar dosyası tercih edilir
+NODE_ID_ENV = "YZNVL_NODE_ID"
 
 DEFAULT_ENDPOINTS = {
     "active_endpoint_id": "default_gemini",
@@ -33,6 +39,41 @@ DEFAULT_ENDPOINTS = {
     ]
 }
 
+# Endpoint bazlı üretim ayarları (MCP_Endpoints.json → "generation").
+#   temperature        : None → Gemini model varsayılanı, OpenAI-uyumlu için 0.7
+#   max_output_tokens  : None (sınır yok, model varsayılanı), sabit sayı veya "auto" (girdi tahmininden türetilir)
+#   output_token_limit : "auto" sınırının üst değeri; None → üst sınır yok (modelin kendi sınırı geçerli)
+#   thinking_budget    : Gemini düşünme bütçesi; 0 → kapalı, None → model varsayılanı (dinamik)
+#   thinking_reserve_tokens : Düşünme destekleyen Gemini modellerinde bütçe belirtilmemişse "auto"
+#                        sınırına eklenen pay
+#   reasoning_effort   : OpenAI-uyumlu akıl yürütme modelleri için ("minimal", "low" ...)
+#   max_continuations  : Kesilen yanıt için en fazla kaç devam isteği yapılacağı
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": None,
+    "max_output_tokens": None,
+    "output_token_ratio": 2.0,
+    "min_output_tokens": 2048,
+    "output_token_limit": None,
+    "input_token_limit": None,
+    "thinking_budget": None,
+    "thinking_reserve_tokens": 8192,
+    "reasoning_effort": None,
+    "stop_sequences": [],
+    "max_tokens_param": "max_tokens",
+    "max_continuations": 2,
+}
+
+TRUNCATION_FINISH_REASONS = ("MAX_TOKENS", "length")
+
+# Düşünme (thinking) destekleyen Gemini model ailesi önekleri; bu modellerde düşünme token'ları
+# çıktı sınırından düşülür.  Eski modellerde (1.5, 2.0) düşünme payı eklenmez.
+GEMINI_THINKING_MODEL_PREFIXES = ("gemini-2.5", "gemini-3")
+
+CONTINUATION_PROMPT = (
+    "[DEVAM: Önceki yanıtın uzunluk sınırı nedeniyle kesildi. Kaldığın yerden, hiçbir şeyi "
+    "tekrar etmeden ve açıklama eklemeden çevirinin devamını yaz.]"
+)
+
 # ─────────────────────── Yardımcı Fonksiyonlar ───────────────────────
 
 
@@ -47,6 +88,33 @@ def load_endpoints() -> dict:
     return DEFAULT_ENDPOINTS.copy()
 
 
+def get_generation_config(endpoint: dict) -> dict:
+    """Endpoint'in generation ayarını varsayılanlarla birleştirerek döndürür."""
+    cfg = dict(DEFAULT_GENERATION_CONFIG)
+    cfg.update((endpoint or {}).get("generation") or {})
+    return cfg
+
+
+def _to_gemini_schema(schema: dict) -> dict:
+    """
+    JSON Schema'yı Gemini response_schema (OpenAPI alt kümesi) biçimine çevirir:
+    tip adları büyük harfe çevrilir, desteklenmeyen additionalProperties atılır.
+    """
+    if isinstance(schema, list):
+        return [_to_gemini_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    converted = {}
+    for key, value in schema.items():
+        if key == "additionalProperties":
+            continue
+        if key == "type" and isinstance(value, str):
+            converted[key] = value.upper()
+        else:
+            converted[key] = _to_gemini_schema(value)
+    return converted
+
+
 def save_endpoints(data: dict):
     """MCP_Endpoints.json dosyasına yazar."""
     os.makedirs(os.path.dirname(MCP_ENDPOINTS_FILE), exist_ok=True)
@@ -73,9 +141,16 @@ def get_active_endpoint() -> dict | None:
     return endpoints[0] if endpoints else None
 
 
-def load_api_keys(endpoint_id: str) -> list[str]:
-    """Belirtilen endpoint ID'ye ait API anahtarlarını dosyadan okur."""
+def load_api_keys(endpoint_id: str, node_id: str | None = None) -> list[str]:
+    """
+    Belirtilen endpoint ID'ye ait API anahtarlarını dosyadan okur.
+    node_id verilirse ve <endpoint_id>@<node_id>.txt varsa ortak dosya yerine o okunur (düğüme özel havuz).
+    """
     key_file = os.path.join(MCP_KEYS_FOLDER, f"{endpoint_id}.txt")
+    if node_id:
+        node_file = os.path.join(MCP_KEYS_FOLDER, f"{endpoint_id}@{node_id}.txt")
+        if os.path.exists(node_file):
+            key_file = node_file
     keys = []
     if os.path.exists(key_file):
         try:
@@ -106,16 +181,18 @@ class KeyPool:
     def __init__(self, endpoint_id: str, use_rotation: bool = True):
         self.endpoint_id = endpoint_id
         self.use_rotation = use_rotation
-        self.keys = load_api_keys(endpoint_id)
+        self.keys = load_api_keys(endpoint_id, os.environ.get(NODE_ID_ENV))
         self._index = 0
+        self._lock = threading.Lock()
 
     def get_key(self) -> str | None:
         """Havuzdan bir anahtar döndürür."""
         if not self.keys:
             return None
         if self.use_rotation:
-            key = self.keys[self._index % len(self.keys)]
-            self._index += 1
+            with self._lock:
+                key = self.keys[self._index % len(self.keys)]
+                self._index += 1
             return key
         return self.keys[0]
 
@@ -123,6 +200,37 @@ class KeyPool:
         return len(self.keys) > 0
 
 
+# Paylaşımlı havuzlar: aynı süreçte birden fazla iş (ör. job server) çalışırken her LLMProvider'ın
+# kendi havuzuyla ilk anahtardan başlaması yerine anahtarlar işler arasında sırayla dağıtılır.
+_shared_key_pools: dict[str, KeyPool] | None = None
+_shared_key_pools_lock = threading.Lock()
+
+
+def enable_shared_key_pools(enabled: bool = True):
+    """Süreç genelinde endpoint başına tek KeyPool kullanımını açar/kapatır."""
+    global _shared_key_pools
+    with _shared_key_pools_lock:
+        _shared_key_pools = {} if enabled else None
+
+
+def get_key_pool(endpoint_id: str, use_rotation: bool = True) -> KeyPool:
+    """Paylaşım açıksa endpoint'in ortak havuzunu, değilse yeni bir havuz döndürür."""
+    with _shared_key_pools_lock:
+        if _shared_key_pools is None:
+            return KeyPool(endpoint_id, use_rotation)
+        pool = _shared_key_pools.get(endpoint_id)
+        if pool is None:
+            pool = _shared_key_pools[endpoint_id] = KeyPool(endpoint_id, use_rotation)
+        return pool
+
+
+def shared_key_pool_stats() -> dict[str, dict]:
+    """Paylaşımlı havuzların anahtar sayısı ve dağıtılan anahtar sayısı."""
+    with _shared_key_pools_lock:
+        pools = dict(_shared_key_pools or {})
+    return {ep_id: {"keys": len(pool.keys), "handed_out": pool._index} for ep_id, pool in pools.items()}
+
+
 # ─────────────────────── LLM Provider ───────────────────────
 
 
@@ -162,13 +270,14 @@ class LLMProvider:
         self.headers = self.endpoint.get("headers", {})
         self.ep_id = self.endpoint.get("id", "unknown")
         self.ep_name = self.endpoint.get("name", self.ep_id)
+        self.generation_config = get_generation_config(self.endpoint)
 
         # API anahtarı
         if api_key:
             self._key_pool = None
             self._single_key = api_key
         else:
-            self._key_pool = KeyPool(
+            self._key_pool = get_key_pool(
                 self.ep_id,
                 self.endpoint.get("use_key_rotation", True)
             )
@@ -179,12 +288,15 @@ class LLMProvider:
         self._tried_key_count = 1
 
         # Thread-safe istemci yeniden başlatma kilidi
-        import threading
         self._client_lock = threading.Lock()
 
         # Dahili istemciler (lazy init)
         self._gemini_model = None
         self._openai_client = None
+        self._active_key = None  # istemcinin kullandığı anahtar (metriklerde etiketlenir)
+
+        # Statik ön ek (prompt + terminoloji) için sağlayıcı tarafı cache
+        self._context_cache = ContextCacheManager(get_context_cache_config(self.endpoint), self.model_id)
 
     # ──────── Anahtar alma ────────
 
@@ -202,20 +314,101 @@ class LLMProvider:
             with self._client_lock:
                 if self._gemini_model is None:  # double-checked locking
                     from google import genai
-                    self._gemini_client = genai.Client(api_key=self._get_api_key())
+                    self._active_key = self._get_api_key()
+                    self._gemini_client = genai.Client(api_key=self._active_key)
                     self._gemini_model = "initialized"  # Bayrak olarak kullanıyoruz
 
-    def _gemini_generate(self, prompt: str) -> str:
+    def _gemini_config(self, prompt: str, cache_name: str = None, **overrides):
+        """Endpoint generation ayarlarından GenerateContentConfig oluşturur.  Ayar yoksa None döner."""
+        from google.genai import types
+        gen = self.generation_config
+        kwargs = {}
+        if cache_name:
+            kwargs["cached_content"] = cache_name
+        if gen.get("temperature") is not None:
+            kwargs["temperature"] = float(gen["temperature"])
+        max_output = self._resolve_max_output_tokens(prompt)
+        if max_output:
+            kwargs["max_output_tokens"] = max_output
+        if gen.get("stop_sequences"):
+            kwargs["stop_sequences"] = list(gen["stop_sequences"])
+        if gen.get("thinking_budget") is not None:
+            kwargs["thinking_config"] = types.ThinkingConfig(thinking_budget=int(gen["thinking_budget"]))
+        kwargs.update(overrides)
+        return types.GenerateContentConfig(**kwargs) if kwargs else None
+
+    @staticmethod
+    def _gemini_contents(text: str, partial: str = None):
+        """Devam isteği için kesilen yanıtı model turu olarak ekler."""
+        if not partial:
+            return text
+        from google.genai import types
+        return [
+            types.Content(role="user", parts=[types.Part(text=text)]),
+            types.Content(role="model", parts=[types.Part(text=partial)]),
+            types.Content(role="user", parts=[types.Part(text=CONTINUATION_PROMPT)]),
+        ]
+
+    def _gemini_generate(self, prompt: str, prefix: str = None, partial: str = None,
+                         response_schema: dict = None) -> tuple[str, str | None, TokenUsage]:
         self._ensure_gemini()
-        response = self._gemini_client.models.generate_content(
-            model=self.model_id,
-            contents=prompt
-        )
+        client = self._gemini_client
+        schema_overrides = {}
+        if response_schema:
+            schema_overrides = {
+                "response_mime_type": "application/json",
+                "response_schema": _to_gemini_schema(response_schema),
+            }
+        cache_name = self._context_cache.get_gemini_cache(client, prefix) if prefix else None
+        if cache_name:
+            try:
+                response = client.models.generate_content(
+                    model=self.model_id,
+                    contents=self._gemini_contents(prompt, partial),
+                    config=self._gemini_config(prompt, cache_name, **schema_overrides)
+                )
+            except Exception as e:
+                if not any(code in str(e) for code in ["404", "NOT_FOUND", "expired"]):
+                    raise
+                # Cache sunucu tarafında silinmiş / süresi dolmuş → ön eki satır içi gönder
+                app_logger.warning(f"Context cache bulunamadı ({cache_name}), satır içi gönderiliyor: {e}")
+                self._context_cache.invalidate()
+                response = client.models.generate_content(
+                    model=self.model_id,
+                    contents=self._gemini_contents(prefix + prompt, partial),
+                    config=self._gemini_config(prompt, **schema_overrides)
+                )
+        else:
+            response = client.models.generate_content(
+                model=self.model_id,
+                contents=self._gemini_contents((prefix or "") + prompt, partial),
+                config=self._gemini_config(prompt, **schema_overrides)
+            )
+        usage = getattr(response, "usage_metadata", None)
+        self._context_cache.record_cached_tokens(getattr(usage, "cached_content_token_count", None))
         if hasattr(response, 'prompt_feedback') and response.prompt_feedback and response.prompt_feedback.block_reason:
             raise Exception(f"İçerik engellendi: {response.prompt_feedback.block_reason.name}")
+
+        finish_reason = None
+        if getattr(response, "candidates", None):
+            reason = response.candidates[0].finish_reason
+            finish_reason = getattr(reason, "name", None) or (str(reason) if reason else None)
         if not response.text:
+            if finish_reason == "MAX_TOKENS":
+                raise Exception("API'den boş metin alındı: çıktı sınırı (max_output_tokens / thinking_budget) metne yer bırakmadı.")
             raise Exception("API'den boş veya geçersiz metin alındı.")
-        return response.text
+        return response.text, finish_reason, self._gemini_usage(usage)
+
+    @staticmethod
+    def _gemini_usage(usage) -> TokenUsage:
+        """usage_metadata → TokenUsage.  candidates_token_count düşünme token'larını içermez."""
+        return TokenUsage(
+            requests=1,
+            input_tokens=getattr(usage, "prompt_token_count", None) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", None) or 0,
+            thinking_tokens=getattr(usage, "thoughts_token_count", None) or 0,
+            cached_tokens=getattr(usage, "cached_content_token_count", None) or 0,
+        )
 
     def _gemini_count_tokens(self, text: str) -> int:
         self._ensure_gemini()
@@ -235,8 +428,9 @@ class LLMProvider:
                         from openai import OpenAI
                     except ImportError:
                         raise ImportError("openai paketi yüklü değil.  Lütfen `pip install openai` ile yükleyin.")
+                    self._active_key = self._get_api_key()
                     self._openai_client = OpenAI(
-                        api_key=self._get_api_key(),
+                        api_key=self._active_key,
                         base_url=self.base_url,
                         default_headers=self.headers if self.headers else None
                     )
@@ -266,6 +460,8 @@ class LLMProvider:
             return False
 
         self._tried_key_count += 1
+        # Gemini context cache'i eski anahtarın projesine bağlı — yeni anahtarda yeniden oluşturulur
+        self._context_cache.invalidate(getattr(self, "_gemini_client", None))
         # Gemini / OpenAI istemcisini sıfırla; bir sonraki _ensure_* çağrısında
         # _key_pool.get_key() sıradaki anahtarı verecek.
         with self._client_lock:
@@ -279,16 +475,100 @@ class LLMProvider:
         )
         return True
 
-    def _openai_generate(self, prompt: str) -> str:
+    def _openai_generate(self, prompt: str, prefix: str = None, partial: str = None,
+                         response_schema: dict = None) -> tuple[str, str | None, TokenUsage]:
         self._ensure_openai()
+        gen = self.generation_config
+        kwargs = {}
+        if response_schema:
+            kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "structured_response", "schema": response_schema, "strict": True},
+            }
+        extra_body = self._context_cache.openai_extra_body(prefix)
+        if extra_body:
+            kwargs["extra_body"] = extra_body
+        max_output = self._resolve_max_output_tokens(prompt)
+        if max_output:
+            kwargs[gen.get("max_tokens_param") or "max_tokens"] = max_output
+        if gen.get("stop_sequences"):
+            kwargs["stop"] = list(gen["stop_sequences"])[:4]
+        if gen.get("reasoning_effort"):
+            kwargs["reasoning_effort"] = gen["reasoning_effort"]
+
+        messages = self._context_cache.build_openai_messages(prefix, prompt)
+        if partial:
+            messages = messages + [
+                {"role": "assistant", "content": partial},
+                {"role": "user", "content": CONTINUATION_PROMPT},
+            ]
+        temperature = gen.get("temperature")
         response = self._openai_client.chat.completions.create(
             model=self.model_id,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
+            messages=messages,
+            temperature=0.7 if temperature is None else float(temperature),
+            **kwargs,
         )
         if not response.choices:
             raise Exception("API'den boş yanıt alındı.")
-        return response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        self._context_cache.record_cached_tokens(getattr(details, "cached_tokens", None))
+        choice = response.choices[0]
+        if not choice.message.content:
+            raise Exception("API'den boş yanıt alındı.")
+        return choice.message.content, choice.finish_reason, self._openai_usage(usage)
+
+    @staticmethod
+    def _openai_usage(usage) -> TokenUsage:
+        """
+        usage → TokenUsage.  completion_tokens akıl yürütme (reasoning) token'larını da içerir;
+        düşünme ayrı sayıldığından çıktıdan düşülür.
+        """
+        details = getattr(usage, "completion_tokens_details", None)
+        thinking = getattr(details, "reasoning_tokens", None) or 0
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+        return TokenUsage(
+            requests=1,
+            input_tokens=getattr(usage, "prompt_tokens", None) or 0,
+            output_tokens=max(0, (getattr(usage, "completion_tokens", None) or 0) - thinking),
+            thinking_tokens=thinking,
+            cached_tokens=cached,
+        )
+
+    def supports_thinking(self) -> bool:
+        """Model düşünme token'ları üretiyor mu (yalnızca Gemini 2.5+ ailesi)?"""
+        model = (self.model_id or "").lower().split("/")[-1]
+        return self.ep_type == "gemini" and model.startswith(GEMINI_THINKING_MODEL_PREFIXES)
+
+    def thinking_reserve(self) -> int:
+        """Çıktı sınırından düşünmeye ayrılan pay; düşünme desteklemeyen modellerde 0."""
+        if not self.supports_thinking():
+            return 0
+        gen = self.generation_config
+        budget = gen.get("thinking_budget")
+        # Bütçe belirtilmemişse (dinamik düşünme) metne yer kalması için pay bırakılır
+        return int(budget) if budget is not None else int(gen.get("thinking_reserve_tokens", 8192))
+
+    def _resolve_max_output_tokens(self, prompt: str) -> int | None:
+        """
+        Çıktı token sınırını belirler.  "auto" ise girdi token tahmininden türetilir:
+        tahmin × output_token_ratio, [min_output_tokens, output_token_limit] aralığına sıkıştırılır.
+        Düşünme destekleyen Gemini modellerinde düşünme bütçesi çıktı sınırına dahil olduğundan
+        üstüne eklenir.  Ayar yoksa (varsayılan) sınır gönderilmez.
+        """
+        gen = self.generation_config
+        value = gen.get("max_output_tokens")
+        if not value:
+            return None
+        if value != "auto":
+            return int(value)
+        from core.workers.token_counter import estimate_tokens
+        estimate = int(estimate_tokens(prompt, self.model_id) * float(gen.get("output_token_ratio", 2.0)))
+        estimate = max(estimate, int(gen.get("min_output_tokens", 2048)))
+        estimate += self.thinking_reserve()
+        limit = gen.get("output_token_limit")
+        return min(estimate, int(limit)) if limit else estimate
 
     def _openai_count_tokens(self, text: str) -> int:
         """OpenAI-uyumlu servisler için yaklaşık token sayısı (karakter/4 tahmini)."""
@@ -303,12 +583,76 @@ class LLMProvider:
 
     # ──────── Genel API ────────
 
-    def generate(self, prompt: str) -> str:
-        """Prompt göndererek LLM'den yanıt alır."""
-        if self.ep_type == "gemini":
-            return self._gemini_generate(prompt)
+    def _generate_once(self, prompt: str, prefix: str = None, partial: str = None,
+                       response_schema: dict = None) -> tuple[str, str | None, TokenUsage]:
+        """Tek API çağrısı; gecikme, token ve hata kodu endpoint/anahtar metriklerine yazılır."""
+        started = time.monotonic()
+        try:
+            if self.ep_type == "gemini":
+                text, finish_reason, usage = self._gemini_generate(prompt, prefix, partial, response_schema)
+            else:
+                text, finish_reason, usage = self._openai_generate(prompt, prefix, partial, response_schema)
+        except Exception as e:
+            record_request(self.ep_id, self._active_key, time.monotonic() - started, error=e)
+            raise
+        record_request(self.ep_id, self._active_key, time.monotonic() - started,
+                       usage.input_tokens, usage.output_tokens + usage.thinking_tokens)
+        # Token tahmini kalibrasyonu; devam isteklerinin girdisi kesik yanıtı da içerdiğinden yalnızca çıktısı örnektir
+        if partial is None:
+            observe_usage(self.model_id, prompt, prefix, text, usage.input_tokens, usage.output_tokens)
         else:
-            return self._openai_generate(prompt)
+            observe_usage(self.model_id, "", None, text, 0, usage.output_tokens)
+        return text, finish_reason, usage
+
+    @property
+    def key_id(self) -> str:
+        """Şu an kullanılan anahtarın etiketi (son 4 karakter); metrik ve kullanım raporları için."""
+        return key_label(self._active_key)
+
+    def generate(self, prompt: str, prefix: str = None, response_schema: dict = None,
+                 usage: TokenUsage = None) -> str:
+        """
+        Prompt göndererek LLM'den yanıt alır.
+
+        prefix: İstekler arasında değişmeyen ön ek (prompt + terminoloji).  Verilirse
+                sağlayıcı tarafında cache'lenir; gönderilen metin mantıksal olarak prefix + prompt'tur.
+
+        response_schema: JSON Schema (draft, küçük harf tipler).  Verilirse yanıt yapılandırılmış JSON
+                         olarak istenir (Gemini response_schema / OpenAI json_schema).
+
+        usage: Verilirse yanıtların bildirdiği gerçek token kullanımı (devam istekleri dahil) buna
+               eklenir; ayrıca count_tokens çağrısı gerekmez.
+
+        Yanıt çıktı sınırında kesilirse (finish_reason MAX_TOKENS / length) tüm bölümü yeniden
+        göndermek yerine devam isteği yapılır ve parçalar birleştirilir.
+        """
+        text, finish_reason, call_usage = self._generate_once(prompt, prefix, response_schema=response_schema)
+        if usage is not None:
+            usage.add(call_usage)
+        parts = [text]
+        max_continuations = int(self.generation_config.get("max_continuations", 2))
+        while finish_reason in TRUNCATION_FINISH_REASONS and len(parts) <= max_continuations:
+            app_logger.warning(
+                f"'{self.ep_name}' yanıtı çıktı sınırında kesildi (finish_reason={finish_reason}); "
+                f"devam isteği gönderiliyor ({len(parts)}/{max_continuations})."
+            )
+            text, finish_reason, call_usage = self._generate_once(prompt, prefix, partial="".join(parts),
+                                                                  response_schema=response_schema)
+            if usage is not None:
+                usage.add(call_usage)
+            parts.append(text)
+        if finish_reason in TRUNCATION_FINISH_REASONS:
+            app_logger.warning(f"'{self.ep_name}' devam isteği sınırına ulaşıldı; yanıt kesik olabilir.")
+        return "".join(parts)
+
+    def get_context_cache_stats(self) -> dict:
+        """Context cache ile tasarruf edilen input token istatistikleri."""
+        return self._context_cache.stats()
+
+    def release_context_cache(self):
+        """Çalışma sonunda sağlayıcı tarafındaki cache'i siler (depolama ücretini durdurur)."""
+        if self.ep_type == "gemini":
+            self._context_cache.invalidate(getattr(self, "_gemini_client", None))
 
     def count_tokens(self, text: str) -> int:
         """Metnin token sayısını hesaplar."""
@@ -0,0 +1,174 @@
+"""
+Model Cascade — Ucuz modelden güçlü modele kademeli çeviri.
+
+Bölümün paragrafları önce ilk (ucuz/hızlı) kademeye gönderilir.  Her paragraf kalite kontrolünden
+(TranslationQualityChecker) ve terim tutarlılığı kontrolünden geçirilir; yalnızca başarısız olanlar
+bir sonraki kademeye yükseltilir.  Son kademe projenin ana endpoint'idir.
+
+Kademeler MCP_Endpoints.json'daki endpoint ID'leriyle tanımlanır (Proje ayarı [Cascade] cascade_endpoints,
+ucuzdan pahalıya, virgülle ayrılmış).  Maliyet hesabı için endpoint'e isteğe bağlı fiyat bilgisi eklenebilir
+(1M token başına):
+
+    "pricing": {"input_per_mtok": 0.10, "output_per_mtok": 0.40}
+
+Tasarruf, tüm paragrafların doğrudan son kademeye gönderildiği senaryoya göre hesaplanır.
+"""
+
+import threading
+from logger import app_logger
+
+
+class CascadeTier:
+    """Tek bir kademe: sağlayıcı, görünen ad ve 1M token başına fiyatlar."""
+
+    def __init__(self, provider, name: str = None, input_price: float = 0.0, output_price: float = 0.0):
+        self.provider = provider
+        self.name = name or getattr(provider, 'ep_name', None) or getattr(provider, 'model_id', '?')
+        self.input_price = float(input_price or 0.0)
+        self.output_price = float(output_price or 0.0)
+
+        # İstatistikler
+        self.attempted = 0        # kademeye gönderilen paragraf
+        self.accepted = 0         # kademede kabul edilen paragraf
+        self.chapters = 0         # en yüksek kademesi bu olan bölüm
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.accepted_output_tokens = 0
+        self.seconds = 0.0
+
+    @classmethod
+    def from_endpoint(cls, provider, endpoint: dict | None):
+        pricing = (endpoint or {}).get("pricing") or {}
+        return cls(
+            provider,
+            name=(endpoint or {}).get("name"),
+            input_price=pricing.get("input_per_mtok", 0.0),
+            output_price=pricing.get("output_per_mtok", 0.0),
+        )
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+
+class ModelCascade:
+    """
+    Kademe listesini ve kademe bazlı istatistikleri tutar.  Thread-safe.
+
+    Args:
+        tiers: Ucuzdan pahalıya sıralı CascadeTier listesi (en az 1).
+    """
+
+    def __init__(self, tiers: list[CascadeTier]):
+        if not tiers:
+            raise ValueError("Model cascade için en az bir kademe gerekli.")
+        self.tiers = tiers
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tiers)
+
+    @property
+    def top(self) -> CascadeTier:
+        return self.tiers[-1]
+
+    def record_attempt(self, tier_idx: int, attempted: int, accepted: int, input_tokens: int,
+                       output_tokens: int, accepted_output_tokens: int, seconds: float):
+        """
+        Bir kademe denemesini kaydeder.  input_tokens: gönderilen paragraflar, output_tokens: alınan
+        tüm çeviriler, accepted_output_tokens: kontrollerden geçip kabul edilen çeviriler.
+        """
+        tier = self.tiers[tier_idx]
+        with self._lock:
+            tier.attempted += attempted
+            tier.accepted += accepted
+            tier.input_tokens += input_tokens
+            tier.output_tokens += output_tokens
+            tier.accepted_output_tokens += accepted_output_tokens
+            tier.seconds += seconds
+
+    def record_chapter(self, tier_idx: int):
+        """Bölümün tamamlanması için gereken en yüksek kademeyi kaydeder."""
+        with self._lock:
+            self.tiers[tier_idx].chapters += 1
+
+    def summary(self) -> dict:
+        """
+        Kademe bazlı sayılar ile gerçek maliyet/süre ve yalnızca son kademe kullanılsaydı
+        oluşacak tahmini maliyet/süreye göre tasarruf.
+        """
+        with self._lock:
+            top = self.top
+            tiers = [{
+                "name": t.name,
+                "attempted": t.attempted,
+                "accepted": t.accepted,
+                "chapters": t.chapters,
+                "input_tokens": t.input_tokens,
+                "output_tokens": t.output_tokens,
+                "seconds": t.seconds,
+                "cost": t.cost(t.input_tokens, t.output_tokens),
+            } for t in self.tiers]
+
+            # Taban senaryoda her paragraf yalnızca bir kez son kademeye gider: girdi = ilk kademeye
+            # gönderilen girdi (her paragraf önce oraya gider), çıktı = kabul edilen çevirilerin toplamı
+            base_in = self.tiers[0].input_tokens
+            base_out = sum(t.accepted_output_tokens for t in self.tiers)
+            baseline_cost = top.cost(base_in, base_out)
+
+            # Süre için son kademenin ölçülen token başına süresi kullanılır (hiç kullanılmadıysa ölçülemez)
+            top_tokens = top.input_tokens + top.output_tokens
+            baseline_seconds = None
+            if top_tokens:
+                baseline_seconds = top.seconds / top_tokens * (base_in + base_out)
+
+        actual_cost = sum(t["cost"] for t in tiers)
+        actual_seconds = sum(t["seconds"] for t in tiers)
+        return {
+            "tiers": tiers,
+            "cost": actual_cost,
+            "baseline_cost": baseline_cost,
+            "cost_saved": baseline_cost - actual_cost,
+            "seconds": actual_seconds,
+            "baseline_seconds": baseline_seconds,
+            "seconds_saved": (baseline_seconds - actual_seconds) if baseline_seconds is not None else None,
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        parts = [
+            f"{t['name']}: {t['accepted']}/{t['attempted']} paragraf, {t['chapters']} bölüm"
+            for t in s["tiers"]
+        ]
+        text = "Model cascade — " + " | ".join(parts)
+        text += f" | maliyet ${s['cost']:.4f} (tasarruf ${s['cost_saved']:.4f})"
+        if s["seconds_saved"] is not None:
+            text += f", süre {s['seconds']:.0f}s (tasarruf ~{s['seconds_saved']:.0f}s)"
+        else:
+            text += f", süre {s['seconds']:.0f}s (son kademe kullanılmadı, süre tasarrufu ölçülemedi)"
+        return text
+
+
+def build_cascade(endpoint_ids: list[str], final_provider) -> ModelCascade | None:
+    """
+    Endpoint ID listesinden kademeleri oluşturur; son kademe final_provider'dır (projenin ana endpoint'i).
+    Listede ana endpoint varsa tekrar eklenmez.  Oluşturulamayan endpoint'ler atlanır.
+    """
+    from core.llm_provider import LLMProvider, get_endpoint_by_id
+
+    final_id = getattr(final_provider, 'ep_id', None)
+    tiers = []
+    for ep_id in endpoint_ids:
+        if not ep_id or ep_id == final_id:
+            continue
+        endpoint = get_endpoint_by_id(ep_id)
+        if not endpoint:
+            app_logger.warning(f"Model cascade: endpoint bulunamadı, atlanıyor: {ep_id}")
+            continue
+        try:
+            tiers.append(CascadeTier.from_endpoint(LLMProvider(endpoint=endpoint), endpoint))
+        except Exception as e:
+            app_logger.warning(f"Model cascade: '{ep_id}' başlatılamadı, atlanıyor: {e}")
+    if not tiers or final_provider is None:
+        return None
+    tiers.append(CascadeTier.from_endpoint(final_provider, getattr(final_provider, 'endpoint', None)))
+    return ModelCascade(tiers)
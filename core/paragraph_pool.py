@@ -0,0 +1,168 @@
+"""
+Paragraph Pool — Bölümler arası paragraf havuzu (batch dışı modlar için).
+
+Projenin sonlarına doğru paragrafların çoğu cache'dedir; her bölümün birkaç cache-miss paragrafını
+ayrı istek olarak göndermek RPD (günlük istek) sınırlı anahtarlarda kotayı boşa harcar.  Havuz,
+birçok bölümden gelen miss paragrafları toplar ve token bütçesi dolduğunda tek istek olarak gönderir.
+
+Gecikme sınırı (max_wait_seconds): havuzdaki en eski paragraf bu süreyi aştığında bütçe dolmasa da
+istek gönderilir; hiçbir bölüm çok uzun beklemez.
+
+Kullanım:
+    pool = ParagraphPool(translate_batch, token_budget=8000, max_wait_seconds=5.0, workers=3)
+    pool.submit(["para 1", "para 2"], on_done=lambda results: ..., keys=[("b1", 0), ("b1", 3)])
+    # results: {index: çeviri | None}; keys (isteğe bağlı) translate_batch'e paragraflarla birlikte iletilir
+    pool.close()    # kalanları gönderir ve tüm isteklerin bitmesini bekler
+"""
+
+import concurrent.futures
+import threading
+import time
+from logger import app_logger
+
+
+class PoolTicket:
+    """Tek bir bölümün havuza gönderdiği paragraflar.  Tüm paragraflar sonuçlanınca on_done çağrılır."""
+
+    def __init__(self, count: int, on_done):
+        self.results: dict[int, str | None] = {}
+        self._remaining = count
+        self._on_done = on_done
+
+    def _resolve(self, index: int, text: str | None) -> bool:
+        self.results[index] = text
+        self._remaining -= 1
+        return self._remaining == 0
+
+
+class ParagraphPool:
+    """
+    Thread-safe paragraf havuzu.
+
+    Args:
+        translate_batch: (list[str], list[anahtar]) → {index: çeviri}; eksik index'ler başarısız sayılır.
+            Anahtarlar submit'e verilen keys'tir (verilmediyse bölüm içi index); aynı metin birden fazla
+            bölümde geçse de her paragrafın sahibini ayırt etmeyi sağlar.
+        token_budget: Tek istekteki en fazla tahmini girdi token'ı.
+        max_wait_seconds: Bir paragrafın havuzda bekleyebileceği en uzun süre.
+        max_paragraphs: Tek istekteki en fazla paragraf sayısı.
+        workers: Aynı anda uçuşta olabilecek istek sayısı.
+        model: Token tahmininde kullanılacak kalibrasyonun modeli (None: ortak kalibrasyon).
+    """
+
+    def __init__(self, translate_batch, token_budget: int, max_wait_seconds: float = 5.0,
+                 max_paragraphs: int = 200, workers: int = 1, model: str | None = None):
+        from core.workers.token_counter import estimate_tokens
+        self._estimate = lambda text: estimate_tokens(text, model)
+        self._translate_batch = translate_batch
+        self.token_budget = max(1, int(token_budget))
+        self.max_wait_seconds = max_wait_seconds
+        self.max_paragraphs = max_paragraphs
+
+        self._cond = threading.Condition()
+        self._pending: list[tuple[PoolTicket, int, str, int, object]] = []   # (ticket, index, metin, token, anahtar)
+        self._pending_tokens = 0
+        self._oldest_at = None
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers))
+
+        # İstatistikler
+        self.requests = 0
+        self.paragraphs = 0
+        self.sent_tokens = 0
+
+        self._timer = threading.Thread(target=self._latency_loop, daemon=True)
+        self._timer.start()
+
+    # ──────── Dış arayüz ────────
+
+    def submit(self, texts: list[str], on_done, keys: list = None) -> PoolTicket:
+        """Bir bölümün paragraflarını havuza ekler.  Bütçe dolarsa istek hemen gönderilir."""
+        ticket = PoolTicket(len(texts), on_done)
+        if not texts:
+            on_done(ticket.results)
+            return ticket
+        keys = list(keys) if keys is not None else list(range(len(texts)))
+        with self._cond:
+            for index, (text, key) in enumerate(zip(texts, keys)):
+                tokens = self._estimate(text)
+                if self._pending and (
+                    self._pending_tokens + tokens > self.token_budget
+                    or len(self._pending) >= self.max_paragraphs
+                ):
+                    self._flush_locked("bütçe")
+                if not self._pending:
+                    self._oldest_at = time.monotonic()
+                self._pending.append((ticket, index, text, tokens, key))
+                self._pending_tokens += tokens
+            self._cond.notify_all()
+        return ticket
+
+    def flush(self):
+        with self._cond:
+            self._flush_locked("manuel")
+
+    def close(self, wait: bool = True):
+        """Kalan paragrafları gönderir ve (wait=True ise) uçuştaki tüm isteklerin bitmesini bekler."""
+        with self._cond:
+            self._flush_locked("kapanış")
+            self._closed = True
+            self._cond.notify_all()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "paragraphs": self.paragraphs,
+                "avg_fill": (self.sent_tokens / (self.requests * self.token_budget)) if self.requests else 0.0,
+            }
+
+    # ──────── İç işleyiş ────────
+
+    def _latency_loop(self):
+        with self._cond:
+            while not self._closed:
+                if self._pending and self._oldest_at is not None:
+                    remaining = self.max_wait_seconds - (time.monotonic() - self._oldest_at)
+                    if remaining <= 0:
+                        self._flush_locked("gecikme sınırı")
+                        continue
+                    self._cond.wait(timeout=remaining)
+                else:
+                    self._cond.wait()
+
+    def _flush_locked(self, reason: str):
+        if not self._pending:
+            return
+        units = self._pending
+        tokens = self._pending_tokens
+        self._pending = []
+        self._pending_tokens = 0
+        self._oldest_at = None
+        self.requests += 1
+        self.paragraphs += len(units)
+        self.sent_tokens += tokens
+        app_logger.debug(
+            f"Paragraf havuzu gönderiliyor ({reason}): {len(units)} paragraf, "
+            f"{len({id(u[0]) for u in units})} bölüm, ~{tokens} token"
+        )
+        self._executor.submit(self._run_request, units)
+
+    def _run_request(self, units: list[tuple[PoolTicket, int, str, int, object]]):
+        try:
+            translated = self._translate_batch([u[2] for u in units], [u[4] for u in units]) or {}
+        except Exception as e:
+            app_logger.error(f"Paragraf havuzu isteği başarısız: {e}")
+            translated = {}
+
+        finished = []
+        with self._cond:
+            for n, (ticket, index, *_) in enumerate(units):
+                if ticket._resolve(index, translated.get(n)):
+                    finished.append(ticket)
+        for ticket in finished:
+            try:
+                ticket._on_done(ticket.results)
+            except Exception as e:
+                app_logger.error(f"Paragraf havuzu geri çağrı hatası: {e}")
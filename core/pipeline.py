@@ -0,0 +1,275 @@
+"""
+Pipeline — Sınırlı kuyruklarla bağlanmış aşamalı (staged) akış işleyici.
+
+Her aşama kendi giriş kuyruğundan (queue.Queue, maxsize ile sınırlı) öğe alır, işler ve bir sonraki
+aşamanın kuyruğuna koyar.  Kuyruk doluysa put() bekler → geri basınç (backpressure): yavaş bir aşama,
+önceki aşamaları ve dolayısıyla bellekte tutulan öğe sayısını doğal olarak sınırlar.
+
+Aşama türleri:
+  - "thread": workers kadar iş parçacığı (bloklayan I/O, API çağrıları veya process pool'a iş gönderen aşamalar)
+  - "async":  tek bir asyncio döngüsünde workers kadar eşzamanlı tüketici; yalnızca coroutine fonksiyonlar
+              (gerçek async I/O) içindir.  Bloklayan fonksiyonlar "thread" aşamasında çalıştırılmalıdır.
+
+Aşama fonksiyonu öğeyi (veya yenisini) döndürür; None dönerse öğe akıştan çıkarılır.
+İptal edildikten sonra kuyrukta bekleyen veya sonraki aşamaya aktarılamayan öğeler işlenmeden atılır
+(dropped); atılan her öğe on_drop(öğe) ile bildirilir (ör. durumunu geri almak için).
+
+Kullanım:
+    pipeline = Pipeline([
+        Stage("ingest", read_file, workers=2, queue_size=8),
+        Stage("dispatch", call_api, workers=3, queue_size=4),
+        Stage("persist", write_file),
+    ])
+    pipeline.start()
+    for item in items:
+        if not pipeline.put(item):
+            break
+    pipeline.close()
+    pipeline.join()
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import queue
+import threading
+from logger import app_logger
+
+
+KIND_THREAD = "thread"
+KIND_ASYNC = "async"
+
+_END = object()
+_POLL_SECONDS = 0.5
+
+
+class Stage:
+    def __init__(self, name: str, func, workers: int = 1, queue_size: int = 8, kind: str = KIND_THREAD):
+        if kind == KIND_ASYNC and not inspect.iscoroutinefunction(func):
+            raise ValueError(f"'{name}' aşaması async türünde ancak fonksiyonu coroutine değil; 'thread' kullanın.")
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.kind = kind
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+
+        # Metrikler
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0
+        self.max_depth = 0
+        self._finished_workers = 0
+        self._lock = threading.Lock()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self.queue.qsize(),
+                "capacity": self.queue.maxsize,
+                "max_depth": self.max_depth,
+                "workers": self.workers,
+                "busy": self.busy,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+class Pipeline:
+    """
+    Aşamaları başlatır, öğeleri akıtır ve kapanışı (son öğe işaretinin aşamadan aşamaya iletilmesi) yönetir.
+
+    Args:
+        stages: Sıralı Stage listesi
+        metrics_interval: Kuyruk derinliklerinin loglanma aralığı (saniye); 0 → kapalı
+        on_drop: İptalde işlenmeden atılan her öğe için çağrılır (aşamanın iş parçacığından)
+    """
+
+    def __init__(self, stages: list[Stage], metrics_interval: float = 10.0, on_drop=None):
+        self.stages = stages
+        self.metrics_interval = metrics_interval
+        self.on_drop = on_drop
+        self._cancelled = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._done = threading.Event()
+
+    # ──────── Dış arayüz ────────
+
+    def start(self):
+        for idx, stage in enumerate(self.stages):
+            if stage.kind == KIND_ASYNC:
+                t = threading.Thread(target=self._run_async_stage, args=(idx,), daemon=True,
+                                     name=f"pipeline-{stage.name}")
+                self._threads.append(t)
+            else:
+                for n in range(stage.workers):
+                    t = threading.Thread(target=self._run_thread_worker, args=(idx,), daemon=True,
+                                         name=f"pipeline-{stage.name}-{n}")
+                    self._threads.append(t)
+        if self.metrics_interval:
+            self._threads.append(threading.Thread(target=self._metrics_loop, daemon=True, name="pipeline-metrics"))
+        for t in self._threads:
+            t.start()
+
+    def put(self, item) -> bool:
+        """İlk aşamaya öğe ekler; kuyruk doluysa bekler.  İptal edildiyse False döner."""
+        return self._put(0, item)
+
+    def close(self):
+        """Girdi sonunu bildirir; aşamalar kuyruklarını boşaltıp sırayla kapanır."""
+        self._put(0, _END, force=True)
+
+    def cancel(self):
+        """Bekleyen öğeleri bırakır; çalışan aşama fonksiyonları tamamlanınca iş parçacıkları çıkar."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def join(self, timeout: float | None = None):
+        for t in self._threads:
+            if t.name == "pipeline-metrics":
+                continue
+            t.join(timeout)
+        self._done.set()
+
+    def metrics(self) -> dict:
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    def format_metrics(self) -> str:
+        return ", ".join(
+            f"{name}: {m['depth']}/{m['capacity']} (maks {m['max_depth']}, meşgul {m['busy']}/{m['workers']})"
+            for name, m in self.metrics().items()
+        )
+
+    # ──────── İç işleyiş ────────
+
+    def _put(self, idx: int, item, force: bool = False) -> bool:
+        if idx >= len(self.stages):
+            return True
+        stage = self.stages[idx]
+        while True:
+            if self._cancelled.is_set() and not force:
+                return False
+            try:
+                stage.queue.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                if self._cancelled.is_set() and force:
+                    # İptalde kuyruk boşaltılmayacağından kapanış işareti için yer aç
+                    self._drain(stage)
+                continue
+        if item is not _END:
+            with stage._lock:
+                stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+        return True
+
+    def _drain(self, stage: Stage):
+        try:
+            while True:
+                item = stage.queue.get_nowait()
+                if item is _END:
+                    stage.queue.put_nowait(_END)
+                    return
+                self._drop(stage, item)
+        except (queue.Empty, queue.Full):
+            pass
+
+    def _drop(self, stage: Stage, item):
+        with stage._lock:
+            stage.dropped += 1
+        if self.on_drop is not None:
+            try:
+                self.on_drop(item)
+            except Exception as e:
+                app_logger.error(f"Pipeline on_drop hatası ('{stage.name}'): {type(e).__name__}: {e}")
+
+    def _get(self, stage: Stage):
+        while True:
+            try:
+                return stage.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _worker_finished(self, idx: int) -> None:
+        """Aşamanın son worker'ı kapanış işaretini sonraki aşamaya iletir."""
+        stage = self.stages[idx]
+        with stage._lock:
+            stage._finished_workers += 1
+            last = stage._finished_workers >= stage.workers
+        if last:
+            self._put(idx + 1, _END, force=True)
+        else:
+            stage.queue.put(_END)
+
+    def _begin(self, stage: Stage, item) -> bool:
+        """Öğe işlenecekse True; iptal edildiyse öğe işlenmeden atlanır."""
+        with stage._lock:
+            cancelled = self._cancelled.is_set()
+            if not cancelled:
+                stage.busy += 1
+        if cancelled:
+            self._drop(stage, item)
+        return not cancelled
+
+    def _complete(self, idx: int, stage: Stage, result, error: Exception | None):
+        with stage._lock:
+            stage.busy -= 1
+            if error is not None:
+                stage.errors += 1
+            else:
+                stage.processed += 1
+        if error is not None:
+            app_logger.error(f"Pipeline aşaması '{stage.name}' hatası: {type(error).__name__}: {error}")
+            return
+        if result is not None and not self._put(idx + 1, result):
+            # İptal edildi: sonraki aşamaya aktarılamayan öğe atılır
+            self._drop(self.stages[idx + 1], result)
+
+    def _run_thread_worker(self, idx: int):
+        stage = self.stages[idx]
+        while True:
+            item = self._get(stage)
+            if item is _END:
+                self._worker_finished(idx)
+                return
+            if not self._begin(stage, item):
+                continue
+            try:
+                result, error = stage.func(item), None
+            except Exception as e:
+                result, error = None, e
+            self._complete(idx, stage, result, error)
+
+    def _run_async_stage(self, idx: int):
+        stage = self.stages[idx]
+
+        async def _consumer():
+            while True:
+                item = await asyncio.to_thread(self._get, stage)
+                if item is _END:
+                    self._worker_finished(idx)
+                    return
+                if not self._begin(stage, item):
+                    continue
+                try:
+                    result, error = await stage.func(item), None
+                except Exception as e:
+                    result, error = None, e
+                await asyncio.to_thread(self._complete, idx, stage, result, error)
+
+        async def _main():
+            # Her tüketici kuyruk beklerken bir thread tutar
+            asyncio.get_running_loop().set_default_executor(
+                concurrent.futures.ThreadPoolExecutor(max_workers=stage.workers,
+                                                      thread_name_prefix=f"pipeline-{stage.name}")
+            )
+            await asyncio.gather(*(_consumer() for _ in range(stage.workers)))
+
+        asyncio.run(_main())
+
+    def _metrics_loop(self):
+        while not self._done.wait(self.metrics_interval):
+            app_logger.info(f"Pipeline kuyrukları — {self.format_metrics()}")
@@ -21,6 +21,7 @@ from core.chapter_check_worker import ChapterCheckWorker
 from core.workers.translation_error_check_worker import TranslationErrorCheckWorker
 from core.workers.ml_terminology_worker import MLTerminologyWorker
 from core.utils import natural_sort_key
+from core.job_journal import JobJournal, STATE_QUEUED
 
 
 class CleaningController:
@@ -381,12 +382,19 @@ class ErrorCheckController:
             )
             if reply == QMessageBox.StandardButton.Yes:
                 deleted_count = 0
+                journal = self._open_job_journal()
                 for f_info in high:
                     try:
                         os.remove(f_info['filepath'])
                         deleted_count += 1
+                        if journal:
+                            # Silinen çeviri yeniden sıraya alınır (devam ederken günlük esas alınır)
+                            original_name = os.path.basename(f_info['filepath']).removeprefix("translated_")
+                            journal.record(original_name, STATE_QUEUED, "Hata kontrolü: çeviri silindi")
                     except Exception:
                         pass
+                if journal:
+                    journal.close()
                 QMessageBox.information(self.win, "Silindi", f"{deleted_count} dosya silindi.")
                 self.win.sync_database_if_exists()
                 self.win.update_file_list_from_selection()
@@ -394,6 +402,13 @@ class ErrorCheckController:
         self.thread = None
         self.worker = None
 
+    def _open_job_journal(self):
+        """Silinen çevirilerin iş günlüğüne yazılması için projenin günlüğünü açar."""
+        try:
+            return JobJournal(self.win.current_project_path)
+        except Exception:
+            return None
+
     def _on_error(self, message):
         self.win._set_all_buttons_enabled_state(True)
         self.win.progressBar.setVisible(False)
@@ -0,0 +1,135 @@
+"""
+Qt Compat — Worker'ların PyQt6 olmadan da çalışabilmesi için QObject / pyqtSignal / QThread katmanı.
+
+Varsayılan olarak PyQt6 sınıfları aynen dışa aktarılır (arayüz davranışı değişmez).  Aşağıdaki
+durumlarda saf Python karşılıkları kullanılır:
+
+  - YZNVL_HEADLESS=1 ortam değişkeni tanımlıysa (CLI bunu core modüllerini yüklemeden önce ayarlar)
+  - PyQt6 kurulu değilse
+
+Saf Python sinyalleri Qt'nin DirectConnection davranışını taklit eder: emit() bağlı fonksiyonları
+yayan thread içinde, bağlanma sırasıyla çağırır.  Böylece worker'lar başsız (headless) ortamda
+sıradan geri çağırım (callback) arayüzüyle sürülebilir.
+
+Kullanım:
+    from core.qt_compat import QObject, pyqtSignal
+"""
+
+import os
+import threading
+
+
+HEADLESS_ENV = "YZNVL_HEADLESS"
+
+
+def _want_headless() -> bool:
+    return os.environ.get(HEADLESS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+HEADLESS = _want_headless()
+
+if not HEADLESS:
+    try:
+        from PyQt6.QtCore import QObject, QThread, pyqtSignal
+    except ImportError:
+        HEADLESS = True
+
+
+if HEADLESS:
+
+    class _BoundSignal:
+        """Tek bir nesneye bağlı sinyal: connect / disconnect / emit."""
+
+        def __init__(self):
+            self._slots = []
+            self._lock = threading.Lock()
+
+        def connect(self, slot):
+            with self._lock:
+                self._slots.append(slot)
+
+        def disconnect(self, slot=None):
+            with self._lock:
+                if slot is None:
+                    self._slots.clear()
+                elif slot in self._slots:
+                    self._slots.remove(slot)
+                else:
+                    raise TypeError("disconnect() failed between signal and slot")
+
+        def emit(self, *args):
+            with self._lock:
+                slots = list(self._slots)
+            for slot in slots:
+                slot(*args)
+
+    class pyqtSignal:
+        """Sınıf düzeyinde tanımlanan sinyal; her nesne için ayrı _BoundSignal üretir."""
+
+        def __init__(self, *types, name=None):
+            self._types = types
+            self._name = name
+
+        def __set_name__(self, owner, name):
+            if self._name is None:
+                self._name = name
+
+        def __get__(self, obj, objtype=None):
+            if obj is None:
+                return self
+            key = "_signal_" + self._name
+            bound = obj.__dict__.get(key)
+            if bound is None:
+                bound = obj.__dict__.setdefault(key, _BoundSignal())
+            return bound
+
+    class QObject:
+        def __init__(self, parent=None):
+            self._parent = parent
+
+        def moveToThread(self, thread):
+            pass
+
+        def deleteLater(self):
+            pass
+
+    class QThread(QObject):
+        """threading.Thread üzerine kurulu asgari QThread: start / run / wait / isRunning."""
+
+        started = pyqtSignal()
+        finished = pyqtSignal()
+
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self._thread = None
+
+        def run(self):
+            pass
+
+        def _bootstrap(self):
+            self.started.emit()
+            try:
+                self.run()
+            finally:
+                # Alt sınıf 'finished' sinyalini argümanlı olarak yeniden tanımlamış olabilir
+                if type(self).finished is QThread.__dict__["finished"]:
+                    self.finished.emit()
+
+        def start(self):
+            self._thread = threading.Thread(target=self._bootstrap, daemon=True)
+            self._thread.start()
+
+        def isRunning(self) -> bool:
+            return self._thread is not None and self._thread.is_alive()
+
+        def wait(self, msecs: int | None = None) -> bool:
+            if self._thread is None:
+                return True
+            self._thread.join(None if msecs is None else msecs / 1000)
+            return not self._thread.is_alive()
+
+        def quit(self):
+            pass
+
+
+__all__ = ["HEADLESS", "HEADLESS_ENV", "QObject", "QThread", "pyqtSignal"]
@@ -0,0 +1,247 @@
+"""
+Quota Scheduler — Birden fazla projenin API isteklerini ortak kota üzerinden adil paylaştıran zamanlayıcı.
+
+Aynı süreçte birden fazla proje çevrilirken (job server) her istek, gönderileceği endpoint'in
+kotasından bir yuva alır.  Endpoint kotası, MCP_Endpoints.json'daki isteğe bağlı anahtar başına
+sınırların anahtar sayısıyla çarpımıdır:
+
+    "rate_limit": {"concurrency": 3, "rpm": 10}     # anahtar başına eşzamanlı istek / dakikalık istek
+
+Yuvalar ağırlıklı adil kuyruk (WFQ) ile dağıtılır: her istek geldiğinde projesinin sanal bitiş
+zamanı (önceki bitiş veya şimdiki sanal zaman + maliyet / ağırlık) ile etiketlenir; yuva
+boşaldığında en küçük etiketli istek geçer.  Ağırlığı 2 olan proje, ağırlığı 1 olana göre iki kat
+istek alır; boşta kalan projenin payı diğerlerine geçer ve hiçbir proje aç kalmaz.
+
+Kullanım:
+    scheduler = QuotaScheduler()
+    flow = scheduler.flow("Proje A", weight=2)
+    with flow.slot(provider.ep_id, cancelled=lambda: not worker.is_running):
+        provider.generate(...)
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from logger import app_logger
+
+
+DEFAULT_CONCURRENCY_PER_KEY = 3
+
+
+class QuotaCancelled(Exception):
+    """Yuva beklenirken iş durduruldu."""
+
+
+class _Resource:
+    """Tek bir endpoint'in kotası: eşzamanlılık sınırı, dakikalık istek sınırı ve WFQ kuyruğu."""
+
+    def __init__(self, name: str, concurrency: int, rpm: float | None):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.rpm = float(rpm) if rpm else None
+        self.in_flight = 0
+        self.virtual_time = 0.0
+        self.heap: list[tuple[float, int, object]] = []
+        self.recent: deque[float] = deque()     # son 60 sn içindeki yuva verme zamanları
+        self.granted = 0
+
+    def rate_wait(self, now: float) -> float:
+        """Dakikalık sınır doluysa bir sonraki yuvaya kadar beklenecek süre (sn)."""
+        if self.rpm is None:
+            return 0.0
+        while self.recent and now - self.recent[0] >= 60.0:
+            self.recent.popleft()
+        if len(self.recent) < self.rpm:
+            return 0.0
+        return 60.0 - (now - self.recent[0])
+
+
+class _Ticket:
+    __slots__ = ("flow", "start", "finish", "done")
+
+    def __init__(self, flow: str, start: float, finish: float):
+        self.flow = flow
+        self.start = start
+        self.finish = finish
+        self.done = False    # yuva verildi veya bekleme iptal edildi
+
+
+class QuotaFlow:
+    """Bir projenin zamanlayıcıdaki tanıtıcısı (TranslationWorker'a quota= olarak verilir)."""
+
+    def __init__(self, scheduler: "QuotaScheduler", name: str):
+        self.scheduler = scheduler
+        self.name = name
+
+    def slot(self, resource: str, cost: float = 1.0, cancelled=None):
+        return _Slot(self.scheduler, self.name, resource, cost, cancelled)
+
+
+class _Slot:
+    def __init__(self, scheduler, flow, resource, cost, cancelled):
+        self.scheduler = scheduler
+        self.flow = flow
+        self.resource = resource
+        self.cost = cost
+        self.cancelled = cancelled
+
+    def __enter__(self):
+        if not self.scheduler.acquire(self.flow, self.resource, self.cost, self.cancelled):
+            raise QuotaCancelled(f"Kota beklenirken durduruldu ({self.flow})")
+        return self
+
+    def __exit__(self, *exc):
+        self.scheduler.release(self.flow, self.resource)
+        return False
+
+
+class QuotaScheduler:
+    """
+    Thread-safe WFQ zamanlayıcısı.
+
+    Args:
+        limits: Endpoint ID → (eşzamanlılık, rpm).  Verilmeyen endpoint'ler için limits_for() ile
+            MCP_Endpoints.json'dan okunur.
+    """
+
+    def __init__(self, limits: dict[str, tuple[int, float | None]] | None = None):
+        self._limits = dict(limits or {})
+        self._cond = threading.Condition()
+        self._resources: dict[str, _Resource] = {}
+        self._weights: dict[str, float] = {}
+        self._last_finish: dict[tuple[str, str], float] = {}
+        self._seq = itertools.count()
+        self._flow_stats: dict[str, dict] = {}
+
+    # ──────── Projeler ────────
+
+    def flow(self, name: str, weight: float = 1.0) -> QuotaFlow:
+        self.set_weight(name, weight)
+        return QuotaFlow(self, name)
+
+    def set_weight(self, name: str, weight: float):
+        with self._cond:
+            self._weights[name] = max(0.01, float(weight or 1.0))
+            self._flow_stats.setdefault(name, {"granted": 0, "wait_seconds": 0.0, "in_flight": 0})
+
+    # ──────── Kotalar ────────
+
+    @staticmethod
+    def limits_for(endpoint_id: str) -> tuple[int, float | None]:
+        """Endpoint'in toplam kotası: anahtar başına sınırlar × anahtar sayısı."""
+        from core.llm_provider import NODE_ID_ENV, get_endpoint_by_id, load_api_keys
+
+        endpoint = get_endpoint_by_id(endpoint_id) or {}
+        limit = endpoint.get("rate_limit") or {}
+        keys = max(1, len(load_api_keys(endpoint_id, os.environ.get(NODE_ID_ENV)))) if endpoint.get("use_key_rotation", True) else 1
+        concurrency = int(limit.get("concurrency", DEFAULT_CONCURRENCY_PER_KEY)) * keys
+        rpm = limit.get("rpm")
+        return concurrency, (float(rpm) * keys if rpm else None)
+
+    def _resource(self, name: str) -> _Resource:
+        res = self._resources.get(name)
+        if res is None:
+            if name not in self._limits:
+                try:
+                    self._limits[name] = self.limits_for(name)
+                except Exception as e:
+                    app_logger.warning(f"Kota sınırları okunamadı ({name}): {e}")
+                    self._limits[name] = (DEFAULT_CONCURRENCY_PER_KEY, None)
+            concurrency, rpm = self._limits[name]
+            res = self._resources[name] = _Resource(name, concurrency, rpm)
+            app_logger.info(f"Kota: '{name}' → eşzamanlı {res.concurrency}, rpm {res.rpm or 'sınırsız'}")
+        return res
+
+    # ──────── Yuva alma / bırakma ────────
+
+    def acquire(self, flow: str, resource: str, cost: float = 1.0, cancelled=None) -> bool:
+        """
+        Yuva verilene kadar bekler.  cancelled() True dönerse beklemeyi bırakır ve False döner;
+        koşul her uyanışta (yuva bırakıldığında veya wake() çağrıldığında) yeniden değerlendirilir.
+        """
+        requested = time.time()
+        with self._cond:
+            res = self._resource(resource)
+            weight = self._weights.get(flow)
+            if weight is None:
+                self.set_weight(flow, 1.0)
+                weight = 1.0
+            start = max(res.virtual_time, self._last_finish.get((resource, flow), 0.0))
+            ticket = _Ticket(flow, start, start + cost / weight)
+            self._last_finish[(resource, flow)] = ticket.finish
+            heapq.heappush(res.heap, (ticket.finish, next(self._seq), ticket))
+
+            while True:
+                self._drop_done(res)
+                if res.heap and res.heap[0][2] is ticket and res.in_flight < res.concurrency:
+                    wait = res.rate_wait(time.time())
+                    if wait <= 0:
+                        break
+                else:
+                    wait = None     # sıra/yuva bekleniyor: release() veya wake() uyandırır
+                if cancelled is not None and cancelled():
+                    ticket.done = True
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(wait)
+
+            heapq.heappop(res.heap)
+            ticket.done = True
+            res.virtual_time = max(res.virtual_time, ticket.start)
+            res.in_flight += 1
+            res.granted += 1
+            now = time.time()
+            if res.rpm is not None:
+                res.recent.append(now)
+            stats = self._flow_stats[flow]
+            stats["granted"] += 1
+            stats["in_flight"] += 1
+            stats["wait_seconds"] += now - requested
+            # Sıradaki istek de geçebilir (boş yuva kaldıysa)
+            self._cond.notify_all()
+        return True
+
+    def release(self, flow: str, resource: str):
+        with self._cond:
+            res = self._resources.get(resource)
+            if res is not None and res.in_flight > 0:
+                res.in_flight -= 1
+            stats = self._flow_stats.get(flow)
+            if stats and stats["in_flight"] > 0:
+                stats["in_flight"] -= 1
+            self._cond.notify_all()
+
+    def wake(self):
+        """Bekleyenleri uyandırır; iptal koşulları (cancelled) hemen yeniden değerlendirilir."""
+        with self._cond:
+            self._cond.notify_all()
+
+    @staticmethod
+    def _drop_done(res: _Resource):
+        while res.heap and res.heap[0][2].done:
+            heapq.heappop(res.heap)
+
+    # ──────── Rapor ────────
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "resources": {
+                    name: {
+                        "concurrency": r.concurrency,
+                        "rpm": r.rpm,
+                        "in_flight": r.in_flight,
+                        "waiting": sum(1 for _, _, t in r.heap if not t.done),
+                        "granted": r.granted,
+                    }
+                    for name, r in self._resources.items()
+                },
+                "flows": {
+                    name: {**s, "weight": self._weights.get(name, 1.0)}
+                    for name, s in self._flow_stats.items()
+                },
+            }
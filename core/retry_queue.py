@@ -0,0 +1,129 @@
+"""
+Retry Queue — Kalite kontrolünden geçemeyen bölümlerin otomatik yeniden denenmesi.
+
+Ana çeviri turu bittikten sonra hatalı bölümler, deneme bütçesi (retry_attempts) dolana kadar
+her seferinde farklı bir strateji ile yeniden çevrilir:
+
+  - ("endpoint", endpoint_id): bölüm başka bir endpoint/model ile çevrilir
+  - ("chunk", n):             bölüm n paragraflık küçük parçalar halinde gönderilir
+
+Endpoint ve parça stratejileri sırayla harmanlanır (B, 4, C, 2, 1 ...) böylece küçük bütçelerde de
+her iki yaklaşım denenir.  Bölüme uygulanamayan strateji (ör. paragraf sayısı parça boyutunu aşmayan
+bölümde parça denemesi — başarısız isteğin aynısı olurdu) deneme sayılmadan atlanır (skip).
+Bütçesi biten bölümler tüm deneme geçmişiyle birlikte raporlanır.
+"""
+
+import time
+import threading
+
+
+STRATEGY_ENDPOINT = "endpoint"
+STRATEGY_CHUNK = "chunk"
+
+
+class RetryAttempt:
+    def __init__(self, attempt: int, strategy: tuple[str, object], reason: str | None):
+        self.attempt = attempt
+        self.strategy = strategy
+        self.reason = reason
+        self.ts = time.time()
+
+    def to_dict(self) -> dict:
+        kind, value = self.strategy
+        return {"attempt": self.attempt, "strategy": kind, "value": value, "reason": self.reason, "ts": self.ts}
+
+
+class RetryQueue:
+    """
+    Bölüm bazlı deneme sayacı ve strateji seçicisi.  Thread-safe.
+
+    Args:
+        max_attempts: Bölüm başına en fazla otomatik deneme (0 → kapalı).
+        endpoint_ids: Denenebilecek alternatif endpoint ID'leri (ana endpoint hariç).
+        chunk_sizes: Küçük parça denemelerinde kullanılacak paragraf sayıları (büyükten küçüğe).
+    """
+
+    def __init__(self, max_attempts: int, endpoint_ids: list[str], chunk_sizes: list[int]):
+        self.max_attempts = max(0, int(max_attempts))
+        self._strategies = self._interleave(
+            [(STRATEGY_ENDPOINT, ep_id) for ep_id in endpoint_ids],
+            [(STRATEGY_CHUNK, size) for size in chunk_sizes],
+        )
+        self._lock = threading.Lock()
+        self._history: dict[str, list[RetryAttempt]] = {}
+        self._cursor: dict[str, int] = {}       # bölüm → sıradaki stratejinin index'i (deneme + atlanan)
+        self._initial_reasons: dict[str, str] = {}
+        self._recovered: set[str] = set()
+
+    @staticmethod
+    def _interleave(first: list, second: list) -> list:
+        merged = []
+        for n in range(max(len(first), len(second))):
+            if n < len(first):
+                merged.append(first[n])
+            if n < len(second):
+                merged.append(second[n])
+        return merged
+
+    # ──────── Kuyruk ────────
+
+    def add(self, file_name: str, reason: str):
+        """Ana turda başarısız olan bölümü kuyruğa alır."""
+        with self._lock:
+            self._initial_reasons.setdefault(file_name, reason)
+            self._history.setdefault(file_name, [])
+
+    def pending(self) -> list[str]:
+        """Henüz kurtarılmamış ve bütçesi bitmemiş bölümler."""
+        with self._lock:
+            return [name for name in self._history if self._has_next(name)]
+
+    def next_strategy(self, file_name: str) -> tuple[str, object] | None:
+        with self._lock:
+            if not self._has_next(file_name):
+                return None
+            return self._strategies[self._cursor.get(file_name, 0)]
+
+    def record(self, file_name: str, strategy: tuple[str, object], ok: bool, reason: str | None = None):
+        with self._lock:
+            attempts = self._history.setdefault(file_name, [])
+            attempts.append(RetryAttempt(len(attempts) + 1, strategy, None if ok else reason))
+            self._cursor[file_name] = self._cursor.get(file_name, 0) + 1
+            if ok:
+                self._recovered.add(file_name)
+
+    def skip(self, file_name: str):
+        """Sıradaki strateji bu bölüme uygulanamıyor; deneme bütçesinden düşmeden sonrakine geçilir."""
+        with self._lock:
+            self._cursor[file_name] = self._cursor.get(file_name, 0) + 1
+
+    def _has_next(self, file_name: str) -> bool:
+        return (
+            file_name in self._history
+            and file_name not in self._recovered
+            and len(self._history[file_name]) < self.max_attempts
+            and self._cursor.get(file_name, 0) < len(self._strategies)
+        )
+
+    # ──────── Rapor ────────
+
+    def diagnostics(self) -> dict[str, dict]:
+        """Kalıcı olarak başarısız bölümler: ilk hata nedeni ve tüm deneme geçmişi."""
+        with self._lock:
+            return {
+                name: {
+                    "initial_reason": self._initial_reasons.get(name),
+                    "attempts": [a.to_dict() for a in attempts],
+                }
+                for name, attempts in self._history.items()
+                if name not in self._recovered
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": len(self._history),
+                "recovered": len(self._recovered),
+                "failed": len(self._history) - len(self._recovered),
+                "attempts": sum(len(a) for a in self._history.values()),
+            }
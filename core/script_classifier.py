@@ -0,0 +1,232 @@
+"""
+ScriptClassifier — Tek geçişli, önceden derlenmiş yazı sistemi (script) histogramı.
+
+Token tahmini, kalibrasyon ve kalite kontrolü (CJK oranı) aynı metni ayrı ayrı regex'lerle
+tarıyordu: her çağrıda yeniden derlenen CJK deseni, findall (eşleşme listesi) ve sub (metnin
+kopyası).  Burada tüm Unicode aralıkları modül yüklenirken tek bir çeviri tablosuna derlenir;
+str.translate metni tek geçişte sınıf işaretlerine (\\x01…\\x08) çevirir, sınıflar str.count ile
+sayılır.  Sınıflandırılmayan karakterler tablo tarafından silinir ve "other" olarak kalan farktan
+hesaplanır.  Uzun metinler sabit boyutlu dilimler halinde işlenir; ek bellek metin boyundan bağımsızdır.
+Son uzun metinlerin sonucu saklandığından aynı metni soran sonraki çağıranlar metni yeniden taramaz.
+
+Kullanım:
+    counts = script_counts(text)              # SCRIPTS sırasıyla sayımlar
+    script_histogram(text)["hangul"]
+    script_ratio(text, "hangul", "han")       # CJK oranı (kalite kontrolü)
+
+Mikro kıyaslama (10 MB karışık külliyat veya verilen dosya / klasör):
+    python -m core.script_classifier [--size-mb 10] [yol]
+"""
+
+import threading
+
+SCRIPTS = ("latin", "cyrillic", "hangul", "han", "kana", "digit", "space", "punct", "other")
+
+# Sınıf → Unicode aralıkları (dahil).  "other" bunların dışında kalan her şeydir.
+SCRIPT_RANGES = {
+    "latin": ((0x41, 0x5A), (0x61, 0x7A), (0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0x24F),   # Türkçe harfler dahil
+              (0x1E00, 0x1EFF)),
+    "cyrillic": ((0x400, 0x4FF),),
+    "hangul": ((0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F)),                   # hece + jamo
+    "han": ((0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0xF900, 0xFAFF), (0x20000, 0x2FFFF)),
+    "kana": ((0x3040, 0x309F), (0x30A0, 0x30FF)),
+    "digit": ((0x30, 0x39),),
+    "space": ((0x09, 0x0D), (0x20, 0x20), (0xA0, 0xA0), (0x3000, 0x3000)),
+    "punct": ((0x21, 0x2F), (0x3A, 0x40), (0x5B, 0x60), (0x7B, 0x7E), (0xA1, 0xBF), (0x2000, 0x206F),
+              (0x3001, 0x303F), (0xFF01, 0xFF0F), (0xFF1A, 0xFF20), (0xFF3B, 0xFF40), (0xFF5B, 0xFF65)),
+}
+
+_MARKERS = tuple(chr(1 + i) for i in range(len(SCRIPTS) - 1))
+_TABLE_SIZE = 0x30000          # BMP + SIP (CJK Ext. B–F); üstündeki karakterler "other"
+_CHUNK = 1 << 14
+_EMPTY = (0,) * len(SCRIPTS)
+
+# Aynı metin (bölüm, çeviri, yanıt) tahmin, CJK kontrolü, kalite kontrolü ve kalibrasyon tarafından
+# art arda sınıflandırılır; son metinlerin sonucu saklanır.  Anahtar metnin kendisidir (hash'i str
+# nesnesinde saklanır, eşitlik kontrolü aynı nesnede anında döner).  Kısa metinler saklanmaz.
+_CACHE_MIN_CHARS = 512
+_CACHE_SIZE = 64
+_cache: dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _build_table() -> list:
+    # Liste tablosu dict'ten hızlıdır (hash yok); None karakteri siler, tablo dışı kalan
+    # karakterler (IndexError) değişmeden geçer ve hiçbir işaretle eşleşmez.
+    table = [None] * _TABLE_SIZE
+    for marker, script in zip(_MARKERS, SCRIPTS):
+        for low, high in SCRIPT_RANGES[script]:
+            for cp in range(low, min(high, _TABLE_SIZE - 1) + 1):
+                table[cp] = ord(marker)
+    return table
+
+
+_TABLE = _build_table()
+
+
+def _classify(text: str) -> tuple:
+    counts = [0] * len(SCRIPTS)
+    length = len(text)
+    for start in range(0, length, _CHUNK):
+        marked = (text if length <= _CHUNK else text[start:start + _CHUNK]).translate(_TABLE)
+        for i, marker in enumerate(_MARKERS):
+            counts[i] += marked.count(marker)
+    counts[-1] = length - sum(counts)
+    return tuple(counts)
+
+
+def script_counts(text: str) -> tuple:
+    """Metnin SCRIPTS sırasıyla yazı sistemi sayımları (son eleman: diğer)."""
+    if not text:
+        return _EMPTY
+    if len(text) < _CACHE_MIN_CHARS:
+        return _classify(text)
+    with _cache_lock:
+        counts = _cache.get(text)
+    if counts is None:
+        counts = _classify(text)
+        with _cache_lock:
+            _cache[text] = counts
+            if len(_cache) > _CACHE_SIZE:
+                del _cache[next(iter(_cache))]
+    return counts
+
+
+def script_histogram(text: str) -> dict[str, int]:
+    """script_counts'un sınıf adıyla eşlenmiş hali."""
+    return dict(zip(SCRIPTS, script_counts(text)))
+
+
+def script_ratio(text: str, *scripts: str) -> float:
+    """Verilen sınıfların metindeki toplam oranı (0.0 - 1.0)."""
+    if not text:
+        return 0.0
+    counts = script_counts(text)
+    return sum(counts[SCRIPTS.index(s)] for s in scripts) / len(text)
+
+
+# ──────── Mikro kıyaslama ────────
+
+_SAMPLE_LINES = (
+    "Bugün hava çok güzel, değil mi? Şimdi Iğdır'a gidiyoruz; 2024'te 15 kişiydik.\n",
+    "오늘은 날씨가 정말 좋네요. 그렇지 않나요? ㅋㅋㅋ 「김철수」가 말했다.\n",
+    "今天天气很好，不是吗？我们现在出发。「好的」他说。\n",
+    "今日はいい天気ですね。カタカナもあります。\n",
+    "Сегодня хорошая погода, не правда ли?\n",
+    "The quick brown fox jumps over the lazy dog — \"twice\", he said.\n",
+)
+
+
+def _corpus(size_mb: float, path: str = None) -> str:
+    """size_mb MB (UTF-8) külliyat: verilen dosya / .txt klasörü tekrarlanarak veya sentetik karışık metin."""
+    import os
+    import random
+    size = int(size_mb * 1024 * 1024)
+    if path:
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(root, name) for root, _, names in os.walk(path) for name in sorted(names)
+            if name.endswith(".txt")
+        ]
+        parts, total = [], 0
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                parts.append(f.read())
+            total += len(parts[-1])
+            if total >= size:
+                break
+        data = b"".join(parts)
+        if not data:
+            raise SystemExit(f"'{path}' altında okunacak .txt bulunamadı.")
+        return (data * (size // len(data) + 1))[:size].decode("utf-8", errors="ignore")
+    rng = random.Random(0)
+    lines, total = [], 0
+    while total < size:
+        line = rng.choice(_SAMPLE_LINES)
+        lines.append(line)
+        total += len(line.encode("utf-8"))
+    return "".join(lines)
+
+
+def _benchmark(size_mb: float = 10, path: str = None, repeat: int = 3):
+    """Eski regex taramaları ile tek geçişli sınıflandırıcıyı aynı külliyatta, işlem işlem karşılaştırır."""
+    import re
+    import time
+
+    text = _corpus(size_mb, path)
+
+    def legacy_estimate(t):
+        # Eski estimate_tokens / get_local_token_count_approx: her çağrıda derleme + findall + sub
+        cjk = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]')
+        return len(cjk.findall(t)) * 1.4 + len(cjk.sub('', t)) / 4.0
+
+    legacy_korean = re.compile(r'[\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f]')
+    legacy_chinese = re.compile(r'[\u4e00-\u9fff]')
+    legacy_cjk = re.compile(r'[\u4e00-\u9fff\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f]')
+
+    def legacy_worker_cjk(t):
+        # TranslationWorker._has_excessive_cjk
+        return (len(legacy_korean.findall(t)) + len(legacy_chinese.findall(t))) / len(t)
+
+    def legacy_checker_cjk(t):
+        # TranslationQualityChecker._has_excessive_cjk
+        return len(legacy_cjk.findall(t)) / len(t)
+
+    legacy_patterns = [re.compile(r"[A-Za-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f\u1e00-\u1eff]"),
+                       re.compile(r"[\u0400-\u04ff]"),
+                       re.compile(r"[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]"),
+                       re.compile(r"[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff]"),
+                       re.compile(r"[\u3040-\u309f\u30a0-\u30ff]"),
+                       re.compile(r"[0-9]"),
+                       re.compile(r"[ \t\n\r\f\v\u00a0\u3000]"),
+                       re.compile(r"[!-/:-@\[-`{-~\u00a1-\u00bf\u2000-\u206f\u3001-\u303f"
+                                  r"\uff01-\uff0f\uff1a-\uff20\uff3b-\uff40\uff5b-\uff65]")]
+
+    def legacy_histogram(t):
+        # Sınıf başına bir regex (findall) ile aynı histogram
+        return [len(p.findall(t)) for p in legacy_patterns]
+
+    def timed(fn):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(text)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+    print(f"Külliyat: {len(text):,} karakter ({mb:.1f} MB UTF-8), {repeat} denemenin en iyisi")
+    def legacy_chapter(t):
+        legacy_estimate(t)
+        legacy_worker_cjk(t)
+        legacy_checker_cjk(t)
+
+    def current_chapter(t):
+        _cache.clear()
+        script_counts(t)                        # tahmin
+        script_ratio(t, "hangul", "han")        # worker CJK kontrolü
+        script_ratio(t, "hangul", "han")        # kalite kontrolcüsü
+
+    # Tek işlem satırları önbelleksiz (_classify) ölçülür; son satır aynı metnin ardışık kullanımıdır
+    cases = [
+        ("token tahmini", legacy_estimate, _classify),
+        ("worker CJK kontrolü", legacy_worker_cjk, _classify),
+        ("kalite kontrolcüsü CJK kontrolü", legacy_checker_cjk, _classify),
+        ("yazı sistemi histogramı", legacy_histogram, _classify),
+        ("bölüm: tahmin + 2 CJK kontrolü", legacy_chapter, current_chapter),
+    ]
+    print(f"  {'işlem':<32} {'eski (ms)':>10} {'yeni (ms)':>10} {'hızlanma':>9}")
+    for label, legacy, current in cases:
+        old_s, new_s = timed(legacy), timed(current)
+        print(f"  {label:<32} {old_s * 1000:10.1f} {new_s * 1000:10.1f} {old_s / new_s:8.1f}x")
+    print("Histogram:", script_histogram(text))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Yazı sistemi sınıflandırıcısı mikro kıyaslaması")
+    parser.add_argument("path", nargs="?", default=None, help="Külliyat dosyası veya .txt klasörü (varsayılan: sentetik)")
+    parser.add_argument("--size-mb", type=float, default=10, help="Külliyat boyutu (MB, varsayılan 10)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    _benchmark(args.size_mb, args.path, args.repeat)
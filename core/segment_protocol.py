@@ -0,0 +1,190 @@
+"""
+Segment Protocol — Paragraf bazlı çeviride numaralı segment işaretleri ve kaynak/hedef hizalama.
+
+Her paragraf isteğe kendi numarasıyla gönderilir:
+
+    [[P12]]
+    <paragraf metni>
+
+Model işaretleri çıktıda korursa segmentler doğrudan eşleşir.  İşaretlerin bir kısmı kaybolduğunda
+(birleştirilmiş / atlanmış paragraflar) ilgili blok boş satırlardan bölünür ve uzunluk oranına göre
+(Gale-Church benzeri) hizalanır.  Yalnızca güvenle hizalanan segmentler kabul edilir; geri kalanlar
+"eşleşmedi" olarak döner ve çağıran yalnızca onları yeniden ister.
+"""
+
+import math
+import re
+import statistics
+
+
+SEGMENT_MARKER = re.compile(r'\[\[\s*P(\d+)\s*\]\]')
+
+SEGMENT_INSTRUCTION = (
+    "\n\n[ÖNEMLİ: Metin numaralı paragraflar halinde verilmiştir. Her paragraf [[P<numara>]] işaretiyle "
+    "başlar. Her paragrafı ayrı ayrı çevir ve çevirinin başına aynı işareti koy. İşaretleri çevirme, "
+    "paragrafları birleştirme veya atlama.]\n\n"
+)
+
+# Segment uzunluk oranının beklenen orandan sapabileceği sınırlar
+RATIO_LOW = 0.4
+RATIO_HIGH = 2.5
+# Bu uzunluğun altındaki segmentlerde oran kontrolü yapılmaz (kısa satırlar çok oynaktır)
+RATIO_MIN_CHARS = 40
+
+# Hizalama maliyetleri (log-oran sapması + bead cezası)
+_MERGE_PENALTY = 0.6
+_SKIP_PENALTY = 3.0
+
+
+def format_segments(items: list[tuple[int, str]]) -> str:
+    """[(numara, paragraf), ...] listesini numaralı işaretlerle birleştirir."""
+    return "\n\n".join(f"[[P{num}]]\n{text.strip()}" for num, text in items)
+
+
+def align_segments(items: list[tuple[int, str]], response: str) -> tuple[dict[int, str], list[int]]:
+    """
+    Model yanıtını istenen segmentlerle hizalar.
+
+    Args:
+        items: İstek sırasıyla [(numara, kaynak paragraf), ...]
+        response: Model çıktısı
+
+    Returns:
+        (hizalanan {numara: çeviri}, eşleşmeyen numaralar listesi — istek sırasıyla)
+    """
+    order = [num for num, _ in items]
+    sources = dict(items)
+    if not order or not response or not response.strip():
+        return {}, order
+
+    blocks = _split_blocks(order, response)
+    expected = _expected_ratio(sources, response)
+
+    candidates: dict[int, str] = {}
+    for covered, text in blocks:
+        if not covered or not text.strip():
+            continue
+        if len(covered) == 1:
+            candidates[covered[0]] = text.strip()
+            continue
+        targets = [t.strip() for t in re.split(r'\n\s*\n', text) if t.strip()]
+        candidates.update(_align_block([(n, sources[n]) for n in covered], targets, expected))
+
+    aligned = _filter_by_ratio(sources, candidates, expected)
+    unmatched = [num for num in order if num not in aligned]
+    return aligned, unmatched
+
+
+def _split_blocks(order: list[int], response: str) -> list[tuple[list[int], str]]:
+    """
+    Yanıtı işaretlere göre bloklara ayırır. Her blok, bir sonraki geçerli işarete kadar olan
+    kaynak segmentleri kapsar (eksik işaretler önceki bloğa katılır).
+    Geriye giden / bilinmeyen / tekrarlanan işaretler yok sayılır, metni mevcut bloğa eklenir.
+    """
+    position = {num: i for i, num in enumerate(order)}
+    pieces = SEGMENT_MARKER.split(response)
+
+    starts: list[tuple[int, list[str]]] = [(0, [pieces[0]])]   # (order indeksi, metin parçaları)
+    next_allowed = 0
+    for k in range(1, len(pieces), 2):
+        num = int(pieces[k])
+        text = pieces[k + 1] if k + 1 < len(pieces) else ""
+        idx = position.get(num)
+        if idx is not None and idx >= next_allowed:
+            if idx == 0:
+                # İlk segmentin işareti — öncesindeki metin (ör. "İşte çeviri:") atılır
+                starts[0] = (0, [text])
+            else:
+                starts.append((idx, [text]))
+            next_allowed = idx + 1
+        else:
+            starts[-1][1].append(text)
+
+    blocks = []
+    for i, (start, texts) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(order)
+        blocks.append((order[start:end], "\n\n".join(texts)))
+    return blocks
+
+
+def _expected_ratio(sources: dict[int, str], response: str) -> float:
+    """Yanıtın toplam uzunluğunun kaynak toplamına oranı (işaretler hariç)."""
+    src_len = sum(len(s) for s in sources.values())
+    tgt_len = len(SEGMENT_MARKER.sub("", response).strip())
+    if src_len <= 0 or tgt_len <= 0:
+        return 1.0
+    return tgt_len / src_len
+
+
+def _bead_cost(src_len: int, tgt_len: int, ratio: float) -> float:
+    return abs(math.log((tgt_len + 1) / (src_len * ratio + 1)))
+
+
+def _align_block(sources: list[tuple[int, str]], targets: list[str], ratio: float) -> dict[int, str]:
+    """
+    Tek bir bloğun kaynak segmentlerini hedef paragraflarıyla uzunluk oranına göre hizalar.
+    1-1 ve 1-2 (kaynak paragraf hedefte ikiye bölünmüş) eşleşmeler kabul edilir;
+    birleştirilmiş (2-1) ve atlanmış segmentler eşleşmemiş sayılır.
+    """
+    m, n = len(sources), len(targets)
+    if m == 0 or n == 0:
+        return {}
+    s_len = [len(text) for _, text in sources]
+    t_len = [len(t) for t in targets]
+
+    inf = float("inf")
+    cost = [[inf] * (n + 1) for _ in range(m + 1)]
+    back: list[list[tuple[int, int] | None]] = [[None] * (n + 1) for _ in range(m + 1)]
+    cost[0][0] = 0.0
+    for i in range(m + 1):
+        for j in range(n + 1):
+            base = cost[i][j]
+            if base == inf:
+                continue
+            moves = (
+                (1, 1, 0.0),
+                (1, 2, _MERGE_PENALTY),
+                (2, 1, _MERGE_PENALTY),
+                (1, 0, _SKIP_PENALTY),
+                (0, 1, _SKIP_PENALTY),
+            )
+            for di, dj, penalty in moves:
+                ni, nj = i + di, j + dj
+                if ni > m or nj > n:
+                    continue
+                if di and dj:
+                    c = _bead_cost(sum(s_len[i:ni]), sum(t_len[j:nj]), ratio) + penalty
+                else:
+                    c = penalty
+                if base + c < cost[ni][nj]:
+                    cost[ni][nj] = base + c
+                    back[ni][nj] = (di, dj)
+
+    result = {}
+    i, j = m, n
+    while i > 0 or j > 0:
+        di, dj = back[i][j]
+        if di == 1 and dj >= 1:
+            result[sources[i - 1][0]] = "\n\n".join(targets[j - dj:j])
+        i, j = i - di, j - dj
+    return result
+
+
+def _filter_by_ratio(sources: dict[int, str], candidates: dict[int, str], expected: float) -> dict[int, str]:
+    """Uzunluk oranı diğer segmentlerden belirgin biçimde sapan adayları eler."""
+    ratios = [
+        len(candidates[num]) / len(sources[num])
+        for num in candidates
+        if len(sources[num]) >= RATIO_MIN_CHARS
+    ]
+    reference = statistics.median(ratios) if len(ratios) >= 3 else expected
+
+    accepted = {}
+    for num, text in candidates.items():
+        src = sources[num]
+        if max(len(src), len(text)) >= RATIO_MIN_CHARS and reference > 0:
+            r = (len(text) / max(len(src), 1)) / reference
+            if r < RATIO_LOW or r > RATIO_HIGH:
+                continue
+        accepted[num] = text
+    return accepted
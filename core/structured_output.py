@@ -0,0 +1,99 @@
+"""
+Structured Output — Batch çevirileri için JSON şema modu.
+
+Model, bölüm ayraçlarını (===CHAPTER_START=== / ===CHAPTER_END===) metin içinde korumak yerine
+yanıtı şemaya uygun JSON olarak döndürür:
+
+    {"chapters": [{"id": "c1", "translation": "..."}, ...]}
+
+Yanıt bozuk veya kesik olsa bile ayrıştırılabilen her {id, translation} nesnesi kurtarılır;
+yalnızca eksik kimlikler yeniden istenir.
+"""
+
+import json
+import re
+
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "chapters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "translation": {"type": "string"},
+                },
+                "required": ["id", "translation"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["chapters"],
+    "additionalProperties": False,
+}
+
+JSON_BATCH_INSTRUCTION = (
+    "\n\n[ÖNEMLİ: Aşağıda birden fazla bölüm verilmiştir. Her bölüm ===CHAPTER_START id=\"...\"=== "
+    "ile başlar ve ===CHAPTER_END=== ile biter. Her bölümü ayrı ayrı çevir ve yanıtı YALNIZCA şu JSON "
+    "biçiminde ver: {\"chapters\": [{\"id\": \"<bölüm id>\", \"translation\": \"<çeviri>\"}]}. "
+    "Kimlikleri değiştirme, bölüm atlama.]\n\n"
+)
+
+_CODE_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+def format_chapters_with_ids(items: list[tuple[str, str]]) -> str:
+    """[(id, içerik), ...] listesini kimlikli bölüm ayraçlarıyla sarar."""
+    return "\n\n".join(
+        f'===CHAPTER_START id="{item_id}"===\n{content.strip()}\n===CHAPTER_END==='
+        for item_id, content in items
+    )
+
+
+def parse_json_items(response: str) -> dict[str, str]:
+    """
+    Yanıttaki {id, translation} nesnelerini {id: çeviri} olarak döndürür.
+
+    Önce tüm yanıt JSON olarak çözülür; başarısız olursa (kesik / bozuk çıktı) metin içindeki
+    her '{' konumundan raw_decode denenerek tam olarak ayrıştırılabilen nesneler kurtarılır.
+    """
+    if not response:
+        return {}
+    text = _CODE_FENCE.sub("", response.strip())
+
+    try:
+        data = json.loads(text)
+        items = data.get("chapters", []) if isinstance(data, dict) else data
+        return _collect(items if isinstance(items, list) else [])
+    except json.JSONDecodeError:
+        pass
+
+    decoder = json.JSONDecoder()
+    salvaged = []
+    pos = text.find("{")
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find("{", pos + 1)
+            continue
+        if isinstance(obj, dict) and "id" in obj and "translation" in obj:
+            salvaged.append(obj)
+            pos = text.find("{", end)
+        else:
+            pos = text.find("{", pos + 1)
+    return _collect(salvaged)
+
+
+def _collect(items: list) -> dict[str, str]:
+    result = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id = str(item.get("id", "")).strip()
+        translation = item.get("translation")
+        if item_id and isinstance(translation, str) and translation.strip():
+            result[item_id] = translation.strip()
+    return result
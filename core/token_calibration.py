@@ -0,0 +1,395 @@
+"""
+TokenCalibration — Gözlenen API kullanımından model / yazı sistemi bazlı token katsayıları öğrenir.
+
+estimate_tokens sabit oranlar kullanıyordu (CJK karakter başına 1.4 token, geri kalanda 4 karakter
+1 token).  Bu oranlar Türkçe çıktıda, Korecede ve Gemini tokenizer'ında belirgin biçimde sapar;
+sapma batch planlamasını, parçalama bütçesini ve ML terminoloji parça boyutunu bozar.
+
+Her başarılı API çağrısından sonra LLMProvider iki örnek bildirir:
+  girdi: (prefix + prompt metninin yazı sistemi sayımları, usage.input_tokens)
+  çıktı: (yanıt metninin yazı sistemi sayımları, usage.output_tokens)
+Model başına doğrusal model
+
+    token ≈ Σ katsayı[yazı sistemi] × karakter[yazı sistemi] + istek ek yükü
+
+yeter istatistikler (XᵀX, Xᵀy) üzerinden, sabit oranlara doğru çekilen (ridge) negatif olmayan
+en küçük kareler ile çözülür.  Az örnekli yazı sistemlerinin katsayısı sabit orana yakın kalır.
+Ek yük terimleri (sohbet şablonu, şema, rol etiketleri) yalnızca regresyonu düzeltmek içindir;
+metin tahminine eklenmez.  Modeli bilinmeyen tahminler tüm modellerin ortak ("*") katsayılarını kullanır.
+
+Katsayılar, yeter istatistikler ve son örnekler AppConfigs/token_calibration.json'a yazılır.
+error_report() son örnekler üzerinde sabit oranlı ve kalibre tahminin hatasını karşılaştırır
+(python -m core calibrate-tokens).  Kalibre hata, katsayıların uydurulduğu örneklerde değil, k-katlı
+çapraz doğrulamayla (örnek, katsayılar çözülürken dışarıda bırakılarak) ölçülür.
+
+Kullanım:
+    calibrator = get_calibrator()
+    calibrator.observe("gemini-2.5-flash", prompt_text, usage.input_tokens, kind="input", prefix=prefix)
+    calibrator.estimate(text, "gemini-2.5-flash")
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from logger import app_logger
+from core.script_classifier import SCRIPTS, script_counts
+
+CALIBRATION_FILE = os.path.join(os.getcwd(), "AppConfigs", "token_calibration.json")
+
+OVERHEADS = ("input_overhead", "output_overhead")
+FEATURES = SCRIPTS + OVERHEADS
+
+# Kalibrasyon öncesi sabit oranlar (eski estimate_tokens ile aynı sonucu verir)
+DEFAULT_RATIOS = {
+    "latin": 0.25, "cyrillic": 0.25, "hangul": 1.4, "han": 1.4, "kana": 1.4,
+    "digit": 0.25, "space": 0.25, "punct": 0.25, "other": 0.25,
+}
+_PRIOR = [DEFAULT_RATIOS[s] for s in SCRIPTS] + [0.0] * len(OVERHEADS)
+# Ridge ağırlığı: her yazı sistemi için sabit oranda PRIOR_CHARS karakter görülmüş sayılır
+PRIOR_CHARS = 2000.0
+PRIOR_REQUESTS = 1.0
+_RIDGE = [PRIOR_CHARS] * len(SCRIPTS) + [PRIOR_REQUESTS] * len(OVERHEADS)
+
+MIN_SAMPLES = 20        # bu kadar örnekten önce sabit oranlar kullanılır
+MAX_SAMPLES = 500       # hata raporu için model başına saklanan son örnek
+CV_FOLDS = 5            # hata raporundaki çapraz doğrulama kat sayısı
+SAVE_INTERVAL = 60      # sn
+ALL_MODELS = "*"
+# Hata raporunda örnekler en çok harfi olan yazı sistemine göre gruplanır
+_LETTER_SCRIPTS = [(s, SCRIPTS.index(s)) for s in ("latin", "cyrillic", "hangul", "han", "kana")]
+
+
+def fixed_estimate(counts: list[int]) -> float:
+    """Sabit oranlı (kalibrasyonsuz) tahmin."""
+    return sum(c * r for c, r in zip(counts, _PRIOR))
+
+
+def _solve(a: list[list[float]], b: list[float]) -> list[float] | None:
+    """Kısmi pivotlu Gauss eliminasyonu; köşegenle ölçeklenerek (Jacobi) koşullanma iyileştirilir."""
+    n = len(b)
+    scale = [(a[i][i] ** 0.5) or 1.0 for i in range(n)]
+    m = [[a[i][j] / (scale[i] * scale[j]) for j in range(n)] + [b[i] / scale[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-12:
+            return None
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(col + 1, n):
+            factor = m[r][col] / m[col][col]
+            if factor:
+                for c in range(col, n + 1):
+                    m[r][c] -= factor * m[col][c]
+    z = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        z[r] = (m[r][n] - sum(m[r][c] * z[c] for c in range(r + 1, n))) / m[r][r]
+    return [z[i] / scale[i] for i in range(n)]
+
+
+def _solve_nonnegative(a: list[list[float]], b: list[float]) -> list[float] | None:
+    """
+    Negatif olmayan çözüm (basit aktif küme): negatif çıkan katsayılar sıfıra sabitlenip
+    kalanlarla yeniden çözülür.
+    """
+    free = list(range(len(b)))
+    coef = [0.0] * len(b)
+    while free:
+        sub = _solve([[a[i][j] for j in free] for i in free], [b[i] for i in free])
+        if sub is None:
+            return None
+        negative = {free[k] for k, value in enumerate(sub) if value < 0}
+        if not negative:
+            for k, i in enumerate(free):
+                coef[i] = sub[k]
+            break
+        free = [i for i in free if i not in negative]
+    return coef
+
+
+class _ModelStats:
+    """Bir modelin yeter istatistikleri, katsayıları ve son örnekleri."""
+
+    __slots__ = ("n", "xtx", "xty", "coef", "samples")
+
+    def __init__(self):
+        k = len(FEATURES)
+        self.n = 0
+        self.xtx = [[0.0] * k for _ in range(k)]
+        self.xty = [0.0] * k
+        self.coef: list[float] | None = None
+        self.samples: deque = deque(maxlen=MAX_SAMPLES)   # (özellikler, gerçek token)
+
+    def add(self, x: list[int], y: int):
+        for i, xi in enumerate(x):
+            if not xi:
+                continue
+            row = self.xtx[i]
+            for j, xj in enumerate(x):
+                if xj:
+                    row[j] += xi * xj
+            self.xty[i] += xi * y
+        self.n += 1
+        self.samples.append((x, y))
+
+    def fit(self):
+        coef = self._solve([row[:] for row in self.xtx], self.xty[:])
+        if coef is not None:
+            self.coef = coef
+
+    @staticmethod
+    def _solve(a: list[list[float]], b: list[float]) -> list[float] | None:
+        for i, weight in enumerate(_RIDGE):
+            a[i][i] += weight
+            b[i] += weight * _PRIOR[i]
+        return _solve_nonnegative(a, b)
+
+    def held_out_estimates(self, folds: int = CV_FOLDS) -> list[float | None]:
+        """
+        Son örneklerin k-katlı çapraz doğrulama tahminleri: her katın örnekleri yeter istatistiklerden
+        çıkarılır, katsayılar kalan gözlemlerle çözülür ve dışarıda bırakılan örnekler tahmin edilir.
+        Kalan gözlem sayısı MIN_SAMPLES'ın altındaysa (kalibrasyon etkin olmazdı) tahmin None'dır.
+        """
+        samples = list(self.samples)
+        estimates: list[float | None] = [None] * len(samples)
+        for fold in range(min(folds, len(samples))):
+            held = range(fold, len(samples), folds)
+            if self.n - len(held) < MIN_SAMPLES:
+                continue
+            a = [row[:] for row in self.xtx]
+            b = self.xty[:]
+            for idx in held:
+                x, y = samples[idx]
+                for i, xi in enumerate(x):
+                    if not xi:
+                        continue
+                    row = a[i]
+                    for j, xj in enumerate(x):
+                        if xj:
+                            row[j] -= xi * xj
+                    b[i] -= xi * y
+            coef = self._solve(a, b)
+            if coef is None:
+                continue
+            for idx in held:
+                estimates[idx] = sum(v * k for v, k in zip(samples[idx][0], coef))
+        return estimates
+
+    def active_coef(self) -> list[float] | None:
+        return self.coef if self.coef is not None and self.n >= MIN_SAMPLES else None
+
+    def to_dict(self) -> dict:
+        return {
+            "n": self.n,
+            "xtx": self.xtx,
+            "xty": self.xty,
+            "coefficients": dict(zip(FEATURES, self.coef)) if self.coef is not None else None,
+            "samples": [list(x) + [y] for x, y in self.samples],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "_ModelStats":
+        stats = cls()
+        k = len(FEATURES)
+        xtx = data.get("xtx") or []
+        if len(xtx) == k and all(len(row) == k for row in xtx) and len(data.get("xty") or []) == k:
+            stats.n = int(data.get("n", 0))
+            stats.xtx = [[float(v) for v in row] for row in xtx]
+            stats.xty = [float(v) for v in data["xty"]]
+            for sample in data.get("samples") or []:
+                if len(sample) == k + 1:
+                    stats.samples.append(([int(v) for v in sample[:k]], int(sample[k])))
+            stats.fit()
+        return stats
+
+
+def _errors(pairs: list[tuple[float, int]]) -> dict:
+    """(tahmin, gerçek) çiftleri → ortalama mutlak yüzde hata ve toplam sapma (%)."""
+    pairs = [(est, act) for est, act in pairs if act > 0]
+    if not pairs:
+        return {"mape": None, "bias": None}
+    mape = sum(abs(est - act) / act for est, act in pairs) / len(pairs)
+    bias = (sum(est for est, _ in pairs) - sum(act for _, act in pairs)) / sum(act for _, act in pairs)
+    return {"mape": round(mape * 100, 2), "bias": round(bias * 100, 2)}
+
+
+class TokenCalibrator:
+    """Thread-safe model bazlı token kalibrasyonu."""
+
+    def __init__(self, path: str = CALIBRATION_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._models: dict[str, _ModelStats] = {}
+        self._coef: dict[str, list[float]] = {}          # yalnızca etkin (yeterli örnekli) katsayılar
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._load()
+
+    # ──────── Tahmin ────────
+
+    def coefficients(self, model: str | None = None) -> list[float] | None:
+        """Modelin (yoksa ortak) etkin katsayıları; kalibrasyon yoksa None."""
+        return (model and self._coef.get(model)) or self._coef.get(ALL_MODELS)
+
+    def estimate(self, text: str, model: str | None = None) -> float:
+        """Metnin tahmini token sayısı (ek yük terimleri hariç)."""
+        if not text:
+            return 0.0
+        counts = script_counts(text)
+        coef = self.coefficients(model)
+        if coef is None:
+            return fixed_estimate(counts)
+        return sum(c * k for c, k in zip(counts, coef))
+
+    # ──────── Gözlem ────────
+
+    def observe(self, model: str, text: str, actual_tokens: int, kind: str = "input", prefix: str = None):
+        """
+        Bir API çağrısının metnini ve sağlayıcının bildirdiği gerçek token sayısını örnek olarak ekler.
+        kind: "input" (prefix + prompt) veya "output" (yanıt metni).
+        """
+        if not model or not actual_tokens or actual_tokens <= 0 or not (text or prefix):
+            return
+        # Ön ek istekler arasında değişmez; sayımı sınıflandırıcının önbelleğinden gelir
+        counts = script_counts(text)
+        if prefix:
+            counts = [a + b for a, b in zip(counts, script_counts(prefix))]
+        x = list(counts) + [1 if kind == "input" else 0, 0 if kind == "input" else 1]
+        with self._lock:
+            for name in (model, ALL_MODELS):
+                stats = self._models.setdefault(name, _ModelStats())
+                stats.add(x, int(actual_tokens))
+                stats.fit()
+                coef = stats.active_coef()
+                if coef is not None:
+                    self._coef[name] = coef
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= SAVE_INTERVAL
+        if due:
+            self.save()
+
+    # ──────── Rapor ────────
+
+    def error_report(self, model: str | None = None) -> list[dict]:
+        """
+        Model başına son örnekler üzerinde sabit oranlı (before) ve kalibre (after) tahminin
+        ortalama mutlak yüzde hatası (mape) ve toplam sapması (bias, + fazla tahmin).
+
+        "after" dışarıda bırakılan örneklerde ölçülür (CV_FOLDS katlı çapraz doğrulama); yeterli
+        eğitim gözlemi olmayan katlarda sabit oran kullanılır.  Katsayıların uydurulduğu örnekler
+        üzerindeki (iyimser) hata "after_in_sample" olarak ayrıca verilir.
+        Örnekler baskın yazı sistemine göre de ayrıca raporlanır.
+        """
+        with self._lock:
+            items = [(name, stats.n, stats.active_coef(), list(stats.samples), stats.held_out_estimates())
+                     for name, stats in self._models.items() if model is None or name in (model, ALL_MODELS)]
+        report = []
+        for name, n, coef, samples, held_out in sorted(items, key=lambda item: item[0]):
+            before, after, in_sample, by_script = [], [], [], {}
+            for (x, actual), validated in zip(samples, held_out):
+                fixed = fixed_estimate(x)
+                fitted = sum(v * k for v, k in zip(x, coef)) if coef is not None else fixed
+                validated = validated if validated is not None else fixed
+                before.append((fixed, actual))
+                after.append((validated, actual))
+                in_sample.append((fitted, actual))
+                dominant = max(_LETTER_SCRIPTS, key=lambda item: x[item[1]])[0]
+                group = by_script.setdefault(dominant, ([], []))
+                group[0].append((fixed, actual))
+                group[1].append((validated, actual))
+            report.append({
+                "model": name,
+                "observations": n,
+                "samples": len(samples),
+                "calibrated": coef is not None,
+                "coefficients": {f: round(v, 4) for f, v in zip(FEATURES, coef)} if coef is not None else None,
+                "before": _errors(before),
+                "after": _errors(after),
+                "after_in_sample": _errors(in_sample),
+                "evaluation": f"{CV_FOLDS}-fold",
+                "by_script": {
+                    script: {"samples": len(b), "before": _errors(b), "after": _errors(a)}
+                    for script, (b, a) in sorted(by_script.items())
+                },
+            })
+        return report
+
+    def reset(self, model: str | None = None):
+        """Modelin (None ise tümünün) kalibrasyonunu siler."""
+        with self._lock:
+            if model is None:
+                self._models.clear()
+                self._coef.clear()
+            else:
+                self._models.pop(model, None)
+                self._coef.pop(model, None)
+            self._dirty = True
+        self.save()
+
+    # ──────── Kalıcılık ────────
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if list(data.get("features") or []) != list(FEATURES):
+                app_logger.warning("Token kalibrasyon dosyası farklı özellik setiyle yazılmış; yok sayılıyor.")
+                return
+            for name, entry in (data.get("models") or {}).items():
+                stats = _ModelStats.from_dict(entry)
+                self._models[name] = stats
+                coef = stats.active_coef()
+                if coef is not None:
+                    self._coef[name] = coef
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            app_logger.warning(f"Token kalibrasyon dosyası okunamadı: {e}")
+
+    def save(self):
+        """Değişiklik varsa dosyaya atomik olarak yazar."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "features": list(FEATURES),
+                "models": {name: stats.to_dict() for name, stats in self._models.items()},
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            app_logger.warning(f"Token kalibrasyonu kaydedilemedi: {e}")
+
+
+_calibrator: TokenCalibrator | None = None
+_calibrator_lock = threading.Lock()
+
+
+def get_calibrator() -> TokenCalibrator:
+    """Süreç genelinde paylaşılan kalibrasyon (ilk çağrıda dosyadan yüklenir)."""
+    global _calibrator
+    if _calibrator is None:
+        with _calibrator_lock:
+            if _calibrator is None:
+                _calibrator = TokenCalibrator()
+                atexit.register(_calibrator.save)
+    return _calibrator
+
+
+def observe_usage(model: str, prompt: str, prefix: str | None, output: str,
+                  input_tokens: int, output_tokens: int):
+    """LLMProvider için kısa yol: bir çağrının girdi ve çıktı örneklerini ekler; hata çeviriyi durdurmaz."""
+    try:
+        calibrator = get_calibrator()
+        calibrator.observe(model, prompt, input_tokens, kind="input", prefix=prefix)
+        calibrator.observe(model, output, output_tokens, kind="output")
+    except Exception as e:
+        app_logger.warning(f"Token kalibrasyon örneği eklenemedi: {type(e).__name__}: {e}")
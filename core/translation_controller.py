@@ -10,12 +10,16 @@ Sorumluluklar:
 import os
 import sys
 import configparser
-from PyQt6.QtCore import QThread, QTimer
+from PyQt6.QtCore import Qt, QThread, QTimer
 from PyQt6.QtWidgets import QMessageBox
 
-from core.workers.translation_worker import TranslationWorker
+from core.workers.translation_worker import TranslationWorker, worker_kwargs_from_config
+from ui.signal_aggregator import SignalAggregator
 from logger import app_logger
 
+# Okuma konumu bölüm açıldıkça bellekte tutulur; config.ini'ye son değişiklikten bu kadar sonra yazılır
+READING_POSITION_SAVE_DELAY_MS = 3000
+
 
 class TranslationController:
     """Çeviri işlemlerini yönetir."""
@@ -24,7 +28,14 @@ class TranslationController:
         self.win = main_window
         self.thread = None
         self.worker = None
+        self._aggregator = None
         self._has_error = False
+        self._reading_positions = {}            # proje yolu → son okuma konumu (bellekte)
+        self._pending_reading_position = None   # (proje yolu, dosya adı) — henüz diske yazılmadı
+        self._reading_position_timer = QTimer(main_window)
+        self._reading_position_timer.setSingleShot(True)
+        self._reading_position_timer.setInterval(READING_POSITION_SAVE_DELAY_MS)
+        self._reading_position_timer.timeout.connect(self.save_reading_position)
 
     # ─── Güvenli QThread Geçerlilik Kontrolü ───────────────────────────────
     def _is_thread_alive(self):
@@ -41,10 +52,18 @@ class TranslationController:
 
     def _cleanup(self):
         """Thread ve Worker referanslarını güvenle serbest bırakır."""
+        self._release_aggregator()
         self.thread = None
         self.worker = None
         self._has_error = False
 
+    def _release_aggregator(self):
+        """Bekleyen ilerleme/istek sayılarını iletir ve sinyal biriktiriciyi siler."""
+        if self._aggregator is not None:
+            self._aggregator.stop()
+            self._aggregator.deleteLater()
+            self._aggregator = None
+
     # ─── Başlatma ──────────────────────────────────────────────────────────
     def start(self):
         """Çeviri işlemini başlatır veya duraklatma/devam işlemini yönetir."""
@@ -64,6 +83,8 @@ class TranslationController:
         project_name = current_item.text()
         project_path = os.path.join(os.getcwd(), project_name)
         config_path = os.path.join(project_path, 'config', 'config.ini')
+        # Bekleyen okuma konumu config okunmadan önce yazılır (worker güncel konumla başlar)
+        self.save_reading_position()
         if not os.path.exists(config_path):
             QMessageBox.critical(self.win, "Hata", f"'{project_name}' projesi için config.ini bulunamadı. API anahtarı okunamıyor.")
             return
@@ -102,23 +123,12 @@ class TranslationController:
         if self.win.limit_checkbox.isChecked():
             file_limit = self.win.limit_spinbox.value()
 
-        max_retries = self.win.config.getint('ProjectInfo', 'max_retries', fallback=3)
-        cache_enabled = self.win.config.getboolean('Features', 'cache_enabled', fallback=True)
-        terminology_enabled = self.win.config.getboolean('Features', 'terminology_enabled', fallback=True)
-        async_enabled = self.win.config.getboolean('Features', 'async_enabled', fallback=False)
-        async_threads = self.win.config.getint('Features', 'async_threads', fallback=3)
-        batch_enabled = self.win.config.getboolean('Batch', 'batch_enabled', fallback=False)
-        max_batch_chars = self.win.config.getint('Batch', 'max_batch_chars', fallback=33000)
-        max_chapters_per_batch = self.win.config.getint('Batch', 'max_chapters_per_batch', fallback=5)
-
         self.thread = QThread()
         self.worker = TranslationWorker(
             input_folder, output_folder, api_key, startpromt, model_version,
-            file_limit=file_limit, max_retries=max_retries, project_path=project_path,
-            cache_enabled=cache_enabled, terminology_enabled=terminology_enabled,
-            endpoint_id=mcp_endpoint_id, async_enabled=async_enabled, async_threads=async_threads,
-            batch_enabled=batch_enabled, max_batch_chars=max_batch_chars,
-            max_chapters_per_batch=max_chapters_per_batch,
+            file_limit=file_limit, project_path=project_path,
+            priority_files=self._checked_file_names(),
+            **worker_kwargs_from_config(self.win.config),
         )
 
         self.worker.shutdown_on_finish = self.win.shutdown_checkbox.isChecked()
@@ -129,12 +139,18 @@ class TranslationController:
         # referanslar thread.finished sinyali ile güvenle temizleniyor.
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.thread.quit)
+        # İlerleme ve istek sayaçları saniyede 10 kez toplu iletilir (her istekte UI güncellenmez)
+        self._aggregator = SignalAggregator(fps=10, parent=self.win)
+        self._aggregator.progress.connect(self._on_progress)
+        self._aggregator.requests.connect(self._on_requests_made)
+        self._aggregator.attach(self.worker)
+        self.worker.finished.connect(self._aggregator.stop)
         self.worker.finished.connect(self._on_finished)
         self.worker.error.connect(self._on_error)
-        self.worker.progress.connect(self._on_progress)
-        self.worker.request_made.connect(self._on_request_made)
         # Thread GERÇEKTEN durduğunda referansları temizle
         self.thread.finished.connect(self._on_thread_done)
+        # Çeviri sırasında işaretlenen bölümler öne alınır
+        self.win.file_table.itemChanged.connect(self._on_table_item_changed)
 
         self.thread.start()
 
@@ -187,16 +203,79 @@ class TranslationController:
             self.win.translateButton.setStyleSheet("background-color: #4CAF50; color: white; border-radius: 5px; padding: 10px;")
             self.win.statusLabel.setText("Durum: Çeviri duraklatıldı.")
 
+    # ─── Öncelik (seçili bölümler / okuma konumu) ─────────────────────────
+    def _checked_file_names(self):
+        """Dosya tablosunda işaretli satırların orijinal dosya adları."""
+        names = []
+        for row in range(self.win.file_table.rowCount()):
+            checkbox_item = self.win.file_table.item(row, 0)
+            name_item = self.win.file_table.item(row, 1)
+            if checkbox_item and name_item and checkbox_item.checkState() == Qt.CheckState.Checked:
+                names.append(name_item.text())
+        return names
+
+    def _on_table_item_changed(self, item):
+        if item.column() == 0 and self.worker:
+            self.worker.set_priority_files(self._checked_file_names())
+
+    def update_reading_position(self, file_name):
+        """
+        Okuma konumunu bellekte günceller; çeviri sürüyorsa önden çeviri penceresi bu bölüme kaydırılır.
+        Konum değiştiyse proje config'ine gecikmeli (son açılıştan READING_POSITION_SAVE_DELAY_MS sonra)
+        tek seferde yazılır; her bölüm açılışında config.ini yeniden yazılmaz.
+        """
+        project_path = self.win.current_project_path
+        if project_path:
+            if self._reading_positions.get(project_path) == file_name:
+                return
+            pending = self._pending_reading_position
+            if pending and pending[0] != project_path:
+                self.save_reading_position()
+            self._reading_positions[project_path] = file_name
+            self._pending_reading_position = (project_path, file_name)
+            self._reading_position_timer.start()
+            # Bellekteki config sonradan diske yazılırsa konum kaybolmasın
+            if self.win.config.has_section('ProjectInfo'):
+                self.win.config.set('ProjectInfo', 'reading_position', file_name)
+        if self.worker:
+            self.worker.set_reading_position(file_name)
+            app_logger.info(f"Okuma konumu güncellendi: {file_name} (önden çeviri penceresi kaydırıldı)")
+
+    def save_reading_position(self):
+        """Bekleyen okuma konumunu proje config'ine yazar (zamanlayıcı, çeviri başlangıcı, proje değişimi, kapanış)."""
+        self._reading_position_timer.stop()
+        pending, self._pending_reading_position = self._pending_reading_position, None
+        if not pending:
+            return
+        project_path, file_name = pending
+        config_path = os.path.join(project_path, 'config', 'config.ini')
+        config = configparser.ConfigParser()
+        try:
+            config.read(config_path, encoding='utf-8')
+            if not config.has_section('ProjectInfo'):
+                config.add_section('ProjectInfo')
+            config.set('ProjectInfo', 'reading_position', file_name)
+            with open(config_path, 'w', encoding='utf-8') as f:
+                config.write(f)
+        except (configparser.Error, OSError) as e:
+            app_logger.warning(f"Okuma konumu kaydedilemedi: {e}")
+
     # ─── Signal Handler'lar ────────────────────────────────────────────────
     def _on_progress(self, current, total):
         self.win.progressBar.setValue(current)
         self.win.progressBar.setMaximum(total)
         self.win.statusLabel.setText(f"Durum: Çevriliyor... Dosya {current}/{total}")
 
-    def _on_request_made(self):
-        self.win.request_counter_manager.increment(self.win._current_model, self.win._current_api_name)
+    def _on_requests_made(self, count):
+        self.win.request_counter_manager.increment(self.win._current_model, self.win._current_api_name, count)
+        self._sync_token_usage()
         self.win.update_status_bar()
 
+    def _sync_token_usage(self):
+        """Durum çubuğundaki token sayısı: sağlayıcının bildirdiği gerçek kullanım (girdi + çıktı + düşünme)."""
+        if self.worker is not None:
+            self.win._api_token_count = int(self.worker.token_usage.total_tokens)
+
     def _restore_ui(self):
         """Çeviri bittikten sonra UI butonlarını sıfırlar."""
         self.win.startButton.setEnabled(True)
@@ -214,6 +293,11 @@ class TranslationController:
     def _on_thread_done(self):
         """QThread kapandığında (finished sinyali) referansları güvenle temizler."""
         app_logger.info("TranslationController: QThread kapandı, referanslar temizleniyor.")
+        try:
+            self.win.file_table.itemChanged.disconnect(self._on_table_item_changed)
+        except (TypeError, RuntimeError):
+            pass
+        self._release_aggregator()
         self.thread = None
         self.worker = None
         self._has_error = False
@@ -229,6 +313,7 @@ class TranslationController:
             return
 
         translated_count = self.win.progressBar.value()
+        self._sync_token_usage()
         self._restore_ui()
         self.win.statusLabel.setText("Durum: Hazır")
         self.win.sync_database_if_exists()
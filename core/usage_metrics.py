@@ -0,0 +1,513 @@
+"""
+UsageMetrics — Endpoint / API anahtarı bazında dakika çözünürlüklü istek metrikleri.
+
+RPM/TPM ayarı için her istek (endpoint, anahtar) çifti ve dakika kovası altında toplanır:
+istek sayısı, hata sayısı, girdi/çıktı (düşünme dahil) token'ları, gecikme histogramı
+(p50/p95/p99 buradan hesaplanır) ve hata kodları.  Kayıtlar bellekte biriktirilir, arka plan thread'i tarafından
+FLUSH_INTERVAL saniyede bir AppConfigs/usage_metrics.db'ye (SQLite, WAL) yalnızca eklenir.
+
+Toplama (rollup) ve saklama:
+  metrics_minute ──(tamamlanan saatler)──► metrics_hour ──(tamamlanan günler)──► metrics_day
+Her seviyenin ne kadarının üst seviyeye aktarıldığı rollup_state tablosunda tutulur (watermark).
+Aktarılmış dakika satırları MINUTE_RETENTION, saat satırları HOUR_RETENTION sonra silinir.
+Sorgular bir seviyenin tablosunu watermark'a kadar, sonrasını alt seviyeden yeniden
+kovalayarak okur; böylece diyalog tüm geçmişi değil yalnızca istenen aralığın özetini okur.
+
+Aynı veritabanına birden fazla süreç (arayüz, CLI, iş sunucusu) yazabilir: aynı dakika için
+birden fazla satır olabilir, okuma ve toplama sırasında birleştirilir.
+
+Kullanım:
+    store = get_metrics_store()
+    store.record("default_gemini", key_label(api_key), latency=1.8, input_tokens=1200, output_tokens=2400)
+    rows = store.query("hour", since=time.time() - 48 * 3600)
+"""
+
+import atexit
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from logger import app_logger
+
+
+METRICS_DB_FILE = os.path.join(os.getcwd(), "AppConfigs", "usage_metrics.db")
+
+RESOLUTIONS = ("minute", "hour", "day")
+
+# Saklama süreleri (saniye).  Yalnızca üst seviyeye aktarılmış satırlar silinir.
+MINUTE_RETENTION = 2 * 86400
+HOUR_RETENTION = 60 * 86400
+DAY_RETENTION = 2 * 365 * 86400
+
+# Başka süreçlerin geç yazdığı dakikaların kaçırılmaması için saat, bittikten bu kadar sonra toplanır
+ROLLUP_LAG = 300
+ROLLUP_INTERVAL = 60
+
+# Gecikme histogramı kova üst sınırları (saniye); son kova bunun üstündeki tüm değerler
+LATENCY_BOUNDS = (0.25, 0.5, 0.75, 1, 1.5, 2, 3, 4, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+
+_STATUS_RE = re.compile(r"\b([45]\d\d)\b")
+
+
+def key_label(api_key: str | None) -> str:
+    """Anahtarın saklanabilir kısa etiketi (yalnızca son 4 karakter)."""
+    if not api_key:
+        return ""
+    return "…" + api_key[-4:]
+
+
+def error_code(exc: BaseException) -> str:
+    """İstisnadan HTTP durum kodu (429, 503 …) veya hata tipi adı çıkarır."""
+    for attr in ("code", "status_code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return str(value)
+    text = str(exc)
+    match = _STATUS_RE.search(text)
+    if match:
+        return match.group(1)
+    if "ResourceExhausted" in text or "RESOURCE_EXHAUSTED" in text:
+        return "429"
+    return type(exc).__name__
+
+
+def bucket_start(ts: float, resolution: str) -> int:
+    """Zaman damgasının ait olduğu kovanın başlangıcı (gün kovaları yerel gece yarısı)."""
+    if resolution == "minute":
+        return int(ts // 60 * 60)
+    if resolution == "hour":
+        return int(ts // 3600 * 3600)
+    day = datetime.datetime.fromtimestamp(ts).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int(day.timestamp())
+
+
+def _latency_index(latency: float) -> int:
+    for i, bound in enumerate(LATENCY_BOUNDS):
+        if latency <= bound:
+            return i
+    return len(LATENCY_BOUNDS)
+
+
+class MetricBucket:
+    """Tek bir (kova, endpoint, anahtar) için birleştirilebilir sayaçlar."""
+
+    __slots__ = ("requests", "errors", "input_tokens", "output_tokens",
+                 "latency_sum", "latency_max", "hist", "codes")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.hist: dict[int, int] = {}
+        self.codes: dict[str, int] = {}
+
+    def add(self, latency: float | None, input_tokens: int, output_tokens: int, code: str | None):
+        self.requests += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        if latency is not None:
+            self.latency_sum += latency
+            self.latency_max = max(self.latency_max, latency)
+            idx = _latency_index(latency)
+            self.hist[idx] = self.hist.get(idx, 0) + 1
+        if code:
+            self.errors += 1
+            self.codes[code] = self.codes.get(code, 0) + 1
+
+    def merge(self, other: "MetricBucket"):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_sum += other.latency_sum
+        self.latency_max = max(self.latency_max, other.latency_max)
+        for idx, count in other.hist.items():
+            self.hist[idx] = self.hist.get(idx, 0) + count
+        for code, count in other.codes.items():
+            self.codes[code] = self.codes.get(code, 0) + count
+
+    def percentile(self, q: float) -> float | None:
+        """Histogramdan q yüzdelik gecikme (kova üst sınırı, en fazla gözlenen en yüksek değer)."""
+        total = sum(self.hist.values())
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for idx in sorted(self.hist):
+            seen += self.hist[idx]
+            if seen >= target:
+                bound = LATENCY_BOUNDS[idx] if idx < len(LATENCY_BOUNDS) else self.latency_max
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    # ──────── Satır dönüşümü ────────
+
+    def to_row(self) -> tuple:
+        hist = ",".join(f"{idx}:{count}" for idx, count in sorted(self.hist.items()))
+        codes = json.dumps(self.codes, separators=(",", ":")) if self.codes else ""
+        return (self.requests, self.errors, self.input_tokens, self.output_tokens,
+                self.latency_sum, self.latency_max, hist, codes)
+
+    @classmethod
+    def from_row(cls, row) -> "MetricBucket":
+        bucket = cls()
+        (bucket.requests, bucket.errors, bucket.input_tokens, bucket.output_tokens,
+         bucket.latency_sum, bucket.latency_max, hist, codes) = row
+        if hist:
+            for part in hist.split(","):
+                idx, count = part.split(":")
+                bucket.hist[int(idx)] = int(count)
+        if codes:
+            bucket.codes = json.loads(codes)
+        return bucket
+
+    def to_dict(self) -> dict:
+        latencies = sum(self.hist.values())
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "latency_avg": (self.latency_sum / latencies) if latencies else None,
+            "latency_p50": self.percentile(0.50),
+            "latency_p95": self.percentile(0.95),
+            "latency_p99": self.percentile(0.99),
+            "latency_max": self.latency_max if latencies else None,
+            "error_codes": dict(self.codes),
+        }
+
+
+class TokenUsage:
+    """
+    Sağlayıcının yanıtta bildirdiği gerçek token kullanımı (Gemini usage_metadata / OpenAI usage).
+    Bölüm, çalıştırma ve endpoint/anahtar toplamlarında biriktirilir; çok bölümlü isteklerde
+    add(weight=...) ile bölümlere paylaştırılabilir (ara değerler ondalıklı, to_dict() tam sayı).
+    """
+
+    FIELDS = ("requests", "input_tokens", "output_tokens", "thinking_tokens", "cached_tokens")
+
+    __slots__ = FIELDS
+
+    def __init__(self, requests=0, input_tokens=0, output_tokens=0, thinking_tokens=0, cached_tokens=0):
+        self.requests = requests
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.thinking_tokens = thinking_tokens
+        self.cached_tokens = cached_tokens
+
+    def add(self, other, weight: float = 1.0) -> "TokenUsage":
+        """Başka bir TokenUsage'ı (veya to_dict() sözlüğünü) weight oranında ekler."""
+        get = other.get if isinstance(other, dict) else (lambda f, d=0: getattr(other, f, d))
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + (get(field, 0) or 0) * weight)
+        return self
+
+    @property
+    def total_tokens(self):
+        return self.input_tokens + self.output_tokens + self.thinking_tokens
+
+    def __bool__(self):
+        return bool(self.requests)
+
+    def to_dict(self, ndigits: int | None = None) -> dict:
+        """Tam sayılara yuvarlanmış alanlar; ndigits verilirse paylaştırılmış kesirler o hassasiyette korunur."""
+        if ndigits is None:
+            return {field: int(round(getattr(self, field))) for field in self.FIELDS}
+        return {field: round(getattr(self, field), ndigits) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "TokenUsage":
+        return cls().add(data or {})
+
+    def __repr__(self):
+        return f"TokenUsage({self.to_dict()})"
+
+
+_COLUMNS = "requests, errors, input_tokens, output_tokens, latency_sum, latency_max, latency_hist, error_codes"
+
+
+class UsageMetricsStore:
+    """Thread-safe, tampon bellekli, yalnızca-ekleme dakika metrik deposu."""
+
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, db_path: str = METRICS_DB_FILE, background: bool = True):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()          # veritabanı bağlantısı
+        self._buffer_lock = threading.Lock()   # yazılmayı bekleyen kovalar
+        self._buffer: dict[tuple[int, str, str], MetricBucket] = {}
+        self._last_rollup = 0.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        created = self._create_schema()
+        if created:
+            self._import_legacy_stats()
+
+        self._closed = threading.Event()
+        self._flusher = None
+        if background:
+            self._flusher = threading.Thread(target=self._flush_loop, name="usage-metrics-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _create_schema(self) -> bool:
+        """Tabloları oluşturur.  Veritabanı yeni oluşturulduysa True."""
+        with self._lock:
+            for resolution in RESOLUTIONS:
+                self._conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS metrics_{resolution} (
+                        bucket INTEGER NOT NULL,
+                        endpoint TEXT NOT NULL,
+                        key_id TEXT NOT NULL,
+                        requests INTEGER NOT NULL,
+                        errors INTEGER NOT NULL,
+                        input_tokens INTEGER NOT NULL,
+                        output_tokens INTEGER NOT NULL,
+                        latency_sum REAL NOT NULL,
+                        latency_max REAL NOT NULL,
+                        latency_hist TEXT NOT NULL,
+                        error_codes TEXT NOT NULL
+                    )
+                ''')
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_metrics_{resolution}_bucket ON metrics_{resolution}(bucket)"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollup_state (level TEXT PRIMARY KEY, upto INTEGER NOT NULL)"
+            )
+            # Watermark'lar ilk açılışta bugünün başlangıcına ayarlanır: önceki günler (eski
+            # request_stats.json aktarımı) doğrudan gün tablosundadır.
+            today = bucket_start(time.time(), "day")
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO rollup_state (level, upto) VALUES ('hour', ?), ('day', ?)",
+                (today, today),
+            )
+            return cursor.rowcount > 0
+
+    def _import_legacy_stats(self):
+        """Eski günlük istek sayılarını (request_stats.json) bir kereliğine gün tablosuna aktarır."""
+        legacy_path = os.path.join(os.path.dirname(self.db_path), "request_stats.json")
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            app_logger.warning(f"request_stats.json metrik deposuna aktarılamadı: {e}")
+            return
+        today = bucket_start(time.time(), "day")
+        rows = {"day": [], "minute": []}
+        for day_str, counts in stats.items():
+            try:
+                day = bucket_start(datetime.datetime.strptime(day_str, "%Y-%m-%d").timestamp(), "day")
+            except ValueError:
+                continue
+            for label, count in counts.items():
+                bucket = MetricBucket()
+                bucket.requests = int(count)
+                # Bugünün sayıları henüz toplanmamış dakika tablosuna (gece yarısı kovası) yazılır
+                rows["day" if day < today else "minute"].append((day, label, "") + bucket.to_row())
+        with self._lock:
+            for resolution, values in rows.items():
+                self._conn.executemany(
+                    f"INSERT INTO metrics_{resolution} (bucket, endpoint, key_id, {_COLUMNS}) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values
+                )
+        app_logger.info(f"request_stats.json metrik deposuna aktarıldı ({len(stats)} gün).")
+
+    # ──────── Yazma ────────
+
+    def record(self, endpoint: str, key_id: str = "", latency: float | None = None,
+               input_tokens: int = 0, output_tokens: int = 0, error: str | None = None,
+               ts: float | None = None):
+        """Tek bir isteği tampona ekler (disk yazımı arka planda)."""
+        minute = bucket_start(ts if ts is not None else time.time(), "minute")
+        with self._buffer_lock:
+            bucket = self._buffer.get((minute, endpoint, key_id))
+            if bucket is None:
+                bucket = self._buffer[(minute, endpoint, key_id)] = MetricBucket()
+            bucket.add(latency, int(input_tokens or 0), int(output_tokens or 0), error)
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Tampondaki kovaları dakika tablosuna ekler; gerekirse toplama ve saklama temizliği yapar."""
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, {}
+        if pending:
+            values = [key + bucket.to_row() for key, bucket in pending.items()]
+            with self._lock:
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO metrics_minute (bucket, endpoint, key_id, {_COLUMNS}) "
+                        f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values
+                    )
+                except sqlite3.Error as e:
+                    app_logger.error(f"Kullanım metrikleri yazılamadı ({len(values)} kova): {e}")
+        if time.time() - self._last_rollup >= ROLLUP_INTERVAL:
+            self.rollup()
+
+    # ──────── Toplama / saklama ────────
+
+    def _watermark(self, level: str) -> int:
+        row = self._conn.execute("SELECT upto FROM rollup_state WHERE level = ?", (level,)).fetchone()
+        return row[0] if row else 0
+
+    def _aggregate(self, source: str, target: str, start: int, end: int) -> int:
+        """source tablosunun [start, end) aralığını target çözünürlüğünde toplar ve ekler."""
+        merged: dict[tuple[int, str, str], MetricBucket] = {}
+        for bucket_ts, endpoint, key_id, *values in self._conn.execute(
+            f"SELECT bucket, endpoint, key_id, {_COLUMNS} FROM metrics_{source} WHERE bucket >= ? AND bucket < ?",
+            (start, end),
+        ):
+            key = (bucket_start(bucket_ts, target), endpoint, key_id)
+            bucket = merged.get(key)
+            if bucket is None:
+                merged[key] = MetricBucket.from_row(values)
+            else:
+                bucket.merge(MetricBucket.from_row(values))
+        self._conn.executemany(
+            f"INSERT INTO metrics_{target} (bucket, endpoint, key_id, {_COLUMNS}) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [key + bucket.to_row() for key, bucket in merged.items()],
+        )
+        self._conn.execute("UPDATE rollup_state SET upto = ? WHERE level = ?", (end, target))
+        return len(merged)
+
+    def rollup(self, now: float | None = None):
+        """Tamamlanan saatleri/günleri üst tabloya aktarır ve saklama süresi dolan satırları siler."""
+        now = time.time() if now is None else now
+        self._last_rollup = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    hour_wm = self._watermark("hour")
+                    hour_limit = bucket_start(now - ROLLUP_LAG, "hour")
+                    if hour_limit > hour_wm:
+                        self._aggregate("minute", "hour", hour_wm, hour_limit)
+                        hour_wm = hour_limit
+                    day_wm = self._watermark("day")
+                    day_limit = bucket_start(hour_wm, "day")
+                    if day_limit > day_wm:
+                        self._aggregate("hour", "day", day_wm, day_limit)
+                        day_wm = day_limit
+                    self._conn.execute("DELETE FROM metrics_minute WHERE bucket < ?",
+                                       (min(now - MINUTE_RETENTION, hour_wm),))
+                    self._conn.execute("DELETE FROM metrics_hour WHERE bucket < ?",
+                                       (min(now - HOUR_RETENTION, day_wm),))
+                    self._conn.execute("DELETE FROM metrics_day WHERE bucket < ?", (now - DAY_RETENTION,))
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                app_logger.error(f"Kullanım metrikleri toplanamadı: {e}")
+
+    # ──────── Okuma ────────
+
+    def _collect(self, resolution: str, target: str, since: int, until: int,
+                 endpoint: str | None, into: dict):
+        """[since, until) aralığını resolution tablosundan (watermark sonrası alt seviyeden) target kovalarına toplar."""
+        if since >= until:
+            return
+        level = RESOLUTIONS.index(resolution)
+        covered_until = until
+        if level > 0:
+            covered_until = min(until, max(since, self._watermark(resolution)))
+        if covered_until > since:
+            sql = (f"SELECT bucket, endpoint, key_id, {_COLUMNS} FROM metrics_{resolution} "
+                   f"WHERE bucket >= ? AND bucket < ?")
+            params: list = [since, covered_until]
+            if endpoint:
+                sql += " AND endpoint = ?"
+                params.append(endpoint)
+            for bucket_ts, ep, key_id, *values in self._conn.execute(sql, params):
+                key = (bucket_start(bucket_ts, target) if target else 0, ep, key_id)
+                bucket = into.get(key)
+                if bucket is None:
+                    into[key] = MetricBucket.from_row(values)
+                else:
+                    bucket.merge(MetricBucket.from_row(values))
+        if level > 0 and covered_until < until:
+            self._collect(RESOLUTIONS[level - 1], target, covered_until, until, endpoint, into)
+
+    def query(self, resolution: str, since: float, until: float | None = None,
+              endpoint: str | None = None, by_bucket: bool = True) -> list[dict]:
+        """
+        [since, until) aralığının resolution kovalarındaki metrikleri döndürür.
+        by_bucket=False ise aralık boyunca (endpoint, anahtar) başına tek satır döner.
+        Her satır: bucket, endpoint, key_id + MetricBucket.to_dict() alanları.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Geçersiz çözünürlük: {resolution}")
+        self.flush()
+        until = time.time() + 60 if until is None else until
+        start = bucket_start(since, resolution)
+        merged: dict[tuple[int, str, str], MetricBucket] = {}
+        with self._lock:
+            try:
+                self._collect(resolution, resolution if by_bucket else None, start, int(until), endpoint, merged)
+            except sqlite3.Error as e:
+                app_logger.error(f"Kullanım metrikleri okunamadı: {e}")
+        rows = []
+        for (bucket_ts, ep, key_id), bucket in sorted(merged.items()):
+            row = {"bucket": bucket_ts, "endpoint": ep, "key_id": key_id}
+            row.update(bucket.to_dict())
+            rows.append(row)
+        return rows
+
+    def totals(self, since: float, until: float | None = None) -> dict:
+        """Aralıktaki tüm endpoint'lerin toplamı (istek, hata, token)."""
+        total = {"requests": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0}
+        for row in self.query("day", since, until, by_bucket=False):
+            for field in total:
+                total[field] += row[field]
+        return total
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_store: UsageMetricsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> UsageMetricsStore:
+    """Süreç genelinde paylaşılan metrik deposu (ilk çağrıda açılır)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UsageMetricsStore()
+    return _store
+
+
+def record_request(endpoint: str, api_key: str | None, latency: float | None,
+                   input_tokens: int = 0, output_tokens: int = 0, error: BaseException | None = None):
+    """LLMProvider için kısa yol: isteği paylaşılan depoya yazar; depo açılamazsa sessizce geçer."""
+    try:
+        get_metrics_store().record(
+            endpoint, key_label(api_key), latency, input_tokens, output_tokens,
+            error_code(error) if error is not None else None,
+        )
+    except (OSError, sqlite3.Error) as e:
+        app_logger.warning(f"Kullanım metriği kaydedilemedi: {e}")
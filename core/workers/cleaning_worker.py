@@ -1,12 +1,13 @@
 import os
 import json
-from PyQt6.QtCore import pyqtSignal, QObject
+from core.qt_compat import pyqtSignal, QObject
+from core.cancel_token import CancellableMixin
 from logger import app_logger
 
 # Temizlik fonksiyonunu içe aktarıyoruz
 from core.temizlik import temizle_ve_kaydet 
 
-class CleaningWorker(QObject):
+class CleaningWorker(CancellableMixin, QObject):
     """
     Dosya temizleme işlemini arayüzü dondurmadan arka planda yürüten işçi sınıfı.
     """
@@ -18,7 +19,6 @@ class CleaningWorker(QObject):
         super().__init__()
         self.file_paths = file_paths
         self.cleaning_folder = cleaning_folder # Projenin trslt klasörü, hata logunu kaydetmek için
-        self.is_running = True
         self.total_files = len(file_paths)
         self.processed_files = 0
         self.cleaning_errors = {} # Store errors for persistence
@@ -97,5 +97,5 @@ class CleaningWorker(QObject):
 
     def stop(self):
         """Temizleme döngüsünü durdurur."""
-        self.is_running = False
+        self.cancel_token.stop()
         app_logger.info("Temizleme işçisi durdurma isteği aldı.")
@@ -1,9 +1,10 @@
 import os
-import time
+import threading
 from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
-from PyQt6.QtCore import pyqtSignal, QObject
+from core.qt_compat import pyqtSignal, QObject
+from core.cancel_token import CancellableMixin
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -11,7 +12,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 from logger import app_logger
 import datetime
 
-class DownloadWorker(QObject):
+class DownloadWorker(CancellableMixin, QObject):
     """
     Dosya indirme işlemini arayüzü dondurmadan arka planda yürüten işçi sınıfı.
     """
@@ -26,13 +27,24 @@ class DownloadWorker(QObject):
         super().__init__()
         self.base_url = base_url
         self.download_folder = download_folder
-        self.is_running = True
         self.max_pages = max_pages # İndirilecek maksimum sayfa sayısı
         self.downloaded_pages = 0
         self.js_script_path = js_script_path # JS dosyası yolu (None ise normal indirme)
-        self.selenium_command = None # UI'dan gelecek komut (booktoki, shuba, cancel)
+        self._selenium_command = None # UI'dan gelecek komut (booktoki, shuba, cancel)
+        self._command_received = threading.Event()
         self.selenium_chapter_limit = 120
 
+    @property
+    def selenium_command(self):
+        return self._selenium_command
+
+    @selenium_command.setter
+    def selenium_command(self, command):
+        # Menüden gelen seçim bekleyen Selenium döngüsünü hemen uyandırır
+        self._selenium_command = command
+        if command is not None:
+            self._command_received.set()
+
     def run(self):
         """İndirme işlemini başlatan ana fonksiyon."""
         app_logger.info(f"İndirme işlemi başlatılıyor: {self.base_url}")
@@ -78,8 +90,9 @@ class DownloadWorker(QObject):
             # Kullanıcının menüden bir seçenek seçmesini bekle
             self.status_message.emit("Kullanıcı seçimi bekleniyor (Panelden seçim yapın)...")
             app_logger.info("Kullanıcı etkileşimi bekleniyor...")
-            while self.selenium_command is None and self.is_running:
-                time.sleep(1)
+            remove_wake = self.cancel_token.on_stop(self._command_received.set)
+            self._command_received.wait()
+            remove_wake()
             
             if not self.is_running or self.selenium_command == "cancel":
                 app_logger.warning("İndirme iptal edildi.")
@@ -179,7 +192,9 @@ class DownloadWorker(QObject):
                     app_logger.info(f"Yeni dosya tespit edildi: {downloaded_file}")
                     break
 
-                time.sleep(3)  # Logları kaçırmamak ve CPU yormamak için
+                # Logları kaçırmamak ve CPU yormamak için; durdurmada bekleme hemen biter
+                if not self.cancel_token.sleep(3):
+                    break
                 elapsed_time += 3
 
                 # Simüle ilerleme (60-%98 arasında, yavaş artış)
@@ -240,7 +255,9 @@ class DownloadWorker(QObject):
                     app_logger.info("Maksimum sayfa sayısına ulaşıldı.")
                     break
 
-                time.sleep(1) # Siteye saygılı olmak için bekleme süresi (ayarlanabilir)
+                # Siteye saygılı olmak için bekleme süresi (ayarlanabilir)
+                if not self.cancel_token.sleep(1):
+                    break
                 self.downloaded_pages += 1
                 
                 try:
@@ -295,5 +312,5 @@ class DownloadWorker(QObject):
 
     def stop(self):
         """İndirme döngüsünü durdurur."""
-        self.is_running = False
+        self.cancel_token.stop()
         app_logger.info("İndirme işçisi durdurma isteği aldı.")
@@ -1,10 +1,11 @@
 import os
 import datetime
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 from ebooklib import epub
 from logger import app_logger
 
-class EpubWorker(QObject):
+class EpubWorker(CancellableMixin, QObject):
     """
     Seçili metin dosyalarını EPUB formatına dönüştüren işçi sınıfı.
     """
@@ -17,7 +18,6 @@ class EpubWorker(QObject):
         self.file_paths = file_paths
         self.output_folder = output_folder
         self.project_name = project_name
-        self.is_running = True
 
     def run(self):
         if not self.file_paths:
@@ -91,4 +91,4 @@ class EpubWorker(QObject):
             self.error.emit(f"EPUB oluşturulurken genel hata: {str(e)}")
         
     def stop(self):
-        self.is_running = False
\ No newline at end of file
+        self.cancel_token.stop()
\ No newline at end of file
@@ -3,9 +3,10 @@ import json
 import re
 import datetime
 from PyQt6.QtCore import QThread, pyqtSignal
+from core.cancel_token import CancellableMixin
 from logger import app_logger
 
-class JsonOutputWorker(QThread):
+class JsonOutputWorker(CancellableMixin, QThread):
     finished = pyqtSignal()
     error = pyqtSignal(str)
     progress = pyqtSignal(int, int)
@@ -16,7 +17,6 @@ class JsonOutputWorker(QThread):
         self.selected_files = selected_files
         self.project_path = project_path
         self.project_name = project_name
-        self.is_running = True
 
     def run(self):
         if not self.selected_files:
@@ -96,4 +96,4 @@ class JsonOutputWorker(QThread):
             app_logger.info("JSON oluşturma işlemi tamamlandı.")
 
     def stop(self):
-        self.is_running = False
+        self.cancel_token.stop()
@@ -5,13 +5,14 @@ GPT-2 tokenizer (transformers) veya karakter tabanlı yaklaşık hesap kullanır
 """
 
 import os
-from PyQt6.QtCore import QThread, pyqtSignal
+from core.qt_compat import QThread, pyqtSignal
+from core.cancel_token import CancellableMixin
 
 from core.workers.token_counter import get_local_token_count_approx
 from logger import app_logger
 
 
-class LocalTokenCountWorker(QThread):
+class LocalTokenCountWorker(CancellableMixin, QThread):
     """Seçili dosyaları yerel olarak (API'sız) sayar."""
 
     progress = pyqtSignal(int, int)   # (tamamlanan, toplam)
@@ -32,10 +33,9 @@ class LocalTokenCountWorker(QThread):
         self.selected_files = selected_files
         self.download_folder = download_folder
         self.translated_folder = translated_folder
-        self._stop_flag = False
 
     def stop(self):
-        self._stop_flag = True
+        self.cancel_token.stop()
 
     def run(self):
         try:
@@ -47,7 +47,7 @@ class LocalTokenCountWorker(QThread):
             total = len(files)
 
             for i, file_name in enumerate(files):
-                if self._stop_flag:
+                if not self.is_running:
                     break
 
                 # Dosyanın nerede olduğunu bul
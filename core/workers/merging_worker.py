@@ -1,9 +1,10 @@
 import os
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 import datetime
 from logger import app_logger
 
-class MergingWorker(QObject):
+class MergingWorker(CancellableMixin, QObject):
     finished = pyqtSignal()
     error = pyqtSignal(str)
     progress = pyqtSignal(int, int)
@@ -12,7 +13,6 @@ class MergingWorker(QObject):
         super().__init__()
         self.files_to_merge = files_to_merge
         self.output_folder = output_folder
-        self.is_running = True
 
     def run(self):
         if not self.files_to_merge:
@@ -54,4 +54,4 @@ class MergingWorker(QObject):
             self.finished.emit()
 
     def stop(self):
-        self.is_running = False
+        self.cancel_token.stop()
@@ -2,10 +2,11 @@ import os
 import threading
 import configparser
 from PyQt6.QtCore import QThread, pyqtSignal
+from core.cancel_token import CancellableMixin
 
 _config_save_lock = threading.Lock()
 
-class MLTerminologyWorker(QThread):
+class MLTerminologyWorker(CancellableMixin, QThread):
     """
     MLTerminologyExtractor'ı arka planda çalıştırmak için kullanılan işçi sınıfı.
     
@@ -40,10 +41,9 @@ class MLTerminologyWorker(QThread):
         self.extract_all = extract_all
         self.async_enabled = async_enabled
         self.async_threads = async_threads
-        self._is_running = True
 
     def stop(self):
-        self._is_running = False
+        self.cancel_token.stop()
 
     def _save_last_operation(self, start_ch: int, end_ch: int):
         """Son terminoloji işleminin bölüm numaralarını proje config.ini'sine yazar."""
@@ -167,7 +167,7 @@ class MLTerminologyWorker(QThread):
                 progress_lock = threading.Lock()
 
                 def process_chunk(chunk_start, chunk_end):
-                    if not self._is_running:
+                    if not self.is_running:
                         return None
                     extractor = MLTerminologyExtractor(self.project_path)
                     res = extractor.run(
@@ -185,9 +185,13 @@ class MLTerminologyWorker(QThread):
                     return res
 
                 with concurrent.futures.ThreadPoolExecutor(max_workers=self.async_threads) as executor:
-                    futures = [executor.submit(process_chunk, c_start, c_end) for c_start, c_end in chunks]
+                    # Durdurmada henüz başlamamış aralıklar iptal edilir
+                    futures = [
+                        self.cancel_token.track(executor.submit(process_chunk, c_start, c_end))
+                        for c_start, c_end in chunks
+                    ]
                     for fut in concurrent.futures.as_completed(futures):
-                        if not self._is_running:
+                        if not self.is_running:
                             break
                         try:
                             res = fut.result()
@@ -199,7 +203,7 @@ class MLTerminologyWorker(QThread):
             else:
                 # Sequential mode
                 for c_start, c_end in chunks:
-                    if not self._is_running:
+                    if not self.is_running:
                         break
                     self.progress_update.emit(f"Bölümler {c_start} - {c_end} işleniyor...")
                     extractor = MLTerminologyExtractor(self.project_path)
@@ -215,7 +219,7 @@ class MLTerminologyWorker(QThread):
                     else:
                         self.progress_update.emit(f"Uyarı: {c_start} - {c_end} aralığı işlenemedi.")
 
-            if not self._is_running:
+            if not self.is_running:
                 self.progress_update.emit("Terminoloji çıkarma işlemi kullanıcı tarafından durduruldu.")
                 return
 
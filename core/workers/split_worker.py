@@ -1,8 +1,9 @@
 import os
 import re
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 
-class SplitWorker(QObject):
+class SplitWorker(CancellableMixin, QObject):
     """
     İndirilen toplu bölüm dosyasını "## Bölüm - X ##" başlıklarına göre bölerek ayrı dosyalar oluşturur.
     
@@ -16,7 +17,6 @@ class SplitWorker(QObject):
         super().__init__()
         self.input_file_path = input_file_path
         self.output_folder = output_folder
-        self.is_running = True
 
     def run(self):
         try:
@@ -64,4 +64,4 @@ class SplitWorker(QObject):
             self.finished.emit()
 
     def stop(self):
-        self.is_running = False
+        self.cancel_token.stop()
@@ -1,11 +1,12 @@
 import os
 import copy
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 
 from logger import app_logger
 from core.workers.token_counter import count_tokens_in_file
 
-class TokenCountWorker(QObject):
+class TokenCountWorker(CancellableMixin, QObject):
     finished = pyqtSignal(dict) # Tüm token verilerini döndür
     progress = pyqtSignal(int, int) # Current file index, total files
     error = pyqtSignal(str)
@@ -14,7 +15,6 @@ class TokenCountWorker(QObject):
         super().__init__()
         self.project_path = project_path
         self.api_key = api_key
-        self.is_running = True
         self.current_token_cache = current_token_cache # Mevcut önbellek (dict)
         self.model_version = model_version
         self.selected_files = selected_files
@@ -91,7 +91,10 @@ class TokenCountWorker(QObject):
             
             if should_recount:
                 app_logger.debug(f"'{file_name}' için API çağrısı yapılıyor...")
-                tokens, err = count_tokens_in_file(file_path, self.api_key, self.model_version, endpoint_id=self.endpoint_id)
+                tokens, err = count_tokens_in_file(
+                    file_path, self.api_key, self.model_version, endpoint_id=self.endpoint_id,
+                    cancel_token=self.cancel_token,
+                )
                 if tokens is not None:
                     token_count = tokens
                     app_logger.debug(f"'{file_name}' token sayımı tamamlandı: {tokens}")
@@ -145,4 +148,4 @@ class TokenCountWorker(QObject):
         app_logger.info("finished sinyali yayınlandı.")
     
     def stop(self):
-        self.is_running = False
+        self.cancel_token.stop()
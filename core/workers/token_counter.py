@@ -2,78 +2,48 @@ import os
 import json
 import time
 from logger import app_logger
+from core.token_calibration import get_calibrator
 
 TOKEN_DATA_FILENAME = "token_data.json"
-import re
 
-def estimate_tokens(text):
+
+def estimate_tokens(text, model=None):
     """
     HTTP isteği gerektirmeyen, script-aware token tahmini.
     Asya dilleri (CJK) ve Latin/Kiril karışık metinlerde
     tek-oranlı tahminlerden daha isabetlidir.
+
+    Yazı sistemi katsayıları API kullanımından model bazında öğrenilir (core/token_calibration.py);
+    yeterli örnek yoksa sabit oranlar (CJK karakter başına ~1.4, geri kalanda ~4 karakter = 1 token)
+    kullanılır.  model verilmezse tüm modellerin ortak kalibrasyonu kullanılır.
     """
     if not text:
         return 0
+    return int(round(get_calibrator().estimate(text, model)))
 
-    # CJK (Çince, Japonca Kanji, Korece Hanja) - genelde karakter başına ~1-1.5 token
-    cjk_pattern = re.compile(
-        r'[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff'  # CJK Unified + Ext A + Compatibility
-        r'\u3040-\u309f\u30a0-\u30ff'                  # Hiragana, Katakana
-        r'\uac00-\ud7af]'                              # Hangul Syllables
-    )
-    cjk_chars = cjk_pattern.findall(text)
-    cjk_count = len(cjk_chars)
-
-    # CJK karakterleri çıkarılmış geri kalan metin (Latin, Kiril, rakam, noktalama, boşluk)
-    remaining_text = cjk_pattern.sub('', text)
-
-    # Kelime/whitespace-bazlı parçalar (Latin script için)
-    # Ortalama İngilizce/Türkçe: ~4 karakter = 1 token
-    non_cjk_token_estimate = len(remaining_text) / 4.0
-
-    # CJK: her karakter neredeyse kendi başına bir token'a yakındır,
-    # biraz daha düşük bir katsayı (1.0-1.5 arası) gerçekçi sonuç verir
-    cjk_token_estimate = cjk_count * 1.4
 
-    total = non_cjk_token_estimate + cjk_token_estimate
-    return int(round(total))
-
-def get_local_token_count_approx(text):
+def get_local_token_count_approx(text, model=None):
     """
-    Hızlı ve yerel token hesaplaması (Transformers AutoTokenizer ile).
-    Eğer kütüphane eksikse veya model yüklenmezse kabaca karakter sayısına göre tahmin yapar.
+    Hızlı ve yerel token hesaplaması (API çağrısı yapmaz).
+    estimate_tokens ile aynı kalibre edilmiş yazı sistemi katsayılarını kullanır.
     """
-    if not text:
-        return 0
-
-    # CJK (Çince, Japonca Kanji, Korece Hanja) - genelde karakter başına ~1-1.5 token
-    cjk_pattern = re.compile(
-        r'[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff'  # CJK Unified + Ext A + Compatibility
-        r'\u3040-\u309f\u30a0-\u30ff'                  # Hiragana, Katakana
-        r'\uac00-\ud7af]'                              # Hangul Syllables
-    )
-    cjk_chars = cjk_pattern.findall(text)
-    cjk_count = len(cjk_chars)
-
-    # CJK karakterleri çıkarılmış geri kalan metin (Latin, Kiril, rakam, noktalama, boşluk)
-    remaining_text = cjk_pattern.sub('', text)
+    return estimate_tokens(text, model)
 
-    # Kelime/whitespace-bazlı parçalar (Latin script için)
-    # Ortalama İngilizce/Türkçe: ~4 karakter = 1 token
-    non_cjk_token_estimate = len(remaining_text) / 4.0
 
-    # CJK: her karakter neredeyse kendi başına bir token'a yakındır,
-    # biraz daha düşük bir katsayı (1.0-1.5 arası) gerçekçi sonuç verir
-    cjk_token_estimate = cjk_count * 1.4
+def _pause(seconds, cancel_token=None) -> bool:
+    """İstekler arası bekleme; cancel_token verilirse durdurmada hemen biter (False döner)."""
+    if cancel_token is not None:
+        return cancel_token.sleep(seconds)
+    time.sleep(seconds)
+    return True
 
-    total = non_cjk_token_estimate + cjk_token_estimate
-    return int(round(total))
 
 def count_tokens_in_text(text, api_key=None, model_version="gemini-2.5-flash",
-                         endpoint_id=None, endpoint_config=None):
+                         endpoint_id=None, endpoint_config=None, cancel_token=None):
     """
     Verilen metnin kaç token olduğunu hesaplar.
     MCP entegrasyonu: LLMProvider üzerinden Gemini veya OpenAI-uyumlu servislerle çalışır.
+    cancel_token (core.cancel_token.CancelToken) verilirse istekler arası beklemeler durdurmada kesilir.
     """
     try:
         from core.llm_provider import LLMProvider
@@ -105,7 +75,7 @@ def count_tokens_in_text(text, api_key=None, model_version="gemini-2.5-flash",
             try:
                 app_logger.debug(f"Token sayım isteği (Deneme {attempt+1}/{max_retries})...")
                 token_count = provider.count_tokens(text)
-                time.sleep(1)
+                _pause(1, cancel_token)
                 app_logger.debug(f"Token sayımı başarılı: {token_count}")
                 return token_count, None
             except Exception as inner_e:
@@ -113,7 +83,8 @@ def count_tokens_in_text(text, api_key=None, model_version="gemini-2.5-flash",
                 if ("429" in str(inner_e) or "ResourceExhausted" in str(inner_e)):
                     if attempt < max_retries - 1:
                         app_logger.info("Kota aşıldı, 3 saniye bekleniyor...")
-                        time.sleep(3)
+                        if not _pause(3, cancel_token):
+                            return None, "Token sayımı durduruldu."
                         continue
                     else:
                         return None, "API Kota Sınırı Aşıldı."
@@ -146,7 +117,7 @@ def _legacy_count_tokens(text, api_key, model_version):
 
 
 def count_tokens_in_file(file_path, api_key=None, model_version="gemini-2.5-flash",
-                         endpoint_id=None, endpoint_config=None):
+                         endpoint_id=None, endpoint_config=None, cancel_token=None):
     """
     Belirtilen TXT dosyasındaki metnin kaç token olduğunu hesaplar.
     """
@@ -160,7 +131,8 @@ def count_tokens_in_file(file_path, api_key=None, model_version="gemini-2.5-flas
         return None, f"Dosya okunurken hata: {str(e)}"
 
     return count_tokens_in_text(file_content, api_key, model_version,
-                                endpoint_id=endpoint_id, endpoint_config=endpoint_config)
+                                endpoint_id=endpoint_id, endpoint_config=endpoint_config,
+                                cancel_token=cancel_token)
 
 
 def load_token_data(config_folder_path):
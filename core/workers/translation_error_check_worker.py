@@ -6,15 +6,17 @@ kontrolederek hatalı/çevrilmemiş dosyaları tespit eder.
 
 import os
 import re
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 from logger import app_logger
-from core.workers.translation_quality_checker import TranslationQualityChecker, _CJK_PATTERN
+from core.script_classifier import SCRIPTS, script_counts
+from core.workers.translation_quality_checker import TranslationQualityChecker
 
 HIGH_THRESHOLD = 1000  # 1000 karakterden fazla ise yüksek risk
 LOW_THRESHOLD = 100    # 100 karakterden fazla ise düşük risk
 
 
-class TranslationErrorCheckWorker(QObject):
+class TranslationErrorCheckWorker(CancellableMixin, QObject):
     """
     Çıktı klasöründeki tüm txt dosyalarını kontrol eder.
     CJK karakter oranı, metin benzerliği (>= %80) ve langdetect dil tespiti
@@ -29,14 +31,13 @@ class TranslationErrorCheckWorker(QObject):
         self.folder_path = folder_path
         self.report_folder = report_folder or folder_path
         self.source_lang = source_lang
-        self.is_running = True
         
         # dwnld klasörü (orijinal metinler için)
         parent_dir = os.path.dirname(os.path.abspath(folder_path))
         self.dwnld_folder = os.path.join(parent_dir, 'dwnld')
 
     def stop(self):
-        self.is_running = False
+        self.cancel_token.stop()
 
     def run(self):
         try:
@@ -98,7 +99,10 @@ class TranslationErrorCheckWorker(QObject):
                         continue
 
                     # Detaylı ölçümler
-                    cjk_matches = len(_CJK_PATTERN.findall(content))
+                    counts = script_counts(content)
+                    korean_count = counts[SCRIPTS.index("hangul")]
+                    chinese_count = counts[SCRIPTS.index("han")]
+                    cjk_matches = korean_count + chinese_count
                     cjk_ratio = cjk_matches / total_chars if total_chars > 0 else 0.0
                     
                     similarity_ratio = checker.calculate_similarity(original_content, content) if original_content else 0.0
@@ -134,10 +138,10 @@ class TranslationErrorCheckWorker(QObject):
                         "filepath": filepath,
                         "total_chars": total_chars,
                         "reason": ", ".join(reasons) if reasons else "Belirtilmedi",
-                        "korean_count": cjk_matches,
-                        "chinese_count": cjk_matches,
-                        "korean_ratio": cjk_ratio,
-                        "chinese_ratio": cjk_ratio,
+                        "korean_count": korean_count,
+                        "chinese_count": chinese_count,
+                        "korean_ratio": korean_count / total_chars if total_chars > 0 else 0.0,
+                        "chinese_ratio": chinese_count / total_chars if total_chars > 0 else 0.0,
                         "similarity_ratio": similarity_ratio,
                         "total_asian_count": cjk_matches,
                     }
@@ -13,6 +13,7 @@ Kontrol akışı:
 import re
 from difflib import SequenceMatcher
 from logger import app_logger
+from core.script_classifier import script_ratio
 
 # Deterministik langdetect — modül yüklendiğinde bir kez ayarlanır
 try:
@@ -21,12 +22,6 @@ try:
 except ImportError:
     pass
 
-# CJK pattern (ch-kontrol.py, kr-kontrol.py ve translation_worker.py ile uyumlu)
-_CJK_PATTERN = re.compile(
-    r'[\u4e00-\u9fff\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f]'
-)
-
-
 def normalize_text(text: str) -> str:
     """Karşılaştırma için metni normalize eder (küçük harf + boşluk tekleştirme)."""
     if not text:
@@ -82,12 +77,8 @@ class TranslationQualityChecker:
         return False
 
     def _has_excessive_cjk(self, text: str) -> bool:
-        """CJK/Korece karakter oranının eşiği aşıp aşmadığını kontrol eder."""
-        total = len(text)
-        if total == 0:
-            return False
-        count = len(_CJK_PATTERN.findall(text))
-        return (count / total) > self.cjk_threshold
+        """CJK/Korece karakter oranının eşiği aşıp aşmadığını kontrol eder (translation_worker ile aynı sınıflar)."""
+        return script_ratio(text, "hangul", "han") > self.cjk_threshold
 
     def calculate_similarity(self, original: str, translated: str) -> float:
         """
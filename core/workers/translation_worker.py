@@ -1,17 +1,56 @@
 import os
 import re
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
+from core.cancel_token import CancellableMixin
 import json
 import time
 from logger import app_logger
 
-# Unicode aralıkları (translation_error_check_worker.py ile uyumlu)
-KOREAN_PATTERN = re.compile(r'[\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f]')
-CHINESE_PATTERN = re.compile(r'[\u4e00-\u9fff]')
-
+from core.script_classifier import script_ratio
 from core.workers.translation_quality_checker import TranslationQualityChecker
+from core.chapter_scheduler import ChapterScheduler
+from core.job_journal import STATE_DONE, STATE_FAILED, STATE_IN_FLIGHT, STATE_QUEUED
+from core.usage_metrics import TokenUsage
+
 
-class TranslationWorker(QObject):
+def worker_kwargs_from_config(config) -> dict:
+    """
+    Proje config.ini'sindeki (ConfigParser) özellik ayarlarını TranslationWorker argümanlarına çevirir.
+    Arayüz (TranslationController) ve CLI aynı ayarları aynı varsayılanlarla okur.
+    """
+    return dict(
+        endpoint_id=config.get('MCP', 'endpoint_id', fallback=None),
+        max_retries=config.getint('ProjectInfo', 'max_retries', fallback=3),
+        reading_position=config.get('ProjectInfo', 'reading_position', fallback=None) or None,
+        cache_enabled=config.getboolean('Features', 'cache_enabled', fallback=True),
+        terminology_enabled=config.getboolean('Features', 'terminology_enabled', fallback=True),
+        terminology_subset_enabled=config.getboolean('Features', 'terminology_subset_enabled', fallback=True),
+        async_enabled=config.getboolean('Features', 'async_enabled', fallback=False),
+        async_threads=config.getint('Features', 'async_threads', fallback=3),
+        paragraph_pool_enabled=config.getboolean('Features', 'paragraph_pool_enabled', fallback=False),
+        paragraph_pool_max_wait=config.getfloat('Features', 'paragraph_pool_max_wait', fallback=5.0),
+        pipeline_enabled=config.getboolean('Features', 'pipeline_enabled', fallback=False),
+        pipeline_qc_processes=config.getint('Features', 'pipeline_qc_processes', fallback=2),
+        translate_ahead_window=config.getint('Features', 'translate_ahead_window', fallback=20),
+        retry_attempts=config.getint('Features', 'retry_attempts', fallback=2),
+        retry_chunk_paragraphs=config.getint('Features', 'retry_chunk_paragraphs', fallback=4),
+        cascade_enabled=config.getboolean('Cascade', 'cascade_enabled', fallback=False),
+        cascade_endpoints=[
+            ep.strip() for ep in config.get('Cascade', 'cascade_endpoints', fallback='').split(',') if ep.strip()
+        ],
+        batch_enabled=config.getboolean('Batch', 'batch_enabled', fallback=False),
+        max_batch_chars=config.getint('Batch', 'max_batch_chars', fallback=33000),
+        max_chapters_per_batch=config.getint('Batch', 'max_chapters_per_batch', fallback=5),
+        batch_output_mode=config.get('Batch', 'batch_output_mode', fallback='markers'),
+        batch_job_enabled=config.getboolean('Batch', 'batch_job_enabled', fallback=False),
+        batch_job_backend=config.get('Batch', 'batch_job_backend', fallback='auto'),
+        batch_job_poll_seconds=config.getint('Batch', 'batch_job_poll_seconds', fallback=60),
+        shard_enabled=config.getboolean('Shard', 'shard_enabled', fallback=False),
+        lease_seconds=config.getint('Shard', 'lease_seconds', fallback=300),
+    )
+
+
+class TranslationWorker(CancellableMixin, QObject):
     """
     Dosya çeviri işlemini arayüzü dondurmadan arka planda yürüten işçi sınıfı.
     MCP entegrasyonu: LLMProvider üzerinden Gemini veya OpenAI-uyumlu servislerle çalışır.
@@ -24,6 +63,15 @@ class TranslationWorker(QObject):
     progress = pyqtSignal(int, int)
     request_made = pyqtSignal()
 
+    # Paragraf segment hizalamasında eşleşmeyen segmentler için en fazla istek turu
+    SEGMENT_MAX_ROUNDS = 3
+    # Cache farkındalıklı batch modunda tek istekteki en fazla paragraf sayısı
+    MAX_PARAGRAPHS_PER_BATCH = 200
+    # Bütçeyi aşan metin parçalara bölündüğünde önceki parçadan bağlam olarak eklenen en fazla token
+    CHUNK_OVERLAP_TOKENS = 150
+    # Otomatik yeniden denemenin anlamsız olduğu hatalar (dosya okunamadı, kota bitti)
+    RETRY_SKIP_PREFIXES = ("Okuma Hatası", "Kota Aşıldı")
+
     def __init__(self, input_folder, output_folder, api_key, startpromt,
                  model_version="gemini-2.5-flash",
                  file_limit=None, max_retries=3,
@@ -32,7 +80,16 @@ class TranslationWorker(QObject):
                  project_path=None, cache_enabled=True, terminology_enabled=True,
                  async_enabled=False, async_threads=3,
                  batch_enabled=False, max_batch_chars=33000, max_chapters_per_batch=5,
-                 source_lang="en"):
+                 source_lang="en",
+                 batch_job_enabled=False, batch_job_backend="auto", batch_job_poll_seconds=60,
+                 batch_output_mode="markers",
+                 paragraph_pool_enabled=False, paragraph_pool_max_wait=5.0,
+                 pipeline_enabled=False, pipeline_qc_processes=2,
+                 priority_files=None, reading_position=None, translate_ahead_window=20,
+                 cascade_enabled=False, cascade_endpoints=None,
+                 retry_attempts=2, retry_chunk_paragraphs=4,
+                 terminology_subset_enabled=True, quota=None,
+                 shard_enabled=False, lease_seconds=300, node_id=None):
         super().__init__()
         self.input_folder = input_folder
         self.output_folder = output_folder
@@ -41,10 +98,10 @@ class TranslationWorker(QObject):
         self.model_version = model_version
         self.file_limit = file_limit
         self.max_retries = max_retries
-        self.is_running = True
-        self.is_paused = False
         self.translation_errors = {}
         self.error_log_path = os.path.join(self.output_folder, 'translation_errors.json')
+        self._journal = None
+        self._journal_states = {}
         self.shutdown_on_finish = False
         self.terminology_section = terminology_section  # Eski uyumluluk (manuel)
         self.source_lang = source_lang
@@ -56,16 +113,66 @@ class TranslationWorker(QObject):
         self.project_path = project_path
         self.cache_enabled = cache_enabled
         self.terminology_enabled = terminology_enabled
+        # Her isteğe yalnızca metninde geçen terimler eklenir (statik ön ekte terminoloji olmaz)
+        self.terminology_subset_enabled = terminology_subset_enabled
+        self._full_terminology_tokens = 0
+        self.terminology_requests = 0
+        self.terminology_tokens_saved = 0
         self.async_enabled = async_enabled
         self.async_threads = async_threads
 
+        # Bölümler arası paragraf havuzu (batch dışı modlar)
+        self.paragraph_pool_enabled = paragraph_pool_enabled
+        self.paragraph_pool_max_wait = paragraph_pool_max_wait
+        self.pool_stats = None
+
+        # Öncelikli sıralama: seçili bölümler → okuma konumu penceresi → geri kalanlar
+        self.priority_files = list(priority_files or [])
+        self.reading_position = reading_position
+        self.translate_ahead_window = translate_ahead_window
+        self.scheduler = None
+
+        # Model cascade: ucuz kademe önce, yalnızca kontrolden geçemeyen paragraflar üst kademeye
+        self.cascade_enabled = cascade_enabled
+        self.cascade_endpoints = list(cascade_endpoints or [])
+        self._cascade = None
+        self.cascade_stats = None
+
+        # Kalite kontrolünden geçemeyen bölümler için otomatik yeniden deneme
+        self.retry_attempts = retry_attempts
+        self.retry_chunk_paragraphs = retry_chunk_paragraphs
+        self.retry_stats = None
+        self.diagnostics_path = os.path.join(self.output_folder, 'translation_diagnostics.json')
+
+        # Çoklu proje: ortak kota zamanlayıcısındaki proje tanıtıcısı (QuotaFlow, job server verir)
+        self.quota = quota
+
+        # Paylaşımlı çeviri: aynı projeyi çeviren süreçler/makineler bölümleri lease queue'dan kiralar
+        self.shard_enabled = shard_enabled
+        self.lease_seconds = lease_seconds
+        self.node_id = node_id
+        self._lease = None
+
+        # Aşamalı akış (pipeline) modu
+        self.pipeline_enabled = pipeline_enabled
+        self.pipeline_qc_processes = pipeline_qc_processes
+        self.pipeline_stats = None
+
         # Batch modu parametreleri
         self.batch_enabled = batch_enabled
         self.max_batch_chars = max_batch_chars
         self.max_chapters_per_batch = max_chapters_per_batch
+        self.batch_output_mode = batch_output_mode  # "markers" (ayraç) veya "json" (şema)
+
+        # Batch job (sağlayıcı batch API, çevrimdışı) modu parametreleri
+        self.batch_job_enabled = batch_job_enabled
+        self.batch_job_backend = batch_job_backend
+        self.batch_job_poll_seconds = batch_job_poll_seconds
 
         import threading
         self.data_lock = threading.Lock()
+        # Thread'e özel sağlayıcı (cascade kademesi); boşsa self.provider kullanılır
+        self._local = threading.local()
         self.translated_count_session = 0
         self.global_error = None
 
@@ -81,10 +188,20 @@ class TranslationWorker(QObject):
         self.cache_miss_count = 0
         self.paragraph_cache_hit_count = 0
         self.paragraph_cache_miss_count = 0
+        self.context_cache_saved_tokens = 0
+        self.batch_fill_stats = None
         self.translation_start_time = None
 
+        # Sağlayıcının bildirdiği gerçek token kullanımı: çalıştırma, endpoint → anahtar ve bölüm
+        # toplamları (bölüm kullanımı done/failed kaydıyla iş günlüğüne yazılır)
+        self.token_usage = TokenUsage()
+        self.token_usage_by_key: dict[str, dict[str, TokenUsage]] = {}
+        self.project_token_usage = None
+        self._chapter_usage: dict[str, TokenUsage] = {}
+
         # LLM Provider (MCP entegrasyonu)
         self.provider = None
+        self._providers_used = []  # Context cache istatistiği / temizliği için
         self.endpoint_id = endpoint_id
         self.endpoint_config = endpoint_config
         self._init_provider()
@@ -118,6 +235,8 @@ class TranslationWorker(QObject):
                 )
             else:
                 self.provider = None
+            if self.provider:
+                self._providers_used.append(self.provider)
         except Exception as e:
             app_logger.error(f"LLMProvider başlatılamadı: {e}")
             self.provider = None
@@ -226,12 +345,9 @@ class TranslationWorker(QObject):
 
             kind, ep, key = self._all_endpoints[next_idx]
             try:
-                from core.llm_provider import LLMProvider
-                if kind == "legacy":
-                    new_provider = LLMProvider(endpoint=ep, api_key=key)
-                else:
-                    new_provider = LLMProvider(endpoint=ep)
+                new_provider = self._create_endpoint_provider(kind, ep, key)
                 self.provider = new_provider
+                self._providers_used.append(new_provider)
                 self._current_endpoint_idx = next_idx
                 app_logger.info(
                     f"Endpoint geçişi başarılı → {ep.get('name', ep.get('id', '?'))} "
@@ -245,6 +361,14 @@ class TranslationWorker(QObject):
                 return False
 
 
+    @staticmethod
+    def _create_endpoint_provider(kind: str, ep: dict, key: str | None):
+        """Failover listesindeki bir kayıttan LLMProvider oluşturur."""
+        from core.llm_provider import LLMProvider
+        if kind == "legacy":
+            return LLMProvider(endpoint=ep, api_key=key)
+        return LLMProvider(endpoint=ep)
+
     def _init_cache_and_terminology(self):
         """Cache ve Terminology nesnelerini proje yoluna göre başlatır."""
         if self.project_path:
@@ -281,23 +405,58 @@ class TranslationWorker(QObject):
                     if auto_section:
                         self.terminology_section = auto_section
                         app_logger.info(f"Terminology Memory etkinleştirildi. {len(self._terminology_manager.terms)} terim yüklendi.")
+                        if self.terminology_subset_enabled:
+                            self._full_terminology_tokens = self._estimate_tokens(auto_section)
+                            app_logger.info("Terminology: istek bazlı terim alt kümesi etkin (yalnızca metinde geçen terimler).")
                     else:
                         app_logger.info("Terminology Memory: terim yok, prompt bölümü eklenmedi.")
                 except Exception as e:
                     app_logger.warning(f"Terminology Manager başlatılamadı: {e}")
                     self._terminology_manager = None
 
+    def _init_cascade(self):
+        """Cascade kademelerini oluşturur; son kademe projenin ana sağlayıcısıdır."""
+        if not self.cascade_enabled:
+            return
+        try:
+            from core.model_cascade import build_cascade
+            self._cascade = build_cascade(self.cascade_endpoints, self.provider)
+        except Exception as e:
+            app_logger.warning(f"Model cascade başlatılamadı: {e}")
+            self._cascade = None
+        if self._cascade is None:
+            app_logger.warning("Model cascade: kullanılabilir alt kademe yok, tek model ile devam ediliyor.")
+            return
+        for tier in self._cascade.tiers[:-1]:
+            self._providers_used.append(tier.provider)
+        app_logger.info(f"Model cascade etkin: {' → '.join(t.name for t in self._cascade.tiers)}")
+
+    def _active_provider(self):
+        return getattr(self._local, 'provider', None) or self.provider
+
+    def set_priority_files(self, file_names: list[str]):
+        """Öncelikli (seçili) bölümleri çalışma sırasında günceller."""
+        self.priority_files = list(file_names or [])
+        if self.scheduler:
+            self.scheduler.set_selected(self.priority_files)
+
+    def set_reading_position(self, file_name: str | None):
+        """Okuma konumunu günceller; önden çeviri penceresi bu bölümden itibaren öne alınır."""
+        self.reading_position = file_name
+        if self.scheduler:
+            self.scheduler.set_reading_position(file_name)
+
     def pause(self):
-        """Çeviriyi duraklatır."""
-        self.is_paused = True
+        """Çeviriyi duraklatır (bekleyen thread'ler bir sonraki istekten önce durur)."""
+        self.cancel_token.pause()
 
     def resume(self):
-        """Çeviriyi devam ettirir."""
-        self.is_paused = False
+        """Çeviriyi devam ettirir; duraklatılmış thread'ler hemen uyanır."""
+        self.cancel_token.resume()
 
     def stop(self):
-        """Çeviriyi durdurur."""
-        self.is_running = False
+        """Çeviriyi durdurur; beklemeler hemen biter, başlamamış future'lar iptal edilir."""
+        self.cancel_token.stop()
 
     @staticmethod
     def _has_excessive_cjk(text, threshold=0.50):
@@ -305,13 +464,7 @@ class TranslationWorker(QObject):
         Eşik varsayılan %50. True dönerse çeviri hatalı kabul edilir."""
         if not text:
             return False
-        total_chars = len(text)
-        if total_chars == 0:
-            return False
-        korean_count = len(KOREAN_PATTERN.findall(text))
-        chinese_count = len(CHINESE_PATTERN.findall(text))
-        cjk_ratio = (korean_count + chinese_count) / total_chars
-        return cjk_ratio > threshold
+        return script_ratio(text, "hangul", "han") > threshold
 
     def is_translation_failed(self, original: str, translated: str, file_name: str = "") -> bool:
         """Çevirinin kalite kontrol kriterlerini (CJK, benzerlik %80+, dil tespiti) karşılayıp karşılamadığını kontrol eder."""
@@ -319,22 +472,261 @@ class TranslationWorker(QObject):
             return self.quality_checker.is_translation_failed(original, translated, file_name)
         return self._has_excessive_cjk(translated)
 
-    def _call_api_with_retry(self, full_prompt: str) -> str | None:
+    # ──────── İş günlüğü (durum geçişleri) ────────
+
+    def _open_journal(self):
+        """
+        İş günlüğünü açar ve hata durumunu yükler.  Günlük boşsa (eski projeler) translation_errors.json
+        okunur ve içeriği günlüğe aktarılır.
+        """
+        self._journal = None
+        self._journal_states = {}
+        if self.project_path:
+            try:
+                from core.job_journal import JobJournal
+                self._journal = JobJournal(self.project_path)
+                self._journal_states = {
+                    name: state for name, (state, _) in self._journal.latest_states().items()
+                }
+            except Exception as e:
+                app_logger.warning(f"İş günlüğü açılamadı, klasör taramasıyla devam ediliyor: {e}")
+                self._journal = None
+
+        if self._journal_states:
+            self.translation_errors = self._journal.failed()
+            app_logger.info(
+                f"İş günlüğünden devam: {sum(1 for st in self._journal_states.values() if st == STATE_DONE)} tamamlanmış, "
+                f"{len(self.translation_errors)} hatalı bölüm."
+            )
+            return
+
+        if os.path.exists(self.error_log_path):
+            try:
+                with open(self.error_log_path, 'r', encoding='utf-8') as f:
+                    self.translation_errors = json.load(f)
+            except:
+                self.translation_errors = {}
+        if self._journal:
+            for name, reason in self.translation_errors.items():
+                self._journal.record(name, STATE_FAILED, reason)
+                self._journal_states[name] = STATE_FAILED
+
+    def _journal_record(self, file_name: str, state: str, reason: str = None):
+        if self._journal is None:
+            return
+        with self.data_lock:
+            self._journal_states[file_name] = state
+            # Bu denemede harcanan token'lar bölümün done / failed kaydına eklenir
+            usage = self._chapter_usage.pop(file_name, None) if state in (STATE_DONE, STATE_FAILED) else None
+        self._journal.record(file_name, state, reason, usage=usage)
+
+    def _is_completed(self, file_name: str) -> bool:
+        """
+        Bölüm daha önce başarıyla çevrildi mi?  Günlükte kaydı varsa yalnızca günlüğe bakılır;
+        kaydı yoksa (günlük öncesi çevrilmiş bölümler) dosya varlığı bir kez kontrol edilip günlüğe yazılır.
+        """
+        with self.data_lock:
+            if file_name in self.translation_errors:
+                return False
+            state = self._journal_states.get(file_name)
+        if state is not None:
+            return state == STATE_DONE
+        if os.path.exists(os.path.join(self.output_folder, f"translated_{file_name}")):
+            self._journal_record(file_name, STATE_DONE, "mevcut çeviri")
+            return True
+        return False
+
+    def _mark_in_flight(self, file_name: str):
+        self._journal_record(file_name, STATE_IN_FLIGHT)
+
+    def _mark_queued(self, file_name: str):
+        """Başlatılıp işlenmeden bırakılan bölümü (ör. durdurmada) yeniden kuyruğa alınmış sayar."""
+        self._journal_record(file_name, STATE_QUEUED)
+
+    def _mark_done(self, file_name: str):
+        with self.data_lock:
+            self.translation_errors.pop(file_name, None)
+        self._journal_record(file_name, STATE_DONE)
+        if self._lease is not None:
+            self._lease.complete(file_name)
+
+    def _mark_failed(self, file_name: str, reason: str):
+        """Hata durumunu kaydeder; günlük sayesinde çökme durumunda bile kalıcıdır."""
+        with self.data_lock:
+            self.translation_errors[file_name] = reason
+        self._journal_record(file_name, STATE_FAILED, reason)
+        if self._lease is not None:
+            self._lease.fail(file_name, reason)
+
+    # ──────── Paylaşımlı çeviri (lease queue) ────────
+
+    def _open_lease_queue(self, files_to_translate: list[str]):
+        """
+        Bölüm sıralayıcısını lease queue ile sarar: bu düğüm yalnızca kiralayabildiği bölümleri
+        çevirir.  Başka düğümlerin tamamladığı bölümler bu çalıştırmada tamamlanmış sayılır.
+        """
+        if self.batch_enabled or self.batch_job_enabled:
+            app_logger.warning("Paylaşımlı çeviri batch modlarında desteklenmiyor; bu çalıştırmada kapalı.")
+            return
+        from core.lease_queue import LeaseQueue, LeasedScheduler
+        try:
+            self._lease = LeaseQueue(self.project_path, node_id=self.node_id, lease_seconds=self.lease_seconds)
+            done = self._lease.seed(
+                files_to_translate, completed=[f for f in files_to_translate if self._is_completed(f)]
+            )
+        except Exception as e:
+            app_logger.error(f"Lease queue açılamadı, paylaşımsız devam ediliyor: {e}")
+            self._lease = None
+            return
+        with self.data_lock:
+            for name in done:
+                if name not in self.translation_errors:
+                    self._journal_states[name] = STATE_DONE
+        self.scheduler = LeasedScheduler(
+            self.scheduler, self._lease, files_to_translate,
+            should_wait=self._can_wait_for_leases, sleep=self.cancel_token.sleep,
+        )
+        self._lease.start_heartbeat()
+        app_logger.info(
+            f"Paylaşımlı çeviri: düğüm '{self._lease.node_id}', kira süresi {self._lease.lease_seconds:.0f} sn, "
+            f"başka düğümlerce tamamlanmış {len(done)} bölüm."
+        )
+
+    def _can_wait_for_leases(self) -> bool:
+        """Başka düğümlerin kiraları beklenmeye değer mi (iş sürüyor ve dosya limiti dolmadı)?"""
+        if not self.is_running:
+            return False
+        with self.data_lock:
+            return self.file_limit is None or self.translated_count_session < self.file_limit
+
+    def _close_lease_queue(self):
+        if self._lease is None:
+            return
+        try:
+            released = self._lease.release_own()
+            stats = self._lease.stats()
+            app_logger.info(
+                f"Paylaşımlı çeviri istatistikleri — Durumlar: {stats['states']}, "
+                f"düğüm başına tamamlanan: {stats['done_by_node']}, bırakılan kira: {released}"
+            )
+        except Exception as e:
+            app_logger.warning(f"Lease queue kapatılırken hata: {e}")
+        finally:
+            self._lease.close()
+            self._lease = None
+
+    def _build_static_prefix(self) -> str:
+        """
+        İstekler arasında değişmeyen ön eki (prompt + terminoloji) döndürür.
+        Sağlayıcı tarafında cache'lenebilmesi için her istekte birebir aynı olmalıdır.
+        """
+        prefix = self.prompt_prefix or ""
+        if self.terminology_section and not self._terminology_subset_active():
+            prefix += "\n\n" + self.terminology_section
+        return prefix
+
+    def _terminology_subset_active(self) -> bool:
+        return bool(self.terminology_subset_enabled and self._terminology_manager and self._full_terminology_tokens)
+
+    def _with_terms(self, prompt: str) -> str:
+        """
+        Terim alt kümesi etkinse isteğin metninde geçen terimleri prompt gövdesinin başına ekler
+        ve tüm terim listesini göndermeye göre tasarruf edilen token'ı sayar.
+        """
+        if not self._terminology_subset_active():
+            return prompt
+        section = self._terminology_manager.build_prompt_section(prompt)
+        section_tokens = self._estimate_tokens(section) if section else 0
+        with self.data_lock:
+            self.terminology_requests += 1
+            self.terminology_tokens_saved += self._full_terminology_tokens - section_tokens
+        return f"{section}\n\n{prompt}" if section else prompt
+
+    def _generate(self, provider, prompt: str, **kwargs) -> str:
+        """
+        provider.generate çağrısı.  Ortak kota zamanlayıcısı (quota) verilmişse istek, endpoint
+        kotasından yuva alınana kadar bekletilir (çoklu proje adil paylaşımı).
+        Yanıtın bildirdiği token kullanımı _account_usage() ile toplamlara eklenir.
+        """
+        usage = TokenUsage()
+        try:
+            if self.quota is None:
+                return provider.generate(prompt, usage=usage, **kwargs)
+            remove = self.cancel_token.on_stop(self.quota.scheduler.wake)
+            try:
+                with self.quota.slot(getattr(provider, 'ep_id', 'default'), cancelled=lambda: not self.is_running):
+                    return provider.generate(prompt, usage=usage, **kwargs)
+            finally:
+                remove()
+        finally:
+            if usage:
+                self._account_usage(provider, usage)
+
+    # ──────── Token kullanımı ────────
+
+    def _account_usage(self, provider, usage: TokenUsage):
+        """
+        Bir isteğin kullanımını çalıştırma ve endpoint/anahtar toplamlarına, thread'in kullanım
+        hedeflerindeki bölümlere (çok bölümlü isteklerde kaynak uzunluğu oranında) ekler.
+        """
+        ep_id = getattr(provider, 'ep_id', 'default')
+        key_id = getattr(provider, 'key_id', '')
+        targets = getattr(self._local, 'usage_targets', None)
+        with self.data_lock:
+            self.token_usage.add(usage)
+            self.token_usage_by_key.setdefault(ep_id, {}).setdefault(key_id, TokenUsage()).add(usage)
+            if targets:
+                total_weight = sum(weight for _, weight in targets) or 1
+                for file_name, weight in targets:
+                    self._chapter_usage.setdefault(file_name, TokenUsage()).add(usage, weight / total_weight)
+
+    def _usage_targets(self, weights: dict[str, float]):
+        """Thread'in bundan sonraki isteklerinin kullanımını bu bölümlere yazar (with bloğu)."""
+        import contextlib
+
+        @contextlib.contextmanager
+        def _scope():
+            previous = getattr(self._local, 'usage_targets', None)
+            self._local.usage_targets = [(name, max(weight, 1)) for name, weight in weights.items()]
+            try:
+                yield
+            finally:
+                self._local.usage_targets = previous
+        return _scope()
+
+    def token_usage_report(self) -> dict:
+        """Çalıştırma, proje ve endpoint/anahtar bazında gerçek token kullanımı (CLI / job server)."""
+        with self.data_lock:
+            report = {
+                "run": self.token_usage.to_dict(),
+                "by_endpoint": {
+                    ep_id: {key_id: usage.to_dict() for key_id, usage in keys.items()}
+                    for ep_id, keys in self.token_usage_by_key.items()
+                },
+            }
+        if self.project_token_usage is not None:
+            report["project"] = self.project_token_usage.to_dict()
+        return report
+
+    def _call_api_with_retry(self, full_prompt: str, prefix: str = None,
+                             response_schema: dict = None) -> str | None:
         """
         Verilen prompt'u API'ye gönderir, retry + duraklatma/durdurma mantığıyla.
+        prefix verilirse statik ön ek olarak ayrı gönderilir (context cache).
+        response_schema verilirse yanıt yapılandırılmış JSON olarak istenir.
         Başarılı yanıtı string olarak döndürür; hata durumunda None döner.
         """
+        full_prompt = self._with_terms(full_prompt)
         retry_count = 0
         while retry_count < self.max_retries:
-            while self.is_paused and self.is_running:
-                time.sleep(0.5)
-            if not self.is_running:
+            if not self.cancel_token.wait_if_paused():
                 return None
             # API çağrısından önce hangi endpoint'te olduğumuzu yakala (CAS için)
             with self.data_lock:
                 my_ep_idx = self._current_endpoint_idx
+            provider = self._active_provider()
             try:
-                result = self.provider.generate(full_prompt)
+                result = self._generate(provider, full_prompt, prefix=prefix, response_schema=response_schema)
                 return result
             except Exception as e:
                 last_error = str(e)
@@ -342,11 +734,15 @@ class TranslationWorker(QObject):
                     retry_count += 1
                     wait_time = min(2 ** retry_count, 60)
                     self.global_error = f"Sunucu hatası. {wait_time}s sonra tekrar deneniyor. ({retry_count}/{self.max_retries})"
-                    sleep_start = time.time()
-                    while time.time() - sleep_start < wait_time:
-                        if not self.is_running:
-                            return None
-                        time.sleep(0.5)
+                    if not self.cancel_token.sleep(wait_time):
+                        return None
+                elif provider is not self.provider and (("429" in last_error) or ("ResourceExhausted" in last_error)):
+                    # Cascade alt kademesi: yalnızca kendi anahtar havuzunda döner, tükenirse üst kademeye bırakır
+                    if provider.rotate_key():
+                        retry_count = 0
+                        continue
+                    app_logger.warning(f"Cascade kademesi kotası tükendi ({provider.ep_name}) — üst kademeye bırakılıyor.")
+                    return None
                 elif ("429" in last_error) or ("ResourceExhausted" in last_error):
                     app_logger.warning(f"429 / ResourceExhausted (EP idx={my_ep_idx}) — sonraki endpoint'e geçiliyor...")
                     if self._try_next_endpoint(my_ep_idx):
@@ -377,34 +773,11 @@ class TranslationWorker(QObject):
         from cache.translation_cache import TranslationCache
 
         paragraphs = TranslationCache.split_into_paragraphs(content)
-        if len(paragraphs) <= 1:
-            # Tek paragraf — klasik tam-dosya akışına bırak
+        if not paragraphs or (len(paragraphs) == 1 and self._cascade is None):
+            # Tek paragraf — klasik tam-dosya akışına bırak (cascade etkinse kademeli akıştan geçer)
             return None
 
-        results = {}        # index -> translated_text
-        miss_indices = []
-
-        # Cache kontrol (yalnızca cache etkinse)
-        if self._cache:
-            for idx, para in enumerate(paragraphs):
-                cached = self._cache.get_paragraph(para, self.model_version, prompt_hash)
-                if cached is not None:
-                    if self._has_excessive_cjk(cached):
-                        app_logger.warning(f"Paragraf cache hit CJK yüksek, atlanıyor (#{idx})")
-                        try:
-                            self._cache.remove(para, self.model_version, prompt_hash)
-                        except Exception:
-                            pass
-                        miss_indices.append(idx)
-                    else:
-                        results[idx] = cached
-                        self.paragraph_cache_hit_count += 1
-                else:
-                    miss_indices.append(idx)
-                    self.paragraph_cache_miss_count += 1
-        else:
-            # Cache yok — hepsi miss
-            miss_indices = list(range(len(paragraphs)))
+        results, miss_indices = self._lookup_cached_paragraphs(paragraphs, prompt_hash)
 
         # Tümü cache hit
         if not miss_indices:
@@ -412,72 +785,463 @@ class TranslationWorker(QObject):
             self.cache_hit_count += 1
             return "\n\n".join(results[i] for i in range(len(paragraphs)))
 
-        # Miss paragrafları API'ye gönder
-        PARA_SEP = "\n\n===PARAGRAPH_BREAK===\n\n"
-        miss_text = PARA_SEP.join(paragraphs[i] for i in miss_indices)
-
-        full_prompt = self.prompt_prefix or ""
-        if self.terminology_section:
-            full_prompt += "\n\n" + self.terminology_section
-        if len(miss_indices) > 1:
-            full_prompt += (
-                "\n\n[ÖNEMLİ: Metin paragraflar halinde verilmiştir. "
-                "Her paragrafı ayrı ayrı çevir. "
-                "Paragraflar arasındaki ===PARAGRAPH_BREAK=== ayırıcılarını çıktıda da koru.]\n\n"
+        # Miss paragrafları numaralı segmentler halinde API'ye gönder; hizalanamayanlar yeniden istenir
+        if not self._translate_misses(paragraphs, miss_indices, results, prompt_hash):
+            return None
+
+        if self._cache:
+            self.cache_miss_count += 1
+
+        final_parts = [results[i] for i in range(len(paragraphs)) if results.get(i, "")]
+        return "\n\n".join(final_parts)
+
+    def _lookup_cached_paragraphs(self, paragraphs: list[str], prompt_hash: str) -> tuple[dict, list[int]]:
+        """
+        Paragrafları cache'de arar.
+
+        Returns:
+            (index -> cache'deki çeviri, miss index listesi). Cache devre dışı ise tümü miss.
+        """
+        results = {}
+        miss_indices = []
+        if not self._cache:
+            return results, list(range(len(paragraphs)))
+
+        for idx, para in enumerate(paragraphs):
+            cached = self._cache.get_paragraph(para, self.model_version, prompt_hash)
+            if cached is not None:
+                if self._has_excessive_cjk(cached):
+                    app_logger.warning(f"Paragraf cache hit CJK yüksek, atlanıyor (#{idx})")
+                    try:
+                        self._cache.remove(para, self.model_version, prompt_hash)
+                    except Exception:
+                        pass
+                    miss_indices.append(idx)
+                    self.paragraph_cache_miss_count += 1
+                else:
+                    results[idx] = cached
+                    self.paragraph_cache_hit_count += 1
+            else:
+                miss_indices.append(idx)
+                self.paragraph_cache_miss_count += 1
+        return results, miss_indices
+
+    def _translate_segments(self, paragraphs: list[str], miss_indices: list[int],
+                            results: dict, prompt_hash: str) -> bool:
+        """
+        Miss paragrafları [[P<n>]] işaretleriyle gönderir ve yanıtı kaynakla hizalar.
+
+        Hizalanan her paragraf results'a ve paragraf cache'ine ayrı ayrı yazılır; yalnızca
+        eşleşmeyen segmentler (en fazla SEGMENT_MAX_ROUNDS tur) yeniden istenir. Tek segment
+        kaldığında işaretsiz gönderilir ve yanıtın tamamı kabul edilir.
+
+        Returns:
+            Tüm miss paragraflar çevrildiyse True.
+        """
+        from core.segment_protocol import SEGMENT_INSTRUCTION, align_segments, format_segments
+
+        pending = list(miss_indices)
+        for round_no in range(1, self.SEGMENT_MAX_ROUNDS + 1):
+            if not self.is_running:
+                return False
+
+            if len(pending) == 1:
+                full_prompt = "\n\n" + paragraphs[pending[0]]
+            else:
+                items = [(idx + 1, paragraphs[idx]) for idx in pending]
+                full_prompt = SEGMENT_INSTRUCTION + format_segments(items)
+
+            with self.data_lock:
+                self.api_request_count += 1
+            self.request_made.emit()
+
+            translated_text = self._call_api_with_retry(full_prompt, prefix=self._build_static_prefix())
+            if translated_text is None:
+                return False
+            if self._has_excessive_cjk(translated_text):
+                app_logger.warning("Paragraf bazlı çeviri CJK oranı yüksek.")
+                return False
+
+            if len(pending) == 1:
+                aligned = {pending[0] + 1: translated_text.strip()}
+                unmatched = []
+            else:
+                aligned, unmatched = align_segments(items, translated_text)
+
+            for num, text in aligned.items():
+                idx = num - 1
+                results[idx] = text
+                if self._cache:
+                    try:
+                        self._cache.set_paragraph(paragraphs[idx], self.model_version, prompt_hash, text)
+                    except Exception as e:
+                        app_logger.warning(f"Paragraf cache yazma hatası: {e}")
+
+            if not unmatched:
+                return True
+            app_logger.warning(
+                f"Segment hizalama (tur {round_no}): {len(aligned)}/{len(pending)} paragraf eşleşti, "
+                f"{len(unmatched)} paragraf yeniden istenecek."
             )
-        else:
-            full_prompt += "\n\n"
-        full_prompt += miss_text
+            pending = [num - 1 for num in unmatched]
 
-        with self.data_lock:
-            self.api_request_count += 1
-        self.request_made.emit()
+        app_logger.warning(f"Segment hizalama başarısız: {len(pending)} paragraf çevrilemedi.")
+        return False
 
-        translated_text = self._call_api_with_retry(full_prompt)
+    def _translate_segments_json(self, paragraphs: list[str], results: dict, prompt_hash: str) -> bool:
+        """
+        _translate_segments'in yapılandırılmış JSON karşılığı (batch_output_mode == "json"):
+        paragraflar kimlikli ayraçlarla gönderilir, yanıt şemaya göre ayrıştırılır.  Yanıtta eksik
+        kalan kimlikler bir kez daha istenir; hâlâ eksik kalanlar results'a eklenmez.
 
-        if translated_text is None:
-            return None
-        if self._has_excessive_cjk(translated_text):
-            app_logger.warning("Paragraf bazlı çeviri CJK oranı yüksek.")
-            return None
+        Returns:
+            Tüm paragraflar çevrildiyse True.
+        """
+        from core.structured_output import (
+            BATCH_RESPONSE_SCHEMA, JSON_BATCH_INSTRUCTION, format_chapters_with_ids, parse_json_items,
+        )
 
-        # Sonuçları paragraflara ayır
-        if len(miss_indices) > 1 and "===PARAGRAPH_BREAK===" in translated_text:
-            translated_parts = re.split(r'\s*===PARAGRAPH_BREAK===\s*', translated_text)
-        else:
-            translated_parts = [translated_text]
-        translated_parts = [p.strip() for p in translated_parts if p.strip()]
-
-        # Index ile eşleştir
-        if len(translated_parts) == len(miss_indices):
-            for i, miss_idx in enumerate(miss_indices):
-                t = translated_parts[i]
-                results[miss_idx] = t
+        pending = list(range(len(paragraphs)))
+        for _ in range(2):
+            if not pending or not self.is_running:
+                break
+            id_map = {f"p{idx + 1}": idx for idx in pending}
+            full_prompt = JSON_BATCH_INSTRUCTION + format_chapters_with_ids(
+                [(item_id, paragraphs[idx]) for item_id, idx in id_map.items()]
+            )
+
+            with self.data_lock:
+                self.api_request_count += 1
+            self.request_made.emit()
+
+            response = self._call_api_with_retry(
+                full_prompt, prefix=self._build_static_prefix(), response_schema=BATCH_RESPONSE_SCHEMA
+            )
+            if response is None:
+                return False
+
+            for item_id, text in parse_json_items(response).items():
+                idx = id_map.get(item_id)
+                if idx is None or not text.strip():
+                    continue
+                if self._has_excessive_cjk(text):
+                    app_logger.warning(f"Paragraf JSON parse: CJK oranı yüksek, atlanıyor — {item_id}")
+                    continue
+                results[idx] = text.strip()
                 if self._cache:
                     try:
-                        self._cache.set_paragraph(paragraphs[miss_idx], self.model_version, prompt_hash, t)
+                        self._cache.set_paragraph(paragraphs[idx], self.model_version, prompt_hash, results[idx])
                     except Exception as e:
                         app_logger.warning(f"Paragraf cache yazma hatası: {e}")
-        else:
+            pending = [idx for idx in pending if idx not in results]
+            if pending:
+                app_logger.warning(f"Paragraf JSON batch: {len(pending)} paragraf yanıtta eksik.")
+
+        return not pending
+
+    def _translate_misses(self, paragraphs: list[str], miss_indices: list[int],
+                          results: dict, prompt_hash: str) -> bool:
+        """
+        Miss paragrafları istek bütçesine sığan gruplar halinde çevirir: cascade etkinse kademeli,
+        değilse doğrudan ana sağlayıcıyla.  Tek başına bütçeyi aşan paragraflar parçalı çevrilir.
+        """
+        budget = self._chunk_token_budget()
+        groups = []
+        group_tokens = 0
+        for idx in miss_indices:
+            tokens = self._estimate_tokens(paragraphs[idx])
+            if tokens > budget:
+                translated = self._translate_chunked(paragraphs[idx])
+                if translated is None:
+                    return False
+                results[idx] = translated
+                if self._cache:
+                    try:
+                        self._cache.set_paragraph(paragraphs[idx], self.model_version, prompt_hash, translated)
+                    except Exception as e:
+                        app_logger.warning(f"Paragraf cache yazma hatası: {e}")
+                continue
+            if not groups or group_tokens + tokens > budget:
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(idx)
+            group_tokens += tokens
+
+        for group in groups:
+            if self._cascade is not None:
+                ok = self._translate_segments_cascade(paragraphs, group, results, prompt_hash)
+            else:
+                ok = self._translate_segments(paragraphs, group, results, prompt_hash)
+            if not ok:
+                return False
+        return True
+
+    def _estimate_tokens(self, text: str, provider=None) -> int:
+        """Token tahmini; sağlayıcının modeli için öğrenilmiş kalibrasyon katsayıları kullanılır."""
+        from core.workers.token_counter import estimate_tokens
+        provider = provider or self._active_provider()
+        return estimate_tokens(text, getattr(provider, "model_id", None) or self.model_version)
+
+    def _chunk_token_budget(self) -> int:
+        """Parçalama eşiği: aktif endpoint'in girdi/çıktı sınırlarından türetilen istek bütçesi."""
+        return self._request_token_budget(self._active_provider())
+
+    def _translate_chunked(self, text: str) -> str | None:
+        """
+        Bütçeyi aşan metni cümle sınırlarından parçalara böler, parçaları eşzamanlı çevirir ve
+        orijinal ayraçlarla birleştirir.  Bir parça bile çevrilemezse None döner.
+        """
+        import concurrent.futures
+        from core.chunker import chunk_text, format_chunk_prompt, stitch_chunks
+
+        provider = getattr(self._local, 'provider', None)
+        chunks = chunk_text(text, self._chunk_token_budget(), self.CHUNK_OVERLAP_TOKENS,
+                            model=getattr(provider or self.provider, "model_id", None) or self.model_version)
+        usage_targets = getattr(self._local, 'usage_targets', None)
+        prefix = self._build_static_prefix()
+        app_logger.info(f"Parçalı çeviri: {len(text)} karakter → {len(chunks)} parça (cümle sınırlarından)")
+
+        def _translate_chunk(chunk):
+            # Cascade kademesi gibi thread'e özel sağlayıcı ve kullanım hedefi parça thread'lerine de aktarılır
+            self._local.provider = provider
+            self._local.usage_targets = usage_targets
+            try:
+                with self.data_lock:
+                    self.api_request_count += 1
+                self.request_made.emit()
+                return self._call_api_with_retry(format_chunk_prompt(chunk), prefix=prefix)
+            finally:
+                self._local.provider = None
+                self._local.usage_targets = None
+
+        workers = max(1, min(len(chunks), self.async_threads))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # Durdurmada henüz başlamamış parçalar iptal edilir
+            futures = [self.cancel_token.track(executor.submit(_translate_chunk, chunk)) for chunk in chunks]
+            translations = [None if fut.cancelled() else fut.result() for fut in futures]
+        if any(t is None for t in translations):
             app_logger.warning(
-                f"Paragraf sayı uyumsuzluğu: beklenen {len(miss_indices)}, alınan {len(translated_parts)}. "
-                "Tek parça olarak işleniyor."
+                f"Parçalı çeviri başarısız: {sum(t is None for t in translations)}/{len(chunks)} parça çevrilemedi."
             )
-            combined = "\n\n".join(translated_parts)
-            for i, miss_idx in enumerate(miss_indices):
-                results[miss_idx] = combined if i == 0 else ""
-            if self._cache:
-                combined_orig = "\n\n".join(paragraphs[i] for i in miss_indices)
+            return None
+        return stitch_chunks(chunks, translations)
+
+    def _paragraph_fails(self, original: str, translated: str) -> bool:
+        """Paragraf düzeyinde kalite + terim tutarlılığı kontrolü (cascade yükseltme kararı)."""
+        if self.is_translation_failed(original, translated):
+            return True
+        if self._terminology_manager and self._terminology_manager.find_violations(original, translated):
+            return True
+        return False
+
+    def _translate_segments_cascade(self, paragraphs: list[str], miss_indices: list[int],
+                                    results: dict, prompt_hash: str) -> bool:
+        """
+        Miss paragrafları cascade kademeleriyle çevirir.  Her kademeden sonra kalite/terim kontrolünü
+        geçemeyen paragraflar cache'den silinip bir sonraki kademeye gönderilir; son kademenin
+        çevirisi (segment hizalaması başarılıysa) kontrol edilmeden kabul edilir.
+        """
+        pending = list(miss_indices)
+        top_idx = len(self._cascade) - 1
+        used_tier = 0
+        for tier_idx, tier in enumerate(self._cascade.tiers):
+            if not pending or not self.is_running:
+                break
+            used_tier = tier_idx
+            started = time.monotonic()
+            self._local.provider = tier.provider if tier_idx < top_idx else None
+            try:
+                self._translate_segments(paragraphs, pending, results, prompt_hash)
+            finally:
+                self._local.provider = None
+            elapsed = time.monotonic() - started
+
+            failing = [
+                idx for idx in pending
+                if idx not in results or (tier_idx < top_idx and self._paragraph_fails(paragraphs[idx], results[idx]))
+            ]
+            failing_set = set(failing)
+            accepted = [idx for idx in pending if idx not in failing_set]
+            self._cascade.record_attempt(
+                tier_idx,
+                attempted=len(pending),
+                accepted=len(accepted),
+                input_tokens=sum(self._estimate_tokens(paragraphs[idx]) for idx in pending),
+                output_tokens=sum(self._estimate_tokens(results[idx]) for idx in pending if idx in results),
+                accepted_output_tokens=sum(self._estimate_tokens(results[idx]) for idx in accepted),
+                seconds=elapsed,
+            )
+
+            if failing and tier_idx < top_idx:
+                app_logger.info(
+                    f"Model cascade: {tier.name} → {len(accepted)}/{len(pending)} paragraf kabul edildi, "
+                    f"{len(failing)} paragraf üst kademeye yükseltiliyor."
+                )
+                for idx in failing:
+                    if results.pop(idx, None) is not None and self._cache:
+                        try:
+                            self._cache.remove(paragraphs[idx], self.model_version, prompt_hash)
+                        except Exception:
+                            pass
+            pending = failing
+
+        if not pending:
+            self._cascade.record_chapter(used_tier)
+        return not pending
+
+    # ──────── Otomatik yeniden deneme ────────
+
+    def _run_retry_queue(self, files_to_translate: list[str], total_files: int, prompt_hash: str):
+        """
+        Ana turda başarısız olan bölümleri deneme bütçesi dolana kadar farklı endpoint'lerle veya
+        daha küçük parçalarla yeniden çevirir.  Kalıcı hatalar tanılama dosyasına yazılır.
+        """
+        from core.retry_queue import RetryQueue
+
+        with self.data_lock:
+            failed = {
+                name: reason for name, reason in self.translation_errors.items()
+                if name in files_to_translate and not reason.startswith(self.RETRY_SKIP_PREFIXES)
+            }
+        if self._lease is not None:
+            # Paylaşımlı çeviride her düğüm yalnızca kendi başarısız bölümlerini yeniden dener
+            failed = {name: reason for name, reason in failed.items() if self._lease.owns(name)}
+        if not failed:
+            return
+
+        main_id = getattr(self.provider, 'ep_id', None)
+        endpoint_ids = [ep.get("id") for _, ep, _ in self._all_endpoints if ep.get("id") != main_id]
+        chunk_sizes = []
+        size = max(1, int(self.retry_chunk_paragraphs))
+        while True:
+            chunk_sizes.append(size)
+            if size == 1:
+                break
+            size //= 2
+        queue = RetryQueue(self.retry_attempts, endpoint_ids, chunk_sizes)
+        for name, reason in failed.items():
+            queue.add(name, reason)
+
+        app_logger.info(
+            f"Otomatik yeniden deneme: {len(failed)} hatalı bölüm, bölüm başına en fazla {self.retry_attempts} deneme."
+        )
+        providers = {}
+        while self.is_running:
+            pending = queue.pending()
+            if not pending:
+                break
+            for file_name in pending:
+                if not self.is_running:
+                    break
+                strategy = queue.next_strategy(file_name)
+                if strategy is None:
+                    continue
+                ok, reason = self._retry_chapter(file_name, strategy, prompt_hash, providers)
+                if ok is None:
+                    app_logger.debug(f"Yeniden deneme [{file_name}] {strategy[0]}={strategy[1]} atlandı: {reason}")
+                    queue.skip(file_name)
+                    continue
+                queue.record(file_name, strategy, ok, reason)
+                app_logger.info(
+                    f"Yeniden deneme [{file_name}] {strategy[0]}={strategy[1]}: "
+                    f"{'başarılı' if ok else 'başarısız — ' + str(reason)}"
+                )
+                if ok:
+                    self.progress.emit(files_to_translate.index(file_name) + 1, total_files)
+
+        self.retry_stats = queue.stats()
+        diagnostics = queue.diagnostics()
+        for name, info in diagnostics.items():
+            with self.data_lock:
+                info["last_reason"] = self.translation_errors.get(name)
+        try:
+            with open(self.diagnostics_path, 'w', encoding='utf-8') as f:
+                json.dump(diagnostics, f, indent=4, ensure_ascii=False)
+        except Exception as e:
+            app_logger.warning(f"Tanılama dosyası yazılamadı: {e}")
+        for name, info in diagnostics.items():
+            history = "; ".join(
+                f"#{a['attempt']} {a['strategy']}={a['value']}: {a['reason']}" for a in info["attempts"]
+            )
+            app_logger.warning(f"Kalıcı hata [{name}] — ilk neden: {info['initial_reason']} | denemeler: {history or 'yok'}")
+
+    def _retry_chapter(self, file_name: str, strategy: tuple, prompt_hash: str,
+                       providers: dict) -> tuple[bool, str | None]:
+        """
+        Tek bir yeniden deneme: (başarılı mı, başarısızlık nedeni).  Strateji bölüme uygulanamıyorsa
+        (parça boyutu paragraf sayısından küçük değil → tek istek, başarısız olanın aynısı) istek
+        yapılmadan (None, neden) döner; deneme sayılmaz.
+        """
+        from cache.translation_cache import TranslationCache
+        from core.retry_queue import STRATEGY_ENDPOINT
+
+        try:
+            with open(os.path.join(self.input_folder, file_name), 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            return False, f"Okuma Hatası: {e}"
+
+        kind, value = strategy
+        provider = None
+        chunk = None
+        if kind == STRATEGY_ENDPOINT:
+            provider = providers.get(value)
+            if provider is None:
+                entry = next((e for e in self._all_endpoints if e[1].get("id") == value), None)
                 try:
-                    self._cache.set_paragraph(combined_orig, self.model_version, prompt_hash, combined)
+                    provider = self._create_endpoint_provider(*entry)
                 except Exception as e:
-                    app_logger.warning(f"Paragraf cache yazma hatası: {e}")
+                    return False, f"Endpoint başlatılamadı: {e}"
+                providers[value] = provider
+                self._providers_used.append(provider)
+        else:
+            chunk = value
+
+        paragraphs = TranslationCache.split_into_paragraphs(content) or [content.strip()]
+        results = {}
+        indices = list(range(len(paragraphs)))
+        groups = [indices[n:n + chunk] for n in range(0, len(indices), chunk)] if chunk else [indices]
+        if chunk and len(groups) < 2:
+            return None, f"{len(paragraphs)} paragraflık bölüm {chunk} paragraflık parçalara bölünmüyor"
+
+        self._mark_in_flight(file_name)
+        self._local.provider = provider
+        self._local.usage_targets = [(file_name, 1)]
+        try:
+            budget = self._chunk_token_budget()
+            for group in groups:
+                if not self.is_running:
+                    break
+                if len(group) == 1 and self._estimate_tokens(paragraphs[group[0]]) > budget:
+                    translated = self._translate_chunked(paragraphs[group[0]])
+                    if translated is None:
+                        break
+                    results[group[0]] = translated
+                elif not self._translate_segments(paragraphs, group, results, prompt_hash):
+                    break
+        finally:
+            self._local.provider = None
+            self._local.usage_targets = None
 
+        if len(results) < len(paragraphs):
+            reason = f"Çeviri Hatası: {len(paragraphs) - len(results)}/{len(paragraphs)} paragraf çevrilemedi"
+        else:
+            translated = "\n\n".join(results[i] for i in indices)
+            if not self.is_translation_failed(content, translated, file_name):
+                if self._save_batch_results({file_name: translated}):
+                    return False, "Dosya yazılamadı"
+                return True, None
+            reason = "Çeviri Hatası: Çeviri kalite kontrol başarısız"
+
+        # Başarısız denemenin paragrafları sonraki denemelerde cache'den dönmesin
         if self._cache:
-            self.cache_miss_count += 1
-
-        final_parts = [results[i] for i in range(len(paragraphs)) if results.get(i, "")]
-        return "\n\n".join(final_parts)
+            for idx in results:
+                try:
+                    self._cache.remove(paragraphs[idx], self.model_version, prompt_hash)
+                except Exception:
+                    pass
+        self._mark_failed(file_name, reason)
+        return False, reason
 
     def _translate_with_paragraph_cache(self, content: str, prompt_hash: str) -> str | None:
         """
@@ -488,12 +1252,12 @@ class TranslationWorker(QObject):
 
 
     def _process_single_file(self, i, file_name, prompt_hash, total_files):
-        # Duraklatma Döngüsü
-        while self.is_paused and self.is_running:
-            import time
-            time.sleep(0.5)
+        with self._usage_targets({file_name: 1}):
+            self._translate_single_file(i, file_name, prompt_hash, total_files)
 
-        if not self.is_running:
+    def _translate_single_file(self, i, file_name, prompt_hash, total_files):
+        # Duraklatma: devam veya durdurma gelene kadar bekler
+        if not self.cancel_token.wait_if_paused():
             return
 
         with self.data_lock:
@@ -505,20 +1269,19 @@ class TranslationWorker(QObject):
         translated_file_name = f"translated_{file_name}"
         translated_file_path = os.path.join(self.output_folder, translated_file_name)
 
-        with self.data_lock:
-            has_error = file_name in self.translation_errors
-
         # Zaten çevrilmişse pas geç
-        if os.path.exists(translated_file_path) and not has_error:
+        if self._is_completed(file_name):
+            if self._lease is not None:
+                self._lease.complete(file_name)
             self.progress.emit(i + 1, total_files)
             return
+        self._mark_in_flight(file_name)
 
         try:
             with open(original_file_path, 'r', encoding='utf-8') as f:
                 content_text = f.read()
         except Exception as e:
-            with self.data_lock:
-                self.translation_errors[file_name] = f"Okuma Hatası: {str(e)}"
+            self._mark_failed(file_name, f"Okuma Hatası: {str(e)}")
             self.progress.emit(i + 1, total_files)
             return
 
@@ -530,8 +1293,7 @@ class TranslationWorker(QObject):
                     f.write(para_result)
                 with self.data_lock:
                     self.translated_count_session += 1
-                    if file_name in self.translation_errors:
-                        del self.translation_errors[file_name]
+                self._mark_done(file_name)
                 app_logger.info(f"Paragraf bazlı çeviri tamamlandı: {file_name}")
                 self.progress.emit(i + 1, total_files)
                 return
@@ -559,21 +1321,24 @@ class TranslationWorker(QObject):
                     f.write(cached_translation)
                 with self.data_lock:
                     self.translated_count_session += 1
-                    if file_name in self.translation_errors:
-                        del self.translation_errors[file_name]
+                self._mark_done(file_name)
                 self.progress.emit(i + 1, total_files)
                 return
 
         if self._cache:
             with self.data_lock:
                 self.cache_miss_count += 1
-        if self.prompt_prefix:
-            full_prompt = self.prompt_prefix
-        else:
-            full_prompt = ""
-        if self.terminology_section:
-            full_prompt += "\n\n" + self.terminology_section
-        full_prompt += "\n\n" + content_text
+
+        if self._estimate_tokens(content_text) > self._chunk_token_budget():
+            # Bütçeyi aşan bölüm tek istekte kesilir; cümle sınırlarından parçalara bölünüp eşzamanlı çevrilir
+            translated_text = self._translate_chunked(content_text)
+            if translated_text is None and self.is_running:
+                self._mark_failed(file_name, "Çeviri Hatası: Parçalı çeviri başarısız")
+            self._finish_full_file(i, file_name, content_text, translated_text, prompt_hash, total_files)
+            return
+
+        static_prefix = self._build_static_prefix()
+        full_prompt = self._with_terms("\n\n" + content_text)
 
         translated_text = None
         last_error = ""
@@ -585,11 +1350,7 @@ class TranslationWorker(QObject):
         self.request_made.emit()
         
         while retry_count < self.max_retries:
-            while self.is_paused and self.is_running:
-                import time
-                time.sleep(0.5)
-
-            if not self.is_running:
+            if not self.cancel_token.wait_if_paused():
                 break
 
             # API çağrısından önce hangi endpoint'te olduğumuzu yakala (CAS için)
@@ -597,7 +1358,7 @@ class TranslationWorker(QObject):
                 my_ep_idx = self._current_endpoint_idx
 
             try:
-                translated_text = self.provider.generate(full_prompt)
+                translated_text = self._generate(self.provider, full_prompt, prefix=static_prefix)
                 with self.data_lock:
                     if file_name in self.translation_errors:
                         del self.translation_errors[file_name]
@@ -608,12 +1369,7 @@ class TranslationWorker(QObject):
                     retry_count += 1
                     wait_time = min(2 ** retry_count, 60)
                     self.global_error = f"Sunucu hatası ({last_error}). {wait_time} saniye sonra tekrar denenecek. Deneme Sayısı: {retry_count}/{self.max_retries}"
-                    import time
-                    sleep_start = time.time()
-                    while time.time() - sleep_start < wait_time:
-                        if not self.is_running:
-                            break
-                        time.sleep(0.5)
+                    self.cancel_token.sleep(wait_time)
                 elif ("429" in last_error) or ("ResourceExhausted" in last_error):
                     app_logger.warning(f"429 / ResourceExhausted [{file_name}] (EP idx={my_ep_idx}) — sonraki endpoint'e geçiliyor...")
                     if self._try_next_endpoint(my_ep_idx):
@@ -624,8 +1380,7 @@ class TranslationWorker(QObject):
                             self.global_error = "Tüm API endpoint'leri tükendi. Çeviri durduruluyor."
                             self.is_running = False
                         api_limit_hit = True
-                        with self.data_lock:
-                            self.translation_errors[file_name] = f"Kota Aşıldı: {last_error}"
+                        self._mark_failed(file_name, f"Kota Aşıldı: {last_error}")
                         try:
                             with open(translated_file_path, 'w', encoding='utf-8') as f:
                                 f.write(f"Çeviri hatası (Kota aşıldı): {last_error}\n\nOrijinal Metin:\n{content_text[:500]}...")
@@ -633,8 +1388,7 @@ class TranslationWorker(QObject):
                             pass
                         break
                 else:
-                    with self.data_lock:
-                        self.translation_errors[file_name] = f"Çeviri Hatası: {last_error}"
+                    self._mark_failed(file_name, f"Çeviri Hatası: {last_error}")
                     try:
                         with open(translated_file_path, 'w', encoding='utf-8') as f:
                             f.write(f"Çeviri hatası: {last_error}\n\nOrijinal Metin:\n{content_text[:500]}...")
@@ -642,19 +1396,24 @@ class TranslationWorker(QObject):
                         pass
                     break
 
+        self._finish_full_file(i, file_name, content_text, translated_text, prompt_hash, total_files)
+
+    def _finish_full_file(self, i, file_name, content_text, translated_text, prompt_hash, total_files):
+        """Tam dosya çevirisini kalite kontrolünden geçirip kaydeder ve cache'e yazar."""
+        translated_file_path = os.path.join(self.output_folder, f"translated_{file_name}")
         if not self.is_running:
             return
 
         if translated_text is not None:
             if self.is_translation_failed(content_text, translated_text, file_name):
                 app_logger.warning(f"Çeviri sonucu kalite kontrolünden geçemedi: {file_name}")
-                with self.data_lock:
-                    self.translation_errors[file_name] = "Çeviri Hatası: Çeviri kalite kontrol başarısız (çevrilmemiş metin / benzerlik >= %80 / CJK)"
+                self._mark_failed(file_name, "Çeviri Hatası: Çeviri kalite kontrol başarısız (çevrilmemiş metin / benzerlik >= %80 / CJK)")
             else:
                 with open(translated_file_path, 'w', encoding='utf-8') as f:
                     f.write(translated_text)
                 with self.data_lock:
                     self.translated_count_session += 1
+                self._mark_done(file_name)
 
                 if self._cache:
                     try:
@@ -666,43 +1425,325 @@ class TranslationWorker(QObject):
         self.progress.emit(i + 1, total_files)
 
     # ═══════════════════════════════════════════════════════
-    # BATCH ÇEVİRİ — Yeni metotlar
+    # PIPELINE — Aşamalı akış modu
     # ═══════════════════════════════════════════════════════
 
-    def build_batches(self, files: list[str]) -> list[list[str]]:
+    def _run_pipeline_mode(self, files_to_translate: list[str], total_files: int, prompt_hash: str):
         """
-        Dosya listesini maxBatchChars ve maxChaptersPerBatch limitine
-        göre batch'lere böler.
+        Çeviriyi sınırlı kuyruklarla bağlı aşamalara böler:
 
-        Her eleman batch: [dosya_adı_1, dosya_adı_2, ...]
+          ingest (I/O thread'leri) → segment/cache → dispatch (async_threads thread, eşzamanlı istek)
+          → validate (kalite kontrolü, CPU process pool) → persist (tek yazıcı)
+
+        Kuyruklar dolduğunda önceki aşamalar bekler; bellekte tutulan bölüm sayısı kuyruk
+        kapasiteleriyle sınırlıdır.  Başarısız bölümler sonunda _process_single_file() ile tek tek işlenir.
         """
-        batches = []
-        current_batch = []
-        current_chars = 0
+        import concurrent.futures
+        from cache.translation_cache import TranslationCache
+        from core.pipeline import Pipeline, Stage
 
-        for file_name in files:
-            file_path = os.path.join(self.input_folder, file_name)
+        dispatch_workers = self.async_threads if self.async_enabled else 1
+        failed = []
+
+        try:
+            qc_pool = concurrent.futures.ProcessPoolExecutor(max_workers=max(1, self.pipeline_qc_processes))
+        except Exception as e:
+            app_logger.warning(f"Kalite kontrol process pool oluşturulamadı, thread içinde çalışılacak: {e}")
+            qc_pool = None
+
+        def _ingest(job):
+            file_name = job["file_name"]
+            if self._is_completed(file_name):
+                self.progress.emit(job["index"] + 1, total_files)
+                return None
+            self._mark_in_flight(file_name)
             try:
-                file_size = os.path.getsize(file_path)
-            except OSError:
-                file_size = 0
+                with open(os.path.join(self.input_folder, file_name), 'r', encoding='utf-8') as f:
+                    job["content"] = f.read()
+            except Exception as e:
+                self._mark_failed(file_name, f"Okuma Hatası: {str(e)}")
+                self.progress.emit(job["index"] + 1, total_files)
+                return None
+            return job
 
-            # Yeni batch mi başlatılmalı?
-            if current_batch and (
-                current_chars + file_size > self.max_batch_chars
-                or len(current_batch) >= self.max_chapters_per_batch
-            ):
-                batches.append(current_batch)
-                current_batch = []
-                current_chars = 0
+        def _segment(job):
+            job["paragraphs"] = TranslationCache.split_into_paragraphs(job["content"])
+            job["results"], job["misses"] = self._lookup_cached_paragraphs(job["paragraphs"], prompt_hash)
+            if self._cache:
+                with self.data_lock:
+                    if job["misses"]:
+                        self.cache_miss_count += 1
+                    else:
+                        self.cache_hit_count += 1
+            return job
+
+        def _dispatch(job):
+            self.cancel_token.wait_if_paused()
+            ok = True
+            if job["misses"] and self.is_running:
+                with self._usage_targets({job["file_name"]: 1}):
+                    ok = self._translate_misses(job["paragraphs"], job["misses"], job["results"], prompt_hash)
+            elif job["misses"]:
+                ok = False
+            paragraphs = job["paragraphs"]
+            job["translated"] = "\n\n".join(
+                job["results"][i] for i in range(len(paragraphs)) if job["results"].get(i)
+            ) if ok else None
+            return job
+
+        def _validate(job):
+            text = job["translated"]
+            if text is None:
+                job["qc_failed"] = True
+            elif qc_pool is not None:
+                job["qc_failed"] = qc_pool.submit(
+                    self.quality_checker.is_translation_failed, job["content"], text, job["file_name"]
+                ).result()
+            else:
+                job["qc_failed"] = self.is_translation_failed(job["content"], text, job["file_name"])
+            return job
 
-            current_batch.append(file_name)
-            current_chars += file_size
+        def _dropped(job):
+            # Ingest'ten geçen bölümler in_flight işaretlenmişti; durdurmada atılınca kuyruğa geri döner
+            if "content" in job:
+                self._mark_queued(job["file_name"])
 
-        if current_batch:
-            batches.append(current_batch)
+        def _persist(job):
+            file_name = job["file_name"]
+            if job["qc_failed"] or self._save_batch_results({file_name: job["translated"]}):
+                with self.data_lock:
+                    failed.append(file_name)
+            self.progress.emit(job["index"] + 1, total_files)
+            return None
 
-        return batches
+        pipeline = Pipeline([
+            Stage("ingest", _ingest, workers=2, queue_size=4),
+            Stage("segment", _segment, workers=1, queue_size=4),
+            Stage("dispatch", _dispatch, workers=dispatch_workers, queue_size=dispatch_workers * 2),
+            Stage("validate", _validate, workers=max(1, self.pipeline_qc_processes), queue_size=4),
+            Stage("persist", _persist, workers=1, queue_size=8),
+        ], on_drop=_dropped)
+        app_logger.info(
+            f"Pipeline Çeviri başlatılıyor: {total_files} dosya, {dispatch_workers} eşzamanlı istek, "
+            f"{self.pipeline_qc_processes} kalite kontrol süreci."
+        )
+        pipeline.start()
+        # Durdurmada kuyruktaki bölümler bırakılır, dolu kuyrukta bekleyen put() hemen döner
+        remove_cancel = self.cancel_token.on_stop(pipeline.cancel)
+        # Limit gönderilen bölümlerle sınırlanır; kaydedilenlerle sınırlansaydı kuyruklardaki
+        # bölümler kadar aşılırdı.  Zaten tamamlanmış bölümler sayılmaz.
+        submitted = 0
+        try:
+            for i, file_name in iter(self.scheduler.next, None):
+                if not self.is_running:
+                    app_logger.info(f"Pipeline çeviri durduruldu, kalan: {len(self.scheduler) + 1}")
+                    pipeline.cancel()
+                    break
+                if self._is_completed(file_name):
+                    self.progress.emit(i + 1, total_files)
+                    continue
+                if self.file_limit is not None and submitted >= self.file_limit:
+                    app_logger.info(f"Belirlenen limit ({self.file_limit}) sayısına ulaşıldı.")
+                    break
+                if not pipeline.put({"index": i, "file_name": file_name}):
+                    break
+                submitted += 1
+        finally:
+            remove_cancel()
+            pipeline.close()
+            pipeline.join()
+            self.pipeline_stats = pipeline.metrics()
+            if qc_pool is not None:
+                qc_pool.shutdown(wait=True)
+
+        for file_name in sorted(failed):
+            if not self.is_running:
+                # Durdurulduysa tekli çeviriye kalan bölümler de in_flight bırakılmaz
+                self._mark_queued(file_name)
+                continue
+            app_logger.info(f"Pipeline fallback → tekli çeviri: {file_name}")
+            self._process_single_file(files_to_translate.index(file_name), file_name, prompt_hash, total_files)
+
+    # ═══════════════════════════════════════════════════════
+    # PARAGRAF HAVUZU — Bölümler arası paragraf toplama
+    # ═══════════════════════════════════════════════════════
+
+    def _request_token_budget(self, provider=None) -> int:
+        """Tek bir isteğin taşıyabileceği en fazla tahmini girdi token'ı (model girdi/çıktı sınırlarından)."""
+        limits = self._batch_limits(provider)
+        candidates = []
+        if limits.max_input_tokens:
+            candidates.append(limits.max_input_tokens)
+        if limits.max_output_tokens:
+            candidates.append(int(limits.max_output_tokens / max(limits.output_ratio, 0.1)))
+        return min(candidates) if candidates else 8000
+
+    def _run_pooled_mode(self, files_to_translate: list[str], total_files: int, prompt_hash: str):
+        """
+        Batch dışı modlarda bölümlerin cache-miss paragraflarını ortak bir havuzda toplar.
+        Havuz, token bütçesi dolduğunda veya gecikme sınırı aşıldığında tek istek gönderir;
+        async etkinse aynı anda async_threads kadar istek uçuşta olabilir.
+        Tamamlanamayan bölümler _process_single_file() ile tek tek işlenir.
+        """
+        from cache.translation_cache import TranslationCache
+        from core.paragraph_pool import ParagraphPool
+
+        def _translate_batch(texts, keys):
+            # Havuz isteğinin kullanımı, anahtarı (bölüm, paragraf index'i) olan paragrafların
+            # bölümlerine paylaştırılır; aynı metin iki bölümde geçse de her biri kendi payını alır
+            weights = {}
+            for text, (owner, _) in zip(texts, keys):
+                weights[owner] = weights.get(owner, 0) + len(text)
+            translated = {}
+            with self._usage_targets(weights):
+                if self.batch_output_mode == "json":
+                    self._translate_segments_json(texts, translated, prompt_hash)
+                else:
+                    self._translate_segments(texts, list(range(len(texts))), translated, prompt_hash)
+            return translated
+
+        budget = self._request_token_budget()
+        pool = ParagraphPool(
+            _translate_batch, token_budget=budget, max_wait_seconds=self.paragraph_pool_max_wait,
+            max_paragraphs=self.MAX_PARAGRAPHS_PER_BATCH,
+            workers=self.async_threads if self.async_enabled else 1,
+            model=getattr(self.provider, "model_id", None) or self.model_version,
+        )
+        app_logger.info(
+            f"Paragraf havuzu başlatılıyor: bütçe ~{budget} token, gecikme sınırı {self.paragraph_pool_max_wait}s."
+        )
+
+        failed = []
+
+        def _make_callback(i, file_name, state, miss_indices):
+            def _on_done(pool_results):
+                ok = True
+                for pos, idx in enumerate(miss_indices):
+                    text = pool_results.get(pos)
+                    if text is None:
+                        ok = False
+                    else:
+                        state["results"][idx] = text
+                if not ok or not self._finish_assembled_chapter(file_name, state):
+                    with self.data_lock:
+                        failed.append(file_name)
+                self.progress.emit(i + 1, total_files)
+            return _on_done
+
+        # Limit başlatılan bölümlerle sınırlanır; kaydedilen bölümler havuz isteği dönünce sayıldığından
+        # onlarla sınırlansaydı döngü tüm bölümleri havuza göndermiş olurdu.  Tamamlanmışlar sayılmaz.
+        submitted = 0
+        try:
+            for i, file_name in iter(self.scheduler.next, None):
+                if not self.cancel_token.wait_if_paused():
+                    app_logger.info(f"Havuzlu çeviri durduruldu, kalan: {len(self.scheduler) + 1}")
+                    break
+
+                if self._is_completed(file_name):
+                    self.progress.emit(i + 1, total_files)
+                    continue
+                if self.file_limit is not None and submitted >= self.file_limit:
+                    app_logger.info(f"Belirlenen limit ({self.file_limit}) sayısına ulaşıldı.")
+                    break
+                submitted += 1
+                self._mark_in_flight(file_name)
+
+                try:
+                    with open(os.path.join(self.input_folder, file_name), 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except Exception as e:
+                    self._mark_failed(file_name, f"Okuma Hatası: {str(e)}")
+                    self.progress.emit(i + 1, total_files)
+                    continue
+
+                paragraphs = TranslationCache.split_into_paragraphs(content)
+                results, miss_indices = self._lookup_cached_paragraphs(paragraphs, prompt_hash)
+                state = {"content": content, "paragraphs": paragraphs, "results": results}
+                if not miss_indices:
+                    with self.data_lock:
+                        self.cache_hit_count += 1
+                    if not self._finish_assembled_chapter(file_name, state):
+                        failed.append(file_name)
+                    self.progress.emit(i + 1, total_files)
+                    continue
+
+                if self._cache:
+                    with self.data_lock:
+                        self.cache_miss_count += 1
+                pool.submit(
+                    [paragraphs[idx] for idx in miss_indices],
+                    _make_callback(i, file_name, state, miss_indices),
+                    keys=[(file_name, idx) for idx in miss_indices],
+                )
+        finally:
+            pool.close(wait=True)
+            self.pool_stats = pool.stats()
+
+        for file_name in sorted(failed):
+            if not self.is_running:
+                break
+            app_logger.info(f"Havuz fallback → tekli çeviri: {file_name}")
+            self._process_single_file(files_to_translate.index(file_name), file_name, prompt_hash, total_files)
+
+    # ═══════════════════════════════════════════════════════
+    # BATCH ÇEVİRİ — Yeni metotlar
+    # ═══════════════════════════════════════════════════════
+
+    def build_batches(self, files: list[str]) -> list[list[str]]:
+        """
+        Dosya listesini token farkındalıklı first-fit-decreasing yöntemiyle batch'lere böler.
+
+        Sınırlar: maxBatchChars (karakter), maxChaptersPerBatch, modelin girdi token sınırı
+        (statik ön ek düşülerek) ve çıktı token sınırı (token × output_token_ratio).
+        Her batch içinde bölümler orijinal sırasını korur.
+
+        Her eleman batch: [dosya_adı_1, dosya_adı_2, ...]
+        """
+        from core.batch_planner import BatchItem, plan_batches, summarize_fill
+
+        items = []
+        for index, file_name in enumerate(files):
+            file_path = os.path.join(self.input_folder, file_name)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception:
+                content = ""
+            items.append(BatchItem(file_name, index, len(content), self._estimate_tokens(content)))
+
+        limits = self._batch_limits()
+        batches = plan_batches(items, limits)
+        self.batch_fill_stats = summarize_fill(batches, limits)
+        app_logger.info(
+            f"Batch planı: {len(batches)} batch, doluluk ort. %{self.batch_fill_stats['avg_fill'] * 100:.0f} "
+            f"(min %{self.batch_fill_stats['min_fill'] * 100:.0f}, maks %{self.batch_fill_stats['max_fill'] * 100:.0f})"
+        )
+        return [batch.names for batch in batches]
+
+    def _batch_limits(self, provider=None):
+        """Proje ayarları ve endpoint generation ayarından batch sınırlarını oluşturur."""
+        from core.batch_planner import BatchLimits
+
+        provider = provider or self.provider
+        gen = getattr(provider, "generation_config", None) or {}
+        output_ratio = float(gen.get("output_token_ratio", 2.0))
+
+        max_output = gen.get("output_token_limit")
+        if max_output:
+            reserve = provider.thinking_reserve() if hasattr(provider, "thinking_reserve") else 0
+            max_output = max(int(max_output) - reserve, 1)
+
+        max_input = gen.get("input_token_limit")
+        if max_input:
+            max_input = max(int(max_input) - self._estimate_tokens(self._build_static_prefix(), provider), 1)
+
+        return BatchLimits(
+            max_chars=self.max_batch_chars,
+            max_items=self.max_chapters_per_batch,
+            max_input_tokens=max_input,
+            max_output_tokens=max_output,
+            output_ratio=output_ratio,
+        )
 
     def format_batch_input(self, batch: list[str], contents: dict[str, str]) -> str:
         """
@@ -745,27 +1786,36 @@ class TranslationWorker(QObject):
             result[file_name] = chapter_text
 
             # Parse edilen bölümü paragraf bazlı cache'e yaz
-            if self._cache and file_name in contents:
-                original = contents[file_name]
-                from cache.translation_cache import TranslationCache
-                paragraphs = TranslationCache.split_into_paragraphs(original)
-                translated_paragraphs = TranslationCache.split_into_paragraphs(chapter_text)
-                if len(paragraphs) == len(translated_paragraphs):
-                    for orig_para, trans_para in zip(paragraphs, translated_paragraphs):
-                        try:
-                            self._cache.set_paragraph(orig_para, self.model_version, prompt_hash, trans_para)
-                        except Exception as e:
-                            app_logger.warning(f"Batch cache yazma hatası: {e}")
-                else:
-                    # Sayı uyuşmazsa tüm içeriği tek girdi olarak cache'e yaz
-                    try:
-                        self._cache.set_paragraph(original, self.model_version, prompt_hash, chapter_text)
-                    except Exception as e:
-                        app_logger.warning(f"Batch cache tek-parça yazma hatası: {e}")
+            if file_name in contents:
+                self._cache_chapter_translation(contents[file_name], chapter_text, prompt_hash)
 
         app_logger.info(f"Batch parse: {len(result)}/{len(batch)} bölüm parse edildi.")
         return result
 
+    def _cache_chapter_translation(self, original: str, translated: str, prompt_hash: str):
+        """
+        Bütün olarak çevrilmiş bir bölümü paragraf bazlı cache'e yazar.
+        Paragraflar yalnızca eksiksiz 1:1 hizalandığında ayrı ayrı yazılır; tahmini (kısmi) hizalama
+        yanlış paragraf çiftlerini cache'e kalıcı olarak işleyebileceğinden tüm içerik tek girdi olarak yazılır.
+        """
+        if not self._cache:
+            return
+        from cache.translation_cache import TranslationCache
+        from core.segment_protocol import align_segments
+        paragraphs = TranslationCache.split_into_paragraphs(original)
+        aligned, unmatched = align_segments(list(enumerate(paragraphs)), translated)
+        if not unmatched and len(aligned) == len(paragraphs):
+            for idx, trans_para in aligned.items():
+                try:
+                    self._cache.set_paragraph(paragraphs[idx], self.model_version, prompt_hash, trans_para)
+                except Exception as e:
+                    app_logger.warning(f"Batch cache yazma hatası: {e}")
+        else:
+            try:
+                self._cache.set_paragraph(original, self.model_version, prompt_hash, translated)
+            except Exception as e:
+                app_logger.warning(f"Batch cache tek-parça yazma hatası: {e}")
+
     def _process_batch(self, batch: list[str], batch_idx: int,
                        total_batches: int, prompt_hash: str) -> list[str]:
         """
@@ -780,9 +1830,7 @@ class TranslationWorker(QObject):
         Returns: Başarısız kalan dosya adları listesi (boş liste = tam başarı)
         """
         # Duraklatma / durdurma
-        while self.is_paused and self.is_running:
-            time.sleep(0.5)
-        if not self.is_running:
+        if not self.cancel_token.wait_if_paused():
             return batch
 
         app_logger.info(f"Batch {batch_idx + 1}/{total_batches}: {len(batch)} dosya işleniyor — {batch}")
@@ -797,20 +1845,21 @@ class TranslationWorker(QObject):
                     contents[file_name] = f.read()
             except Exception as e:
                 app_logger.error(f"Batch okuma hatası [{file_name}]: {e}")
-                with self.data_lock:
-                    self.translation_errors[file_name] = f"Okuma Hatası: {e}"
+                self._mark_failed(file_name, f"Okuma Hatası: {e}")
                 unreadable.append(file_name)
 
         readable_batch = [f for f in batch if f not in unreadable]
         if not readable_batch:
             return []
+        for file_name in readable_batch:
+            self._mark_in_flight(file_name)
+
+        if self.batch_output_mode == "json":
+            return self._process_batch_json(readable_batch, contents, batch_idx, prompt_hash)
 
         # Batch prompt oluştur
         batch_input = self.format_batch_input(readable_batch, contents)
-        full_prompt = self.prompt_prefix or ""
-        if self.terminology_section:
-            full_prompt += "\n\n" + self.terminology_section
-        full_prompt += (
+        full_prompt = (
             "\n\n[ÖNEMLİ: Aşağıda birden fazla bölüm verilmiştir. "
             "Her bölümü ===CHAPTER_START=== ile başlayan ve ===CHAPTER_END=== ile biten "
             "bloklar halinde ayrı ayrı çevir. Ayraçları ve sıralamayı kesinlikle koru.]\n\n"
@@ -821,7 +1870,8 @@ class TranslationWorker(QObject):
             self.api_request_count += 1
         self.request_made.emit()
 
-        response = self._call_api_with_retry(full_prompt)
+        with self._usage_targets({f: len(contents[f]) for f in readable_batch}):
+            response = self._call_api_with_retry(full_prompt, prefix=self._build_static_prefix())
 
         if response is None:
             app_logger.warning(f"Batch {batch_idx + 1}: API yanıtı alınamadı.")
@@ -837,6 +1887,18 @@ class TranslationWorker(QObject):
             return self._fallback_split_batch(readable_batch, batch_idx, total_batches, prompt_hash)
 
         # Başarılı olanları kaydet
+        failed.extend(self._save_batch_results(parsed))
+
+        # Parse edilemeyen dosyalar fallback'e
+        for file_name in readable_batch:
+            if file_name not in parsed:
+                failed.append(file_name)
+
+        return failed
+
+    def _save_batch_results(self, parsed: dict[str, str]) -> list[str]:
+        """Parse edilen bölümleri trslt'ye yazar.  Yazılamayan dosya adlarını döndürür."""
+        failed = []
         for file_name, chapter_text in parsed.items():
             translated_file_path = os.path.join(self.output_folder, f"translated_{file_name}")
             try:
@@ -844,19 +1906,67 @@ class TranslationWorker(QObject):
                     f.write(chapter_text)
                 with self.data_lock:
                     self.translated_count_session += 1
-                    if file_name in self.translation_errors:
-                        del self.translation_errors[file_name]
-                app_logger.info(f"Batch çeviri kaydedildi: {file_name}")
+                self._mark_done(file_name)
+                app_logger.info(f"Çeviri kaydedildi: {file_name}")
             except Exception as e:
                 app_logger.error(f"Batch kaydetme hatası [{file_name}]: {e}")
                 failed.append(file_name)
+        return failed
 
-        # Parse edilemeyen dosyalar fallback'e
-        for file_name in readable_batch:
-            if file_name not in parsed:
-                failed.append(file_name)
+    def _process_batch_json(self, batch: list[str], contents: dict[str, str],
+                            batch_idx: int, prompt_hash: str) -> list[str]:
+        """
+        Batch'i yapılandırılmış JSON modunda işler (Gemini response_schema / OpenAI json_schema).
 
-        return failed
+        Ayrıştırılabilen her bölüm kaydedilir; yanıtta eksik kalan kimlikler tek bir ek istekte
+        yeniden gönderilir (batch ikiye bölünmez).  Hâlâ eksik kalanlar tekli çeviriye bırakılır.
+
+        Returns: Başarısız kalan dosya adları listesi
+        """
+        from core.structured_output import (
+            BATCH_RESPONSE_SCHEMA, JSON_BATCH_INSTRUCTION, format_chapters_with_ids, parse_json_items,
+        )
+
+        remaining = list(batch)
+        for attempt in range(2):
+            if not remaining or not self.is_running:
+                break
+            id_map = {f"c{n + 1}": file_name for n, file_name in enumerate(remaining)}
+            full_prompt = JSON_BATCH_INSTRUCTION + format_chapters_with_ids(
+                [(item_id, contents[file_name]) for item_id, file_name in id_map.items()]
+            )
+
+            with self.data_lock:
+                self.api_request_count += 1
+            self.request_made.emit()
+
+            with self._usage_targets({f: len(contents[f]) for f in remaining}):
+                response = self._call_api_with_retry(
+                    full_prompt, prefix=self._build_static_prefix(), response_schema=BATCH_RESPONSE_SCHEMA
+                )
+            if response is None:
+                app_logger.warning(f"Batch {batch_idx + 1} (JSON): API yanıtı alınamadı.")
+                break
+
+            parsed = {}
+            for item_id, chapter_text in parse_json_items(response).items():
+                file_name = id_map.get(item_id)
+                if not file_name:
+                    continue
+                if self._has_excessive_cjk(chapter_text):
+                    app_logger.warning(f"Batch JSON parse: CJK oranı yüksek, atlanıyor — {file_name}")
+                    continue
+                parsed[file_name] = chapter_text
+                self._cache_chapter_translation(contents[file_name], chapter_text, prompt_hash)
+
+            save_failed = self._save_batch_results(parsed)
+            remaining = [f for f in remaining if f not in parsed] + save_failed
+            app_logger.info(
+                f"Batch {batch_idx + 1} (JSON, deneme {attempt + 1}): {len(parsed)} bölüm ayrıştırıldı, "
+                f"{len(remaining)} eksik."
+            )
+
+        return remaining
 
     def _fallback_split_batch(self, batch: list[str], batch_idx: int,
                               total_batches: int, prompt_hash: str) -> list[str]:
@@ -897,14 +2007,25 @@ class TranslationWorker(QObject):
         # Zaten çevrilmiş dosyaları atla
         pending = []
         for file_name in files_to_translate:
-            translated_path = os.path.join(self.output_folder, f"translated_{file_name}")
-            with self.data_lock:
-                has_error = file_name in self.translation_errors
-            if os.path.exists(translated_path) and not has_error:
+            if self._is_completed(file_name):
                 self.progress.emit(files_to_translate.index(file_name) + 1, total_files)
             else:
                 pending.append(file_name)
 
+        # Batch'ler bölüm sırasına göre dizildiğinden öncelik sırası batch sırasını da belirler
+        if self.scheduler:
+            pending = self.scheduler.ordered(pending)
+
+        if self._cache:
+            # Cache etkin: yalnızca cache-miss paragraflar bölümler arası paketlenerek gönderilir
+            app_logger.info(
+                f"Batch yolu: cache farkındalıklı paragraf batch'leri (çıktı biçimi: {self.batch_output_mode})."
+            )
+            self._run_cached_batch_mode(pending, files_to_translate, total_files, prompt_hash)
+            app_logger.info("Batch Çeviri tamamlandı.")
+            return
+
+        app_logger.info(f"Batch yolu: bölüm batch'leri (çıktı biçimi: {self.batch_output_mode}).")
         batches = self.build_batches(pending)
         app_logger.info(f"Batch Çeviri: {len(pending)} dosya, {len(batches)} batch oluşturuldu.")
 
@@ -928,6 +2049,12 @@ class TranslationWorker(QObject):
                 idx = files_to_translate.index(file_name) if file_name in files_to_translate else 0
                 self._process_single_file(idx, file_name, prompt_hash, total_files)
 
+        self._dispatch_batches(batches, _run_single_batch)
+
+        app_logger.info("Batch Çeviri tamamlandı.")
+
+    def _dispatch_batches(self, batches: list, run_one):
+        """Batch'leri async ayarına göre paralel (ThreadPoolExecutor) veya sıralı çalıştırır."""
         if self.async_enabled and len(batches) > 1:
             # ── Batch + Async: Batch'ler ThreadPoolExecutor ile paralel işlenir ──
             import concurrent.futures
@@ -937,12 +2064,14 @@ class TranslationWorker(QObject):
             )
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.async_threads) as executor:
                 future_to_idx = {
-                    executor.submit(_run_single_batch, (batch_idx, batch)): batch_idx
+                    self.cancel_token.track(executor.submit(run_one, (batch_idx, batch))): batch_idx
                     for batch_idx, batch in enumerate(batches)
                     if self.is_running
                 }
                 for fut in concurrent.futures.as_completed(future_to_idx):
                     b_idx = future_to_idx[fut]
+                    if fut.cancelled():
+                        continue
                     try:
                         fut.result()
                     except Exception as be:
@@ -956,9 +2085,355 @@ class TranslationWorker(QObject):
             for batch_idx, batch in enumerate(batches):
                 if not self.is_running:
                     break
-                _run_single_batch((batch_idx, batch))
+                run_one((batch_idx, batch))
 
-        app_logger.info("Batch Çeviri tamamlandı.")
+    def _run_cached_batch_mode(self, pending: list[str], files_to_translate: list[str],
+                               total_files: int, prompt_hash: str):
+        """
+        Cache farkındalıklı batch modu.
+
+          1. Her bölümün paragrafları cache'de aranır; tamamı cache'de olan bölümler doğrudan yazılır.
+          2. Kalan bölümlerin yalnızca cache-miss paragrafları, paragraf kimlikleriyle ([[P<n>]])
+             bölümler arası batch'lere paketlenir.
+          3. Her bölüm, cache'den gelen ve yeni çevrilen parçalarından yeniden birleştirilir.
+        Tamamlanamayan bölümler _process_single_file() ile tek tek işlenir (hazır paragraflar cache'ten gelir).
+        """
+        from cache.translation_cache import TranslationCache
+        from core.batch_planner import BatchItem, plan_batches, summarize_fill
+
+        progress_counter = [total_files - len(pending)]
+        chapters = {}       # dosya_adı -> {"content", "paragraphs", "results", "missing"}
+        units = []          # (dosya_adı, paragraf_index)
+
+        def _progress():
+            with self.data_lock:
+                progress_counter[0] += 1
+                cur = progress_counter[0]
+            self.progress.emit(cur, total_files)
+
+        for file_name in pending:
+            if not self.is_running:
+                return
+            file_path = os.path.join(self.input_folder, file_name)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                app_logger.error(f"Batch okuma hatası [{file_name}]: {e}")
+                self._mark_failed(file_name, f"Okuma Hatası: {e}")
+                _progress()
+                continue
+
+            paragraphs = TranslationCache.split_into_paragraphs(content)
+            results, miss_indices = self._lookup_cached_paragraphs(paragraphs, prompt_hash)
+            chapters[file_name] = {
+                "content": content, "paragraphs": paragraphs,
+                "results": results, "missing": set(miss_indices),
+            }
+            if not miss_indices:
+                with self.data_lock:
+                    self.cache_hit_count += 1
+                self._finish_assembled_chapter(file_name, chapters[file_name])
+                _progress()
+                continue
+            with self.data_lock:
+                self.cache_miss_count += 1
+            units.extend((file_name, idx) for idx in miss_indices)
+            self._mark_in_flight(file_name)
+
+        cached_chapters = sum(1 for c in chapters.values() if not c["missing"])
+        app_logger.info(
+            f"Batch cache taraması: {cached_chapters} bölüm tamamen cache'den, "
+            f"{len(chapters) - cached_chapters} bölümde {len(units)} paragraf çevrilecek."
+        )
+        if not units:
+            return
+
+        items = [
+            BatchItem(n, n, len(chapters[f]["paragraphs"][idx]), self._estimate_tokens(chapters[f]["paragraphs"][idx]))
+            for n, (f, idx) in enumerate(units)
+        ]
+        limits = self._batch_limits()
+        limits.max_items = self.MAX_PARAGRAPHS_PER_BATCH
+        planned = plan_batches(items, limits)
+        self.batch_fill_stats = summarize_fill(planned, limits)
+        batches = [[units[n] for n in batch.names] for batch in planned]
+        app_logger.info(
+            f"Batch Çeviri: {len(units)} paragraf, {len(batches)} batch oluşturuldu "
+            f"(doluluk ort. %{self.batch_fill_stats['avg_fill'] * 100:.0f})."
+        )
+
+        failed_chapters = set()
+
+        def _run_paragraph_batch(args):
+            batch_idx, batch = args
+            if not self.is_running:
+                return
+            app_logger.info(
+                f"Batch {batch_idx + 1}/{len(batches)}: {len(batch)} paragraf, "
+                f"{len({f for f, _ in batch})} bölüm işleniyor."
+            )
+            texts = [chapters[f]["paragraphs"][idx] for f, idx in batch]
+            weights = {}
+            for (file_name, _), text in zip(batch, texts):
+                weights[file_name] = weights.get(file_name, 0) + len(text)
+            translated = {}
+            with self._usage_targets(weights):
+                if self.batch_output_mode == "json":
+                    self._translate_segments_json(texts, translated, prompt_hash)
+                else:
+                    self._translate_segments(texts, list(range(len(texts))), translated, prompt_hash)
+
+            completed = []
+            with self.data_lock:
+                for n, (file_name, idx) in enumerate(batch):
+                    state = chapters[file_name]
+                    if n in translated:
+                        state["results"][idx] = translated[n]
+                        state["missing"].discard(idx)
+                    else:
+                        failed_chapters.add(file_name)
+                for file_name in {f for f, _ in batch}:
+                    state = chapters[file_name]
+                    if not state["missing"] and not state.get("done") and file_name not in failed_chapters:
+                        state["done"] = True
+                        completed.append(file_name)
+            for file_name in completed:
+                if not self._finish_assembled_chapter(file_name, chapters[file_name]):
+                    with self.data_lock:
+                        failed_chapters.add(file_name)
+                _progress()
+
+        self._dispatch_batches(batches, _run_paragraph_batch)
+
+        for file_name in files_to_translate:
+            if file_name not in failed_chapters:
+                continue
+            if not self.is_running:
+                break
+            app_logger.info(f"Batch fallback → tekli çeviri: {file_name}")
+            self._process_single_file(files_to_translate.index(file_name), file_name, prompt_hash, total_files)
+
+    def _finish_assembled_chapter(self, file_name: str, state: dict) -> bool:
+        """Cache'den ve yeni çeviriden gelen paragrafları birleştirip bölümü yazar."""
+        paragraphs = state["paragraphs"]
+        text = "\n\n".join(state["results"][i] for i in range(len(paragraphs)) if state["results"].get(i))
+        if self.is_translation_failed(state["content"], text, file_name):
+            app_logger.warning(f"Birleştirilen batch çevirisi kalite kontrolünden geçemedi: {file_name}")
+            return False
+        return not self._save_batch_results({file_name: text})
+
+    # ═══════════════════════════════════════════════════════
+    # BATCH JOB — Sağlayıcı batch API'si ile çevrimdışı mod
+    # ═══════════════════════════════════════════════════════
+
+    def _run_batch_job_mode(self, files_to_translate: list[str],
+                            total_files: int, prompt_hash: str):
+        """
+        Bekleyen tüm bölümleri sağlayıcının batch API'sine tek iş olarak gönderir,
+        iş tamamlanınca sonuçları trslt'ye ve cache'e aktarır.
+
+        Gönderim ve içe aktarma kaldığı yerden devam eder: açık işlerdeki bölümler
+        yeniden gönderilmez, durdurulan bir iş sonraki çalıştırmada sorgulanmaya devam eder.
+        """
+        from core.batch_job import BatchJobManager, create_batch_backend, STATUS_COMPLETED, STATUS_FAILED
+
+        if not self.project_path:
+            self.global_error = "Batch job modu için proje yolu gerekli."
+            return
+
+        backend = create_batch_backend(self.batch_job_backend, self.provider, self.project_path)
+        manager = BatchJobManager(self.project_path, backend)
+
+        in_flight = manager.pending_custom_ids()
+        pending = []
+        done_count = 0
+        for file_name in files_to_translate:
+            if self._is_completed(file_name):
+                done_count += 1
+            elif file_name not in in_flight:
+                pending.append(file_name)
+        self.progress.emit(done_count, total_files)
+
+        app_logger.info(
+            f"Batch Job modu: {len(pending)} yeni bölüm, {len(in_flight)} bölüm açık işlerde bekliyor "
+            f"(arka uç: {self.batch_job_backend})."
+        )
+
+        if pending:
+            prefix = self._build_static_prefix()
+            requests = {}
+            for file_name in pending:
+                if self.file_limit is not None and len(requests) >= self.file_limit:
+                    break
+                try:
+                    with open(os.path.join(self.input_folder, file_name), 'r', encoding='utf-8') as f:
+                        requests[file_name] = prefix + "\n\n" + self._with_terms(f.read())
+                except Exception as e:
+                    self._mark_failed(file_name, f"Okuma Hatası: {e}")
+            if requests:
+                manager.prepare(requests, self.provider.model_id)
+                for file_name in requests:
+                    self._mark_in_flight(file_name)
+
+        progress_counter = [done_count]
+        for job in manager.open_jobs():
+            if not self.is_running:
+                break
+            try:
+                manager.submit(job)
+            except Exception as e:
+                app_logger.error(f"Batch iş gönderilemedi ({job['job_id']}): {e}")
+                self.global_error = f"Batch iş gönderilemedi: {e}"
+                return
+            with self.data_lock:
+                self.api_request_count += 1
+            self.request_made.emit()
+
+            status = self._wait_for_batch_job(manager, job)
+            if status == STATUS_COMPLETED:
+                self._ingest_batch_job(manager, job, prompt_hash, total_files, progress_counter)
+            elif status == STATUS_FAILED:
+                self._fail_batch_job(manager, job)
+
+        app_logger.info("Batch Job modu tamamlandı.")
+
+    def _wait_for_batch_job(self, manager, job: dict) -> str:
+        """İş tamamlanana, başarısız olana veya çeviri durdurulana kadar sorgular."""
+        from core.batch_job import STATUS_SUBMITTED
+        while self.is_running:
+            try:
+                status = manager.poll(job)
+            except Exception as e:
+                app_logger.warning(f"Batch iş durumu sorgulanamadı ({job['job_id']}): {e}")
+                status = STATUS_SUBMITTED
+            if status != STATUS_SUBMITTED:
+                return status
+            self.cancel_token.sleep(self.batch_job_poll_seconds)
+        app_logger.info(f"Batch iş beklemesi durduruldu; sonraki çalıştırmada devam edilecek: {job['job_id']}")
+        return job["status"]
+
+    def _ingest_batch_job(self, manager, job: dict, prompt_hash: str,
+                          total_files: int, progress_counter: list):
+        """Tamamlanan işin sonuçlarını kalite kontrolünden geçirip trslt'ye ve cache'e yazar."""
+        received = set()
+        for file_name, text, error in manager.iter_results(job):
+            received.add(file_name)
+            if not self.is_running:
+                app_logger.info(f"Batch içe aktarma durduruldu; kaldığı yerden devam edilecek: {job['job_id']}")
+                return
+            self._ingest_batch_result(file_name, text, error, prompt_hash)
+            manager.mark_ingested(job, file_name)
+            progress_counter[0] += 1
+            self.progress.emit(min(progress_counter[0], total_files), total_files)
+
+        already = manager.load_ingested(job)
+        for file_name in job.get("custom_ids", []):
+            if file_name not in received and file_name not in already:
+                self._mark_failed(file_name, "Batch Hatası: Sonuç dosyasında yanıt yok.")
+        manager.finish(job)
+        app_logger.info(f"Batch iş içe aktarıldı: {job['job_id']}")
+
+    def _fail_batch_job(self, manager, job: dict):
+        """
+        Sağlayıcı tarafında başarısız olan işin içe aktarılmamış bölümlerini başarısız işaretler;
+        böylece yeniden deneme / yedek endpoint akışına girer ve hata listesinde görünür.
+        """
+        already = manager.load_ingested(job)
+        error = job.get("error") or "bilinmeyen hata"
+        failed = [name for name in job.get("custom_ids", []) if name not in already]
+        for file_name in failed:
+            self._mark_failed(file_name, f"Batch Hatası: İş başarısız ({error})")
+        app_logger.error(f"Batch iş başarısız, {len(failed)} bölüm hatalı işaretlendi: {job['job_id']}")
+
+    def _ingest_batch_result(self, file_name: str, text: str | None, error: str | None, prompt_hash: str):
+        if error or text is None:
+            self._mark_failed(file_name, f"Batch Hatası: {error}")
+            return
+        try:
+            with open(os.path.join(self.input_folder, file_name), 'r', encoding='utf-8') as f:
+                original = f.read()
+        except Exception as e:
+            self._mark_failed(file_name, f"Okuma Hatası: {e}")
+            return
+
+        text = text.strip()
+        if self.is_translation_failed(original, text, file_name):
+            self._mark_failed(file_name, "Çeviri Hatası: Batch sonucu kalite kontrol başarısız")
+            return
+
+        with open(os.path.join(self.output_folder, f"translated_{file_name}"), 'w', encoding='utf-8') as f:
+            f.write(text)
+        with self.data_lock:
+            self.translated_count_session += 1
+        self._mark_done(file_name)
+        self._cache_chapter_translation(original, text, prompt_hash)
+
+    def _report_token_usage(self):
+        """Çalıştırmanın, projenin (iş günlüğü toplamı) ve endpoint/anahtarların gerçek token kullanımını loglar."""
+        if self._journal is not None:
+            try:
+                self.project_token_usage = self._journal.usage_totals()
+            except Exception as e:
+                app_logger.warning(f"Proje token kullanımı okunamadı: {e}")
+        if not self.token_usage:
+            return
+        run = self.token_usage.to_dict()
+        elapsed = time.time() - self.translation_start_time if self.translation_start_time else 0
+        rate = f", {run['output_tokens'] / elapsed * 60:.0f} çıktı token/dk" if elapsed > 0 else ""
+        app_logger.info(
+            f"Token kullanımı (çalıştırma) — İstek: {run['requests']}, Girdi: {run['input_tokens']} "
+            f"(cache: {run['cached_tokens']}), Çıktı: {run['output_tokens']}, Düşünme: {run['thinking_tokens']}{rate}"
+        )
+        for ep_id, keys in self.token_usage_by_key.items():
+            for key_id, usage in keys.items():
+                u = usage.to_dict()
+                app_logger.info(
+                    f"  {ep_id} {key_id or '-'}: {u['requests']} istek, {u['input_tokens']} girdi, "
+                    f"{u['output_tokens']} çıktı, {u['thinking_tokens']} düşünme"
+                )
+        if self.project_token_usage:
+            p = self.project_token_usage.to_dict()
+            app_logger.info(
+                f"Token kullanımı (proje toplamı) — İstek: {p['requests']}, Girdi: {p['input_tokens']}, "
+                f"Çıktı: {p['output_tokens']}, Düşünme: {p['thinking_tokens']}"
+            )
+        self._report_token_calibration()
+
+    def _report_token_calibration(self):
+        """Aktif modelin token tahmini hatasını kalibrasyon öncesi/sonrası olarak loglar."""
+        from core.token_calibration import get_calibrator
+        model = getattr(self.provider, "model_id", None) or self.model_version
+        for entry in get_calibrator().error_report(model):
+            if entry["model"] != model or entry["before"]["mape"] is None:
+                continue
+            state = "etkin" if entry["calibrated"] else f"henüz etkin değil, {entry['observations']} örnek"
+            app_logger.info(
+                f"Token tahmini ({model}, kalibrasyon {state}) — ortalama hata: "
+                f"sabit oran %{entry['before']['mape']} → kalibre %{entry['after']['mape']} "
+                f"({entry['evaluation']} çapraz doğrulama)"
+            )
+
+    def _finalize_context_cache(self):
+        """Context cache ile tasarruf edilen input token'ları raporlar ve cache'leri serbest bırakır."""
+        saved_tokens = 0
+        hits = 0
+        creations = 0
+        for provider in self._providers_used:
+            try:
+                stats = provider.get_context_cache_stats()
+                saved_tokens += stats["cached_input_tokens"]
+                hits += stats["cache_hits"]
+                creations += stats["cache_creations"]
+                provider.release_context_cache()
+            except Exception as e:
+                app_logger.debug(f"Context cache sonlandırma hatası: {e}")
+        self.context_cache_saved_tokens = saved_tokens
+        if hits or creations:
+            app_logger.info(
+                f"Context cache — Tasarruf edilen input token: {saved_tokens}, "
+                f"Cache'li istek: {hits}, Oluşturulan cache: {creations}"
+            )
 
     def run(self):
         if not self.provider:
@@ -970,57 +2445,77 @@ class TranslationWorker(QObject):
 
         # Cache ve Terminology başlat
         self._init_cache_and_terminology()
+        self._init_cascade()
 
         # Prompt hash (cache key + batch mod için — her zaman hesaplanır)
         from cache.translation_cache import TranslationCache
         prompt_hash = TranslationCache.hash_prompt(self.prompt_prefix or "")
 
-        # Hata logunu yükle
-        if os.path.exists(self.error_log_path):
-            try:
-                with open(self.error_log_path, 'r', encoding='utf-8') as f:
-                    self.translation_errors = json.load(f)
-            except:
-                self.translation_errors = {}
+        # İş günlüğünü aç ve hata durumunu yükle
+        self._open_journal()
 
         try:
-            time.sleep(0.5)
             files_to_translate = sorted([f for f in os.listdir(self.input_folder) if f.endswith('.txt')])
             total_files = len(files_to_translate)
 
             self.translated_count_session = 0
+            self.scheduler = ChapterScheduler(
+                files_to_translate, selected=self.priority_files,
+                reading_position=self.reading_position, ahead_window=self.translate_ahead_window,
+            )
+            if self.shard_enabled and self.project_path:
+                self._open_lease_queue(files_to_translate)
+            elif self._journal:
+                # Paylaşımlı çeviride kuyruk durumu lease queue'dadır; ortak günlüğe 'queued' yazılmaz
+                # (başka düğümün yeni yazdığı 'done' kaydının üzerine yazılmasın diye)
+                self._journal.record_many(
+                    [f for f in files_to_translate if not self._is_completed(f)], STATE_QUEUED
+                )
 
-            if self.batch_enabled:
+            if self.batch_job_enabled:
+                # ─── Batch Job Modu (sağlayıcı batch API) ───
+                self._run_batch_job_mode(files_to_translate, total_files, prompt_hash)
+            elif self.batch_enabled:
                 # ─── Batch Modu ───
                 self._run_batch_mode(files_to_translate, total_files, prompt_hash)
+            elif self.pipeline_enabled:
+                # ─── Aşamalı Akış: ingest → segment/cache → dispatch → validate → persist ───
+                self._run_pipeline_mode(files_to_translate, total_files, prompt_hash)
+            elif self.paragraph_pool_enabled:
+                # ─── Paragraf Havuzu: miss paragraflar bölümler arası toplanır ───
+                self._run_pooled_mode(files_to_translate, total_files, prompt_hash)
             elif self.async_enabled:
                 import concurrent.futures
                 app_logger.info(f"Asenkron Çeviri: {self.async_threads} thread ile başlatılıyor. Toplam dosya: {total_files}")
                 
                 executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.async_threads)
                 futures = {}
-                
+
+                def _drain_scheduler(slot):
+                    # Her thread sıradaki en öncelikli bölümü alır; öncelik değişiklikleri anında geçerli olur
+                    while self.is_running:
+                        entry = self.scheduler.next()
+                        if entry is None:
+                            return
+                        i, file_name = entry
+                        try:
+                            self._process_single_file(i, file_name, prompt_hash, total_files)
+                            app_logger.debug(f"Async: Görev tamamlandı — {file_name}")
+                        except Exception as thread_e:
+                            app_logger.error(f"Async Thread İstisnası [{file_name}]: {type(thread_e).__name__}: {thread_e}")
+                    app_logger.warning(f"Async: is_running=False — thread {slot} yeni görev almıyor")
+
                 try:
-                    for i, file_name in enumerate(files_to_translate):
-                        if not self.is_running:
-                            app_logger.warning(f"Async: is_running=False — görev gönderimi durduruldu ({i}/{total_files})")
-                            break
-                        fut = executor.submit(self._process_single_file, i, file_name, prompt_hash, total_files)
-                        futures[fut] = file_name
-                    
-                    app_logger.info(f"Async: {len(futures)} görev gönderildi, tamamlanmaları bekleniyor...")
-                    
+                    for slot in range(self.async_threads):
+                        futures[executor.submit(_drain_scheduler, slot)] = slot
+
+                    app_logger.info(f"Async: {len(futures)} thread çalışıyor, tamamlanmaları bekleniyor...")
+
                     for fut in concurrent.futures.as_completed(futures):
-                        fname = futures[fut]
                         try:
                             fut.result()
-                            app_logger.debug(f"Async: Görev tamamlandı — {fname}")
                         except Exception as thread_e:
-                            app_logger.error(f"Async Thread İstisnası [{fname}]: {type(thread_e).__name__}: {thread_e}")
-                        
-                        if not self.is_running:
-                            app_logger.warning("Async: is_running=False — kalan görevler beklenecek, yeni görev gönderilmeyecek")
-                            break
+                            app_logger.error(f"Async Thread İstisnası [thread {futures[fut]}]: {type(thread_e).__name__}: {thread_e}")
                 finally:
                     # Executor'ı KAPATARAK tüm thread'lerin bitmesini bekle
                     # Bu satır QThread Destroyed hatasının esas çözümüdür
@@ -1030,12 +2525,15 @@ class TranslationWorker(QObject):
             else:
                 # Klasik Sıralı (Sequential) işlem
                 app_logger.info("Klasik (Ardışık) Çeviri başlatılıyor.")
-                for i, file_name in enumerate(files_to_translate):
+                for i, file_name in iter(self.scheduler.next, None):
                     if not self.is_running:
-                        app_logger.info(f"Sıralı çeviri durduruldu: {i}/{total_files}")
+                        app_logger.info(f"Sıralı çeviri durduruldu: {total_files - len(self.scheduler) - 1}/{total_files}")
                         break
                     self._process_single_file(i, file_name, prompt_hash, total_files)
-                    
+
+            if self.retry_attempts > 0 and not self.batch_job_enabled and self.is_running:
+                self._run_retry_queue(files_to_translate, total_files, prompt_hash)
+
         except Exception as e:
             import traceback
             app_logger.critical(f"TranslationWorker Kritik Hata: {type(e).__name__}: {e}\n{traceback.format_exc()}")
@@ -1065,6 +2563,53 @@ class TranslationWorker(QObject):
                     f"Süre: {elapsed:.1f}s"
                 )
 
+            if self.terminology_requests:
+                app_logger.info(
+                    f"Terminoloji alt kümesi — İstek: {self.terminology_requests}, "
+                    f"tasarruf edilen girdi: ~{self.terminology_tokens_saved} token "
+                    f"(tam liste ~{self._full_terminology_tokens} token/istek)"
+                )
+
+            if self.retry_stats:
+                app_logger.info(
+                    f"Yeniden deneme istatistikleri — Bölüm: {self.retry_stats['queued']}, "
+                    f"Kurtarılan: {self.retry_stats['recovered']}, Kalıcı hata: {self.retry_stats['failed']}, "
+                    f"Deneme: {self.retry_stats['attempts']}"
+                )
+
+            if self._cascade is not None:
+                self.cascade_stats = self._cascade.summary()
+                app_logger.info(self._cascade.format_summary())
+
+            if self.pipeline_stats:
+                app_logger.info(
+                    "Pipeline istatistikleri — " + ", ".join(
+                        f"{name}: işlenen {m['processed']}, maks kuyruk {m['max_depth']}/{m['capacity']}"
+                        for name, m in self.pipeline_stats.items()
+                    )
+                )
+
+            if self.pool_stats:
+                app_logger.info(
+                    f"Paragraf havuzu istatistikleri — İstek: {self.pool_stats['requests']}, "
+                    f"Paragraf: {self.pool_stats['paragraphs']}, "
+                    f"Ortalama doluluk: %{self.pool_stats['avg_fill'] * 100:.0f}"
+                )
+
+            if self.batch_fill_stats:
+                app_logger.info(
+                    f"Batch istatistikleri — Batch: {self.batch_fill_stats['batches']}, "
+                    f"Ortalama doluluk: %{self.batch_fill_stats['avg_fill'] * 100:.0f}"
+                )
+
+            self._finalize_context_cache()
+            self._close_lease_queue()
+            self._report_token_usage()
+
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
             try:
                 with open(self.error_log_path, 'w', encoding='utf-8') as f:
                     json.dump(self.translation_errors, f, indent=4, ensure_ascii=False)
@@ -1075,4 +2620,44 @@ class TranslationWorker(QObject):
             try:
                 self.finished.emit(self.shutdown_on_finish)
             except RuntimeError as e:
-                app_logger.error(f"TranslationWorker: finished.emit sonrası RuntimeError: {e}")
\ No newline at end of file
+                app_logger.error(f"TranslationWorker: finished.emit sonrası RuntimeError: {e}")
+
+def default_model_version() -> str:
+    """Arayüzdeki model seçimiyle aynı kaynak: AppConfigs/GVersion.ini."""
+    import configparser
+    config_path = os.path.join(os.getcwd(), "AppConfigs", "GVersion.ini")
+    config = configparser.ConfigParser()
+    if os.path.exists(config_path):
+        config.read(config_path)
+        return config.get("Version", "model_name", fallback="gemini-2.5-flash")
+    return "gemini-2.5-flash"
+
+
+def create_translation_worker(project_path: str, config, model_version: str = None,
+                              file_limit: int = None, priority_files: list[str] = None,
+                              quota=None, shard: bool = None, node_id: str = None) -> TranslationWorker:
+    """
+    Proje klasörü ve config.ini'den arayüz dışı (CLI / job server) kullanım için TranslationWorker oluşturur.
+    Proje çevrilemeyecek durumdaysa (API anahtarı/endpoint yok, dwnld boş) ValueError fırlatır.
+    shard verilirse config.ini'deki [Shard] shard_enabled ayarını geçersiz kılar.
+    """
+    api_key = config.get('API', 'gemini_api_key', fallback=None)
+    startpromt = config.get('Startpromt', 'startpromt', fallback=None)
+    kwargs = worker_kwargs_from_config(config)
+    if shard is not None:
+        kwargs["shard_enabled"] = shard
+    if not api_key and not kwargs["endpoint_id"]:
+        raise ValueError("Proje için API anahtarı veya MCP bağlantısı bulunamadı.")
+
+    input_folder = os.path.join(project_path, 'dwnld')
+    output_folder = os.path.join(project_path, 'trslt')
+    if not os.path.isdir(input_folder) or not any(f.endswith('.txt') for f in os.listdir(input_folder)):
+        raise ValueError("İndirilenler klasöründe çevrilecek dosya bulunamadı.")
+    os.makedirs(output_folder, exist_ok=True)
+
+    return TranslationWorker(
+        input_folder, output_folder, api_key, startpromt, model_version or default_model_version(),
+        file_limit=file_limit, project_path=project_path,
+        priority_files=priority_files or [], quota=quota, node_id=node_id,
+        **kwargs,
+    )
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 import configparser
 import time
 from PyQt6.QtWidgets import (
@@ -594,6 +595,8 @@ class MainWindow(QMainWindow):
         from ui.menu_bar_builder import build_menu_bar
         build_menu_bar(self)
     def update_file_list_from_selection(self):
+        # Önceki projenin bekleyen okuma konumu proje değişmeden yazılır
+        self.translation_ctrl.save_reading_position()
         self.file_table.setRowCount(0)
         current_item = self.project_list.currentItem()
         if not current_item:
@@ -780,6 +783,7 @@ class MainWindow(QMainWindow):
 
     # ─────────────── Kapatma ───────────────
     def closeEvent(self, event):
+        self.translation_ctrl.save_reading_position()
         controllers = [
             self.download_ctrl, self.translation_ctrl, self.cleaning_ctrl,
             self.merge_ctrl, self.token_ctrl, self.chapter_check_ctrl,
@@ -808,6 +812,8 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Dondurulmuş (cx_Freeze) sürümde kalite kontrol process pool'unun alt süreçleri için gerekli
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -33,12 +33,34 @@ try:
         "core.chapter_check_worker",
         "core.utils",
         "core.llm_provider",
+        "core.context_cache",
+        "core.batch_job",
+        "core.batch_planner",
+        "core.structured_output",
+        "core.segment_protocol",
+        "core.paragraph_pool",
+        "core.pipeline",
+        "core.job_journal",
+        "core.chapter_scheduler",
+        "core.model_cascade",
+        "core.retry_queue",
+        "core.chunker",
+        "core.qt_compat",
+        "core.cli",
+        "core.job_server",
+        "core.quota_scheduler",
+        "core.lease_queue",
+        "core.cancel_token",
+        "core.usage_metrics",
+        "core.token_calibration",
+        "core.script_classifier",
         "core.js_create",
         "core.token_controller",                    
         "core.theme_defaultCreate",                 
         "core.file_list_manager",
         "core.process_controller",
         "ui.request_counter_manager",
+        "ui.signal_aggregator",
         "ui.text_editor_dialog",
         "ui.api_stats_dialog",
         "ui.app_settings_dialog",
@@ -52,6 +74,7 @@ try:
         "ui.ml_terminology_range_dialog",           
         "cache.translation_cache",
         "terminology.terminology_manager",
+        "terminology.term_matcher",
     ]
 
     # --- Harici Kütüphaneler ---
@@ -0,0 +1,152 @@
+"""
+Term Matcher — Terim kaynaklarını tek geçişte bulan Aho-Corasick otomatı.
+
+  - Büyük/küçük harf duyarsız (casefold)
+  - CJK farkındalıklı: Latin/Kiril terimler yalnızca kelime sınırında eşleşir ("Qi" → "Qing" içinde
+    bulunmaz); CJK/Hangul terimler kelime sınırı aranmadan metnin herhangi bir yerinde eşleşir
+  - Artımlı güncelleme: yeni terimler mevcut trie'ye eklenir, silinen terimlerin çıktısı kaldırılır;
+    yalnızca hata (failure) bağlantıları bir sonraki aramadan önce yeniden hesaplanır
+
+Kullanım:
+    matcher = TermMatcher()
+    matcher.sync(["Nascent Soul", "Qi", "元婴"])
+    matcher.find("The nascent soul absorbed qi.")   # {"nascent soul", "qi"}
+"""
+
+import re
+import threading
+from collections import deque
+
+
+_CJK_CHAR = re.compile(
+    r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'   # Kana, CJK
+    r'\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]'                # Hangul
+)
+
+
+def _normalize(text: str) -> str:
+    return text.casefold()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class _Node:
+    __slots__ = ("children", "fail", "outputs")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.fail: "_Node | None" = None
+        self.outputs: set[str] = set()    # bu düğümde biten anahtarlar (fail zinciri hariç)
+
+
+class TermMatcher:
+    """Thread-safe Aho-Corasick otomatı.  Anahtarlar normalize edilmiş (casefold) terim kaynaklarıdır."""
+
+    def __init__(self):
+        self._root = _Node()
+        self._keys: set[str] = set()
+        self._boundary: dict[str, bool] = {}   # anahtar → kelime sınırı gerekli mi (CJK değilse)
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    # ──────── Güncelleme ────────
+
+    def add(self, source: str):
+        key = _normalize(source.strip())
+        if not key:
+            return
+        with self._lock:
+            if key in self._keys:
+                return
+            node = self._root
+            for ch in key:
+                node = node.children.setdefault(ch, _Node())
+            node.outputs.add(key)
+            self._keys.add(key)
+            self._boundary[key] = not _CJK_CHAR.search(key)
+            self._dirty = True
+
+    def remove(self, source: str):
+        """Terimin çıktısını kaldırır; trie düğümleri (başka terimlerin öneki olabilir) korunur."""
+        key = _normalize(source.strip())
+        with self._lock:
+            if key not in self._keys:
+                return
+            node = self._root
+            for ch in key:
+                node = node.children[ch]
+            node.outputs.discard(key)
+            self._keys.discard(key)
+            self._boundary.pop(key, None)
+
+    def sync(self, sources) -> tuple[int, int]:
+        """Otomatı verilen terim listesiyle eşitler; (eklenen, silinen) döndürür."""
+        wanted = {_normalize(s.strip()) for s in sources if s and s.strip()}
+        with self._lock:
+            current = set(self._keys)
+        removed = current - wanted
+        added = wanted - current
+        for key in removed:
+            self.remove(key)
+        for key in added:
+            self.add(key)
+        return len(added), len(removed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    # ──────── Arama ────────
+
+    def find(self, text: str) -> set[str]:
+        """Metinde geçen anahtarları (normalize edilmiş terim kaynakları) döndürür."""
+        if not text:
+            return set()
+        with self._lock:
+            if not self._keys:
+                return set()
+            if self._dirty:
+                self._build_failure_links()
+            haystack = _normalize(text)
+            found = set()
+            node = self._root
+            for pos, ch in enumerate(haystack):
+                while node is not self._root and ch not in node.children:
+                    node = node.fail
+                node = node.children.get(ch, self._root)
+                out = node
+                while out is not self._root:
+                    for key in out.outputs:
+                        if key not in found and self._at_boundary(haystack, pos, key):
+                            found.add(key)
+                    out = out.fail
+            return found
+
+    def _at_boundary(self, haystack: str, end: int, key: str) -> bool:
+        if not self._boundary.get(key):
+            return True
+        start = end - len(key) + 1
+        if _is_word_char(key[0]) and start > 0 and _is_word_char(haystack[start - 1]):
+            return False
+        if _is_word_char(key[-1]) and end + 1 < len(haystack) and _is_word_char(haystack[end + 1]):
+            return False
+        return True
+
+    def _build_failure_links(self):
+        """BFS ile hata bağlantılarını yeniden hesaplar (trie yapısı korunur)."""
+        self._root.fail = self._root
+        queue = deque()
+        for child in self._root.children.values():
+            child.fail = self._root
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in node.children.items():
+                fail = node.fail
+                while fail is not self._root and ch not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(ch, self._root)
+                queue.append(child)
+        self._dirty = False
@@ -6,6 +6,7 @@ Terminology Manager — Proje bazlı terim/terminoloji sözlüğü yönetimi.
   - Çeviri promptuna otomatik olarak terim kuralları ekler
   - Proje config/terminology.json dosyasında saklanır
   - Case-insensitive terim eşleştirme
+  - Bölüm bazlı terim alt kümesi: yalnızca metinde geçen terimler prompta eklenir (Aho-Corasick)
   - Toplu import/export desteği
 """
 
@@ -13,6 +14,7 @@ import os
 import json
 import re
 from logger import app_logger
+from terminology.term_matcher import TermMatcher
 
 
 # ────────────────────── Terim Çıkarma Prompt'u ──────────────────────
@@ -54,6 +56,7 @@ class TerminologyManager:
         self.project_path = project_path
         self.terms_file = os.path.join(project_path, "config", "terminology.json")
         self.terms: list[dict] = self._load()
+        self._matcher = TermMatcher()
 
     # ────────────────────── Yükleme / Kaydetme ──────────────────────
 
@@ -221,13 +224,28 @@ class TerminologyManager:
 
     # ────────────────────── Prompt Entegrasyonu ──────────────────────
 
-    def build_prompt_section(self) -> str:
-        """Çeviri promptuna eklenecek terminology bölümünü oluşturur."""
-        if not self.terms:
+    def terms_in(self, text: str) -> list[dict]:
+        """
+        Metinde geçen terimler (Aho-Corasick, büyük/küçük harf duyarsız, CJK farkındalıklı).
+        Otomat önbellekte tutulur; terim listesi değiştiyse yalnızca farklar eklenir/silinir.
+        """
+        if not self.terms or not text:
+            return []
+        self._matcher.sync(t["source"] for t in self.terms if t.get("source"))
+        found = self._matcher.find(text)
+        return [t for t in self.terms if t.get("source") and t["source"].strip().casefold() in found]
+
+    def build_prompt_section(self, text: str | None = None) -> str:
+        """
+        Çeviri promptuna eklenecek terminology bölümünü oluşturur.
+        text verilirse yalnızca o metinde geçen terimler eklenir.
+        """
+        terms = self.terms if text is None else self.terms_in(text)
+        if not terms:
             return ""
 
         lines = ["[TERMİNOLOJİ KURALLARI - Aşağıdaki terimleri çeviride birebir kullanın:]"]
-        for t in self.terms:
+        for t in terms:
             line = f"  • {t['source']} → {t['target']}"
             if t.get("note") and t["note"] != "auto-extracted":
                 line += f" ({t['note']})"
@@ -235,6 +253,21 @@ class TerminologyManager:
         lines.append("[TERMİNOLOJİ SONU]")
         return "\n".join(lines)
 
+    # ────────────────────── Tutarlılık Kontrolü ──────────────────────
+
+    def find_violations(self, source_text: str, translated_text: str) -> list[dict]:
+        """
+        Kaynak metinde geçen fakat çeviride karşılığı kullanılmayan terimleri döndürür
+        (büyük/küçük harf duyarsız).
+        """
+        if not self.terms or not source_text or not translated_text:
+            return []
+        translated_lower = translated_text.casefold()
+        return [
+            t for t in self.terms_in(source_text)
+            if t.get("target") and t["target"].casefold() not in translated_lower
+        ]
+
     # ────────────────────── Import / Export ──────────────────────
 
     def import_from_text(self, text: str, delimiter: str = "="):
@@ -1,98 +1,172 @@
 """
 ApiStatsDialog — API kullanım istatistikleri diyaloğu.
+
+Veriler core.usage_metrics deposunun toplanmış (rollup) tablolarından yalnızca seçilen aralık
+için okunur: son 1 saat dakika, son 48 saat saat, son 30 gün gün çözünürlüğünde.
 """
 
-from datetime import date, timedelta
+import time
+from datetime import datetime
 from PyQt6.QtWidgets import (
     QDialog, QHeaderView, QVBoxLayout, QHBoxLayout, QTabWidget, QWidget,
-    QTableWidget, QTableWidgetItem, QPushButton, QLabel
+    QTableWidget, QTableWidgetItem, QPushButton, QLabel, QComboBox
 )
 from PyQt6.QtCore import Qt
 
+from core.usage_metrics import get_metrics_store, bucket_start
+
+# (etiket, çözünürlük, aralık saniye, eksen etiketi biçimi)
+RANGES = [
+    ("Son 1 saat (dakika)", "minute", 3600, "%H:%M"),
+    ("Son 48 saat (saat)", "hour", 48 * 3600, "%d.%m %H:00"),
+    ("Son 30 gün (gün)", "day", 30 * 86400, "%m-%d"),
+]
+
+TABLE_HEADERS = ["Endpoint", "Anahtar", "İstek", "Hata", "Girdi Token", "Çıktı Token",
+                 "p50 (sn)", "p95 (sn)", "p99 (sn)", "Hata Kodları"]
+
+
+def _fmt_latency(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def _draw_chart(fig, rows, resolution, span, time_format):
+    """İstek (çubuk) ve hata (çizgi) serisini aralıktaki tüm kovalar için çizer."""
+    step = {"minute": 60, "hour": 3600, "day": 86400}[resolution]
+    per_bucket = {}
+    for row in rows:
+        requests, errors = per_bucket.get(row["bucket"], (0, 0))
+        per_bucket[row["bucket"]] = (requests + row["requests"], errors + row["errors"])
+    now = time.time()
+    buckets = []
+    ts = bucket_start(now - span + step, resolution)
+    while ts <= now:
+        buckets.append(ts)
+        # Gün kovaları yerel gece yarısıdır; yaz saati geçişlerinde de bir sonraki güne denk gelir
+        ts = bucket_start(ts + step + (3600 if resolution == "day" else 0), resolution)
+
+    fig.clear()
+    ax = fig.add_subplot(111)
+    ax.set_facecolor('#2D2D30')
+    x = list(range(len(buckets)))
+    requests = [per_bucket.get(b, (0, 0))[0] for b in buckets]
+    errors = [per_bucket.get(b, (0, 0))[1] for b in buckets]
+    ax.bar(x, requests, color='#4CAF50', alpha=0.85, edgecolor='#2E7D32', label='İstek')
+    if any(errors):
+        ax.plot(x, errors, color='#F44336', marker='.', linewidth=1.2, label='Hata')
+    tick_every = max(1, len(buckets) // 12)
+    ax.set_xticks(x[::tick_every])
+    ax.set_xticklabels([datetime.fromtimestamp(b).strftime(time_format) for b in buckets[::tick_every]],
+                       rotation=45, ha='right', fontsize=8)
+    ax.set_title(f'API İstekleri ({len(buckets)} kova)', color='white', fontsize=12)
+    ax.tick_params(colors='white')
+    ax.spines['bottom'].set_color('#555')
+    ax.spines['left'].set_color('#555')
+    ax.spines['top'].set_color('#1E1E1E')
+    ax.spines['right'].set_color('#1E1E1E')
+    ax.legend(facecolor='#2D2D30', labelcolor='white', fontsize=8)
+    fig.tight_layout()
+
+
+def _fill_table(table, summary):
+    table.setRowCount(len(summary))
+    for i, row in enumerate(summary):
+        codes = ", ".join(f"{code}×{count}" for code, count in sorted(row["error_codes"].items()))
+        values = [row["endpoint"], row["key_id"] or "-", str(row["requests"]), str(row["errors"]),
+                  str(row["input_tokens"]), str(row["output_tokens"]),
+                  _fmt_latency(row["latency_p50"]), _fmt_latency(row["latency_p95"]),
+                  _fmt_latency(row["latency_p99"]), codes]
+        for col, value in enumerate(values):
+            table.setItem(i, col, QTableWidgetItem(value))
+
+
+def _peak_info(rows) -> str:
+    """Dakika serisinde en yüksek istek/token dakikası (RPM/TPM ayarı için)."""
+    per_minute = {}
+    for row in rows:
+        requests, tokens = per_minute.get(row["bucket"], (0, 0))
+        per_minute[row["bucket"]] = (requests + row["requests"],
+                                     tokens + row["input_tokens"] + row["output_tokens"])
+    if not per_minute:
+        return ""
+    peak_rpm = max(v[0] for v in per_minute.values())
+    peak_tpm = max(v[1] for v in per_minute.values())
+    return f"   |   En yüksek dakika: {peak_rpm} istek, {peak_tpm} token"
+
 
 def show_api_stats_dialog(main_window):
-    stats = main_window.request_counter_manager.get_daily_stats()
+    store = get_metrics_store()
     dialog = QDialog(main_window)
     dialog.setWindowTitle("📊 API Kullanım İstatistikleri")
-    dialog.resize(700, 500)
+    dialog.resize(900, 560)
     main_layout = QVBoxLayout(dialog)
+
+    range_row = QHBoxLayout()
+    range_row.addWidget(QLabel("Aralık:"))
+    range_combo = QComboBox()
+    for label, *_ in RANGES:
+        range_combo.addItem(label)
+    range_row.addWidget(range_combo)
+    range_row.addStretch()
+    main_layout.addLayout(range_row)
+
     tabs = QTabWidget()
 
     # ── Matplotlib Grafik ──
+    fig = canvas = None
+    chart_tab = QWidget()
+    chart_layout = QVBoxLayout(chart_tab)
     try:
-        import matplotlib
-        # Backend'i yalnızca henüz başlatılmamışsa ayarla.
-        # Çeviri sırasında zaten 'QtAgg' yüklüyse 'Agg' yazmak
-        # Qt event loop'unu bozuyor ve worker thread'i askıya alıyor.
-        if not matplotlib.is_interactive() and matplotlib.get_backend().lower() == "agg":
-            pass  # Zaten Agg, sorun yok
-        else:
-            # Aktif Qt oturumunda backend değiştirilmez; sadece figure
-            # oluşturulurken Agg renderer kullanılır (FigureCanvasAgg).
-            pass
-
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        # Aktif Qt oturumunda backend değiştirilmez (worker thread'ini askıya alıyor);
+        # figure doğrudan QtAgg canvas'ına çizilir.
         from matplotlib.figure import Figure
         from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 
         fig = Figure(figsize=(8, 4), facecolor='#1E1E1E')
-        ax = fig.add_subplot(111)
-        ax.set_facecolor('#2D2D30')
-        days = [(str(date.today() - timedelta(days=i))) for i in range(6, -1, -1)]
-        totals = [sum(stats.get(d, {}).values()) for d in days]
-        short_days = [d[5:] for d in days]
-        bars = ax.bar(short_days, totals, color='#4CAF50', alpha=0.85, edgecolor='#2E7D32')
-        ax.set_title('Son 7 Günük API İstekleri', color='white', fontsize=12)
-        ax.tick_params(colors='white')
-        ax.spines['bottom'].set_color('#555')
-        ax.spines['left'].set_color('#555')
-        ax.spines['top'].set_color('#1E1E1E')
-        ax.spines['right'].set_color('#1E1E1E')
-        for bar, val in zip(bars, totals):
-            if val > 0:
-                ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + 0.1,
-                        str(val), ha='center', va='bottom', color='white', fontsize=9)
-        fig.tight_layout()
-        chart_tab = QWidget()
-        chart_layout = QVBoxLayout(chart_tab)
         canvas = FigureCanvas(fig)
         chart_layout.addWidget(canvas)
-        tabs.addTab(chart_tab, "📊 Grafik")
     except ImportError:
-        chart_tab = QWidget()
         lbl = QLabel("matplotlib yüklenmediğinden grafik gösterilemiyor.\npip install matplotlib")
         lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        QVBoxLayout(chart_tab).addWidget(lbl)
-        tabs.addTab(chart_tab, "📊 Grafik")
-
+        chart_layout.addWidget(lbl)
+    tabs.addTab(chart_tab, "📊 Grafik")
 
-    # ── Tablo ──
+    # ── Tablo (endpoint / anahtar özeti) ──
     table_tab = QWidget()
     table_layout = QVBoxLayout(table_tab)
-    all_rows = []
-    for day, apis in sorted(stats.items(), reverse=True):
-        for api_key, count in apis.items():
-            all_rows.append((day, api_key, count))
-    table = QTableWidget(len(all_rows), 3)
-    table.setHorizontalHeaderLabels(["Tarih", "API / Model", "Toplam İstek"])
-    table.horizontalHeader().setStretchLastSection(True)
+    table = QTableWidget(0, len(TABLE_HEADERS))
+    table.setHorizontalHeaderLabels(TABLE_HEADERS)
     table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-    for i, (day, api, count) in enumerate(all_rows):
-        table.setItem(i, 0, QTableWidgetItem(day))
-        table.setItem(i, 1, QTableWidgetItem(api))
-        table.setItem(i, 2, QTableWidgetItem(str(count)))
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    table.horizontalHeader().setStretchLastSection(True)
     table_layout.addWidget(table)
     tabs.addTab(table_tab, "📝 Tablo")
     main_layout.addWidget(tabs)
-    table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # Tarih ve API sütunları genişlesin
-    table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # İstek
-    table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # İstek sayısı sütunu esnek olsun
-    today_count = main_window.request_counter_manager.get_total_today()
-    info_label = QLabel(f"Bugünkü toplam istek: {today_count}")
+
+    info_label = QLabel()
     info_label.setStyleSheet("font-size: 11pt; padding: 4px;")
     main_layout.addWidget(info_label)
 
+    def refresh():
+        _, resolution, span, time_format = RANGES[range_combo.currentIndex()]
+        since = time.time() - span
+        rows = store.query(resolution, since)
+        summary = store.query(resolution, since, by_bucket=False)
+        summary.sort(key=lambda r: r["requests"], reverse=True)
+        if fig is not None:
+            _draw_chart(fig, rows, resolution, span, time_format)
+            canvas.draw()
+        _fill_table(table, summary)
+        today = store.totals(bucket_start(time.time(), "day"))
+        text = (f"Bugünkü toplam istek: {today['requests']}  (hata: {today['errors']}, "
+                f"token: {today['input_tokens']} girdi / {today['output_tokens']} çıktı)")
+        if resolution == "minute":
+            text += _peak_info(rows)
+        info_label.setText(text)
+
+    range_combo.currentIndexChanged.connect(lambda _i: refresh())
+    refresh()
+
     close_btn = QPushButton("Kapat")
     close_btn.clicked.connect(dialog.close)
     btn_row = QHBoxLayout()
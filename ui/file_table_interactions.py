@@ -62,6 +62,8 @@ class FileTableInteractions:
             return
         if column == 1:
             file_path = os.path.join(self.win.current_project_path, 'dwnld', file_name)
+            # Açılan orijinal bölüm okuma konumu olarak kaydedilir (önden çeviri penceresi)
+            self.win.translation_ctrl.update_reading_position(file_name)
         else:
             status = self.win.file_table.item(row, 5).text() if self.win.file_table.item(row, 5) else ""
             if "Birleştirildi" in status or tr("file_table.status_merged", "Birleştirildi") in status:
@@ -388,7 +388,8 @@ class MCPServerDialog(QDialog):
             found = False
             for i, ep in enumerate(endpoints):
                 if ep["id"] == ep_id:
-                    endpoints[i] = new_ep
+                    # Formda olmayan gelişmiş ayarları (context_cache vb.) koru
+                    endpoints[i] = {**ep, **new_ep}
                     found = True
                     break
             if not found:
@@ -6,6 +6,10 @@ V2.1.0 İyileştirmeleri:
   - get_daily_stats() ile geçmiş istatistiklere erişim
   - Geriye uyumluluk: eski get_count() / increment() API'leri korunuyor
 
+Kalıcılık: sayaçlar bellekte güncellenir; dosyalar arka plan thread'inde en fazla
+FLUSH_INTERVAL saniyede bir (yalnızca değişiklik varsa) yazılır.  Uygulama kapanırken close()
+ile son durum diske yazılır.
+
 Veri Formatı (request_stats.json):
 {
   "2026-04-03": {
@@ -18,13 +22,18 @@ Veri Formatı (request_stats.json):
 
 import os
 import json
+import atexit
 import datetime
+import threading
 from logger import app_logger
 
 
 class RequestCounterManager:
     """Yapay zeka API istek sayısını endpoint/model bazında günlük takip eden sınıf."""
 
+    # Değişikliklerin diske yazılma aralığı (saniye)
+    FLUSH_INTERVAL = 2.0
+
     def __init__(self, config_folder="AppConfigs"):
         self.config_folder = os.path.join(os.getcwd(), config_folder)
         os.makedirs(self.config_folder, exist_ok=True)
@@ -34,6 +43,10 @@ class RequestCounterManager:
         # Eski uyumluluk dosyası (geriye uyumluluk için korunuyor)
         self.count_file = os.path.join(self.config_folder, "request_count.json")
 
+        self._lock = threading.RLock()
+        self._stats_dirty = False
+        self._legacy_dirty = False
+
         self._stats: dict = {}  # {"tarih": {"api_key": count}}
         self._load_stats()
 
@@ -44,6 +57,53 @@ class RequestCounterManager:
         self.last_api_key_name = ""
         self._load_legacy()
 
+        # Arka plan yazıcısı: UI thread'i dosya yazımıyla meşgul edilmez
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="request-counter-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # ─────────────── Kalıcılık (arka plan yazıcısı) ───────────────
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Bekleyen değişiklikleri diske yazar (değişiklik yoksa hiçbir şey yapmaz)."""
+        with self._lock:
+            stats = {day: dict(counts) for day, counts in self._stats.items()} if self._stats_dirty else None
+            legacy = {
+                "count": self.count,
+                "last_date": self.last_date,
+                "last_model": self.last_model,
+                "last_api_key_name": self.last_api_key_name,
+            } if self._legacy_dirty else None
+            self._stats_dirty = self._legacy_dirty = False
+        if stats is not None:
+            self._write_json(self.stats_file, stats, indent=2)
+        if legacy is not None:
+            self._write_json(self.count_file, legacy, indent=4)
+
+    def close(self):
+        """Arka plan yazıcısını durdurur ve son durumu diske yazar."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+
+    @staticmethod
+    def _write_json(path: str, data: dict, indent: int):
+        # Önce geçici dosyaya yazılır: yazım sırasında çökme dosyayı bozmaz
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            app_logger.error(f"{os.path.basename(path)} kaydedilemedi: {e}")
+
     # ─────────────── Yeni Çok-API İstatistik Sistemi ───────────────
 
     def _load_stats(self):
@@ -57,40 +117,39 @@ class RequestCounterManager:
                 self._stats = {}
 
     def _save_stats(self):
-        """Detaylı istatistikleri kaydeder."""
-        try:
-            with open(self.stats_file, "w", encoding="utf-8") as f:
-                json.dump(self._stats, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            app_logger.error(f"request_stats.json kaydedilemedi: {e}")
+        """Detaylı istatistikleri yazılmak üzere işaretler (arka plan yazıcısı kaydeder)."""
+        self._stats_dirty = True
 
-    def record_request(self, model: str = "", api_key_name: str = ""):
+    def record_request(self, model: str = "", api_key_name: str = "", count: int = 1):
         """
         API isteğini tarih + endpoint anahtarıyla kaydeder.
         
         Args:
             model: Model adı (örn: 'gemini-2.5-flash')
             api_key_name: API anahtarı adı veya endpoint adı
+            count: Kaydedilecek istek sayısı (toplu güncelleme)
         """
         today = str(datetime.date.today())
         # Anahtar: "model-apiname" veya sadece model
         key = f"{model}-{api_key_name}" if api_key_name else (model or "unknown")
         
-        if today not in self._stats:
-            self._stats[today] = {}
-        
-        self._stats[today][key] = self._stats[today].get(key, 0) + 1
-        self._save_stats()
-        app_logger.debug(f"API isteği kaydedildi: {today}/{key} = {self._stats[today][key]}")
+        with self._lock:
+            if today not in self._stats:
+                self._stats[today] = {}
+            self._stats[today][key] = self._stats[today].get(key, 0) + count
+            self._save_stats()
+            app_logger.debug(f"API isteği kaydedildi: {today}/{key} = {self._stats[today][key]}")
 
     def get_daily_stats(self) -> dict:
         """Tüm geçmiş günlerin istatistiklerini döndürür."""
-        return dict(self._stats)
+        with self._lock:
+            return {day: dict(counts) for day, counts in self._stats.items()}
 
     def get_today_stats(self) -> dict:
         """Bugünkü API istek sayılarını döndürür."""
         today = str(datetime.date.today())
-        return self._stats.get(today, {})
+        with self._lock:
+            return dict(self._stats.get(today, {}))
 
     def get_total_today(self) -> int:
         """Bugünkü toplam istek sayısını döndürür."""
@@ -100,10 +159,11 @@ class RequestCounterManager:
         """Son N günün istatistiklerini döndürür."""
         result = {}
         today = datetime.date.today()
-        for i in range(days):
-            day = str(today - datetime.timedelta(days=i))
-            if day in self._stats:
-                result[day] = self._stats[day]
+        with self._lock:
+            for i in range(days):
+                day = str(today - datetime.timedelta(days=i))
+                if day in self._stats:
+                    result[day] = dict(self._stats[day])
         return result
 
     # ─────────────── Geriye Uyumluluk (Eski API) ───────────────
@@ -123,49 +183,43 @@ class RequestCounterManager:
         self._check_reset_legacy(self.last_model, self.last_api_key_name)
 
     def _save_legacy(self):
-        data = {
-            "count": self.count,
-            "last_date": self.last_date,
-            "last_model": self.last_model,
-            "last_api_key_name": self.last_api_key_name,
-        }
-        try:
-            with open(self.count_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            app_logger.error(f"request_count.json kaydedilemedi: {e}")
+        """Eski sayacı yazılmak üzere işaretler (arka plan yazıcısı kaydeder)."""
+        self._legacy_dirty = True
 
     def _check_reset_legacy(self, current_model, current_api_key_name):
         today = str(datetime.date.today())
-        should_reset = False
-        if today != self.last_date:
-            should_reset = True
-        elif current_model and current_model != self.last_model:
-            should_reset = True
-        elif current_api_key_name and current_api_key_name != self.last_api_key_name:
-            should_reset = True
-
-        if should_reset:
-            self.count = 0
-            self.last_date = today
-            if current_model:
-                self.last_model = current_model
-            if current_api_key_name:
-                self.last_api_key_name = current_api_key_name
-            self._save_legacy()
+        with self._lock:
+            should_reset = False
+            if today != self.last_date:
+                should_reset = True
+            elif current_model and current_model != self.last_model:
+                should_reset = True
+            elif current_api_key_name and current_api_key_name != self.last_api_key_name:
+                should_reset = True
+
+            if should_reset:
+                self.count = 0
+                self.last_date = today
+                if current_model:
+                    self.last_model = current_model
+                if current_api_key_name:
+                    self.last_api_key_name = current_api_key_name
+                self._save_legacy()
 
     def get_count(self, current_model, current_api_key_name):
         """Geriye uyumluluk — günlük istek sayısını döndürür."""
-        self._check_reset_legacy(current_model, current_api_key_name)
-        return self.count
-
-    def increment(self, current_model, current_api_key_name):
-        """Geriye uyumluluk — sayacı artırır ve yeni sisteme de kaydeder."""
-        self._check_reset_legacy(current_model, current_api_key_name)
-        self.count += 1
-        self.last_model = current_model
-        self.last_api_key_name = current_api_key_name
-        self._save_legacy()
-        # Yeni sisteme de kaydet
-        self.record_request(current_model, current_api_key_name)
-        return self.count
+        with self._lock:
+            self._check_reset_legacy(current_model, current_api_key_name)
+            return self.count
+
+    def increment(self, current_model, current_api_key_name, count: int = 1):
+        """Geriye uyumluluk — sayacı count kadar artırır ve yeni sisteme de kaydeder."""
+        with self._lock:
+            self._check_reset_legacy(current_model, current_api_key_name)
+            self.count += count
+            self.last_model = current_model
+            self.last_api_key_name = current_api_key_name
+            self._save_legacy()
+            # Yeni sisteme de kaydet
+            self.record_request(current_model, current_api_key_name, count)
+            return self.count
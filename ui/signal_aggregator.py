@@ -0,0 +1,69 @@
+"""
+SignalAggregator — Worker sinyallerini biriktirip arayüze sabit kare hızında ileten ara katman.
+
+Her bölüm için progress, her API isteği için request_made yayınlanır.  Bunlar doğrudan arayüz
+slotlarına bağlandığında yüksek hızda Qt olay döngüsü her sinyal için ayrı bir kuyruklu çağrı
+işler (ilerleme çubuğu, durum satırı, sayaç).  Aggregator sinyalleri worker thread'inde
+(DirectConnection) yalnızca sayaçlara yazar; arayüz thread'indeki QTimer saniyede `fps` kez
+son ilerlemeyi ve aradaki istek sayısını tek seferde yayınlar.
+
+Kullanım:
+    aggregator = SignalAggregator(fps=10, parent=self.win)
+    aggregator.progress.connect(self._on_progress)        # (current, total) — son değer
+    aggregator.requests.connect(self._on_requests)        # son kareden beri yapılan istek sayısı
+    aggregator.attach(worker)
+    worker.finished.connect(aggregator.stop)              # kalanlar son kez iletilir
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+
+class SignalAggregator(QObject):
+    progress = pyqtSignal(int, int)
+    requests = pyqtSignal(int)
+
+    def __init__(self, fps: int = 10, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._progress: tuple[int, int] | None = None
+        self._pending_requests = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / max(1, fps))))
+        self._timer.timeout.connect(self.flush)
+
+    def attach(self, worker):
+        """Worker'ın progress / request_made sinyallerini (varsa) biriktiricilere bağlar ve zamanlayıcıyı başlatır."""
+        if hasattr(worker, "progress"):
+            worker.progress.connect(self._on_progress, Qt.ConnectionType.DirectConnection)
+        if hasattr(worker, "request_made"):
+            worker.request_made.connect(self._on_request, Qt.ConnectionType.DirectConnection)
+        self._timer.start()
+
+    # ──────── Worker thread'i ────────
+
+    def _on_progress(self, current: int, total: int):
+        with self._lock:
+            self._progress = (current, total)
+
+    def _on_request(self):
+        with self._lock:
+            self._pending_requests += 1
+
+    # ──────── Arayüz thread'i ────────
+
+    def flush(self):
+        """Biriken son ilerlemeyi ve istek sayısını yayınlar (değişiklik yoksa hiçbir şey yayınlanmaz)."""
+        with self._lock:
+            progress, self._progress = self._progress, None
+            requests, self._pending_requests = self._pending_requests, 0
+        if progress is not None:
+            self.progress.emit(*progress)
+        if requests:
+            self.requests.emit(requests)
+
+    def stop(self, *_):
+        """Zamanlayıcıyı durdurur ve bekleyenleri son kez iletir (worker.finished'e bağlanabilir)."""
+        self._timer.stop()
+        self.flush()